@@ -1,9 +1,10 @@
 import django_filters
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.db.models import Q
 
 from credentials.apps.catalog.models import Program
-from credentials.apps.credentials.models import UserCredential
+from credentials.apps.credentials.models import CourseCertificate, ProgramCertificate, UserCredential
 from credentials.apps.credentials.utils import filter_visible
 
 
@@ -17,15 +18,27 @@ class ProgramRelatedFilter(django_filters.Filter):
             return UserCredential.objects.none()
 
         course_runs = program.course_runs.all() if program else []
-        return qs.filter(Q(program_credentials__program_uuid=value) | Q(course_credentials__course_run__in=course_runs))
+        # Filtered on the credential configuration ids rather than joined, so that the (site, credential type,
+        # credential id) index is used.
+        content_types = ContentType.objects.get_for_models(ProgramCertificate, CourseCertificate)
+        return qs.filter(
+            Q(
+                credential_content_type=content_types[ProgramCertificate],
+                credential_id__in=ProgramCertificate.objects.filter(program_uuid=value).values("id"),
+            )
+            | Q(
+                credential_content_type=content_types[CourseCertificate],
+                credential_id__in=CourseCertificate.objects.filter(course_run__in=course_runs).values("id"),
+            )
+        )
 
 
 class CredentialTypeFilter(django_filters.Filter):
     def filter(self, qs, value):
         if value == "program":
-            return qs.filter(program_credentials__isnull=False)
+            return qs.filter(credential_content_type=ContentType.objects.get_for_model(ProgramCertificate))
         if value == "course-run":
-            return qs.filter(course_credentials__isnull=False)
+            return qs.filter(credential_content_type=ContentType.objects.get_for_model(CourseCertificate))
         return qs
 
 
@@ -41,6 +54,9 @@ class UserCredentialFilter(django_filters.FilterSet):
     )
     username = django_filters.CharFilter(label="Username of the recipient of the credential")
     only_visible = django_filters.BooleanFilter(method=handle_only_visible)
+    modified_since = django_filters.IsoDateTimeFilter(
+        field_name="modified", lookup_expr="gte", label="Only the credentials modified since this (ISO 8601) time"
+    )
 
     class Meta:
         model = UserCredential
@@ -49,4 +65,5 @@ class UserCredentialFilter(django_filters.FilterSet):
             "type",
             "status",
             "username",
+            "modified_since",
         ]
@@ -151,7 +151,10 @@ class UserCredentialDateOverrideSerializer(serializers.ModelSerializer):
 
 
 class UserCredentialSerializer(serializers.ModelSerializer):
-    """Serializer for UserCredential objects."""
+    """Serializer for UserCredential objects.
+
+    Only the fields listed by the (optional) `fields` context are serialized.
+    """
 
     credential = CredentialField(read_only=True)
     attributes = UserCredentialAttributeSerializer(many=True, read_only=True)
@@ -180,6 +183,13 @@ class UserCredentialSerializer(serializers.ModelSerializer):
             "modified",
         )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get("fields")
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
 
 class UserCredentialCreationSerializer(serializers.ModelSerializer):
     """Serializer used to create UserCredential objects."""
@@ -1,4 +1,5 @@
 import datetime
+import itertools
 import json
 from decimal import Decimal
 from unittest import mock
@@ -7,7 +8,9 @@ import ddt
 import pytz
 from django.contrib.auth.models import Permission
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIRequestFactory, APITestCase
@@ -53,6 +56,12 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         request = APIRequestFactory(SERVER_NAME=self.site.domain).get("/")
         return UserCredentialSerializer(user_credential, context={"request": request}, many=many).data
 
+    def override_user_credential_site(self, active):
+        """Filters the credentials of the site on their denormalized site, or on their configurations."""
+        switch = override_switch("api.use_user_credential_site", active=active)
+        switch.enable()
+        self.addCleanup(switch.disable)
+
     def authenticate_user(self, user):
         """Login as the given user."""
         self.client.logout()
@@ -216,8 +225,10 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         with self.assertRaises(ObjectDoesNotExist):
             print(user_credential.date_override)
 
-    def test_destroy(self):
+    @ddt.data(False, True)
+    def test_destroy(self, use_user_credential_site):
         """Verify the endpoint does NOT support the DELETE operation."""
+        self.override_user_credential_site(use_user_credential_site)
         credential = UserCredentialFactory(
             credential__site=self.site, status=UserCredential.AWARDED, username=self.user.username
         )
@@ -235,8 +246,10 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data, self.serialize_user_credential(credential))
 
-    def test_retrieve(self):
+    @ddt.data(False, True)
+    def test_retrieve(self, use_user_credential_site):
         """Verify the endpoint returns data for a single UserCredential."""
+        self.override_user_credential_site(use_user_credential_site)
         credential = UserCredentialFactory(credential__site=self.site, username=self.user.username)
         path = reverse("api:v2:credentials-detail", kwargs={"uuid": credential.uuid})
 
@@ -249,8 +262,10 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data, self.serialize_user_credential(credential))
 
-    def test_list(self):
+    @ddt.data(False, True)
+    def test_list(self, use_user_credential_site):
         """Verify the endpoint returns data for multiple UserCredentials."""
+        self.override_user_credential_site(use_user_credential_site)
         # Verify users without the view permission are denied access
         self.assert_access_denied(self.user, "get", self.list_path)
 
@@ -262,8 +277,10 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
             response.data["results"], self.serialize_user_credential(UserCredential.objects.all(), many=True)
         )
 
-    def test_list_status_filtering(self):
+    @ddt.data(False, True)
+    def test_list_status_filtering(self, use_user_credential_site):
         """Verify the endpoint returns data for all UserCredentials that match the specified status."""
+        self.override_user_credential_site(use_user_credential_site)
         awarded = UserCredentialFactory.create_batch(3, credential__site=self.site, status=UserCredential.AWARDED)
         revoked = UserCredentialFactory.create_batch(3, credential__site=self.site, status=UserCredential.REVOKED)
 
@@ -281,8 +298,10 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["results"], self.serialize_user_credential(expected, many=True))
 
-    def test_list_username_filtering(self):
+    @ddt.data(False, True)
+    def test_list_username_filtering(self, use_user_credential_site):
         """Verify the endpoint returns data for all UserCredentials awarded to the user matching the username."""
+        self.override_user_credential_site(use_user_credential_site)
         UserCredentialFactory.create_batch(3, credential__site=self.site)
 
         self.authenticate_user(self.user)
@@ -308,8 +327,10 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         response = self.client.get(self.list_path + "?program_uuid=1234fewef")
         self.assertListEqual(response.data["results"], [])
 
-    def test_list_program_uuid_filtering(self):
+    @ddt.data(False, True)
+    def test_list_program_uuid_filtering(self, use_user_credential_site):
         """Verify the endpoint returns data for all UserCredentials in the given program."""
+        self.override_user_credential_site(use_user_credential_site)
 
         # Course run 1 is in a program, course run 2 is not
         course1_run = CourseRunFactory()
@@ -336,8 +357,10 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["results"], self.serialize_user_credential(expected, many=True))
 
-    def test_list_type_filtering(self):
+    @ddt.data(False, True)
+    def test_list_type_filtering(self, use_user_credential_site):
         """Verify the endpoint returns data for all UserCredentials for the given type."""
+        self.override_user_credential_site(use_user_credential_site)
         program_certificate = ProgramCertificateFactory(site=self.site)
         course_run = CourseRunFactory()
         course_certificate = CourseCertificateFactory(course_id=course_run.key, course_run=course_run, site=self.site)
@@ -356,8 +379,10 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["results"], self.serialize_user_credential([program_cred], many=True))
 
-    def test_list_visible_filtering_with_certificate_available_date(self):
+    @ddt.data(False, True)
+    def test_list_visible_filtering_with_certificate_available_date(self, use_user_credential_site):
         """Verify the endpoint can filter by visible date."""
+        self.override_user_credential_site(use_user_credential_site)
         course = CourseFactory.create(site=self.site)
         course_run = CourseRunFactory.create(course=course)
         course_certificate = CourseCertificateFactory.create(
@@ -390,9 +415,11 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["results"], self.serialize_user_credential(both, many=True))
 
-    @ddt.data("put", "patch")
-    def test_update(self, method):
+    @ddt.data(*itertools.product(("put", "patch"), (False, True)))
+    @ddt.unpack
+    def test_update(self, method, use_user_credential_site):
         """Verify the endpoint supports updating the status of a UserCredential, but no other fields."""
+        self.override_user_credential_site(use_user_credential_site)
         credential = UserCredentialFactory(credential__site=self.site, username=self.user.username)
         path = reverse("api:v2:credentials-detail", kwargs={"uuid": credential.uuid})
         expected_status = UserCredential.REVOKED
@@ -410,8 +437,10 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data, self.serialize_user_credential(credential))
 
-    def test_site_filtering(self):
+    @ddt.data(False, True)
+    def test_site_filtering(self, use_user_credential_site):
         """Verify the endpoint only returns credentials linked to a single site."""
+        self.override_user_credential_site(use_user_credential_site)
         credential = UserCredentialFactory(credential__site=self.site)
         UserCredentialFactory()
 
@@ -424,6 +453,95 @@ class CredentialViewSetTests(SiteMixin, APITestCase):
         self.assertEqual(response.data["count"], 1)
         self.assertEqual(response.data["results"][0], self.serialize_user_credential(credential))
 
+    @ddt.data(False, True)
+    def test_list_cursor_pagination(self, use_user_credential_site):
+        """Verify the endpoint pages the credentials by (modified, id) when a cursor is given."""
+        self.override_user_credential_site(use_user_credential_site)
+        credentials = UserCredentialFactory.create_batch(5, credential__site=self.site)
+        # Credentials modified at the same time are paged by id.
+        modified = datetime.datetime(2024, 1, 1, tzinfo=pytz.UTC)
+        UserCredential.objects.filter(id__in=[credentials[1].id, credentials[3].id]).update(modified=modified)
+        expected = [str(credential.uuid) for credential in credentials[1::2] + credentials[0::2]]
+
+        self.authenticate_user(self.user)
+        self.add_user_permission(self.user, "view_usercredential")
+
+        uuids = []
+        path = self.list_path + "?cursor=&page_size=2"
+        while path:
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            uuids += [result["uuid"] for result in response.data["results"]]
+            path = response.data["next"]
+
+        self.assertEqual(uuids, expected)
+
+    @ddt.data(("cursor=invalid", 404), ("cursor=&page_size=0", 400), ("cursor=&page_size=many", 400))
+    @ddt.unpack
+    def test_list_cursor_pagination_errors(self, query, expected_status):
+        """Verify the endpoint rejects invalid cursors and page sizes."""
+        self.authenticate_user(self.user)
+        self.add_user_permission(self.user, "view_usercredential")
+
+        response = self.client.get(self.list_path + f"?{query}")
+        self.assertEqual(response.status_code, expected_status)
+
+    @ddt.data(False, True)
+    def test_list_modified_since_filtering(self, use_user_credential_site):
+        """Verify the endpoint returns the credentials modified since the given time."""
+        self.override_user_credential_site(use_user_credential_site)
+        old, recent = UserCredentialFactory.create_batch(2, credential__site=self.site)
+        UserCredential.objects.filter(id=old.id).update(modified=datetime.datetime(2024, 1, 1, tzinfo=pytz.UTC))
+
+        self.authenticate_user(self.user)
+        self.add_user_permission(self.user, "view_usercredential")
+
+        response = self.client.get(self.list_path, {"modified_since": "2024-01-02T00:00:00Z"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result["uuid"] for result in response.data["results"]], [str(recent.uuid)])
+
+    def test_list_fields(self):
+        """Verify the endpoint only serializes (and queries) the requested fields."""
+        credential = UserCredentialFactory(credential__site=self.site)
+        UserCredentialAttributeFactory(user_credential=credential)
+
+        self.authenticate_user(self.user)
+        self.add_user_permission(self.user, "view_usercredential")
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.list_path + "?fields=uuid,status")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"], [{"uuid": str(credential.uuid), "status": credential.status}])
+        self.assertFalse([query for query in captured if "credentials_usercredentialattribute" in query["sql"]])
+
+    def test_list_unknown_fields(self):
+        """Verify the endpoint rejects unknown fields."""
+        self.authenticate_user(self.user)
+        self.add_user_permission(self.user, "view_usercredential")
+
+        response = self.client.get(self.list_path + "?fields=uuid,password")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"fields": ["Unknown field: password"]})
+
+    @override_switch("api.use_user_credential_site", active=True)
+    def test_list_query(self):
+        """Verify the credentials of the site are filtered without joining the credential configurations."""
+        UserCredentialFactory(credential__site=self.site)
+        self.authenticate_user(self.user)
+        self.add_user_permission(self.user, "view_usercredential")
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.list_path + f"?username={self.user.username}&status=awarded")
+
+        self.assertEqual(response.status_code, 200)
+        list_queries = [query["sql"] for query in captured if 'FROM "credentials_usercredential"' in query["sql"]]
+        self.assertTrue(list_queries)
+        for sql in list_queries:
+            self.assertNotIn("JOIN", sql)
+
 
 @ddt.ddt
 class GradeViewSetTests(SiteMixin, APITestCase):
@@ -1,17 +1,19 @@
 import logging
 
 from django.apps import apps
+from django.conf import settings
 from django.db import transaction
 from django.db.models import Q
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
 from rest_framework import mixins, permissions, status, viewsets
-from rest_framework.exceptions import Throttled
+from rest_framework.exceptions import Throttled, ValidationError
 from rest_framework.response import Response
 from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.views import APIView, exception_handler
 
 from credentials.apps.api.v2.decorators import log_incoming_request
 from credentials.apps.api.v2.filters import UserCredentialFilter
+from credentials.apps.api.v2.pagination import ModifiedCursorPagination
 from credentials.apps.api.v2.permissions import CanReplaceUsername, UserCredentialPermissions
 from credentials.apps.api.v2.serializers import (
     CourseCertificateSerializer,
@@ -68,17 +70,47 @@ class CredentialRateThrottle(ScopedRateThrottle):
 class CredentialViewSet(viewsets.ModelViewSet):
     filterset_class = UserCredentialFilter
     lookup_field = "uuid"
+    pagination_class = ModifiedCursorPagination
     permission_classes = (UserCredentialPermissions,)
     serializer_class = UserCredentialSerializer
     throttle_classes = (CredentialRateThrottle,)
     throttle_scope = "credential_view"
 
+    def get_fields(self):
+        """Returns the fields requested with the `fields` parameter (comma-separated), or None for all the fields."""
+        fields = self.request.query_params.get("fields")
+        if self.action not in ("list", "retrieve") or not fields:
+            return None
+
+        fields = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in fields if field not in UserCredentialSerializer.Meta.fields]
+        if unknown:
+            raise ValidationError({"fields": [f"Unknown field: {field}" for field in unknown]})
+        return fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_fields()
+        return context
+
     def get_queryset(self):
-        queryset = UserCredential.objects.all()
+        # Ordered, for stable pages whatever index the filters use.
+        queryset = UserCredential.objects.order_by("id")
+        fields = self.get_fields()
+        if fields is None or "credential" in fields:
+            queryset = queryset.prefetch_related("credential")
+        if fields is None or "attributes" in fields:
+            queryset = queryset.prefetch_related("attributes")
+        if fields is None or "date_override" in fields:
+            queryset = queryset.select_related("date_override")
+        site = self.request.site
+
+        if settings.USE_USER_CREDENTIAL_SITE.is_enabled():
+            # The denormalized site, indexed along with the username and status, or the credential configuration.
+            return queryset.filter(site=site)
 
         # We have to filter on the explicit credential models
         # because we cannot set a GenericRelation field on the Site model.
-        site = self.request.site
         queryset = queryset.filter(Q(program_credentials__site=site) | Q(course_credentials__site=site))
 
         return queryset
@@ -111,7 +143,13 @@ class CredentialViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     def list(self, request, *args, **kwargs):  # pylint: disable=useless-super-delegation
-        """List all credentials."""
+        """List all credentials.
+
+        Pages are numbered (`page`), unless a `cursor` is given: pass an empty `cursor` to get the first page
+        (of up to `page_size` credentials, ordered by modification time), then follow the `next` links. Along with
+        `modified_since`, cursors allow incremental syncs. `fields` (comma-separated) restricts the fields of
+        the credentials, e.g. `fields=uuid,status,modified`.
+        """
         return super().list(request, *args, **kwargs)
 
     def partial_update(self, request, *args, **kwargs):  # pylint: disable=useless-super-delegation
@@ -49,8 +49,12 @@ class CredlyOrganizationAdminForm(forms.ModelForm):
 
             api_key = settings.BADGES_CONFIG["credly"]["ORGANIZATIONS"][str(uuid)]
 
+        # a client of its own: the API key is not validated yet
         credly_api_client = CredlyAPIClient(uuid, api_key)
-        self.ensure_organization_exists(credly_api_client)
+        try:
+            self.ensure_organization_exists(credly_api_client)
+        finally:
+            credly_api_client.session.close()
 
         return cleaned_data
 
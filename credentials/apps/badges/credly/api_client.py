@@ -1,21 +1,89 @@
 import base64
 import logging
-from functools import lru_cache
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
 from urllib.parse import urljoin
 
 import requests
 from attrs import asdict
 from django.conf import settings
 from django.contrib.sites.models import Site
-from requests.exceptions import HTTPError
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError, RequestException
 
-from credentials.apps.badges.credly.exceptions import CredlyAPIError, CredlyError
-from credentials.apps.badges.credly.utils import get_credly_api_base_url
+from credentials.apps.badges.credly.exceptions import CredlyAPIError, CredlyError, CredlyRateLimitError
+from credentials.apps.badges.credly.utils import get_credly_api_base_url, get_credly_setting
 from credentials.apps.badges.models import CredlyBadgeTemplate, CredlyOrganization
+from credentials.apps.core.utils import bump_cache_versions, get_cache_version
 
 
 logger = logging.getLogger(__name__)
 
+# per-process Credly organizations (along with their version) and their keep-alive sessions (see
+# `clear_credly_client_cache`):
+_organizations = {}
+_sessions = {}
+_cache_lock = threading.Lock()
+
+# the version of an organization, shared by all processes: a cached organization of a previous version is reloaded
+ORGANIZATION_VERSION_CACHE_KEY = "badges.credly.organization.{}.version"
+
+
+def get_credly_session(organization_id, api_key):
+    """
+    Returns the shared connection-pooled session for the Credly organization.
+
+    Authorization headers are built once per session; a new session is created if the API key has changed.
+    """
+
+    key = str(organization_id)
+    with _cache_lock:
+        session_api_key, session = _sessions.get(key, (None, None))
+        if session is None or session_api_key != api_key:
+            if session is not None:
+                session.close()
+            session = _build_credly_session(api_key)
+            _sessions[key] = (api_key, session)
+        return session
+
+
+def _build_credly_session(api_key):
+    pool_size = get_credly_setting(settings, "HTTP_POOL_SIZE")
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "Authorization": f"Basic {base64.b64encode(api_key.encode('ascii')).decode('ascii')}",
+        }
+    )
+    return session
+
+
+def clear_credly_client_cache(organization_id=None):
+    """
+    Drops cached Credly organizations and closes their sessions (all of them if no organization is given).
+
+    The given organization is dropped by the other processes too, on their next use of it.
+    """
+
+    if organization_id is not None:
+        bump_cache_versions(ORGANIZATION_VERSION_CACHE_KEY.format(organization_id))
+
+    with _cache_lock:
+        keys = [str(organization_id)] if organization_id is not None else list(_sessions.keys() | _organizations.keys())
+        for key in keys:
+            _organizations.pop(key, None)
+            __, session = _sessions.pop(key, (None, None))
+            if session is not None:
+                session.close()
+
 
 class CredlyAPIClient:
     """
@@ -24,6 +92,10 @@ class CredlyAPIClient:
     This class provides methods for performing various operations on the Credly API,
     such as fetching organization details, fetching badge templates, issuing badges,
     and revoking badges.
+
+    Clients of the same organization share a keep-alive HTTP session (connection pool), so creating a client
+    per request is cheap: neither the organization lookup nor the connection setup is repeated. A client given
+    an API key (e.g. one to validate) has a session of its own instead.
     """
 
     def __init__(self, organization_id, api_key=None):
@@ -36,23 +108,37 @@ class CredlyAPIClient:
         """
         if api_key is None:
             self.organization = self._get_organization(organization_id)
+            self.session = get_credly_session(organization_id, self.organization.api_key)
             api_key = self.organization.api_key
+        else:
+            self.session = _build_credly_session(api_key)
 
         self.api_key = api_key
         self.organization_id = organization_id
 
         self.base_api_url = urljoin(get_credly_api_base_url(settings), f"organizations/{self.organization_id}/")
+        self.timeout = (
+            get_credly_setting(settings, "HTTP_CONNECT_TIMEOUT"),
+            get_credly_setting(settings, "HTTP_READ_TIMEOUT"),
+        )
 
     def _get_organization(self, organization_id):
         """
         Check if Credly Organization with provided ID exists.
         """
+        version = get_cache_version(ORGANIZATION_VERSION_CACHE_KEY.format(organization_id))
+        cached_version, organization = _organizations.get(str(organization_id), (None, None))
+        if organization is not None and cached_version == version:
+            return organization
+
         try:
             organization = CredlyOrganization.objects.get(uuid=organization_id)
-            return organization
         except CredlyOrganization.DoesNotExist:
             raise CredlyError(f"CredlyOrganization with the uuid {organization_id} does not exist!")
 
+        _organizations[str(organization_id)] = (version, organization)
+        return organization
+
     def perform_request(self, method, url_suffix, data=None):
         """
         Perform an HTTP request to the specified URL suffix.
@@ -70,7 +156,7 @@ class CredlyAPIClient:
         """
         url = urljoin(self.base_api_url, url_suffix)
         logger.debug(f"Credly API: {method.upper()} {url}")
-        response = requests.request(method.upper(), url, headers=self._get_headers(), json=data, timeout=10)
+        response = self.session.request(method.upper(), url, json=data, timeout=self.timeout)
         self._raise_for_error(response)
         return response.json()
 
@@ -82,33 +168,34 @@ class CredlyAPIClient:
             response (requests.Response): Response object from the Credly API request.
 
         Raises:
+            CredlyRateLimitError: If the request was throttled (HTTP 429).
             CredlyAPIError: If the response status code indicates an error.
         """
         try:
             response.raise_for_status()
         except HTTPError:
             logger.error(f"Error while processing Credly API request: {response.status_code} - {response.text}")
-            raise CredlyAPIError(f"Credly API:{response.text}({response.status_code})")
+            message = f"Credly API:{response.text}({response.status_code})"
+            if response.status_code == 429:
+                raise CredlyRateLimitError(message, retry_after=self._get_retry_after(response))
+            raise CredlyAPIError(message, status_code=response.status_code)
 
-    def _get_headers(self):
+    @staticmethod
+    def _get_retry_after(response):
         """
-        Returns the headers for making API requests to Credly.
+        Returns the "Retry-After" response header value in seconds (either delay-seconds or HTTP-date form).
         """
-        return {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "Authorization": f"Basic {self._build_authorization_token()}",
-        }
-
-    @lru_cache
-    def _build_authorization_token(self):
-        """
-        Build the authorization token for the Credly API.
-
-        Returns:
-            str: Authorization token.
-        """
-        return base64.b64encode(self.api_key.encode("ascii")).decode("ascii")
+        retry_after = response.headers.get("Retry-After")
+        if not retry_after:
+            return None
+        try:
+            return max(int(retry_after), 0)
+        except ValueError:
+            pass
+        try:
+            return max(int((parsedate_to_datetime(retry_after) - timezone.now()).total_seconds()), 0)
+        except (TypeError, ValueError):
+            return None
 
     def fetch_organization(self):
         """
@@ -140,6 +227,30 @@ class CredlyAPIClient:
         """
         return self.perform_request("post", "badges/", asdict(issue_badge_data))
 
+    def issue_badges(self, issue_badges_data, max_workers=None):
+        """
+        Issues badges concurrently, over the shared session.
+
+        Args:
+            issue_badges_data (List[IssueBadgeData]): Data required to issue each badge.
+            max_workers (int): optional max number of simultaneous requests (see BULK_CONCURRENCY setting);
+                               keep it within the HTTP_POOL_SIZE, so that connections are reused.
+
+        Returns:
+            list: JSON response, or the raised error (CredlyAPIError, requests.RequestException) for each badge,
+                  in the same order.
+        """
+
+        def issue_badge(issue_badge_data):
+            try:
+                return self.issue_badge(issue_badge_data)
+            except (CredlyAPIError, RequestException) as error:
+                return error
+
+        max_workers = max_workers or get_credly_setting(settings, "BULK_CONCURRENCY")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(issue_badge, issue_badges_data))
+
     def revoke_badge(self, badge_id, data):
         """
         Revoke a badge with the given badge ID.
@@ -15,3 +15,19 @@ class CredlyAPIError(CredlyError):
     """
     Credly API errors.
     """
+
+    def __init__(self, message="", status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CredlyRateLimitError(CredlyAPIError):
+    """
+    Credly API throttled the request (HTTP 429).
+
+    `retry_after` holds the number of seconds to wait before the next request, if Credly has provided it.
+    """
+
+    def __init__(self, message="", status_code=429, retry_after=None):
+        super().__init__(message, status_code=status_code)
+        self.retry_after = retry_after
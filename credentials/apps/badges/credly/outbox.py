@@ -0,0 +1,309 @@
+"""
+Credly requests outbox processing.
+
+Badge events processing only schedules Credly requests (see `CredlyBadgeOperation`); this module sends them:
+
+- due operations are claimed in batches (one operation per user credential at a time);
+- requests are sent concurrently, while all database work stays in the calling thread;
+- failed requests are retried with exponential backoff, up to the configured number of attempts;
+- throttled (HTTP 429) requests are retried no earlier than Credly asks to, and the whole organization is paused
+  for that time, without spending the operation's attempts.
+"""
+
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+
+import attr
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+from edx_django_utils.monitoring import set_custom_attribute
+from requests.exceptions import RequestException
+
+from credentials.apps.badges.credly.api_client import CredlyAPIClient
+from credentials.apps.badges.credly.exceptions import CredlyAPIError, CredlyError, CredlyRateLimitError
+from credentials.apps.badges.credly.utils import get_credly_setting
+from credentials.apps.badges.issuers import CredlyBadgeTemplateIssuer
+from credentials.apps.badges.models import CredlyBadge, CredlyBadgeOperation
+from credentials.apps.credentials.constants import UserCredentialStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_backoff(attempts: int) -> float:
+    """
+    Exponential backoff (seconds) before the next attempt, with a small jitter to spread retries.
+    """
+
+    delay = min(
+        get_credly_setting(settings, "OUTBOX_BACKOFF_SECONDS") * 2 ** max(attempts - 1, 0),
+        get_credly_setting(settings, "OUTBOX_MAX_BACKOFF_SECONDS"),
+    )
+    return delay + random.uniform(0, delay * 0.1)
+
+
+class OrganizationThrottled(CredlyError):
+    """
+    The request wasn't sent: the organization is throttled by Credly.
+    """
+
+    def __init__(self, until):
+        super().__init__(f"Throttled until {until.isoformat()}")
+        self.until = until
+
+
+class IssuePending(CredlyError):
+    """
+    The revoke request wasn't sent: the badge is still to be issued (maybe by another worker).
+    """
+
+
+@attr.s(auto_attribs=True)
+class OutboxStats:
+    """
+    Credly outbox processing summary.
+    """
+
+    claimed: int = 0
+    succeeded: int = 0
+    skipped: int = 0
+    retried: int = 0
+    throttled: int = 0
+    failed: int = 0
+    max_latency: float = 0.0
+    queue_depth: int = 0
+    oldest_pending_age: float = 0.0
+
+
+class CredlyOutboxProcessor:
+    """
+    Sends scheduled Credly requests (CredlyBadgeOperation).
+    """
+
+    def __init__(self, concurrency=None, max_attempts=None):
+        self.issuer = CredlyBadgeTemplateIssuer()
+        self.concurrency = concurrency or get_credly_setting(settings, "OUTBOX_CONCURRENCY")
+        self.max_attempts = max_attempts or get_credly_setting(settings, "OUTBOX_MAX_ATTEMPTS")
+        self._clients = {}
+        self._throttled_until = {}
+        self._lock = threading.Lock()
+
+    def process(self, batch_size=None) -> OutboxStats:
+        """
+        Sends all due operations, batch by batch, and reports the outbox state.
+        """
+
+        batch_size = batch_size or get_credly_setting(settings, "OUTBOX_BATCH_SIZE")
+        stats = OutboxStats()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while True:
+                operations = self.claim(batch_size)
+                if not operations:
+                    break
+                stats.claimed += len(operations)
+                self.process_batch(executor, operations, stats)
+
+        self.report(stats)
+        return stats
+
+    def claim(self, batch_size):
+        """
+        Marks a batch of due operations as being processed.
+
+        Operations left "processing" longer than the lease (e.g. a crashed worker) are claimed again.
+        """
+
+        now = timezone.now()
+        lease_expired = now - timedelta(seconds=get_credly_setting(settings, "OUTBOX_LEASE_SECONDS"))
+
+        with transaction.atomic():
+            candidates = (
+                CredlyBadgeOperation.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=CredlyBadgeOperation.STATUSES.pending, next_attempt_at__lte=now)
+                    | Q(status=CredlyBadgeOperation.STATUSES.processing, modified__lt=lease_expired)
+                )
+                .order_by("next_attempt_at", "id")[:batch_size]
+            )
+
+            operations, user_credential_ids = [], set()
+            for operation in candidates:
+                # operations for the same user credential must not run concurrently:
+                if operation.user_credential_id not in user_credential_ids:
+                    user_credential_ids.add(operation.user_credential_id)
+                    operations.append(operation)
+
+            CredlyBadgeOperation.objects.filter(id__in=[operation.id for operation in operations]).update(
+                status=CredlyBadgeOperation.STATUSES.processing, modified=now
+            )
+
+        return operations
+
+    def process_batch(self, executor, operations, stats):
+        """
+        Sends claimed operations concurrently and stores their results.
+        """
+
+        user_credentials = CredlyBadge.objects.in_bulk([operation.user_credential_id for operation in operations])
+        futures = []
+
+        for operation in operations:
+            user_credential = user_credentials[operation.user_credential_id]
+            try:
+                prepared = self.prepare(operation, user_credential)
+            except CredlyError as error:
+                self.retry(operation, user_credential, error, stats)
+                continue
+
+            if prepared is None:
+                self.complete(operation, stats, skipped=True)
+                continue
+
+            organization_id, request = prepared
+            futures.append((operation, user_credential, executor.submit(self.send, organization_id, request)))
+
+        for operation, user_credential, future in futures:
+            response, error = future.result()
+            if error is None:
+                self.store_response(operation, user_credential, response)
+                self.complete(operation, stats)
+            else:
+                self.retry(operation, user_credential, error, stats)
+
+    def prepare(self, operation, user_credential):
+        """
+        Builds the Credly request for the operation, or returns None if there is nothing to send anymore.
+        """
+
+        if operation.action == CredlyBadgeOperation.ACTIONS.issue:
+            if user_credential.status != UserCredentialStatus.AWARDED or user_credential.propagated:
+                return None
+            request = ("issue_badge", self.issuer.get_credly_badge_data(user_credential))
+        else:
+            if not user_credential.propagated:
+                if CredlyBadgeOperation.objects.filter(
+                    user_credential=user_credential,
+                    action=CredlyBadgeOperation.ACTIONS.issue,
+                    status__in=[CredlyBadgeOperation.STATUSES.pending, CredlyBadgeOperation.STATUSES.processing],
+                ).exists():
+                    # revoked once issued, rather than skipped and issued afterwards
+                    raise IssuePending(f"The badge {user_credential.uuid} is still to be issued")
+                return None
+            request = ("revoke_badge", str(user_credential.external_uuid), self.issuer.get_credly_revoke_data())
+
+        organization_id = user_credential.credential.organization.uuid
+        if organization_id not in self._clients:
+            self._clients[organization_id] = CredlyAPIClient(organization_id)
+
+        method, *args = request
+        return organization_id, partial(getattr(self._clients[organization_id], method), *args)
+
+    def send(self, organization_id, request):
+        """
+        Performs the Credly request (runs in a worker thread, must not touch the database).
+
+        Returns: (response, error) pair.
+        """
+
+        throttled_until = self.get_throttled_until(organization_id)
+        if throttled_until and throttled_until > timezone.now():
+            return None, OrganizationThrottled(throttled_until)
+
+        try:
+            return request(), None
+        except CredlyRateLimitError as error:
+            self.throttle(organization_id, timezone.now() + timedelta(seconds=error.retry_after or get_backoff(1)))
+            return None, error
+        except (CredlyAPIError, RequestException) as error:
+            return None, error
+
+    def throttle(self, organization_id, until):
+        """
+        Pauses the requests of the organization until the given time (or a later one it's already paused until).
+        """
+
+        with self._lock:
+            self._throttled_until[organization_id] = max(until, self._throttled_until.get(organization_id, until))
+
+    def get_throttled_until(self, organization_id):
+        with self._lock:
+            return self._throttled_until.get(organization_id)
+
+    def store_response(self, operation, user_credential, response):
+        data = response.get("data")
+        if operation.action == CredlyBadgeOperation.ACTIONS.issue:
+            user_credential.external_uuid = data.get("id")
+        user_credential.state = data.get("state")
+        user_credential.save()
+
+    def complete(self, operation, stats, skipped=False):
+        now = timezone.now()
+        CredlyBadgeOperation.objects.filter(id=operation.id, status=CredlyBadgeOperation.STATUSES.processing).update(
+            status=CredlyBadgeOperation.STATUSES.succeeded, completed_at=now, last_error="", modified=now
+        )
+        if skipped:
+            stats.skipped += 1
+        else:
+            stats.succeeded += 1
+            stats.max_latency = max(stats.max_latency, (now - operation.created).total_seconds())
+
+    def retry(self, operation, user_credential, error, stats):
+        """
+        Re-schedules the failed operation, or gives up once it is out of attempts.
+        """
+
+        now = timezone.now()
+        attempts = operation.attempts
+        status = CredlyBadgeOperation.STATUSES.pending
+
+        if isinstance(error, OrganizationThrottled):
+            next_attempt_at = error.until
+            stats.throttled += 1
+        elif isinstance(error, CredlyRateLimitError):
+            next_attempt_at = self.get_throttled_until(user_credential.credential.organization.uuid)
+            stats.throttled += 1
+        elif isinstance(error, IssuePending):
+            # waiting for the issue operation doesn't spend attempts
+            next_attempt_at = now + timedelta(seconds=get_backoff(1))
+            stats.retried += 1
+        else:
+            attempts += 1
+            next_attempt_at = now + timedelta(seconds=get_backoff(attempts))
+            if attempts >= self.max_attempts:
+                status = CredlyBadgeOperation.STATUSES.failed
+                user_credential.state = CredlyBadge.STATES.error
+                user_credential.save()
+                stats.failed += 1
+                logger.error(
+                    "Credly outbox: giving up on %s after %s attempts: %s", operation.idempotency_key, attempts, error
+                )
+            else:
+                stats.retried += 1
+
+        CredlyBadgeOperation.objects.filter(id=operation.id, status=CredlyBadgeOperation.STATUSES.processing).update(
+            status=status, attempts=attempts, next_attempt_at=next_attempt_at, last_error=str(error), modified=now
+        )
+
+    def report(self, stats):
+        """
+        Reports outbox processing summary and the queue state (logs and monitoring custom attributes).
+        """
+
+        pending = CredlyBadgeOperation.objects.filter(status=CredlyBadgeOperation.STATUSES.pending).aggregate(
+            depth=Count("id"), oldest=Min("created")
+        )
+        stats.queue_depth = pending["depth"]
+        if pending["oldest"]:
+            stats.oldest_pending_age = (timezone.now() - pending["oldest"]).total_seconds()
+
+        for name, value in attr.asdict(stats).items():
+            set_custom_attribute(f"credly_outbox_{name}", value)
+
+        logger.info("Credly outbox: %s", stats)
@@ -2,6 +2,20 @@
 Credly specific utilities.
 """
 
+# optional BADGES_CONFIG["credly"] settings:
+CREDLY_DEFAULTS = {
+    "HTTP_POOL_SIZE": 10,
+    "HTTP_CONNECT_TIMEOUT": 5,
+    "HTTP_READ_TIMEOUT": 10,
+    "BULK_CONCURRENCY": 4,
+    "OUTBOX_BATCH_SIZE": 100,
+    "OUTBOX_CONCURRENCY": 4,
+    "OUTBOX_MAX_ATTEMPTS": 8,
+    "OUTBOX_BACKOFF_SECONDS": 30,
+    "OUTBOX_MAX_BACKOFF_SECONDS": 3600,
+    "OUTBOX_LEASE_SECONDS": 600,
+}
+
 
 def get_credly_api_base_url(settings):
     """
@@ -45,3 +59,11 @@ def get_credly_base_url(settings):
         return credly_config["CREDLY_SANDBOX_BASE_URL"]
 
     return credly_config["CREDLY_BASE_URL"]
+
+
+def get_credly_setting(settings, name):
+    """
+    Returns optional Credly integration setting (see CREDLY_DEFAULTS) from the BADGES_CONFIG["credly"] section.
+    """
+
+    return settings.BADGES_CONFIG.get("credly", {}).get(name, CREDLY_DEFAULTS[name])
@@ -7,6 +7,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from ..models import CredlyBadgeTemplate, CredlyOrganization
+from ..processing.rules import invalidate_rules_index
 from .api_client import CredlyAPIClient
 
 
@@ -115,6 +116,8 @@ class CredlyWebhook(APIView):
                 uuid=badge_template.get("id"),
                 organization=organization,
             ).update(is_active=False)
+            # queryset updates bypass model signals:
+            invalidate_rules_index()
 
     @staticmethod
     def handle_badge_template_deleted_event(request, data):
@@ -2,6 +2,9 @@
 This module provides classes for issuing badge credentials to users.
 """
 
+import logging
+from collections import defaultdict
+
 from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
 from django.utils.translation import gettext as _
@@ -9,13 +12,22 @@ from django.utils.translation import gettext as _
 from credentials.apps.badges.credly.api_client import CredlyAPIClient
 from credentials.apps.badges.credly.data import CredlyBadgeData
 from credentials.apps.badges.credly.exceptions import CredlyAPIError
-from credentials.apps.badges.models import BadgeTemplate, CredlyBadge, CredlyBadgeTemplate, UserCredential
+from credentials.apps.badges.models import (
+    BadgeTemplate,
+    CredlyBadge,
+    CredlyBadgeOperation,
+    CredlyBadgeTemplate,
+    UserCredential,
+)
 from credentials.apps.badges.signals.signals import notify_badge_awarded, notify_badge_revoked
 from credentials.apps.core.api import get_user_by_username
 from credentials.apps.credentials.constants import UserCredentialStatus
 from credentials.apps.credentials.issuers import AbstractCredentialIssuer
 
 
+logger = logging.getLogger(__name__)
+
+
 class BadgeTemplateIssuer(AbstractCredentialIssuer):
     """
     Issues BadgeTemplate credentials to users.
@@ -114,15 +126,15 @@ class CredlyBadgeTemplateIssuer(BadgeTemplateIssuer):
     issued_credential_type = CredlyBadgeTemplate
     issued_user_credential_type = CredlyBadge
 
-    def issue_credly_badge(self, *, user_credential):
+    def get_credly_badge_data(self, user_credential):
         """
-        Requests Credly service for external badge issuing based on internal user credential (CredlyBadge).
+        Builds Credly badge issuing request data for the internal user credential (CredlyBadge).
         """
 
         user = get_user_by_username(user_credential.username)
         badge_template = user_credential.credential
 
-        credly_badge_data = CredlyBadgeData(
+        return CredlyBadgeData(
             recipient_email=user.email,
             issued_to_first_name=(user.first_name or user.username),
             issued_to_last_name=(user.last_name or user.username),
@@ -130,8 +142,25 @@ class CredlyBadgeTemplateIssuer(BadgeTemplateIssuer):
             issued_at=badge_template.created.strftime("%Y-%m-%d %H:%M:%S %z"),
         )
 
+    @staticmethod
+    def get_credly_revoke_data():
+        """
+        Builds Credly badge revoking request data.
+        """
+
+        return {
+            "reason": _("Open edX internal user credential was revoked"),
+        }
+
+    def issue_credly_badge(self, *, user_credential):
+        """
+        Requests Credly service for external badge issuing based on internal user credential (CredlyBadge).
+        """
+
+        credly_badge_data = self.get_credly_badge_data(user_credential)
+
         try:
-            credly_api = CredlyAPIClient(badge_template.organization.uuid)
+            credly_api = CredlyAPIClient(user_credential.credential.organization.uuid)
             response = credly_api.issue_badge(credly_badge_data)
         except CredlyAPIError:
             user_credential.state = "error"
@@ -142,6 +171,39 @@ class CredlyBadgeTemplateIssuer(BadgeTemplateIssuer):
         user_credential.state = response.get("data").get("state")
         user_credential.save()
 
+    def issue_credly_badges(self, user_credentials, max_workers=None):
+        """
+        Requests Credly service for external badges issuing, concurrently (see `CredlyAPIClient.issue_badges`).
+
+        Unlike `issue_credly_badge`, doesn't raise on Credly errors: failed user credentials get the "error" state.
+
+        Returns: (list) user credentials which failed to be issued.
+        """
+
+        by_organization = defaultdict(list)
+        for user_credential in user_credentials:
+            by_organization[user_credential.credential.organization.uuid].append(user_credential)
+
+        failed = []
+        for organization_id, organization_credentials in by_organization.items():
+            credly_api = CredlyAPIClient(organization_id)
+            responses = credly_api.issue_badges(
+                [self.get_credly_badge_data(user_credential) for user_credential in organization_credentials],
+                max_workers=max_workers,
+            )
+
+            for user_credential, response in zip(organization_credentials, responses):
+                if isinstance(response, Exception):
+                    logger.error(f"Credly badge issuing failed for {user_credential.username}: {response}")
+                    user_credential.state = "error"
+                    failed.append(user_credential)
+                else:
+                    user_credential.external_uuid = response.get("data").get("id")
+                    user_credential.state = response.get("data").get("state")
+                user_credential.save()
+
+        return failed
+
     def revoke_credly_badge(self, credential_id, user_credential):
         """
         Requests Credly service for external badge revoking based on internal user credential (CredlyBadge).
@@ -149,11 +211,8 @@ class CredlyBadgeTemplateIssuer(BadgeTemplateIssuer):
 
         credential = self.get_credential(credential_id)
         credly_api = CredlyAPIClient(credential.organization.uuid)
-        revoke_data = {
-            "reason": _("Open edX internal user credential was revoked"),
-        }
         try:
-            response = credly_api.revoke_badge(user_credential.external_uuid, revoke_data)
+            response = credly_api.revoke_badge(user_credential.external_uuid, self.get_credly_revoke_data())
         except CredlyAPIError:
             user_credential.state = "error"
             user_credential.save()
@@ -162,13 +221,13 @@ class CredlyBadgeTemplateIssuer(BadgeTemplateIssuer):
         user_credential.state = response.get("data").get("state")
         user_credential.save()
 
-    def award(self, *, username, credential_id):
+    def award(self, *, username, credential_id, deferred=False):
         """
         Awards a Credly badge.
 
         - Creates user credential record for the given badge template, for a given user;
         - Notifies about the awarded badge (public signal);
-        - Issues external Credly badge (Credly API);
+        - Issues external Credly badge (Credly API), or schedules it if `deferred` (see CredlyBadgeOperation);
 
         Returns: (CredlyBadge) user credential
         """
@@ -177,22 +236,45 @@ class CredlyBadgeTemplateIssuer(BadgeTemplateIssuer):
 
         # do not issue new badges if the badge was issued already
         if not credly_badge.propagated:
-            self.issue_credly_badge(user_credential=credly_badge)
+            if deferred:
+                CredlyBadgeOperation.enqueue(credly_badge, CredlyBadgeOperation.ACTIONS.issue)
+            else:
+                self.issue_credly_badge(user_credential=credly_badge)
 
         return credly_badge
 
-    def revoke(self, credential_id, username):
+    def bulk_award(self, *, usernames, credential_id, max_workers=None):
+        """
+        Awards a Credly badge to many users.
+
+        Same as `award` for each user, except that external Credly badges are issued concurrently.
+
+        Returns: (list) CredlyBadge user credentials
+        """
+
+        credly_badges = [
+            BadgeTemplateIssuer.award(self, username=username, credential_id=credential_id) for username in usernames
+        ]
+        self.issue_credly_badges(
+            [credly_badge for credly_badge in credly_badges if not credly_badge.propagated], max_workers=max_workers
+        )
+        return credly_badges
+
+    def revoke(self, credential_id, username, deferred=False):
         """
         Revokes a Credly badge.
 
         - Changes user credential status to REVOKED, for a given user;
         - Notifies about the revoked badge (public signal);
-        - Revokes external Credly badge (Credly API);
+        - Revokes external Credly badge (Credly API), or schedules it if `deferred` (see CredlyBadgeOperation);
 
         Returns: (CredlyBadge) user credential
         """
 
         user_credential = super().revoke(credential_id, username)
-        if user_credential.propagated:
+        if deferred:
+            # the badge may be not propagated yet, but have its issuing scheduled:
+            CredlyBadgeOperation.enqueue(user_credential, CredlyBadgeOperation.ACTIONS.revoke)
+        elif user_credential.propagated:
             self.revoke_credly_badge(credential_id, user_credential)
         return user_credential
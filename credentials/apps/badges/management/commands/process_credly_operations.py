@@ -0,0 +1,43 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from credentials.apps.badges.credly.outbox import CredlyOutboxProcessor
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Send scheduled Credly badge issuing/revoking requests (Credly outbox)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch_size", type=int, help="Operations claimed at once.")
+        parser.add_argument("--concurrency", type=int, help="Max number of simultaneous Credly requests.")
+        parser.add_argument(
+            "--forever",
+            action="store_true",
+            help="Keep polling for scheduled operations instead of exiting once there are no due ones.",
+        )
+        parser.add_argument("--sleep", type=float, default=5, help="Polling interval (seconds) for --forever.")
+
+    def handle(self, *args, **options):
+        """
+        Drain the Credly outbox.
+
+        Usage:
+            ./manage.py process_credly_operations
+            ./manage.py process_credly_operations --concurrency 8 --forever --sleep 2
+        """
+        processor = CredlyOutboxProcessor(concurrency=options.get("concurrency"))
+
+        while True:
+            stats = processor.process(batch_size=options.get("batch_size"))
+            logger.info(
+                f"Credly outbox: {stats.succeeded} succeeded, {stats.skipped} skipped, {stats.retried} retried, "
+                f"{stats.throttled} throttled, {stats.failed} failed; {stats.queue_depth} pending."
+            )
+            if not options.get("forever"):
+                break
+            time.sleep(options["sleep"])
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.19 on 2026-10-18 18:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import django_extensions.db.fields
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("badges", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CredlyBadgeOperation",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name="created"),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name="modified"),
+                ),
+                ("action", models.CharField(choices=[("issue", "issue"), ("revoke", "revoke")], max_length=32)),
+                ("idempotency_key", models.CharField(max_length=255, unique=True)),
+                (
+                    "status",
+                    model_utils.fields.StatusField(
+                        choices=[
+                            ("pending", "pending"),
+                            ("processing", "processing"),
+                            ("succeeded", "succeeded"),
+                            ("failed", "failed"),
+                        ],
+                        default="pending",
+                        max_length=100,
+                        no_check_for_status=True,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("next_attempt_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "user_credential",
+                    models.ForeignKey(
+                        help_text="User credential (Credly badge) the request is made for.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="credly_operations",
+                        to="badges.credlybadge",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["status", "next_attempt_at"], name="badges_cred_status_8b7887_idx")],
+            },
+        ),
+    ]
@@ -9,6 +9,7 @@ from urllib.parse import urljoin
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
 from model_utils import Choices
@@ -675,3 +676,60 @@ class CredlyBadge(UserCredential):
         """
 
         return self.external_uuid and (self.state in self.ISSUING_STATES)
+
+
+class CredlyBadgeOperation(TimeStampedModel):
+    """
+    Outbox record for a Credly API request (badge issuing or revoking) on behalf of a user credential.
+
+    Records are drained by the `process_credly_operations` management command, so events processing never waits
+    for Credly. There is a single record per user credential and action (see `idempotency_key`): enqueueing the
+    same action again re-schedules the existing record instead of creating a duplicate request.
+    """
+
+    ACTIONS = Choices("issue", "revoke")
+    STATUSES = Choices("pending", "processing", "succeeded", "failed")
+
+    user_credential = models.ForeignKey(
+        CredlyBadge,
+        on_delete=models.CASCADE,
+        related_name="credly_operations",
+        help_text=_("User credential (Credly badge) the request is made for."),
+    )
+    action = models.CharField(max_length=32, choices=ACTIONS)
+    idempotency_key = models.CharField(max_length=255, unique=True)
+    status = StatusField(choices_name="STATUSES")
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"CredlyBadgeOperation:{self.action}:{self.user_credential_id}:{self.status}"
+
+    @staticmethod
+    def get_idempotency_key(user_credential, action):
+        return f"credly:{action}:{user_credential.uuid}"
+
+    @classmethod
+    def enqueue(cls, user_credential, action):
+        """
+        Schedules the Credly request for the user credential (idempotent).
+        """
+
+        key = cls.get_idempotency_key(user_credential, action)
+        operation, created = cls.objects.get_or_create(
+            idempotency_key=key, defaults={"user_credential": user_credential, "action": action}
+        )
+
+        if not created and operation.status != cls.STATUSES.pending:
+            operation.status = cls.STATUSES.pending
+            operation.attempts = 0
+            operation.next_attempt_at = timezone.now()
+            operation.last_error = ""
+            operation.completed_at = None
+            operation.save()
+        return operation
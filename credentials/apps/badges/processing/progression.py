@@ -3,48 +3,45 @@ Badge progression processing.
 """
 
 import logging
-from typing import List
 
 from attrs import asdict
 
-from credentials.apps.badges.models import BadgeRequirement
+from credentials.apps.badges.processing.rules import get_rules_index
+from credentials.apps.badges.processing.state import UserBadgeState
 
 
 logger = logging.getLogger(__name__)
 
 
-def discover_requirements(event_type: str) -> List[BadgeRequirement]:
-    """
-    Picks all relevant requirements based on the event type.
-    """
-
-    return BadgeRequirement.objects.filter(event_type=event_type, template__is_active=True)
-
-
 def process_requirements(event_type, username, payload):
     """
     Finds all relevant requirements, tests them one by one, marks as completed if needed.
+
+    Requirements and their rules come from the compiled rules index, so payload evaluation does not hit the
+    database; user progress is loaded at once and only for templates whose requirements matched.
     """
 
-    requirements = discover_requirements(event_type=event_type)
-    completed_templates = set()
+    index = get_rules_index()
+    requirements = index.requirements_for(event_type)
+    data = asdict(payload)
 
     logger.debug("BADGES: found %s requirements to process.", len(requirements))
 
-    for requirement in requirements:
+    matched = [compiled.requirement for compiled in requirements if compiled.matches(data)]
+    if not matched:
+        return
+
+    state = UserBadgeState.load(username, {requirement.template_id for requirement in matched}, index.template_groups)
 
-        # remember: the badge template is already "done"
-        if requirement.template.is_completed(username):
-            completed_templates.add(requirement.template_id)
+    for requirement in matched:
 
         # drop early: if the badge template is already "done"
-        if requirement.template_id in completed_templates:
+        if state.is_completed(requirement.template_id):
             continue
 
         # drop early: if the requirement is already "done"
-        if requirement.is_fulfilled(username):
+        if state.is_fulfilled(requirement):
             continue
 
-        # process: payload rules
-        if requirement.apply_rules(asdict(payload)):
-            requirement.fulfill(username)
+        requirement.fulfill(username)
+        state.add_fulfillment(requirement)
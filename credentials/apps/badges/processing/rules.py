@@ -0,0 +1,204 @@
+"""
+Compiled badge rules index.
+
+Badge requirements and penalties (with their data rules) change only through the admin, while events arrive
+constantly. Instead of loading requirements, penalties and rules from the database for every incoming event,
+they are compiled once into plain Python callables grouped by event type and reused until the configuration
+changes.
+
+Cross-process invalidation relies on a version token kept in the Django cache: every configuration change
+(see `credentials.apps.badges.signals.handlers`) replaces the token, and each process rebuilds its index
+lazily once it notices that its local copy was built for a stale token.
+"""
+
+import logging
+import operator
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
+import attr
+from attrs import asdict
+from django.db.models import Prefetch
+
+from credentials.apps.badges.models import AbstractDataRule, BadgePenalty, BadgeRequirement
+from credentials.apps.core.utils import bump_cache_versions, get_cache_version
+
+
+logger = logging.getLogger(__name__)
+
+RULES_INDEX_VERSION_CACHE_KEY = "badges.rules_index.version"
+
+_MISSING = object()
+
+
+class CompiledRule:
+    """
+    Pre-parsed data rule: the key path is split and the comparison function is resolved only once.
+
+    Behaves exactly as `AbstractDataRule.apply` for the same rule and payload.
+    """
+
+    __slots__ = ("keys", "comparison_func", "expected")
+
+    def __init__(self, rule: AbstractDataRule):
+        self.keys = tuple(rule.data_path.split("."))
+        self.comparison_func = getattr(operator, rule.operator, None)
+        self.expected = rule._value_to_bool()
+
+    def __call__(self, data: dict) -> bool:
+        if self.comparison_func is None:
+            return False
+        return self.comparison_func(str(self._lookup(data)), self.expected)
+
+    def _lookup(self, data):
+        """
+        Same traversal semantics as `credentials.apps.badges.utils.keypath`.
+        """
+
+        current = data
+        for key in self.keys:
+            if attr.has(current):
+                current = asdict(current)
+            if not isinstance(current, dict):
+                return None
+            current = current.get(key, _MISSING)
+            if current is _MISSING:
+                return None
+        return current
+
+
+def compile_rules(rules) -> Callable[[dict], bool]:
+    """
+    Compiles a set of data rules into a single "AND" predicate.
+
+    No rules means the predicate never matches (see `BadgeRequirement.apply_rules`).
+    """
+
+    compiled = tuple(CompiledRule(rule) for rule in rules)
+
+    if not compiled:
+        return lambda data: False
+    return lambda data: all(rule(data) for rule in compiled)
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class CompiledRequirement:
+    """
+    Active badge requirement with its data rules compiled.
+    """
+
+    requirement: BadgeRequirement
+    matches: Callable[[dict], bool]
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class CompiledPenalty:
+    """
+    Active badge penalty with its data rules compiled.
+    """
+
+    penalty: BadgePenalty
+    matches: Callable[[dict], bool]
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class RulesIndex:
+    """
+    Active requirements and penalties grouped by event type.
+
+    `template_groups` maps every active badge template to its requirement groups (see `BadgeTemplate.groups`)
+    and the requirements (IDs) each group consists of, regardless of the event type.
+    """
+
+    version: Optional[str] = None
+    requirements: Dict[str, Tuple[CompiledRequirement, ...]] = attr.Factory(dict)
+    penalties: Dict[str, Tuple[CompiledPenalty, ...]] = attr.Factory(dict)
+    template_groups: Dict[int, Dict[Optional[str], FrozenSet[int]]] = attr.Factory(dict)
+
+    def requirements_for(self, event_type: str) -> Tuple[CompiledRequirement, ...]:
+        return self.requirements.get(event_type, ())
+
+    def penalties_for(self, event_type: str) -> Tuple[CompiledPenalty, ...]:
+        return self.penalties.get(event_type, ())
+
+
+_index = RulesIndex()
+_index_lock = threading.Lock()
+
+
+def build_rules_index(version: Optional[str] = None) -> RulesIndex:
+    """
+    Loads all active requirements and penalties with their rules and compiles them.
+
+    Model instances are kept with everything processing needs already loaded (templates, penalty's requirements),
+    so that evaluating an event does not touch the database until user progress is involved.
+    """
+
+    requirements = defaultdict(list)
+    penalties = defaultdict(list)
+    template_groups = defaultdict(lambda: defaultdict(set))
+
+    for requirement in (
+        BadgeRequirement.objects.filter(template__is_active=True)
+        .select_related("template")
+        .prefetch_related("rules")
+        .order_by("id")
+    ):
+        requirements[requirement.event_type].append(
+            CompiledRequirement(requirement=requirement, matches=compile_rules(requirement.rules.all()))
+        )
+        template_groups[requirement.template_id][requirement.blend].add(requirement.id)
+
+    for penalty in (
+        BadgePenalty.objects.filter(template__is_active=True)
+        .select_related("template")
+        .prefetch_related(
+            "rules",
+            Prefetch("requirements", queryset=BadgeRequirement.objects.select_related("template")),
+        )
+        .order_by("id")
+    ):
+        penalties[penalty.event_type].append(
+            CompiledPenalty(penalty=penalty, matches=compile_rules(penalty.rules.all()))
+        )
+
+    return RulesIndex(
+        version=version,
+        requirements={event_type: tuple(items) for event_type, items in requirements.items()},
+        penalties={event_type: tuple(items) for event_type, items in penalties.items()},
+        template_groups={
+            template_id: {group: frozenset(requirement_ids) for group, requirement_ids in groups.items()}
+            for template_id, groups in template_groups.items()
+        },
+    )
+
+
+def get_rules_index() -> RulesIndex:
+    """
+    Returns the compiled rules index, rebuilding it if the badges configuration has changed.
+    """
+
+    global _index  # pylint: disable=global-statement
+
+    version = get_cache_version(RULES_INDEX_VERSION_CACHE_KEY)
+    index = _index
+    if index.version is not None and index.version == version:
+        return index
+
+    with _index_lock:
+        if _index.version is None or _index.version != version:
+            logger.debug("BADGES: (re)building compiled rules index (version %s).", version)
+            _index = build_rules_index(version=version)
+        return _index
+
+
+def invalidate_rules_index():
+    """
+    Marks the compiled rules index as stale for all processes.
+    """
+
+    global _index  # pylint: disable=global-statement
+
+    bump_cache_versions(RULES_INDEX_VERSION_CACHE_KEY)
+    _index = RulesIndex()
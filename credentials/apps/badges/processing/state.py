@@ -0,0 +1,81 @@
+"""
+Per-event user badge state.
+
+Answers "is the requirement fulfilled?", "is the group fulfilled?" and "is the badge template completed?" for
+a single user from memory, instead of querying (and get-or-creating) user progress per requirement and group.
+"""
+
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, Optional, Set
+
+from credentials.apps.badges.models import BadgeProgress, BadgeRequirement, Fulfillment
+
+
+class UserBadgeState:
+    """
+    User's badge progress and fulfilled requirements for a set of badge templates.
+
+    Mirrors `BadgeRequirement.is_fulfilled`, `BadgeRequirement.is_group_fulfilled` and
+    `BadgeTemplate.is_completed`; call `add_fulfillment` after fulfilling a requirement to keep it in sync.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        template_groups: Dict[int, Dict[Optional[str], FrozenSet[int]]],
+        fulfilled: Dict[int, Set[int]],
+    ):
+        self.username = username
+        self.template_groups = template_groups
+        self.fulfilled = fulfilled
+
+    @classmethod
+    def load(
+        cls,
+        username: str,
+        template_ids: Iterable[int],
+        template_groups: Dict[int, Dict[Optional[str], FrozenSet[int]]],
+    ) -> "UserBadgeState":
+        """
+        Fetches user's progress and fulfillments for the given badge templates (in two queries at most).
+        """
+
+        fulfilled = defaultdict(set)
+        progress_templates = dict(
+            BadgeProgress.objects.filter(username=username, template_id__in=set(template_ids)).values_list(
+                "id", "template_id"
+            )
+        )
+
+        if progress_templates:
+            for progress_id, requirement_id in Fulfillment.objects.filter(
+                progress_id__in=progress_templates.keys(), requirement__isnull=False
+            ).values_list("progress_id", "requirement_id"):
+                fulfilled[progress_templates[progress_id]].add(requirement_id)
+
+        return cls(username, template_groups, fulfilled)
+
+    def add_fulfillment(self, requirement: BadgeRequirement):
+        self.fulfilled[requirement.template_id].add(requirement.id)
+
+    def is_fulfilled(self, requirement: BadgeRequirement) -> bool:
+        return requirement.id in self.fulfilled[requirement.template_id]
+
+    def is_group_fulfilled(self, template_id: int, group: Optional[str]) -> bool:
+        requirement_ids = self.template_groups.get(template_id, {}).get(group, frozenset())
+        return not requirement_ids.isdisjoint(self.fulfilled[template_id])
+
+    def ratio(self, template_id: int) -> float:
+        """
+        Same as `BadgeProgress.ratio`.
+        """
+
+        groups = self.template_groups.get(template_id, {})
+        if not groups:
+            return 0.00
+
+        fulfilled_groups = sum(1 for group in groups if self.is_group_fulfilled(template_id, group))
+        return round(fulfilled_groups / len(groups), 2)
+
+    def is_completed(self, template_id: int) -> bool:
+        return self.ratio(template_id) == 1.00
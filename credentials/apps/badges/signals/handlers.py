@@ -6,12 +6,25 @@ See:
 
 import logging
 
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from openedx_events.tooling import OpenEdxPublicSignal, load_all_signals
 
+from credentials.apps.badges.credly.api_client import clear_credly_client_cache
 from credentials.apps.badges.issuers import CredlyBadgeTemplateIssuer
-from credentials.apps.badges.models import BadgeProgress
+from credentials.apps.badges.models import (
+    BadgePenalty,
+    BadgeProgress,
+    BadgeRequirement,
+    BadgeTemplate,
+    CredlyBadgeTemplate,
+    CredlyOrganization,
+    DataRule,
+    PenaltyDataRule,
+)
 from credentials.apps.badges.processing.generic import process_event
+from credentials.apps.badges.processing.rules import invalidate_rules_index
 from credentials.apps.badges.signals import (
     BADGE_PROGRESS_COMPLETE,
     BADGE_PROGRESS_INCOMPLETE,
@@ -69,11 +82,13 @@ def handle_badge_completion(sender, username, badge_template_id, **kwargs):  # p
 
     - username
     - badge template ID
+
+    NOTE: external Credly badge issuing is only scheduled here (see `process_credly_operations` command).
     """
 
     logger.debug("BADGES: progress is complete for %s on the %s", username, badge_template_id)
 
-    CredlyBadgeTemplateIssuer().award(username=username, credential_id=badge_template_id)
+    CredlyBadgeTemplateIssuer().award(username=username, credential_id=badge_template_id, deferred=True)
 
 
 @receiver(BADGE_PROGRESS_INCOMPLETE)
@@ -83,6 +98,42 @@ def handle_badge_regression(sender, username, badge_template_id, **kwargs):  # p
 
     - username
     - badge template ID
+
+    NOTE: external Credly badge revoking is only scheduled here (see `process_credly_operations` command).
+    """
+
+    CredlyBadgeTemplateIssuer().revoke(badge_template_id, username, deferred=True)
+
+
+@receiver(post_save, sender=BadgeTemplate)
+@receiver(post_delete, sender=BadgeTemplate)
+@receiver(post_save, sender=CredlyBadgeTemplate)
+@receiver(post_delete, sender=CredlyBadgeTemplate)
+@receiver(post_save, sender=BadgeRequirement)
+@receiver(post_delete, sender=BadgeRequirement)
+@receiver(post_save, sender=DataRule)
+@receiver(post_delete, sender=DataRule)
+@receiver(post_save, sender=BadgePenalty)
+@receiver(post_delete, sender=BadgePenalty)
+@receiver(post_save, sender=PenaltyDataRule)
+@receiver(post_delete, sender=PenaltyDataRule)
+@receiver(m2m_changed, sender=BadgePenalty.requirements.through)
+def handle_badges_configuration_change(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drops the compiled rules index once badge templates, requirements, penalties or their rules change.
+
+    Invalidated once more after commit so that other processes can't keep an index built from uncommitted data.
+    """
+
+    invalidate_rules_index()
+    transaction.on_commit(invalidate_rules_index)
+
+
+@receiver(post_save, sender=CredlyOrganization)
+@receiver(post_delete, sender=CredlyOrganization)
+def handle_credly_organization_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drops the cached organization (and its Credly HTTP session) once the organization (e.g. API key) changes.
     """
 
-    CredlyBadgeTemplateIssuer().revoke(badge_template_id, username)
+    clear_credly_client_cache(instance.uuid)
@@ -1,15 +1,34 @@
+import json
+import logging
+import threading
+import time
+from datetime import timedelta
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import mock
+from urllib.parse import urljoin
 
+import requests
 from attrs import asdict
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
 from faker import Faker
 from openedx_events.learning.data import BadgeData, BadgeTemplateData, UserData, UserPersonalData
 
-from credentials.apps.badges.credly.api_client import CredlyAPIClient
-from credentials.apps.badges.credly.exceptions import CredlyError
+from credentials.apps.badges.credly.api_client import (
+    ORGANIZATION_VERSION_CACHE_KEY,
+    CredlyAPIClient,
+    clear_credly_client_cache,
+)
+from credentials.apps.badges.credly.data import CredlyBadgeData
+from credentials.apps.badges.credly.exceptions import CredlyAPIError, CredlyError, CredlyRateLimitError
 from credentials.apps.badges.models import BadgeTemplate, CredlyOrganization
 
 
+logger = logging.getLogger(__name__)
+
+
 class CredlyApiClientTestCase(TestCase):
     def setUp(self):
         fake = Faker()
@@ -44,7 +63,7 @@ class CredlyApiClientTestCase(TestCase):
             )
 
     def test_perform_request(self):
-        with mock.patch("credentials.apps.badges.credly.api_client.requests.request") as mock_request:
+        with mock.patch.object(requests.Session, "request") as mock_request:
             mock_response = mock.Mock()
             mock_response.json.return_value = {"key": "value"}
             mock_request.return_value = mock_response
@@ -52,15 +71,70 @@ class CredlyApiClientTestCase(TestCase):
             mock_request.assert_called_once_with(
                 "GET",
                 "https://sandbox-api.credly.com/api/endpoint",
-                headers={
-                    "Accept": "application/json",
-                    "Content-Type": "application/json",
-                    "Authorization": "Basic dGVzdF9hcGlfa2V5",
-                },
                 json=None,
-                timeout=10,
+                timeout=(5, 10),
             )
             self.assertEqual(result, {"key": "value"})
+        self.assertEqual(self.api_client.session.headers["Authorization"], "Basic dGVzdF9hcGlfa2V5")
+        self.assertEqual(self.api_client.session.headers["Content-Type"], "application/json")
+
+    def test_session_is_shared_per_organization(self):
+        client = CredlyAPIClient(self.organization.uuid)
+        other_client = CredlyAPIClient(self.organization.uuid)
+        other_organization = CredlyOrganization.objects.create(
+            uuid=Faker().uuid4(), api_key="test-api-key", name="other_organization"
+        )
+        other_organization_client = CredlyAPIClient(other_organization.uuid)
+
+        self.assertIs(other_client.session, client.session)
+        self.assertIsNot(other_organization_client.session, client.session)
+
+    def test_session_of_api_key_client_is_not_shared(self):
+        client = CredlyAPIClient(self.organization.uuid)
+        api_key_client = CredlyAPIClient(self.organization.uuid, "new_api_key")
+
+        self.assertIsNot(api_key_client.session, client.session)
+        self.assertIs(CredlyAPIClient(self.organization.uuid).session, client.session)
+        self.assertEqual(api_key_client.session.headers["Authorization"], "Basic bmV3X2FwaV9rZXk=")
+
+    def test_organization_is_cached(self):
+        CredlyAPIClient(self.organization.uuid)
+
+        with self.assertNumQueries(0):
+            client = CredlyAPIClient(self.organization.uuid)
+        self.assertEqual(client.organization, self.organization)
+
+    def test_organization_change_clears_cache(self):
+        client = CredlyAPIClient(self.organization.uuid)
+
+        self.organization.api_key = "changed-api-key"
+        self.organization.save()
+
+        with self.assertNumQueries(1):
+            changed_client = CredlyAPIClient(self.organization.uuid)
+        self.assertEqual(changed_client.api_key, "changed-api-key")
+        self.assertIsNot(changed_client.session, client.session)
+
+    def test_organization_change_in_other_process_clears_cache(self):
+        client = CredlyAPIClient(self.organization.uuid)
+
+        # as changed by another process: the organization is only dropped through its cached version
+        CredlyOrganization.objects.filter(id=self.organization.id).update(api_key="changed-api-key")
+        cache.set(ORGANIZATION_VERSION_CACHE_KEY.format(self.organization.uuid), "changed", None)
+
+        changed_client = CredlyAPIClient(self.organization.uuid)
+        self.assertEqual(changed_client.api_key, "changed-api-key")
+        self.assertIsNot(changed_client.session, client.session)
+
+    def test_issue_badges(self):
+        error = CredlyAPIError("error", 500)
+        with mock.patch.object(
+            CredlyAPIClient, "perform_request", side_effect=[{"data": {"id": 1}}, error, {"data": {"id": 3}}]
+        ) as mock_perform_request:
+            result = self.api_client.issue_badges([self.badge_data] * 3, max_workers=1)
+
+        self.assertEqual(mock_perform_request.call_count, 3)
+        self.assertEqual(result, [{"data": {"id": 1}}, error, {"data": {"id": 3}}])
 
     def test_fetch_organization(self):
         with mock.patch.object(CredlyAPIClient, "perform_request") as mock_perform_request:
@@ -126,3 +200,124 @@ class CredlyApiClientTestCase(TestCase):
             badge_templates = BadgeTemplate.objects.all()
             self.assertEqual(badge_templates.count(), 2)
             self.assertEqual(badge_templates[0].name, "Badge Template 1")
+
+    def _error_response(self, status_code, headers=None):
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers.update(headers or {})
+        response._content = b"error"  # pylint: disable=protected-access
+        return response
+
+    def test_raise_for_error(self):
+        with self.assertRaises(CredlyAPIError) as cm:
+            self.api_client._raise_for_error(self._error_response(500))  # pylint: disable=protected-access
+        self.assertNotIsInstance(cm.exception, CredlyRateLimitError)
+        self.assertEqual(cm.exception.status_code, 500)
+
+    def test_raise_for_error_rate_limited(self):
+        with self.assertRaises(CredlyRateLimitError) as cm:
+            self.api_client._raise_for_error(  # pylint: disable=protected-access
+                self._error_response(429, {"Retry-After": "120"})
+            )
+        self.assertEqual(cm.exception.status_code, 429)
+        self.assertEqual(cm.exception.retry_after, 120)
+
+    def test_raise_for_error_rate_limited_http_date(self):
+        retry_at = timezone.now() + timedelta(minutes=10)
+        with self.assertRaises(CredlyRateLimitError) as cm:
+            self.api_client._raise_for_error(  # pylint: disable=protected-access
+                self._error_response(429, {"Retry-After": format_datetime(retry_at, usegmt=True)})
+            )
+        self.assertAlmostEqual(cm.exception.retry_after, 600, delta=5)
+
+    def test_raise_for_error_rate_limited_without_retry_after(self):
+        with self.assertRaises(CredlyRateLimitError) as cm:
+            self.api_client._raise_for_error(self._error_response(429))  # pylint: disable=protected-access
+        self.assertIsNone(cm.exception.retry_after)
+
+
+class CredlyStubHandler(BaseHTTPRequestHandler):
+    """
+    Minimal keep-alive Credly API stub: counts connections and requests, answers every badge issuing.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.requests += 1
+        body = json.dumps({"data": {"id": "stub", "state": "pending"}}).encode()
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class CredlyApiClientStubServerTestCase(SimpleTestCase):
+    """
+    Connection reuse benchmark against a local Credly API stub.
+    """
+
+    BADGES = 50
+    MAX_WORKERS = 4
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), CredlyStubHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.connections = self.server.requests = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/"
+        self.settings_override = override_settings(
+            BADGES_CONFIG={"credly": {"USE_SANDBOX": True, "CREDLY_SANDBOX_API_BASE_URL": base_url}}
+        )
+        self.settings_override.enable()
+        self.badge_data = CredlyBadgeData(
+            recipient_email="test_user@example.com",
+            issued_to_first_name="Test",
+            issued_to_last_name="User",
+            badge_template_id="test_template",
+            issued_at="2024-01-01 00:00:00 +0000",
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        clear_credly_client_cache("stub_organization")
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_bulk_issuing_reuses_connections(self):
+        client = CredlyAPIClient("stub_organization", "test_api_key")
+
+        started = time.perf_counter()
+        for __ in range(self.BADGES):
+            requests.post(
+                urljoin(client.base_api_url, "badges/"), json=asdict(self.badge_data), timeout=10
+            ).raise_for_status()
+        unpooled_duration = time.perf_counter() - started
+        unpooled_connections, self.server.connections = self.server.connections, 0
+
+        started = time.perf_counter()
+        responses = client.issue_badges([self.badge_data] * self.BADGES, max_workers=self.MAX_WORKERS)
+        pooled_duration = time.perf_counter() - started
+
+        logger.info(
+            f"Credly stub: {self.BADGES} badges - unpooled {unpooled_duration:.3f}s "
+            f"({unpooled_connections} connections), pooled {pooled_duration:.3f}s "
+            f"({self.server.connections} connections, {self.MAX_WORKERS} workers)"
+        )
+        self.assertEqual(responses, [{"data": {"id": "stub", "state": "pending"}}] * self.BADGES)
+        self.assertEqual(self.server.requests, self.BADGES * 2)
+        self.assertEqual(unpooled_connections, self.BADGES)
+        self.assertLessEqual(self.server.connections, self.MAX_WORKERS)
@@ -136,6 +136,27 @@ class CredlyBadgeTemplateIssuerTestCase(TestCase):
             user_credential.refresh_from_db()
             self.assertEqual(user_credential.state, "error")
 
+    def test_bulk_award(self):
+        for username in ("test_user_1", "test_user_2"):
+            User.objects.create_user(username=username, email=f"{username}@fff.com", password="test_password")
+        responses = [
+            {"data": {"id": self.fake.uuid4(), "state": "pending"}},
+            CredlyAPIError("error"),
+            {"data": {"id": self.fake.uuid4(), "state": "pending"}},
+        ]
+
+        with mock.patch("credentials.apps.badges.issuers.notify_badge_awarded"):
+            with mock.patch.object(CredlyAPIClient, "issue_badges", return_value=responses) as mock_issue_badges:
+                credly_badges = self.issuer().bulk_award(
+                    usernames=["test_user", "test_user_1", "test_user_2"], credential_id=self.badge_template.id
+                )
+
+        self.assertEqual(len(mock_issue_badges.call_args[0][0]), 3)
+        self.assertEqual([badge.username for badge in credly_badges], ["test_user", "test_user_1", "test_user_2"])
+        self.assertEqual(
+            [badge.state for badge in CredlyBadge.objects.order_by("username")], ["pending", "error", "pending"]
+        )
+
     @patch.object(CredlyAPIClient, "revoke_badge")
     def test_revoke_credly_badge_success(self, mock_revoke_badge):
         user_credential = self.issued_user_credential_type.objects.create(
@@ -0,0 +1,272 @@
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from credentials.apps.badges.credly.api_client import CredlyAPIClient
+from credentials.apps.badges.credly.exceptions import CredlyAPIError, CredlyRateLimitError
+from credentials.apps.badges.credly.outbox import CredlyOutboxProcessor
+from credentials.apps.badges.models import CredlyBadge, CredlyBadgeOperation, CredlyBadgeTemplate, CredlyOrganization
+from credentials.apps.badges.signals.handlers import handle_badge_completion, handle_badge_regression
+from credentials.apps.credentials.constants import UserCredentialStatus
+
+
+User = get_user_model()
+
+
+class CredlyOutboxTestMixin:
+    def setUp(self):
+        super().setUp()
+        self.organization = CredlyOrganization.objects.create(
+            uuid=uuid.uuid4(), api_key="test-api-key", name="test_organization"
+        )
+        self.badge_template = CredlyBadgeTemplate.objects.create(
+            uuid=uuid.uuid4(),
+            name="test_template",
+            state="active",
+            site_id=1,
+            organization=self.organization,
+            is_active=True,
+        )
+        User.objects.create_user(username="test_user", email="test_user@example.com", password="test_password")
+
+    def _create_credly_badge(self, username="test_user", **kwargs):
+        return CredlyBadge.objects.create(
+            username=username,
+            credential_content_type=ContentType.objects.get_for_model(self.badge_template),
+            credential_id=self.badge_template.id,
+            **kwargs,
+        )
+
+    def _issued_response(self, *args, **kwargs):
+        return {"data": {"id": str(uuid.uuid4()), "state": CredlyBadge.STATES.pending}}
+
+
+@mock.patch("credentials.apps.badges.issuers.notify_badge_awarded", mock.Mock())
+@mock.patch("credentials.apps.badges.issuers.notify_badge_revoked", mock.Mock())
+class CredlyBadgeOperationEnqueueTestCase(CredlyOutboxTestMixin, TestCase):
+    @mock.patch.object(CredlyAPIClient, "perform_request")
+    def test_badge_completion_only_enqueues(self, mock_perform_request):
+        handle_badge_completion(sender=None, username="test_user", badge_template_id=self.badge_template.id)
+
+        mock_perform_request.assert_not_called()
+        operation = CredlyBadgeOperation.objects.get()
+        self.assertEqual(operation.action, CredlyBadgeOperation.ACTIONS.issue)
+        self.assertEqual(operation.status, CredlyBadgeOperation.STATUSES.pending)
+        self.assertEqual(operation.user_credential.username, "test_user")
+
+    @mock.patch.object(CredlyAPIClient, "perform_request")
+    def test_badge_regression_only_enqueues(self, mock_perform_request):
+        self._create_credly_badge(state=CredlyBadge.STATES.accepted, external_uuid=uuid.uuid4())
+
+        handle_badge_regression(sender=None, username="test_user", badge_template_id=self.badge_template.id)
+
+        mock_perform_request.assert_not_called()
+        self.assertEqual(CredlyBadgeOperation.objects.get().action, CredlyBadgeOperation.ACTIONS.revoke)
+
+    def test_enqueue_is_idempotent(self):
+        credly_badge = self._create_credly_badge()
+
+        first = CredlyBadgeOperation.enqueue(credly_badge, CredlyBadgeOperation.ACTIONS.issue)
+        second = CredlyBadgeOperation.enqueue(credly_badge, CredlyBadgeOperation.ACTIONS.issue)
+
+        self.assertEqual(first, second)
+        self.assertEqual(CredlyBadgeOperation.objects.count(), 1)
+
+    def test_enqueue_reschedules_completed_operation(self):
+        credly_badge = self._create_credly_badge()
+        operation = CredlyBadgeOperation.enqueue(credly_badge, CredlyBadgeOperation.ACTIONS.issue)
+        CredlyBadgeOperation.objects.filter(id=operation.id).update(
+            status=CredlyBadgeOperation.STATUSES.failed, attempts=8, last_error="error"
+        )
+
+        operation = CredlyBadgeOperation.enqueue(credly_badge, CredlyBadgeOperation.ACTIONS.issue)
+
+        self.assertEqual(operation.status, CredlyBadgeOperation.STATUSES.pending)
+        self.assertEqual(operation.attempts, 0)
+        self.assertEqual(operation.last_error, "")
+
+
+@override_settings(
+    BADGES_CONFIG={
+        "credly": {
+            "USE_SANDBOX": True,
+            "CREDLY_SANDBOX_API_BASE_URL": "https://sandbox-api.credly.com/v1/",
+            "OUTBOX_MAX_ATTEMPTS": 3,
+            "OUTBOX_BACKOFF_SECONDS": 10,
+        }
+    }
+)
+class CredlyOutboxProcessorTestCase(CredlyOutboxTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.credly_badge = self._create_credly_badge(status=UserCredentialStatus.AWARDED)
+        self.operation = CredlyBadgeOperation.enqueue(self.credly_badge, CredlyBadgeOperation.ACTIONS.issue)
+
+    def test_issue(self):
+        with mock.patch.object(CredlyAPIClient, "perform_request", side_effect=self._issued_response) as mock_request:
+            stats = CredlyOutboxProcessor().process()
+
+        mock_request.assert_called_once()
+        self.assertEqual((stats.claimed, stats.succeeded, stats.queue_depth), (1, 1, 0))
+        self.operation.refresh_from_db()
+        self.credly_badge.refresh_from_db()
+        self.assertEqual(self.operation.status, CredlyBadgeOperation.STATUSES.succeeded)
+        self.assertIsNotNone(self.operation.completed_at)
+        self.assertTrue(self.credly_badge.propagated)
+
+    def test_issue_skipped_for_revoked_credential(self):
+        self.credly_badge.status = UserCredentialStatus.REVOKED
+        self.credly_badge.save()
+
+        with mock.patch.object(CredlyAPIClient, "perform_request") as mock_request:
+            stats = CredlyOutboxProcessor().process()
+
+        mock_request.assert_not_called()
+        self.assertEqual(stats.skipped, 1)
+        self.operation.refresh_from_db()
+        self.assertEqual(self.operation.status, CredlyBadgeOperation.STATUSES.succeeded)
+
+    def test_revoke(self):
+        self.credly_badge.state = CredlyBadge.STATES.accepted
+        self.credly_badge.external_uuid = uuid.uuid4()
+        self.credly_badge.status = UserCredentialStatus.REVOKED
+        self.credly_badge.save()
+        self.operation.delete()
+        CredlyBadgeOperation.enqueue(self.credly_badge, CredlyBadgeOperation.ACTIONS.revoke)
+
+        with mock.patch.object(
+            CredlyAPIClient, "perform_request", return_value={"data": {"state": CredlyBadge.STATES.revoked}}
+        ) as mock_request:
+            CredlyOutboxProcessor().process()
+
+        self.assertEqual(mock_request.call_args[0][:2], ("put", f"badges/{self.credly_badge.external_uuid}/revoke/"))
+        self.credly_badge.refresh_from_db()
+        self.assertEqual(self.credly_badge.state, CredlyBadge.STATES.revoked)
+
+    def test_revoke_waits_for_issue(self):
+        """
+        A revoke claimed while the issue operation is still processing (by another worker) waits for it.
+        """
+
+        self.credly_badge.status = UserCredentialStatus.REVOKED
+        self.credly_badge.save()
+        CredlyBadgeOperation.objects.filter(id=self.operation.id).update(
+            status=CredlyBadgeOperation.STATUSES.processing
+        )
+        revoke_operation = CredlyBadgeOperation.enqueue(self.credly_badge, CredlyBadgeOperation.ACTIONS.revoke)
+
+        with mock.patch.object(CredlyAPIClient, "perform_request") as mock_request:
+            stats = CredlyOutboxProcessor().process()
+
+        mock_request.assert_not_called()
+        self.assertEqual((stats.claimed, stats.skipped, stats.retried), (1, 0, 1))
+        revoke_operation.refresh_from_db()
+        self.assertEqual(revoke_operation.status, CredlyBadgeOperation.STATUSES.pending)
+        self.assertEqual(revoke_operation.attempts, 0)
+
+        # once issued, the badge is revoked
+        self.credly_badge.external_uuid = uuid.uuid4()
+        self.credly_badge.state = CredlyBadge.STATES.pending
+        self.credly_badge.save()
+        CredlyBadgeOperation.objects.filter(id=self.operation.id).update(status=CredlyBadgeOperation.STATUSES.succeeded)
+        CredlyBadgeOperation.objects.filter(id=revoke_operation.id).update(next_attempt_at=timezone.now())
+        with mock.patch.object(
+            CredlyAPIClient, "perform_request", return_value={"data": {"state": CredlyBadge.STATES.revoked}}
+        ) as mock_request:
+            stats = CredlyOutboxProcessor().process()
+
+        self.assertEqual(mock_request.call_args[0][:2], ("put", f"badges/{self.credly_badge.external_uuid}/revoke/"))
+        self.assertEqual(stats.succeeded, 1)
+
+    def test_retry_with_backoff(self):
+        with mock.patch.object(CredlyAPIClient, "perform_request", side_effect=CredlyAPIError("error", 500)):
+            stats = CredlyOutboxProcessor().process()
+
+        self.assertEqual((stats.retried, stats.queue_depth), (1, 1))
+        self.operation.refresh_from_db()
+        self.assertEqual(self.operation.status, CredlyBadgeOperation.STATUSES.pending)
+        self.assertEqual(self.operation.attempts, 1)
+        self.assertEqual(self.operation.last_error, "error")
+        self.assertGreaterEqual(self.operation.next_attempt_at, timezone.now() + timedelta(seconds=9))
+
+        # not due yet:
+        with mock.patch.object(CredlyAPIClient, "perform_request") as mock_request:
+            CredlyOutboxProcessor().process()
+        mock_request.assert_not_called()
+
+    def test_fail_after_max_attempts(self):
+        CredlyBadgeOperation.objects.filter(id=self.operation.id).update(attempts=2)
+
+        with mock.patch.object(CredlyAPIClient, "perform_request", side_effect=CredlyAPIError("error", 500)):
+            stats = CredlyOutboxProcessor().process()
+
+        self.assertEqual((stats.failed, stats.queue_depth), (1, 0))
+        self.operation.refresh_from_db()
+        self.credly_badge.refresh_from_db()
+        self.assertEqual(self.operation.status, CredlyBadgeOperation.STATUSES.failed)
+        self.assertEqual(self.credly_badge.state, CredlyBadge.STATES.error)
+
+    def test_rate_limited(self):
+        other_badge = self._create_credly_badge(username="other_user", status=UserCredentialStatus.AWARDED)
+        User.objects.create_user(username="other_user", email="other_user@example.com", password="test_password")
+        other_operation = CredlyBadgeOperation.enqueue(other_badge, CredlyBadgeOperation.ACTIONS.issue)
+
+        with mock.patch.object(
+            CredlyAPIClient, "perform_request", side_effect=CredlyRateLimitError("throttled", retry_after=300)
+        ):
+            stats = CredlyOutboxProcessor(concurrency=1).process()
+
+        self.assertEqual((stats.throttled, stats.retried, stats.failed), (2, 0, 0))
+        for operation in (self.operation, other_operation):
+            operation.refresh_from_db()
+            self.assertEqual(operation.status, CredlyBadgeOperation.STATUSES.pending)
+            self.assertEqual(operation.attempts, 0)
+            self.assertGreaterEqual(operation.next_attempt_at, timezone.now() + timedelta(seconds=295))
+
+    def test_organization_throttled_without_sending(self):
+        processor = CredlyOutboxProcessor(concurrency=1)
+        processor.throttle(self.organization.uuid, timezone.now() + timedelta(minutes=1))
+
+        with mock.patch.object(CredlyAPIClient, "perform_request") as mock_request:
+            stats = processor.process()
+
+        mock_request.assert_not_called()
+        self.assertEqual(stats.throttled, 1)
+
+    def test_expired_lease_is_reclaimed(self):
+        CredlyBadgeOperation.objects.filter(id=self.operation.id).update(
+            status=CredlyBadgeOperation.STATUSES.processing, modified=timezone.now() - timedelta(hours=1)
+        )
+
+        with mock.patch.object(CredlyAPIClient, "perform_request", side_effect=self._issued_response):
+            stats = CredlyOutboxProcessor().process()
+
+        self.assertEqual(stats.succeeded, 1)
+
+    def test_concurrent_issuing(self):
+        for index in range(10):
+            username = f"user_{index}"
+            User.objects.create_user(username=username, email=f"{username}@example.com", password="test_password")
+            CredlyBadgeOperation.enqueue(
+                self._create_credly_badge(username=username, status=UserCredentialStatus.AWARDED),
+                CredlyBadgeOperation.ACTIONS.issue,
+            )
+
+        with mock.patch.object(CredlyAPIClient, "perform_request", side_effect=self._issued_response):
+            stats = CredlyOutboxProcessor(concurrency=4).process(batch_size=3)
+
+        self.assertEqual((stats.claimed, stats.succeeded, stats.queue_depth), (11, 11, 0))
+        self.assertEqual(CredlyBadge.objects.filter(external_uuid__isnull=False).count(), 11)
+
+    @mock.patch("credentials.apps.badges.management.commands.process_credly_operations.CredlyOutboxProcessor")
+    def test_management_command(self, mock_processor):
+        call_command("process_credly_operations", "--batch_size", "10", "--concurrency", "2")
+
+        mock_processor.assert_called_once_with(concurrency=2)
+        mock_processor.return_value.process.assert_called_once_with(batch_size=10)
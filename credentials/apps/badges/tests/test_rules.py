@@ -0,0 +1,132 @@
+import uuid
+
+from django.contrib.sites.models import Site
+from django.test import TestCase
+
+from credentials.apps.badges.models import (
+    BadgePenalty,
+    BadgeRequirement,
+    CredlyBadgeTemplate,
+    CredlyOrganization,
+    DataRule,
+    PenaltyDataRule,
+)
+from credentials.apps.badges.processing.progression import process_requirements
+from credentials.apps.badges.processing.regression import process_penalties
+from credentials.apps.badges.processing.rules import (
+    CompiledRule,
+    build_rules_index,
+    get_rules_index,
+    invalidate_rules_index,
+)
+from credentials.apps.badges.signals import BADGE_PROGRESS_COMPLETE
+from credentials.apps.badges.signals.handlers import handle_badge_completion
+from credentials.apps.badges.tests.test_services import COURSE_PASSING_DATA, COURSE_PASSING_EVENT
+
+
+class CompiledRuleTestCase(TestCase):
+    def setUp(self):
+        self.data = {"course": {"display_name": "A"}, "is_passing": True, "user": None}
+
+    def _compile(self, data_path, operator, value):
+        return CompiledRule(DataRule(data_path=data_path, operator=operator, value=value))
+
+    def test_matches_as_data_rule(self):
+        for data_path, operator, value in (
+            ("course.display_name", "eq", "A"),
+            ("course.display_name", "ne", "A"),
+            ("course.display_name", "eq", "B"),
+            ("is_passing", "eq", "true"),
+            ("is_passing", "eq", "No"),
+            ("user.pii.username", "eq", "None"),
+            ("course.missing", "eq", "None"),
+            ("course.display_name", "unknown", "A"),
+        ):
+            rule = DataRule(data_path=data_path, operator=operator, value=value)
+            self.assertEqual(CompiledRule(rule)(self.data), rule.apply(self.data), (data_path, operator, value))
+
+    def test_traverses_attrs_classes(self):
+        self.assertTrue(self._compile("course.display_name", "eq", "A")({"course": COURSE_PASSING_DATA.course}))
+
+
+class RulesIndexTestCase(TestCase):
+    def setUp(self):
+        self.organization = CredlyOrganization.objects.create(
+            uuid=uuid.uuid4(), api_key="test-api-key", name="test_organization"
+        )
+        self.site = Site.objects.create(domain="test_domain", name="test_name")
+        self.badge_template = CredlyBadgeTemplate.objects.create(
+            uuid=uuid.uuid4(),
+            name="test_template",
+            state="draft",
+            site=self.site,
+            organization=self.organization,
+            is_active=True,
+        )
+        self.requirement = BadgeRequirement.objects.create(
+            template=self.badge_template, event_type=COURSE_PASSING_EVENT
+        )
+        self.rule = DataRule.objects.create(
+            requirement=self.requirement, data_path="course.display_name", operator="eq", value="B"
+        )
+        self.penalty = BadgePenalty.objects.create(template=self.badge_template, event_type=COURSE_PASSING_EVENT)
+        self.penalty.requirements.add(self.requirement)
+        PenaltyDataRule.objects.create(penalty=self.penalty, data_path="is_passing", operator="eq", value="False")
+
+        BADGE_PROGRESS_COMPLETE.disconnect(handle_badge_completion)
+
+    def tearDown(self):
+        BADGE_PROGRESS_COMPLETE.connect(handle_badge_completion)
+
+    def test_build_groups_active_by_event_type(self):
+        inactive_template = CredlyBadgeTemplate.objects.create(
+            uuid=uuid.uuid4(), name="inactive", site=self.site, organization=self.organization, is_active=False
+        )
+        BadgeRequirement.objects.create(template=inactive_template, event_type=COURSE_PASSING_EVENT)
+
+        index = build_rules_index()
+
+        self.assertEqual([c.requirement for c in index.requirements_for(COURSE_PASSING_EVENT)], [self.requirement])
+        self.assertEqual([c.penalty for c in index.penalties_for(COURSE_PASSING_EVENT)], [self.penalty])
+        self.assertEqual(index.requirements_for("unknown_event_type"), ())
+
+    def test_index_is_reused(self):
+        index = get_rules_index()
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_rules_index(), index)
+            process_penalties(COURSE_PASSING_EVENT, "test_username", COURSE_PASSING_DATA)
+            process_requirements(COURSE_PASSING_EVENT, "test_username", COURSE_PASSING_DATA)
+
+    def test_rule_change_invalidates_index(self):
+        index = get_rules_index()
+
+        self.rule.value = "A"
+        self.rule.save()
+
+        self.assertIsNot(get_rules_index(), index)
+        process_requirements(COURSE_PASSING_EVENT, "test_username", COURSE_PASSING_DATA)
+        self.assertTrue(self.requirement.is_fulfilled("test_username"))
+
+    def test_template_deactivation_invalidates_index(self):
+        get_rules_index()
+
+        self.badge_template.is_active = False
+        self.badge_template.save()
+
+        self.assertEqual(get_rules_index().requirements_for(COURSE_PASSING_EVENT), ())
+
+    def test_penalty_requirements_change_invalidates_index(self):
+        get_rules_index()
+
+        self.penalty.requirements.clear()
+
+        compiled = get_rules_index().penalties_for(COURSE_PASSING_EVENT)[0]
+        self.assertEqual(list(compiled.penalty.requirements.all()), [])
+
+    def test_invalidate_rules_index(self):
+        index = get_rules_index()
+
+        invalidate_rules_index()
+
+        self.assertIsNot(get_rules_index(), index)
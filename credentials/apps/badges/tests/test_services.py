@@ -20,8 +20,9 @@ from credentials.apps.badges.models import (
     PenaltyDataRule,
 )
 from credentials.apps.badges.processing.generic import identify_user, process_event
-from credentials.apps.badges.processing.progression import discover_requirements, process_requirements
-from credentials.apps.badges.processing.regression import discover_penalties, process_penalties
+from credentials.apps.badges.processing.progression import process_requirements
+from credentials.apps.badges.processing.regression import process_penalties
+from credentials.apps.badges.processing.rules import get_rules_index
 from credentials.apps.badges.signals import BADGE_PROGRESS_COMPLETE
 from credentials.apps.badges.signals.handlers import handle_badge_completion
 
@@ -67,10 +68,15 @@ class BadgeRequirementDiscoveryTestCase(TestCase):
             event_type=self.CCX_COURSE_PASSING_EVENT,
             description="Test ccx course passing revoke description",
         )
-        course_passing_requirements = discover_requirements(event_type=COURSE_PASSING_EVENT)
-        ccx_course_passing_requirements = discover_requirements(event_type=self.CCX_COURSE_PASSING_EVENT)
-        self.assertEqual(course_passing_requirements.count(), 1)
-        self.assertEqual(ccx_course_passing_requirements.count(), 2)
+        index = get_rules_index()
+        course_passing_requirements = [
+            compiled.requirement for compiled in index.requirements_for(COURSE_PASSING_EVENT)
+        ]
+        ccx_course_passing_requirements = [
+            compiled.requirement for compiled in index.requirements_for(self.CCX_COURSE_PASSING_EVENT)
+        ]
+        self.assertEqual(len(course_passing_requirements), 1)
+        self.assertEqual(len(ccx_course_passing_requirements), 2)
         self.assertEqual(course_passing_requirements[0].description, "Test course passing award description")
         self.assertEqual(ccx_course_passing_requirements[0].description, "Test ccx course passing award description")
         self.assertEqual(ccx_course_passing_requirements[1].description, "Test ccx course passing revoke description")
@@ -113,10 +119,13 @@ class BadgePenaltyDiscoveryTestCase(TestCase):
                 description="Test ccx course passing revoke description",
             )
         )
-        course_passing_penalties = discover_penalties(event_type=COURSE_PASSING_EVENT)
-        ccx_course_passing_penalties = discover_penalties(event_type=self.CCX_COURSE_PASSING_EVENT)
-        self.assertEqual(course_passing_penalties.count(), 1)
-        self.assertEqual(ccx_course_passing_penalties.count(), 2)
+        index = get_rules_index()
+        course_passing_penalties = [compiled.penalty for compiled in index.penalties_for(COURSE_PASSING_EVENT)]
+        ccx_course_passing_penalties = [
+            compiled.penalty for compiled in index.penalties_for(self.CCX_COURSE_PASSING_EVENT)
+        ]
+        self.assertEqual(len(course_passing_penalties), 1)
+        self.assertEqual(len(ccx_course_passing_penalties), 2)
         self.assertEqual(
             course_passing_penalties[0].requirements.first().description, "Test course passing award description"
         )
@@ -0,0 +1,135 @@
+import uuid
+
+import ddt
+from django.contrib.sites.models import Site
+from django.test import TestCase
+
+from credentials.apps.badges.models import (
+    BadgeProgress,
+    BadgeRequirement,
+    CredlyBadgeTemplate,
+    CredlyOrganization,
+    DataRule,
+    Fulfillment,
+)
+from credentials.apps.badges.processing.progression import process_requirements
+from credentials.apps.badges.processing.rules import get_rules_index
+from credentials.apps.badges.processing.state import UserBadgeState
+from credentials.apps.badges.signals import BADGE_PROGRESS_COMPLETE
+from credentials.apps.badges.signals.handlers import handle_badge_completion
+from credentials.apps.badges.tests.test_services import COURSE_PASSING_DATA, COURSE_PASSING_EVENT
+
+
+class UserBadgeStateTestCase(TestCase):
+    def setUp(self):
+        self.organization = CredlyOrganization.objects.create(
+            uuid=uuid.uuid4(), api_key="test-api-key", name="test_organization"
+        )
+        self.site = Site.objects.create(domain="test_domain", name="test_name")
+        self.template = CredlyBadgeTemplate.objects.create(
+            uuid=uuid.uuid4(), name="test_template", site=self.site, organization=self.organization, is_active=True
+        )
+        # (A or B) and C
+        self.requirement_a = BadgeRequirement.objects.create(
+            template=self.template, event_type=COURSE_PASSING_EVENT, blend="a_or_b"
+        )
+        self.requirement_b = BadgeRequirement.objects.create(
+            template=self.template, event_type=COURSE_PASSING_EVENT, blend="a_or_b"
+        )
+        self.requirement_c = BadgeRequirement.objects.create(template=self.template, event_type=COURSE_PASSING_EVENT)
+        self.progress = BadgeProgress.for_user(username="test_username", template_id=self.template.id)
+
+    def _load(self):
+        template_groups = get_rules_index().template_groups
+        with self.assertNumQueries(2 if BadgeProgress.objects.exists() else 1):
+            return UserBadgeState.load("test_username", [self.template.id], template_groups)
+
+    def _assert_same_as_models(self, state):
+        for requirement in (self.requirement_a, self.requirement_b, self.requirement_c):
+            self.assertEqual(state.is_fulfilled(requirement), requirement.is_fulfilled("test_username"))
+        for group in self.template.groups:
+            self.assertEqual(
+                state.is_group_fulfilled(self.template.id, group),
+                BadgeRequirement.is_group_fulfilled(group=group, template=self.template, username="test_username"),
+            )
+        self.assertEqual(state.ratio(self.template.id), self.progress.ratio)
+        self.assertEqual(state.is_completed(self.template.id), self.template.is_completed("test_username"))
+
+    def test_no_progress(self):
+        BadgeProgress.objects.all().delete()
+
+        state = self._load()
+
+        self.assertFalse(state.is_fulfilled(self.requirement_a))
+        self.assertEqual(state.ratio(self.template.id), 0.0)
+        self.assertFalse(state.is_completed(self.template.id))
+
+    def test_partial_progress(self):
+        Fulfillment.objects.create(progress=self.progress, requirement=self.requirement_b, blend="a_or_b")
+
+        state = self._load()
+
+        self._assert_same_as_models(state)
+        self.assertEqual(state.ratio(self.template.id), 0.5)
+
+    def test_completed(self):
+        Fulfillment.objects.create(progress=self.progress, requirement=self.requirement_a, blend="a_or_b")
+        Fulfillment.objects.create(progress=self.progress, requirement=self.requirement_c)
+
+        state = self._load()
+
+        self._assert_same_as_models(state)
+        self.assertTrue(state.is_completed(self.template.id))
+
+    def test_add_fulfillment(self):
+        state = self._load()
+
+        state.add_fulfillment(self.requirement_a)
+        state.add_fulfillment(self.requirement_c)
+
+        self.assertTrue(state.is_fulfilled(self.requirement_a))
+        self.assertTrue(state.is_completed(self.template.id))
+
+    def test_other_user_progress_ignored(self):
+        other_progress = BadgeProgress.for_user(username="other_username", template_id=self.template.id)
+        Fulfillment.objects.create(progress=other_progress, requirement=self.requirement_c)
+
+        self._assert_same_as_models(self._load())
+
+
+@ddt.ddt
+class ProcessRequirementsQueryCountTestCase(TestCase):
+    def setUp(self):
+        self.organization = CredlyOrganization.objects.create(
+            uuid=uuid.uuid4(), api_key="test-api-key", name="test_organization"
+        )
+        self.site = Site.objects.create(domain="test_domain", name="test_name")
+        BADGE_PROGRESS_COMPLETE.disconnect(handle_badge_completion)
+
+    def tearDown(self):
+        BADGE_PROGRESS_COMPLETE.connect(handle_badge_completion)
+
+    def _create_templates(self, templates, groups, requirements_per_group):
+        for __ in range(templates):
+            template = CredlyBadgeTemplate.objects.create(
+                uuid=uuid.uuid4(), name="test_template", site=self.site, organization=self.organization, is_active=True
+            )
+            progress = BadgeProgress.for_user(username="test_username", template_id=template.id)
+            for group in range(groups):
+                for __ in range(requirements_per_group):
+                    requirement = BadgeRequirement.objects.create(
+                        template=template, event_type=COURSE_PASSING_EVENT, blend=f"group_{group}"
+                    )
+                    DataRule.objects.create(
+                        requirement=requirement, data_path="course.display_name", operator="eq", value="A"
+                    )
+                    Fulfillment.objects.create(progress=progress, requirement=requirement, blend=requirement.blend)
+
+    @ddt.data((1, 1, 1), (1, 5, 1), (1, 5, 5), (5, 5, 5))
+    @ddt.unpack
+    def test_query_count_is_constant(self, templates, groups, requirements_per_group):
+        self._create_templates(templates, groups, requirements_per_group)
+        get_rules_index()
+
+        with self.assertNumQueries(2):
+            process_requirements(COURSE_PASSING_EVENT, "test_username", COURSE_PASSING_DATA)
@@ -4,9 +4,10 @@ import logging
 import sys
 
 from django.contrib.sites.models import Site
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
 
-from credentials.apps.catalog.utils import CatalogDataSynchronizer
+from credentials.apps.catalog.utils import BulkCatalogDataSynchronizer, CatalogDataSynchronizer
 from credentials.apps.core.models import SiteConfiguration
 
 
@@ -27,6 +28,13 @@ class Command(BaseCommand):
             default=None,
             help="The maximum number of catalog items to request at once.",
         )
+        parser.add_argument(
+            "--concurrency",
+            action="store",
+            type=int,
+            default=None,
+            help="The maximum number of catalog pages to request at once.",
+        )
         parser.add_argument(
             "--delete",
             action="store_true",
@@ -34,10 +42,29 @@ class Command(BaseCommand):
             required=False,
             help="Delete catalog data that doesn't exist in Discovery service",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            required=False,
+            help="Sync the catalog data page by page, with bulk queries.",
+        )
+        parser.add_argument(
+            "--modified-since",
+            action="store",
+            type=parse_datetime,
+            default=None,
+            help="Only copy the catalog data modified since the given ISO 8601 datetime (implies --bulk).",
+        )
 
     def handle(self, *args, **options):
         page_size = options.get("page_size")
+        concurrency = options.get("concurrency")
         delete_data = options.get("delete_data")
+        modified_since = options.get("modified_since")
+        bulk = options.get("bulk") or modified_since
+
+        if modified_since and delete_data:
+            raise CommandError("--delete can't be used with --modified-since: the obsolete data can't be detected.")
 
         for site in Site.objects.all():
             site_configs = SiteConfiguration.objects.filter(site=site)
@@ -49,12 +76,25 @@ class Command(BaseCommand):
                 logger.info(f"Skipping site {site.domain}. No configuration.")
                 continue
 
-            synchronizer = CatalogDataSynchronizer(
-                site=site,
-                api_client=site_config.api_client,
-                catalog_api_url=site_config.catalog_api_url,
-                page_size=page_size,
-            )
+            if bulk:
+                synchronizer = BulkCatalogDataSynchronizer(
+                    site=site,
+                    api_client=None,
+                    site_configuration=site_config,
+                    catalog_api_url=site_config.catalog_api_url,
+                    page_size=page_size,
+                    concurrency=concurrency,
+                    modified_since=modified_since,
+                )
+            else:
+                synchronizer = CatalogDataSynchronizer(
+                    site=site,
+                    api_client=None,
+                    site_configuration=site_config,
+                    catalog_api_url=site_config.catalog_api_url,
+                    page_size=page_size,
+                    concurrency=concurrency,
+                )
             result_data = synchronizer.fetch_data()
 
             self.stdout.write("The copy_catalog command caused the following changes:")
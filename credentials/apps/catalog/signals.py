@@ -0,0 +1,11 @@
+"""
+Catalog app signals.
+"""
+
+from django.dispatch import Signal
+
+
+# Sent after a bulk catalog sync, which bypasses model signals, with:
+#   - site: the synced Site;
+#   - program_ids: IDs of the programs whose data (or related courses, course runs, organizations, pathways) changed.
+CATALOG_PROGRAMS_CHANGED = Signal()
@@ -1,17 +1,30 @@
 """Tests for catalog utilities."""
 
-from unittest.mock import MagicMock
-
-from django.test import TestCase
+import datetime
+import json
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, PropertyMock, patch
+from urllib.parse import parse_qs, urlparse
+
+import ddt
+import requests
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from credentials.apps.catalog.models import Course, CourseRun, Organization, Pathway, Program
-from credentials.apps.catalog.utils import CatalogDataSynchronizer
+from credentials.apps.catalog.signals import CATALOG_PROGRAMS_CHANGED
+from credentials.apps.catalog.utils import BulkCatalogDataSynchronizer, CatalogDataSynchronizer
 from credentials.apps.core.tests.factories import SiteFactory
 from credentials.shared.constants import PathwayType
 
 
-class SynchronizerTests(TestCase):
-    """Tests CatalogDataSynchronizer"""
+class CatalogDataMixin:
+    """Catalog API responses, as parsed by the synchronizers"""
 
     FIRST_ORG = {
         "uuid": "11111111-2222-4444-9999-111111111111",
@@ -99,12 +112,15 @@ class SynchronizerTests(TestCase):
         # Indexes into API_RESPONSES
         self.api_call_count = 0
 
-    def _mock_fetch_resource(
-        self, resource_name, parse_method, extra_request_params=None
-    ):  # pylint: disable=unused-argument
+    def _mock_fetch_resource_pages(self, resource_name, extra_request_params=None):  # pylint: disable=unused-argument
         data = self.API_RESPONSES[self.api_call_count].get(resource_name)
         if data:
-            parse_method(data)
+            yield [data]
+
+    def _get_synchronizer(self, synchronizer_class=BulkCatalogDataSynchronizer, **kwargs):
+        synchronizer = synchronizer_class(self.site, None, "", **kwargs)
+        synchronizer.fetch_resource_pages = self._mock_fetch_resource_pages
+        return synchronizer
 
     def assert_no_data(self):
         assert Course.objects.all().count() == 0
@@ -113,7 +129,13 @@ class SynchronizerTests(TestCase):
         assert Program.objects.all().count() == 0
         assert Pathway.objects.all().count() == 0
 
-    def test_fetch_data_create(self):
+
+@ddt.ddt
+class SynchronizerTests(CatalogDataMixin, TestCase):
+    """Tests CatalogDataSynchronizer and BulkCatalogDataSynchronizer"""
+
+    @ddt.data(CatalogDataSynchronizer, BulkCatalogDataSynchronizer)
+    def test_fetch_data_create(self, synchronizer_class):
         """
         Tests that data is created on `fetch_data`.
 
@@ -121,18 +143,20 @@ class SynchronizerTests(TestCase):
             - program, course, course run, pathway, and organization are created
         """
         self.assert_no_data()
-        synchronizer = CatalogDataSynchronizer(self.site, None, "")
-        synchronizer.fetch_resource = self._mock_fetch_resource
+        synchronizer = self._get_synchronizer(synchronizer_class)
         self.api_call_count = 0
         synchronizer.fetch_data()
 
         # Check organization
-        organization = Organization.objects.all().first()
+        organization = Organization.objects.get()
         assert str(organization.uuid) == self.FIRST_ORG["uuid"]
+        assert organization.name == self.FIRST_ORG["name"]
 
         # Check course run
-        course_run = CourseRun.objects.all().first()
+        course_run = CourseRun.objects.get()
         assert str(course_run.uuid) == self.FIRST_COURSE_RUN["uuid"]
+        assert course_run.title_override == self.FIRST_COURSE_RUN["title"]
+        assert course_run.start_date == datetime.datetime(2018, 1, 1, tzinfo=datetime.timezone.utc)
 
         # Check course
         course = Course.objects.all().first()
@@ -146,13 +170,15 @@ class SynchronizerTests(TestCase):
         assert list(program.authoring_organizations.all()) == [organization]
         assert list(program.course_runs.all()) == [course_run]
         assert program.title == self.FIRST_PROGRAM["title"]
+        assert program.type_slug == self.FIRST_PROGRAM["type_attrs"]["slug"]
 
         # Check pathway
         pathway = Pathway.objects.all().first()
         assert str(pathway.uuid) == self.FIRST_PATHWAY["uuid"]
         assert list(pathway.programs.all()) == [program]
 
-    def test_fetch_data_update(self):
+    @ddt.data(CatalogDataSynchronizer, BulkCatalogDataSynchronizer)
+    def test_fetch_data_update(self, synchronizer_class):
         """
         Tests that data is updated on `fetch_data`
 
@@ -166,23 +192,20 @@ class SynchronizerTests(TestCase):
         """
 
         self.assert_no_data()
-        synchronizer = CatalogDataSynchronizer(self.site, None, "")
-        synchronizer.fetch_resource = self._mock_fetch_resource
         self.api_call_count = 0
-        synchronizer.fetch_data()
+        self._get_synchronizer(synchronizer_class).fetch_data()
 
         # test_fetch_data_create already tests all code above
         # get updated API data
         self.api_call_count = 1
-        synchronizer.fetch_data()
+        self._get_synchronizer(synchronizer_class).fetch_data()
 
         # Check organization is still the same
         organization = Organization.objects.all().first()
         assert str(organization.uuid) == self.FIRST_ORG["uuid"]
 
         # Check old course run wasn't deleted, and new one is created
-        original_course_run = CourseRun.objects.all()[0]
-        new_course_run = CourseRun.objects.all()[1]
+        original_course_run, new_course_run = CourseRun.objects.order_by("id")
         assert str(original_course_run.uuid) == self.FIRST_COURSE_RUN["uuid"]
         assert str(new_course_run.uuid) == self.SECOND_COURSE_RUN["uuid"]
 
@@ -190,7 +213,8 @@ class SynchronizerTests(TestCase):
         course = Course.objects.all().first()
         assert str(course.uuid) == self.UPDATED_COURSE["uuid"]
         assert list(course.owners.all()) == [organization]
-        assert list(course.course_runs.all()) == [original_course_run, new_course_run]
+        assert course.title == self.UPDATED_COURSE["title"]
+        assert list(course.course_runs.order_by("id")) == [original_course_run, new_course_run]
 
         # Check program still exists, name is changed, and contains both course runs
         program = Program.objects.all().first()
@@ -204,7 +228,8 @@ class SynchronizerTests(TestCase):
         assert str(pathway.uuid) == self.FIRST_PATHWAY["uuid"]
         assert list(pathway.programs.all()) == [program]
 
-    def test_remove_obsolete_data(self):
+    @ddt.data(CatalogDataSynchronizer, BulkCatalogDataSynchronizer)
+    def test_remove_obsolete_data(self, synchronizer_class):
         """
         Test that data is delete when `remove_obsolete_data is ran`
 
@@ -218,18 +243,16 @@ class SynchronizerTests(TestCase):
         """
         # Call the API twice to
         self.assert_no_data()
-        synchronizer = CatalogDataSynchronizer(self.site, None, "")
-        synchronizer.fetch_resource = self._mock_fetch_resource
-
         self.api_call_count = 0
-        synchronizer.fetch_data()
+        self._get_synchronizer(synchronizer_class).fetch_data()
 
         # Create new synchronizer, imitating new management command call
-        synchronizer = CatalogDataSynchronizer(self.site, None, "")
-        synchronizer.fetch_resource = self._mock_fetch_resource
+        synchronizer = self._get_synchronizer(synchronizer_class)
 
         self.api_call_count = 1
-        synchronizer.fetch_data()
+        changes = synchronizer.fetch_data()
+        assert changes[synchronizer_class.PATHWAY]["removed"] == [self.FIRST_PATHWAY["uuid"]]
+        assert changes[synchronizer_class.COURSE_RUN]["added"] == [self.SECOND_COURSE_RUN["uuid"]]
 
         # Pathway still exists even though the second API call removed it
         assert Pathway.objects.all().count() == 1
@@ -262,3 +285,347 @@ class SynchronizerTests(TestCase):
 
         mock_response.raise_for_status.assert_called_once()
         mock_parse_method.assert_called_with(self.FIRST_PROGRAM)
+
+    def test_fetch_resource_pages_concurrency(self):
+        responses = {
+            page: {"results": [{"uuid": str(page)}], "count": 5, "next": "next" if page < 5 else None}
+            for page in range(1, 6)
+        }
+        mock_api_client = MagicMock()
+        mock_api_client.get.side_effect = lambda url, params: MagicMock(json=lambda: responses[params["page"]])
+
+        synchronizer = CatalogDataSynchronizer(self.site, mock_api_client, "http://example.com/api/v1/", concurrency=2)
+        pages = list(synchronizer.fetch_resource_pages("programs"))
+
+        assert pages == [[{"uuid": str(page)}] for page in range(1, 6)]
+        assert sorted(call.kwargs["params"]["page"] for call in mock_api_client.get.call_args_list) == [1, 2, 3, 4, 5]
+
+    def test_fetch_resource_pages_catalog_shrank(self):
+        """A page missing past the first one is the end of the catalog, which shrank while it was being fetched."""
+        responses = {
+            page: {"results": [{"uuid": str(page)}], "count": 5, "next": "next" if page < 3 else None}
+            for page in range(1, 4)
+        }
+
+        def get(url, params):  # pylint: disable=unused-argument
+            if params["page"] in responses:
+                return MagicMock(status_code=200, json=lambda: responses[params["page"]])
+            return MagicMock(status_code=404, raise_for_status=MagicMock(side_effect=requests.HTTPError))
+
+        mock_api_client = MagicMock()
+        mock_api_client.get.side_effect = get
+
+        synchronizer = CatalogDataSynchronizer(self.site, mock_api_client, "http://example.com/api/v1/", concurrency=2)
+        pages = list(synchronizer.fetch_resource_pages("programs"))
+
+        assert pages == [[{"uuid": str(page)}] for page in range(1, 4)]
+
+    def test_fetch_resource_pages_first_page_not_found(self):
+        mock_api_client = MagicMock()
+        mock_api_client.get.return_value = MagicMock(
+            status_code=404, raise_for_status=MagicMock(side_effect=requests.HTTPError)
+        )
+
+        synchronizer = CatalogDataSynchronizer(self.site, mock_api_client, "http://example.com/api/v1/")
+        with self.assertRaises(requests.HTTPError):
+            list(synchronizer.fetch_resource_pages("programs"))
+
+    def test_fetch_resource_pages_site_configuration(self):
+        """With a site configuration, each thread requests its pages with its own pooled API client."""
+        responses = {
+            page: {"results": [{"uuid": str(page)}], "count": 5, "next": "next" if page < 5 else None}
+            for page in range(1, 6)
+        }
+        clients = {}
+
+        def get_client():
+            client = clients.setdefault(threading.get_ident(), MagicMock())
+            client.get.side_effect = lambda url, params: MagicMock(json=lambda: responses[params["page"]])
+            return client
+
+        site_configuration = MagicMock()
+        type(site_configuration).api_client = PropertyMock(side_effect=get_client)
+
+        synchronizer = CatalogDataSynchronizer(
+            self.site, None, "http://example.com/api/v1/", concurrency=2, site_configuration=site_configuration
+        )
+        pages = list(synchronizer.fetch_resource_pages("programs"))
+
+        assert pages == [[{"uuid": str(page)}] for page in range(1, 6)]
+        # The first page is requested by this thread, the others by the pool's threads
+        assert len(clients) > 1
+        requested = [call.kwargs["params"]["page"] for client in clients.values() for call in client.get.call_args_list]
+        assert sorted(requested) == [1, 2, 3, 4, 5]
+
+
+class FakeDiscoveryHandler(BaseHTTPRequestHandler):
+    """Serves the catalog of the FakeDiscoveryServer, paginated like Course Discovery, a bit slowly."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        resource_name = url.path.strip("/").split("/")[-1]
+        page, page_size = int(params["page"][0]), int(params.get("page_size", [2])[0])
+        items = self.server.catalog[resource_name]
+
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+            self.server.requests.append((resource_name, page))
+        time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.in_flight -= 1
+
+        body = json.dumps(
+            {
+                "count": len(items),
+                "next": "next" if page * page_size < len(items) else None,
+                "results": items[(page - 1) * page_size : page * page_size],
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class ConcurrentFetchTests(TestCase):
+    """Tests fetching the catalog data from a local fake Course Discovery server"""
+
+    def setUp(self):
+        super().setUp()
+        self.site = SiteFactory()
+
+        orgs = [dict(SynchronizerTests.FIRST_ORG, uuid=f"11111111-2222-4444-9999-{i:012}") for i in range(3)]
+        courses = [
+            dict(
+                SynchronizerTests.FIRST_COURSE,
+                uuid=f"22222222-2222-4444-9999-{i:012}",
+                owners=[orgs[i % 3]],
+                course_runs=[dict(SynchronizerTests.FIRST_COURSE_RUN, uuid=f"33333333-2222-4444-9999-{i:012}")],
+            )
+            for i in range(9)
+        ]
+        programs = [
+            dict(
+                SynchronizerTests.FIRST_PROGRAM,
+                uuid=f"44444444-2222-4444-9999-{i:012}",
+                authoring_organizations=[orgs[i % 3]],
+                courses=courses[i * 3 : (i + 1) * 3],
+            )
+            for i in range(3)
+        ]
+        pathways = [dict(SynchronizerTests.FIRST_PATHWAY, programs=programs)]
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeDiscoveryHandler)
+        self.server.catalog = {"organizations": orgs, "courses": courses, "programs": programs, "pathways": pathways}
+        self.server.latency = 0.05
+        self.server.lock = threading.Lock()
+        self.server.in_flight = self.server.max_in_flight = 0
+        self.server.requests = []
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.catalog_api_url = f"http://127.0.0.1:{self.server.server_port}/api/v1/"
+
+    def assert_catalog_copied(self):
+        assert Organization.objects.count() == 3
+        assert Course.objects.count() == 9
+        assert CourseRun.objects.count() == 9
+        program = Program.objects.get(uuid="44444444-2222-4444-9999-000000000001")
+        assert [str(course_run.uuid) for course_run in program.course_runs.all()] == [
+            f"33333333-2222-4444-9999-{i:012}" for i in range(3, 6)
+        ]
+        assert Pathway.objects.get().programs.count() == 3
+
+    def test_fetch_data(self):
+        with requests.Session() as api_client:
+            CatalogDataSynchronizer(
+                self.site, api_client, self.catalog_api_url, page_size=2, concurrency=3
+            ).fetch_data()
+
+        self.assert_catalog_copied()
+        assert self.server.max_in_flight > 1
+        # All the pages of a resource are requested before the next resource, so the data dependencies are met
+        resources = [resource_name for resource_name, __ in self.server.requests]
+        assert resources == sorted(resources, key=["organizations", "courses", "programs", "pathways"].index)
+        assert len(self.server.requests) == 2 + 5 + 2 + 1
+
+    @override_settings(CATALOG_FETCH_CONCURRENCY=1)
+    def test_fetch_data_sequential(self):
+        with requests.Session() as api_client:
+            BulkCatalogDataSynchronizer(self.site, api_client, self.catalog_api_url, page_size=2).fetch_data()
+
+        self.assert_catalog_copied()
+        assert self.server.max_in_flight == 1
+
+
+class BulkSynchronizerTests(CatalogDataMixin, TestCase):
+    """Tests BulkCatalogDataSynchronizer"""
+
+    def test_fetch_data_order(self):
+        """The many-to-many links keep the catalog order, which is updated in place."""
+        second_org = dict(self.FIRST_ORG, uuid="11111111-2222-4444-9999-222222222222", key="secondorg")
+        self.API_RESPONSES = [
+            {"organizations": second_org, "programs": dict(self.FIRST_PROGRAM, courses=[], authoring_organizations=[])},
+            {"organizations": self.FIRST_ORG},
+            {"programs": dict(self.FIRST_PROGRAM, courses=[], authoring_organizations=[second_org, self.FIRST_ORG])},
+            {"programs": dict(self.FIRST_PROGRAM, courses=[], authoring_organizations=[self.FIRST_ORG, second_org])},
+        ]
+        for self.api_call_count in range(len(self.API_RESPONSES)):
+            self._get_synchronizer().fetch_data()
+
+        program = Program.objects.get()
+        assert [str(org.uuid) for org in program.authoring_organizations.all()] == [
+            self.FIRST_ORG["uuid"],
+            second_org["uuid"],
+        ]
+
+    def test_fetch_data_unchanged(self):
+        """Syncing unchanged data doesn't write anything."""
+        self._get_synchronizer().fetch_data()
+        synchronizer = self._get_synchronizer()
+
+        with patch.object(CATALOG_PROGRAMS_CHANGED, "send") as mock_send:
+            # No writes: a savepoint per page and one lookup per many-to-many relation.
+            with self.assertNumQueries(12):
+                synchronizer.fetch_data()
+
+        mock_send.assert_not_called()
+
+    def test_programs_changed_signal(self):
+        self._get_synchronizer().fetch_data()
+        program = Program.objects.get()
+
+        with patch.object(CATALOG_PROGRAMS_CHANGED, "send") as mock_send:
+            self.api_call_count = 1
+            self._get_synchronizer().fetch_data()
+
+        mock_send.assert_called_once_with(sender=BulkCatalogDataSynchronizer, site=self.site, program_ids={program.id})
+
+    def test_modified_since(self):
+        self._get_synchronizer().fetch_data()
+        modified_since = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        self.api_call_count = 1
+        synchronizer = self._get_synchronizer(modified_since=modified_since)
+        synchronizer.fetch_resource_pages = MagicMock(side_effect=self._mock_fetch_resource_pages)
+        changes = synchronizer.fetch_data()
+
+        synchronizer.fetch_resource_pages.assert_any_call(
+            BulkCatalogDataSynchronizer.PROGRAM, {"timestamp": modified_since.isoformat()}
+        )
+        synchronizer.fetch_resource_pages.assert_any_call(
+            BulkCatalogDataSynchronizer.COURSE,
+            {"include_hidden_course_runs": 1, "timestamp": modified_since.isoformat()},
+        )
+        # Items which weren't fetched again are unchanged, not obsolete
+        assert not any(model_changes["removed"] for model_changes in changes.values())
+        synchronizer.remove_obsolete_data()
+        assert Pathway.objects.count() == 1
+
+    def test_missing_organization(self):
+        self.API_RESPONSES = [{"courses": self.FIRST_COURSE}]
+        with self.assertRaises(Organization.DoesNotExist):
+            self._get_synchronizer().fetch_data()
+
+    def test_query_count(self):
+        """The number of queries doesn't depend on the number of synced items."""
+
+        def generate_catalog(size, title):
+            orgs = [dict(self.FIRST_ORG, uuid=f"11111111-2222-4444-9999-{i:012}") for i in range(size)]
+            courses = [
+                dict(
+                    self.FIRST_COURSE,
+                    uuid=f"22222222-2222-4444-9999-{i:012}",
+                    owners=[orgs[i]],
+                    course_runs=[dict(self.FIRST_COURSE_RUN, uuid=f"33333333-2222-4444-9999-{i:012}")],
+                )
+                for i in range(size)
+            ]
+            programs = [
+                dict(
+                    self.FIRST_PROGRAM,
+                    uuid=f"44444444-2222-4444-9999-{i:012}",
+                    title=title,
+                    authoring_organizations=[orgs[i]],
+                    courses=[courses[i]],
+                )
+                for i in range(size)
+            ]
+            return {"organizations": orgs, "courses": courses, "programs": programs, "pathways": []}
+
+        def sync(catalog):
+            synchronizer = BulkCatalogDataSynchronizer(self.site, None, "")
+            synchronizer.fetch_resource_pages = lambda resource_name, extra_request_params=None: iter(
+                [catalog[resource_name]]
+            )
+            synchronizer.fetch_data()
+
+        query_counts = []
+        for size in (1, 10):
+            Organization.objects.all().delete()
+            sync(generate_catalog(size, "Title"))
+            with CaptureQueriesContext(connection) as queries:
+                sync(generate_catalog(size, "Updated Title"))
+            query_counts.append(len(queries))
+
+        assert query_counts[0] == query_counts[1]
+
+    @unittest.skipUnless(os.environ.get("CATALOG_SYNC_BENCHMARK"), "Set CATALOG_SYNC_BENCHMARK=1 to run the benchmark")
+    def test_benchmark(self):
+        """
+        Compares both synchronizers on a synthetic catalog (~50k course runs), e.g.:
+
+            CATALOG_SYNC_BENCHMARK=1 pytest credentials/apps/catalog/tests/test_utils.py -k benchmark -s
+        """
+        orgs = [dict(self.FIRST_ORG, uuid=f"11111111-2222-4444-9999-{i:012}") for i in range(50)]
+        courses = [
+            dict(
+                self.FIRST_COURSE,
+                uuid=f"22222222-2222-4444-9999-{i:012}",
+                owners=[orgs[i % 50]],
+                course_runs=[dict(self.FIRST_COURSE_RUN, uuid=f"33333333-2222-4444-{j:04}-{i:012}") for j in range(10)],
+            )
+            for i in range(5000)
+        ]
+        programs = [
+            dict(
+                self.FIRST_PROGRAM,
+                uuid=f"44444444-2222-4444-9999-{i:012}",
+                authoring_organizations=[orgs[i % 50]],
+                courses=courses[i * 10 : (i + 1) * 10],
+            )
+            for i in range(500)
+        ]
+        catalog = {"organizations": orgs, "courses": courses, "programs": programs, "pathways": []}
+
+        def fetch_resource_pages(resource_name, extra_request_params=None):  # pylint: disable=unused-argument
+            items = catalog[resource_name]
+            for start in range(0, len(items), 100):
+                yield items[start : start + 100]
+
+        def fetch_resource(resource_name, parse_method, extra_request_params=None):
+            for page in fetch_resource_pages(resource_name, extra_request_params):
+                for item in page:
+                    parse_method(item)
+
+        for synchronizer_class in (BulkCatalogDataSynchronizer, CatalogDataSynchronizer):
+            Organization.objects.all().delete()
+            for run in ("initial", "unchanged"):
+                synchronizer = synchronizer_class(self.site, None, "")
+                synchronizer.fetch_resource_pages = fetch_resource_pages
+                synchronizer.fetch_resource = fetch_resource
+                start = time.perf_counter()
+                with CaptureQueriesContext(connection) as queries:
+                    synchronizer.fetch_data()
+                print(
+                    f"{synchronizer_class.__name__} {run} sync: "
+                    f"{time.perf_counter() - start:.1f}s, {len(queries)} queries"
+                )
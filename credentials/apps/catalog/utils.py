@@ -1,11 +1,21 @@
 """Utilities for integration with the catalog service."""
 
+import datetime
 import logging
+import math
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from urllib.parse import urljoin
 
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from credentials.apps.catalog.models import Course, CourseRun, Organization, Pathway, Program
+from credentials.apps.catalog.signals import CATALOG_PROGRAMS_CHANGED
 
 
 logger = logging.getLogger(__name__)
@@ -29,7 +39,7 @@ class CatalogDataSynchronizer:
     PATHWAY = "pathways"
     PROGRAM = "programs"
 
-    def __init__(self, site, api_client, catalog_api_url, page_size=None):
+    def __init__(self, site, api_client, catalog_api_url, page_size=None, *, concurrency=None, site_configuration=None):
         """
         Constructor
 
@@ -38,14 +48,19 @@ class CatalogDataSynchronizer:
             api_client (ApiClient): The client through which all API calls will be made
             catalog_api_url (str): The full URL root of the catalog API to hit (ex. "https://example.com/api/v1/")
             page_size (int): An optional field to denote the number of results per page to retrieve from the API
+            concurrency (int): An optional field to denote the number of pages to request from the API at once
+            site_configuration (SiteConfiguration): An optional configuration whose pooled API client is used,
+                instead of `api_client`, by each of the threads requesting the pages
 
         Returns:
             CatalogDataSynchronizer: An instance of the class
         """
         self.site = site
         self.api_client = api_client
+        self.site_configuration = site_configuration
         self.catalog_api_url = catalog_api_url
         self.page_size = page_size
+        self.concurrency = concurrency or settings.CATALOG_FETCH_CONCURRENCY
         self.existing_data = {
             self.COURSE: Course.objects.filter(site=site),
             self.COURSE_RUN: CourseRun.objects.filter(course__site=site),
@@ -131,25 +146,76 @@ class CatalogDataSynchronizer:
         Returns:
             None
         """
+        for page in self.fetch_resource_pages(resource_name, extra_request_params):
+            for resource in page:
+                logger.info(f'Copying {resource_name} "{resource["uuid"]}"')
+                parse_method(resource)
+
+    def fetch_resource_pages(self, resource_name, extra_request_params=None):
+        """
+        Generic method to page through the API response
+
+        The first page is requested alone, to learn the number of pages from its `count`; the remaining pages are
+        then requested concurrently (at most `concurrency` at a time), while the pages are still yielded one by
+        one in their API order, as soon as they (and all the pages before them) arrive.
+
+        Arguments:
+            resource_name (str): The resource name on the API e.g. /api/v1/programs/ would be "programs"
+            extra_request_params (dict): Optional additional query parameters
+
+        Yields:
+            list: The results of each page
+        """
 
         if extra_request_params is None:
             extra_request_params = {}
 
-        resource_url = urljoin(self.catalog_api_url, f"{resource_name}/")
-        next_page = 1
+        data = self._fetch_page(resource_name, 1, extra_request_params)
+        yield data["results"]
+
+        next_page = 2 if data["next"] else None
+        if next_page and self.concurrency > 1 and data.get("count") and data["results"]:
+            last_page = math.ceil(data["count"] / len(data["results"]))
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                fetch = partial(self._fetch_page, resource_name, extra_request_params=extra_request_params)
+                # Pages are requested ahead, within a window bounded by the pool size, and yielded in order.
+                pending = deque(
+                    executor.submit(fetch, page) for page in range(2, min(last_page, self.concurrency * 2) + 1)
+                )
+                requested = 1 + len(pending)
+                while pending:
+                    data = pending.popleft().result()
+                    if not data["next"]:
+                        # The catalog shrank while it was being fetched: the pages requested ahead are gone
+                        for future in pending:
+                            future.cancel()
+                        pending.clear()
+                    elif requested < last_page:
+                        requested += 1
+                        pending.append(executor.submit(fetch, requested))
+                    yield data["results"]
+            # The catalog may have grown while it was being fetched
+            next_page = last_page + 1 if data["next"] else None
+
         while next_page:
-            response = self.api_client.get(
-                resource_url,
-                params=dict({"exclude_utm": 1, "page": next_page, "page_size": self.page_size}, **extra_request_params),
-            )
-            response.raise_for_status()
-            data = response.json()
-            for resource in data["results"]:
-                logger.info(f'Copying {resource_name} "{resource["uuid"]}"')
-                parse_method(resource)
+            data = self._fetch_page(resource_name, next_page, extra_request_params)
+            yield data["results"]
 
             next_page = next_page + 1 if data["next"] else None
 
+    def _fetch_page(self, resource_name, page, extra_request_params):
+        # The pooled clients of the site configuration are per thread: resolve it in the thread fetching the page
+        api_client = self.site_configuration.api_client if self.site_configuration else self.api_client
+        response = api_client.get(
+            urljoin(self.catalog_api_url, f"{resource_name}/"),
+            params=dict({"exclude_utm": 1, "page": page, "page_size": self.page_size}, **extra_request_params),
+        )
+        if response.status_code == 404 and page > 1:
+            # Past the first page, a missing page is the end of a catalog that shrank while it was being fetched
+            return {"results": [], "next": None}
+        response.raise_for_status()
+        return response.json()
+
     def _log_and_return_changes(self):
         """
         Log the data that will be added or deleted. Returns the logs as a string for callers that need to print
@@ -344,3 +410,412 @@ class CatalogDataSynchronizer:
             pathway.programs.add(program)
 
         return pathway
+
+
+class BulkCatalogDataSynchronizer(CatalogDataSynchronizer):
+    """
+    CatalogDataSynchronizer which syncs the catalog data page by page, instead of item by item.
+
+    Existing rows (and their many-to-many links) are loaded into in-memory indexes once; each fetched page is diffed
+    against them and only new or changed rows are written, with `bulk_create`/`bulk_update`, in a single transaction.
+
+    With `modified_since`, only items modified since then are requested from the catalog service (incremental sync);
+    nothing is considered obsolete in that case.
+
+    NOTE: bulk writes don't send model signals, so the changed programs are reported with CATALOG_PROGRAMS_CHANGED.
+    """
+
+    BATCH_SIZE = 1000
+    # Course Discovery filter for the items modified since the given ISO 8601 timestamp
+    MODIFIED_SINCE_PARAM = "timestamp"
+
+    def __init__(
+        self,
+        site,
+        api_client,
+        catalog_api_url,
+        page_size=None,
+        *,
+        concurrency=None,
+        site_configuration=None,
+        modified_since=None,
+    ):
+        """
+        Constructor
+
+        Arguments:
+            site (Site): The site that all fetch models should connect to
+            api_client (ApiClient): The client through which all API calls will be made
+            catalog_api_url (str): The full URL root of the catalog API to hit (ex. "https://example.com/api/v1/")
+            page_size (int): An optional field to denote the number of results per page to retrieve from the API
+            concurrency (int): An optional field to denote the number of pages to request from the API at once
+            site_configuration (SiteConfiguration): An optional configuration whose pooled API client is used,
+                instead of `api_client`, by each of the threads requesting the pages
+            modified_since (datetime): An optional field to only sync the items modified since then
+
+        Returns:
+            BulkCatalogDataSynchronizer: An instance of the class
+        """
+        super().__init__(
+            site,
+            api_client,
+            catalog_api_url,
+            page_size=page_size,
+            concurrency=concurrency,
+            site_configuration=site_configuration,
+        )
+        self.modified_since = modified_since
+        if modified_since:
+            # Incremental sync: items which weren't fetched are unchanged rather than obsolete.
+            self.updated_data_sets = {model: set(uuids) for model, uuids in self.existing_data_sets.items()}
+
+        self.organizations = {str(org.uuid): org for org in Organization.objects.filter(site=site)}
+        self.courses = {str(course.uuid): course for course in Course.objects.filter(site=site)}
+        self.course_runs = {
+            (course_run.course_id, str(course_run.uuid)): course_run
+            for course_run in CourseRun.objects.filter(course__site=site)
+        }
+        self.programs = {str(program.uuid): program for program in Program.objects.filter(site=site)}
+        self.pathways = {str(pathway.uuid): pathway for pathway in Pathway.objects.filter(site=site)}
+        self.links = {}
+
+        self.changed_organization_ids = set()
+        self.changed_course_ids = set()
+        self.changed_course_run_ids = set()
+        self.changed_program_ids = set()
+
+    def fetch_data(self):
+        """
+        Fetch data from all catalog endpoints and use it to either create or update data in the DB
+
+        Returns:
+            dict: The added and removed UUIDs per model type
+        """
+        logger.info(f"Bulk copying catalog data for site {self.site.domain}")
+        extra_request_params = {}
+        if self.modified_since:
+            logger.info(f"Copying catalog data modified since {self.modified_since.isoformat()}")
+            extra_request_params[self.MODIFIED_SINCE_PARAM] = self.modified_since.isoformat()
+
+        for resource_name, sync_method, params in (
+            (self.ORGANIZATION, self._sync_organizations, {}),
+            (self.COURSE, self._sync_courses, {"include_hidden_course_runs": 1}),
+            (self.PROGRAM, self._sync_programs, {}),
+            (self.PATHWAY, self._sync_pathways, {}),
+        ):
+            for page in self.fetch_resource_pages(resource_name, dict(params, **extra_request_params)):
+                logger.info(f"Copying {len(page)} {resource_name}")
+                with transaction.atomic():
+                    sync_method(page)
+        logger.info("Finished copying pathways.")
+
+        self._notify_programs_changed()
+        return self._log_and_return_changes()
+
+    def _notify_programs_changed(self):
+        """
+        Reports the programs affected by the sync, including through their organizations, courses and course runs.
+        """
+        program_ids = set(self.changed_program_ids)
+
+        if self.changed_organization_ids:
+            for program_id, organization_ids in self._get_links(Program, "authoring_organizations").items():
+                if not self.changed_organization_ids.isdisjoint(organization_ids):
+                    program_ids.add(program_id)
+
+        if self.changed_course_ids or self.changed_course_run_ids:
+            course_ids = {course_run.id: course_run.course_id for course_run in self.course_runs.values()}
+            for program_id, course_run_ids in self._get_links(Program, "course_runs").items():
+                if not self.changed_course_run_ids.isdisjoint(course_run_ids) or not self.changed_course_ids.isdisjoint(
+                    course_ids.get(course_run_id) for course_run_id in course_run_ids
+                ):
+                    program_ids.add(program_id)
+
+        if program_ids:
+            CATALOG_PROGRAMS_CHANGED.send(sender=self.__class__, site=self.site, program_ids=program_ids)
+
+    def _upsert(self, model, index, rows, *, scope, key):
+        """
+        Creates new and updates changed rows of the model.
+
+        Arguments:
+            model (Model): The model to sync
+            index (dict): Existing instances by their key (updated in place)
+            rows (list): (identity, values) pairs - the fields to create an instance with and the fields to keep updated
+            scope (Q): Filters the site's instances of the model
+            key (func): Returns the index key of an instance
+
+        Returns:
+            tuple(list, set): The instances in the order of the rows and the IDs of the created or changed ones
+        """
+        instances, to_create, to_update = [], [], []
+        now = timezone.now()
+
+        for identity, values in rows:
+            instance = index.get(key(model(**identity)))
+            if instance is None:
+                instance = model(**identity, **values)
+                index[key(instance)] = instance
+                to_create.append(instance)
+            elif any(getattr(instance, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(instance, field, value)
+                instance.modified = now
+                to_update.append(instance)
+            instances.append(instance)
+
+        if to_create:
+            model.objects.bulk_create(to_create, batch_size=self.BATCH_SIZE)
+            if any(instance.pk is None for instance in to_create):
+                # Some database backends (MySQL) don't return primary keys of bulk created rows.
+                created = model.objects.filter(scope, uuid__in=[instance.uuid for instance in to_create])
+                pks = {key(instance): instance.pk for instance in created}
+                for instance in to_create:
+                    instance.pk = pks[key(instance)]
+        if to_update:
+            model.objects.bulk_update(to_update, [*rows[0][1].keys(), "modified"], batch_size=self.BATCH_SIZE)
+
+        return instances, {instance.pk for instance in to_create + to_update}
+
+    def _get_links(self, model, field_name):
+        """
+        Returns the existing many-to-many links of the site's model instances: {source ID: {target ID: through row}}.
+        """
+        if (model, field_name) not in self.links:
+            field = model._meta.get_field(field_name)
+            links = defaultdict(dict)
+            for row in field.remote_field.through.objects.filter(**{f"{field.m2m_field_name()}__site": self.site}):
+                links[getattr(row, f"{field.m2m_field_name()}_id")][
+                    getattr(row, f"{field.m2m_reverse_field_name()}_id")
+                ] = row
+            self.links[(model, field_name)] = links
+        return self.links[(model, field_name)]
+
+    def _sync_links(self, model, field_name, targets):
+        """
+        Applies the difference between the existing and the expected (ordered) many-to-many links.
+
+        Arguments:
+            model (Model): The model owning the SortedManyToManyField
+            field_name (str): The SortedManyToManyField name
+            targets (dict): The expected ordered target IDs by source ID
+
+        Returns:
+            set: The IDs of the sources whose links changed
+        """
+        field = model._meta.get_field(field_name)
+        through = field.remote_field.through
+        source_field, target_field = field.m2m_field_name(), field.m2m_reverse_field_name()
+        sort_field = through._sort_field_name  # pylint: disable=protected-access
+        links = self._get_links(model, field_name)
+
+        changed, to_create, to_update, to_delete = set(), [], [], []
+        for source_id, target_ids in targets.items():
+            target_ids = list(dict.fromkeys(target_ids))
+            existing = links[source_id]
+            ordered = sorted(existing.items(), key=lambda item: getattr(item[1], sort_field))
+            if [target_id for target_id, __ in ordered] == target_ids:
+                continue
+
+            changed.add(source_id)
+            for target_id in set(existing) - set(target_ids):
+                to_delete.append(existing.pop(target_id))
+            for sort_value, target_id in enumerate(target_ids, 1):
+                row = existing.get(target_id)
+                if row is None:
+                    existing[target_id] = through(
+                        **{f"{source_field}_id": source_id, f"{target_field}_id": target_id, sort_field: sort_value}
+                    )
+                    to_create.append(existing[target_id])
+                elif getattr(row, sort_field) != sort_value:
+                    setattr(row, sort_field, sort_value)
+                    to_update.append(row)
+
+        if to_delete:
+            through.objects.filter(pk__in=[row.pk for row in to_delete]).delete()
+        if to_update:
+            through.objects.bulk_update(to_update, [sort_field], batch_size=self.BATCH_SIZE)
+        if to_create:
+            through.objects.bulk_create(to_create, batch_size=self.BATCH_SIZE)
+            if any(row.pk is None for row in to_create):
+                # Reload the links to get primary keys of the created rows (see _upsert).
+                for row in through.objects.filter(**{f"{source_field}_id__in": changed}):
+                    links[getattr(row, f"{source_field}_id")][getattr(row, f"{target_field}_id")] = row
+
+        return changed
+
+    def _get_organization_id(self, org_data):
+        try:
+            return self.organizations[org_data["uuid"]].id
+        except KeyError:
+            raise Organization.DoesNotExist(f"Organization {org_data['uuid']} does not exist")
+
+    def _sync_organizations(self, page):
+        __, changed_organization_ids = self._upsert(
+            Organization,
+            self.organizations,
+            [
+                (
+                    {"site": self.site, "uuid": data["uuid"]},
+                    {
+                        "key": data["key"],
+                        "name": data["name"],
+                        "certificate_logo_image_url": data["certificate_logo_image_url"],
+                    },
+                )
+                for data in page
+            ],
+            scope=Q(site=self.site),
+            key=lambda org: str(org.uuid),
+        )
+        self.changed_organization_ids |= changed_organization_ids
+
+        for data in page:
+            self.add_item(self.ORGANIZATION, data["uuid"])
+
+    def _sync_courses(self, page):
+        courses, changed_course_ids = self._upsert(
+            Course,
+            self.courses,
+            [
+                ({"site": self.site, "uuid": data["uuid"]}, {"key": data["key"], "title": data["title"]})
+                for data in page
+            ],
+            scope=Q(site=self.site),
+            key=lambda course: str(course.uuid),
+        )
+        self.changed_course_ids |= changed_course_ids
+        self.changed_course_ids |= self._sync_links(
+            Course,
+            "owners",
+            {
+                course.id: [self._get_organization_id(org_data) for org_data in data["owners"]]
+                for course, data in zip(courses, page)
+            },
+        )
+
+        __, changed_course_run_ids = self._upsert(
+            CourseRun,
+            self.course_runs,
+            [
+                (
+                    {"course": course, "uuid": run_data["uuid"]},
+                    {
+                        "key": run_data["key"],
+                        "title_override": run_data["title"] if run_data["title"] != course.title else None,
+                        # See CatalogDataSynchronizer._parse_course_run about both date fields variants.
+                        "start_date": self._parse_date(
+                            run_data["start_date"] if "start_date" in run_data else run_data["start"]
+                        ),
+                        "end_date": self._parse_date(
+                            run_data["end_date"] if "end_date" in run_data else run_data["end"]
+                        ),
+                    },
+                )
+                for course, data in zip(courses, page)
+                for run_data in data["course_runs"]
+            ],
+            scope=Q(course__site=self.site),
+            key=lambda course_run: (course_run.course_id, str(course_run.uuid)),
+        )
+        self.changed_course_run_ids |= changed_course_run_ids
+
+        for data in page:
+            self.add_item(self.COURSE, data["uuid"])
+            for run_data in data["course_runs"]:
+                self.add_item(self.COURSE_RUN, run_data["uuid"])
+
+    def _get_course_run_id(self, course_data, course_run_data):
+        course = self.courses.get(course_data["uuid"])
+        course_run = self.course_runs.get((course.id if course else None, course_run_data["uuid"]))
+        if course_run is None:
+            raise CourseRun.DoesNotExist(f"Course run {course_run_data['uuid']} does not exist")
+        return course_run.id
+
+    def _sync_programs(self, page):
+        programs, changed_program_ids = self._upsert(
+            Program,
+            self.programs,
+            [
+                (
+                    {"site": self.site, "uuid": data["uuid"]},
+                    {
+                        "title": data["title"],
+                        "type": data["type"],
+                        "status": data["status"],
+                        "type_slug": data["type_attrs"]["slug"],
+                        "total_hours_of_effort": data["total_hours_of_effort"],
+                    },
+                )
+                for data in page
+            ],
+            scope=Q(site=self.site),
+            key=lambda program: str(program.uuid),
+        )
+        self.changed_program_ids |= changed_program_ids
+        self.changed_program_ids |= self._sync_links(
+            Program,
+            "authoring_organizations",
+            {
+                program.id: [self._get_organization_id(org_data) for org_data in data["authoring_organizations"]]
+                for program, data in zip(programs, page)
+            },
+        )
+        self.changed_program_ids |= self._sync_links(
+            Program,
+            "course_runs",
+            {
+                program.id: [
+                    self._get_course_run_id(course_data, course_run_data)
+                    for course_data in data["courses"]
+                    for course_run_data in course_data["course_runs"]
+                ]
+                for program, data in zip(programs, page)
+            },
+        )
+
+        for data in page:
+            self.add_item(self.PROGRAM, data["uuid"])
+
+    def _sync_pathways(self, page):
+        pathways, __ = self._upsert(
+            Pathway,
+            self.pathways,
+            [
+                (
+                    {"site": self.site, "uuid": data["uuid"]},
+                    {
+                        "name": data["name"],
+                        "email": data["email"],
+                        "org_name": data["org_name"],
+                        "pathway_type": data["pathway_type"],
+                    },
+                )
+                for data in page
+            ],
+            scope=Q(site=self.site),
+            key=lambda pathway: str(pathway.uuid),
+        )
+
+        links = self._get_links(Pathway, "programs")
+        previous_program_ids = {pathway.id: set(links[pathway.id]) for pathway in pathways}
+        targets = {}
+        for pathway, data in zip(pathways, page):
+            targets[pathway.id] = []
+            for program_data in data["programs"]:
+                try:
+                    targets[pathway.id].append(self.programs[program_data["uuid"]].id)
+                except KeyError:
+                    raise Program.DoesNotExist(f"Program {program_data['uuid']} does not exist")
+
+        for pathway_id in self._sync_links(Pathway, "programs", targets):
+            self.changed_program_ids |= previous_program_ids[pathway_id] | set(targets[pathway_id])
+
+        for data in page:
+            self.add_item(self.PATHWAY, data["uuid"])
+
+    @staticmethod
+    def _parse_date(value):
+        if value is None or isinstance(value, datetime.datetime):
+            return value
+        return parse_datetime(value)
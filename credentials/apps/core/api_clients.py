@@ -0,0 +1,152 @@
+"""
+Per-process pool of OAuth API clients.
+
+`OAuthAPIClient` is a `requests.Session`: building one for every API call (as `SiteConfiguration.api_client` used to)
+throws away its HTTP connections, and every new client looks its access token up again (in the TieredCache, or from
+the OAuth provider if the cached token is gone).
+
+Instead, the pool keeps, for each site:
+
+- one client per thread (sessions are not meant to be shared by threads), reused along with its connections;
+- one access token shared by these clients, kept in memory until shortly before it expires, and loaded by one thread
+  at a time, so that concurrent requests of a multi-threaded worker don't all fetch a token at once.
+
+Pool hits and misses and token loads are counted (see `OAuthAPIClientPool.stats`) and reported as monitoring custom
+attributes.
+"""
+
+import datetime
+import logging
+import threading
+
+import attr
+from django.conf import settings
+from edx_django_utils.monitoring import set_custom_attribute
+from edx_rest_api_client.client import (
+    ACCESS_TOKEN_EXPIRED_THRESHOLD_SECONDS,
+    OAuthAPIClient,
+    get_and_cache_oauth_access_token,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(auto_attribs=True)
+class OAuthAPIClientPoolStats:
+    """
+    OAuth API clients pool counters (since the process started, or the pool was last cleared).
+    """
+
+    hits: int = 0
+    misses: int = 0
+    token_loads: int = 0
+
+
+class SharedAccessToken:
+    """
+    An OAuth access token shared by the pooled clients of a site.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.lock = threading.Lock()
+        # (token, expiration) replaced at once, so that readers never see a token with another token's expiration
+        self.value = (None, None)
+
+    @staticmethod
+    def is_valid(value):
+        token, expiration = value
+        threshold = datetime.timedelta(seconds=ACCESS_TOKEN_EXPIRED_THRESHOLD_SECONDS)
+        return token is not None and datetime.datetime.utcnow() < expiration - threshold
+
+    def get(self, client):
+        value = self.value
+        if self.is_valid(value):
+            return value[0]
+
+        with self.lock:
+            # another thread may have loaded the token while we were waiting
+            if not self.is_valid(self.value):
+                self.value = client.load_access_token()
+                self.pool.count("token_loads")
+            return self.value[0]
+
+
+class PooledOAuthAPIClient(OAuthAPIClient):
+    """
+    An `OAuthAPIClient` that gets its access token from the site's shared access token.
+    """
+
+    def __init__(self, base_url, client_id, client_secret, access_token, **kwargs):
+        super().__init__(base_url, client_id, client_secret, **kwargs)
+        self.access_token = access_token
+
+    def load_access_token(self):
+        logger.info("Loading an OAuth access token for client [%s].", self._client_id)
+        set_custom_attribute("api_client_token_load", True)
+        return get_and_cache_oauth_access_token(
+            self._base_url, self._client_id, self._client_secret, grant_type="client_credentials", timeout=self._timeout
+        )
+
+    def _ensure_authentication(self):
+        self.auth.token = self.access_token.get(self)
+
+
+class OAuthAPIClientPool:
+    """
+    OAuth API clients, by site and thread.
+    """
+
+    def __init__(self):
+        self.stats = OAuthAPIClientPoolStats()
+        self._lock = threading.Lock()
+        self._tokens = {}
+        self._local = threading.local()
+        self._generation = 0
+
+    def count(self, name):
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def get_client(self, site_id):
+        """
+        Returns the current thread's client of the site.
+        """
+        # OAuth settings are part of the key, so that a settings change (e.g. in tests) never reuses another client
+        key = (
+            site_id,
+            settings.BACKEND_SERVICE_EDX_OAUTH2_PROVIDER_URL,
+            settings.BACKEND_SERVICE_EDX_OAUTH2_KEY,
+            settings.BACKEND_SERVICE_EDX_OAUTH2_SECRET,
+        )
+
+        if getattr(self._local, "generation", None) != self._generation:
+            self._local.clients = {}
+            self._local.generation = self._generation
+
+        client = self._local.clients.get(key)
+        if client is not None:
+            self.count("hits")
+            set_custom_attribute("api_client_pool_hit", True)
+            return client
+
+        with self._lock:
+            access_token = self._tokens.setdefault(key, SharedAccessToken(self))
+        client = PooledOAuthAPIClient(*key[1:], access_token=access_token)
+        self._local.clients[key] = client
+        self.count("misses")
+        set_custom_attribute("api_client_pool_hit", False)
+        return client
+
+    def clear(self):
+        """
+        Drops all clients and access tokens (every thread builds new clients on its next call).
+        """
+        with self._lock:
+            self._tokens = {}
+            self._generation += 1
+            self.stats = OAuthAPIClientPoolStats()
+
+
+api_client_pool = OAuthAPIClientPool()
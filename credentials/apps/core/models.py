@@ -1,15 +1,12 @@
 """Core models."""
 
-import hashlib
-from urllib.parse import urljoin
-
-from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.sites.models import Site
-from django.core.cache import cache
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from edx_rest_api_client.client import OAuthAPIClient
+
+from credentials.apps.core.api_clients import api_client_pool
+from credentials.apps.core.user_profiles import get_user_profile
 
 
 class SiteConfiguration(models.Model):
@@ -141,23 +138,21 @@ class SiteConfiguration(models.Model):
         """
         Returns a requests client for this site's service user.
 
-        This client is authenticated with the configured oauth settings and automatically cached.
+        This client is authenticated with the configured oauth settings. Clients are pooled (see
+        `credentials.apps.core.api_clients`): they are reused, with their connections and access token, by later calls
+        from the same thread.
 
         Returns:
             requests.Session: API client
         """
-        return OAuthAPIClient(
-            settings.BACKEND_SERVICE_EDX_OAUTH2_PROVIDER_URL,
-            settings.BACKEND_SERVICE_EDX_OAUTH2_KEY,
-            settings.BACKEND_SERVICE_EDX_OAUTH2_SECRET,
-        )
+        return api_client_pool.get_client(self.site_id)
 
     def get_user_api_data(self, username):
         """Retrieve details for the specified user from the User API and Verified Name API.
 
-        If the API calls are successful, the returned data will be cached for the
-        duration of USER_CACHE_TTL (in seconds). Failed API responses will NOT
-        be cached.
+        The returned data is cached (see `credentials.apps.core.user_profiles`): it is served from the cache for
+        USER_CACHE_TTL seconds, then refreshed in background while the stale data is served for USER_CACHE_STALE_TTL
+        more seconds. Failed lookups are cached for USER_CACHE_NEGATIVE_TTL seconds.
 
         Arguments:
             username (str): Unique identifier of the user for retrieval
@@ -165,28 +160,7 @@ class SiteConfiguration(models.Model):
         Returns:
             dict: Data returned from the User API
         """
-        cache_key = "user.api.data.{}".format(hashlib.md5(username.encode("utf8")).hexdigest())
-        user_data = cache.get(cache_key)
-
-        if not user_data:
-            # first get user api data
-            user_url = urljoin(self.user_api_url, f"accounts/{username}")
-            user_response = self.api_client.get(user_url)
-            user_response.raise_for_status()
-            user_data = user_response.json()
-
-            # then get name verification api data
-            verification_url = urljoin(self.name_verification_api_url, f"?username={username}")
-            verification_response = self.api_client.get(verification_url)
-            if verification_response.status_code == 200:
-                verification_data = verification_response.json()
-                # add relevant verified name data to user_data
-                user_data["verified_name"] = verification_data.get("verified_name")
-                user_data["use_verified_name_for_certs"] = verification_data.get("use_verified_name_for_certs")
-
-            cache.set(cache_key, user_data, settings.USER_CACHE_TTL)
-
-        return user_data
+        return get_user_profile(self, username)
 
 
 class User(AbstractUser):
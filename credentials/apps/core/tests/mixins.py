@@ -6,6 +6,7 @@ from django.contrib.sites.models import Site
 from django.core.cache import cache
 from edx_django_utils.cache import TieredCache
 
+from credentials.apps.core.api_clients import api_client_pool
 from credentials.apps.core.tests.factories import SiteConfigurationFactory
 
 
@@ -27,6 +28,7 @@ class SiteMixin:
 
         # Clear edx rest api client cache
         TieredCache.dangerous_clear_all_tiers()
+        api_client_pool.clear()
 
     def mock_access_token_response(self, status=200):
         """Mock the response from the OAuth provider's access token endpoint."""
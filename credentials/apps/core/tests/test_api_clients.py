@@ -0,0 +1,151 @@
+"""Tests for the OAuth API clients pool."""
+
+import datetime
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import urlparse
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from edx_django_utils.cache import TieredCache
+
+from credentials.apps.core.api_clients import PooledOAuthAPIClient, api_client_pool
+from credentials.apps.core.tests.mixins import SiteMixin
+
+
+class FakeLMSHandler(BaseHTTPRequestHandler):
+    """Serves OAuth access tokens, User API accounts and verified names, and keeps track of requests and connections."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, data):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _track(self):
+        with self.server.lock:
+            self.server.requests.append((self.command, urlparse(self.path).path))
+            self.server.connections.add(self.client_address)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self._track()
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self._respond({"access_token": "fake-token", "expires_in": self.server.expires_in})
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self._track()
+        url = urlparse(self.path)
+        if url.path.startswith("/api/user/v1/accounts/"):
+            self._respond({"username": url.path.rsplit("/", 1)[-1]})
+        else:
+            self._respond({"verified_name": "Verified Name", "use_verified_name_for_certs": True})
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class OAuthAPIClientPoolTests(SiteMixin, TestCase):
+    """Tests the OAuth API clients pool against a local fake LMS"""
+
+    def setUp(self):
+        super().setUp()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLMSHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.connections = set()
+        self.server.expires_in = 3600
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        lms_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.site_configuration.lms_url_root = lms_url
+        self.site_configuration.save()
+        settings_override = override_settings(BACKEND_SERVICE_EDX_OAUTH2_PROVIDER_URL=f"{lms_url}/oauth2")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    @property
+    def token_requests(self):
+        return [request for request in self.server.requests if request[0] == "POST"]
+
+    def get_user_api_data(self, count):
+        for index in range(count):
+            self.site_configuration.get_user_api_data(f"user{index}")
+
+    def test_one_token_fetch(self):
+        """Verify N calls share one access token and reuse the client's connection."""
+        self.get_user_api_data(10)
+
+        self.assertEqual(self.token_requests, [("POST", "/oauth2/access_token")])
+        self.assertEqual(len(self.server.requests), 1 + 10 * 2)
+        # one client (and connection) per thread: the verified names are fetched by a pool of threads, and the token
+        # request isn't made by the pooled sessions
+        self.assertLess(api_client_pool.stats.misses, 10)
+        self.assertEqual(len(self.server.connections), api_client_pool.stats.misses + 1)
+        self.assertEqual(api_client_pool.stats.hits + api_client_pool.stats.misses, 10 * 2)
+        self.assertEqual(api_client_pool.stats.token_loads, 1)
+        self.assertIs(self.site_configuration.api_client, self.site_configuration.api_client)
+
+    def test_token_in_memory(self):
+        """Verify the token is reused from memory, even once the shared cache lost it."""
+        self.get_user_api_data(1)
+        TieredCache.dangerous_clear_all_tiers()
+        cache.clear()
+
+        with patch("credentials.apps.core.api_clients.get_and_cache_oauth_access_token") as load_token:
+            self.get_user_api_data(3)
+
+        load_token.assert_not_called()
+        self.assertEqual(len(self.token_requests), 1)
+
+    def test_token_near_expiry(self):
+        """Verify a token is not reused once it (almost) expired."""
+        # within the expiration threshold right away: every API call needs a new token
+        self.server.expires_in = 4
+        self.get_user_api_data(2)
+        self.assertEqual(len(self.token_requests), 2 * 2)
+
+    def test_threads(self):
+        """Verify concurrent threads get their own client, but share one access token."""
+        clients = []
+
+        def get_user_api_data(index):
+            clients.append(self.site_configuration.api_client)
+            self.site_configuration.get_user_api_data(f"user{index}")
+
+        threads = [threading.Thread(target=get_user_api_data, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(map(id, clients))), 8)
+        self.assertTrue(all(isinstance(client, PooledOAuthAPIClient) for client in clients))
+        self.assertEqual(len(self.token_requests), 1)
+        self.assertEqual(len(self.server.requests), 1 + 8 * 2)
+
+    def test_settings_change(self):
+        """Verify clients aren't reused once the OAuth settings changed."""
+        client = self.site_configuration.api_client
+        with override_settings(BACKEND_SERVICE_EDX_OAUTH2_KEY="another-key"):
+            self.assertIsNot(self.site_configuration.api_client, client)
+        self.assertIs(self.site_configuration.api_client, client)
+
+    def test_clear(self):
+        client = self.site_configuration.api_client
+        api_client_pool.clear()
+        self.assertIsNot(self.site_configuration.api_client, client)
+        self.assertEqual(api_client_pool.stats.misses, 1)
+
+    def test_expired_token_value(self):
+        expired = ("token", datetime.datetime.utcnow() - datetime.timedelta(seconds=1))
+        self.assertFalse(self.site_configuration.api_client.access_token.is_valid(expired))
@@ -0,0 +1,167 @@
+"""Tests for the user profiles cache."""
+
+import json
+from unittest import mock
+
+import responses
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from requests.exceptions import HTTPError
+
+from credentials.apps.core import user_profiles
+from credentials.apps.core.tests.mixins import JSON, SiteMixin
+from credentials.apps.core.user_profiles import (
+    UserProfileUnavailable,
+    get_cache_key,
+    get_user_profile,
+    warm_user_profiles,
+)
+
+
+@override_settings(USER_CACHE_TTL=60, USER_CACHE_STALE_TTL=600, USER_CACHE_NEGATIVE_TTL=30)
+class UserProfilesTests(SiteMixin, TestCase):
+    """User profiles cache tests."""
+
+    def setUp(self):
+        super().setUp()
+        self.mock_access_token_response()
+        # background refreshes run right away
+        executor = mock.patch.object(user_profiles, "_refresh_executor")
+        executor.start().submit.side_effect = lambda func, *args: func(*args)
+        self.addCleanup(executor.stop)
+
+    def mock_user_api_responses(self, username, name="Jon Doe", status=200):
+        responses.add(
+            responses.GET,
+            f"{self.site_configuration.user_api_url}accounts/{username}",
+            body=json.dumps({"username": username, "name": name}),
+            content_type=JSON,
+            status=status,
+        )
+        responses.add(
+            responses.GET,
+            f"{self.site_configuration.name_verification_api_url}?username={username}",
+            body=json.dumps({"verified_name": "Jonathan Doe", "use_verified_name_for_certs": True}),
+            content_type=JSON,
+        )
+
+    def mock_accounts_response(self, usernames, found=None):
+        found = usernames if found is None else found
+        responses.add(
+            responses.GET,
+            f"{self.site_configuration.user_api_url}accounts?username={','.join(usernames)}",
+            body=json.dumps([{"username": username, "name": username.title()} for username in found]),
+            content_type=JSON,
+            match_querystring=True,
+        )
+
+    def expire(self, username):
+        key = get_cache_key(self.site_configuration, username)
+        entry = cache.get(key)
+        entry["fresh_until"] = 0
+        cache.set(key, entry)
+
+    @property
+    def api_calls(self):
+        return [call for call in responses.calls if call.request.method == "GET"]
+
+    @property
+    def accounts_calls(self):
+        # the verified name calls are concurrent, they may not be made yet if the accounts call failed
+        return [call for call in self.api_calls if "/accounts" in call.request.url]
+
+    @responses.activate
+    def test_fresh(self):
+        """Verify a cached profile is served without LMS calls."""
+        self.mock_user_api_responses("jdoe")
+        expected = {
+            "username": "jdoe",
+            "name": "Jon Doe",
+            "verified_name": "Jonathan Doe",
+            "use_verified_name_for_certs": True,
+        }
+
+        self.assertEqual(get_user_profile(self.site_configuration, "jdoe"), expected)
+        self.assertEqual(get_user_profile(self.site_configuration, "jdoe"), expected)
+        self.assertEqual(len(self.api_calls), 2)
+
+    @responses.activate
+    def test_stale(self):
+        """Verify a stale profile is served, and refreshed in background."""
+        self.mock_user_api_responses("jdoe")
+        get_user_profile(self.site_configuration, "jdoe")
+        self.expire("jdoe")
+        responses.replace(
+            responses.GET,
+            f"{self.site_configuration.user_api_url}accounts/jdoe",
+            body=json.dumps({"username": "jdoe", "name": "John Doe"}),
+            content_type=JSON,
+        )
+
+        self.assertEqual(get_user_profile(self.site_configuration, "jdoe")["name"], "Jon Doe")
+        self.assertEqual(len(self.api_calls), 4)
+        self.assertEqual(get_user_profile(self.site_configuration, "jdoe")["name"], "John Doe")
+        self.assertEqual(len(self.api_calls), 4)
+
+    @responses.activate
+    def test_stale_refresh_failure(self):
+        """Verify the stale profile is still served once its refresh failed, and the refresh isn't retried at once."""
+        self.mock_user_api_responses("jdoe")
+        get_user_profile(self.site_configuration, "jdoe")
+        self.expire("jdoe")
+        responses.replace(responses.GET, f"{self.site_configuration.user_api_url}accounts/jdoe", status=500)
+
+        self.assertEqual(get_user_profile(self.site_configuration, "jdoe")["name"], "Jon Doe")
+        self.assertEqual(get_user_profile(self.site_configuration, "jdoe")["name"], "Jon Doe")
+        self.assertEqual(len(self.accounts_calls), 2)
+
+    @responses.activate
+    def test_negative(self):
+        """Verify a failed lookup is cached."""
+        self.mock_user_api_responses("jdoe", status=404)
+
+        with self.assertRaises(HTTPError):
+            get_user_profile(self.site_configuration, "jdoe")
+        with self.assertRaises(UserProfileUnavailable):
+            get_user_profile(self.site_configuration, "jdoe")
+        self.assertEqual(len(self.accounts_calls), 1)
+
+    @responses.activate
+    @override_settings(USER_CACHE_TTL=0)
+    def test_disabled(self):
+        self.mock_user_api_responses("jdoe")
+        get_user_profile(self.site_configuration, "jdoe")
+        get_user_profile(self.site_configuration, "jdoe")
+        self.assertEqual(len(self.api_calls), 4)
+
+    @responses.activate
+    def test_warm(self):
+        """Verify the profiles are warmed with one accounts call, and cached or missing ones are skipped."""
+        self.mock_user_api_responses("cached")
+        get_user_profile(self.site_configuration, "cached")
+        self.mock_accounts_response(["alice", "bob", "unknown"], found=["alice", "bob"])
+        for username in ("alice", "bob", "unknown"):
+            responses.add(
+                responses.GET,
+                f"{self.site_configuration.name_verification_api_url}?username={username}",
+                status=404,
+            )
+
+        self.assertEqual(warm_user_profiles(self.site_configuration, ["bob", "alice", "unknown", "cached", "bob"]), 2)
+        self.assertEqual(len(self.accounts_calls), 2)  # the cached profile's one, then the bulk one
+
+        responses.reset()
+        self.assertEqual(get_user_profile(self.site_configuration, "alice"), {"username": "alice", "name": "Alice"})
+        self.assertEqual(get_user_profile(self.site_configuration, "bob")["name"], "Bob")
+        with self.assertRaises(UserProfileUnavailable):
+            get_user_profile(self.site_configuration, "unknown")
+        self.assertEqual(len(responses.calls), 0)
+
+    @responses.activate
+    def test_warm_batches(self):
+        self.mock_accounts_response(["alice", "bob"])
+        self.mock_accounts_response(["carol"])
+        responses.add(responses.GET, self.site_configuration.name_verification_api_url, status=404)
+
+        self.assertEqual(warm_user_profiles(self.site_configuration, ["alice", "bob", "carol"], batch_size=2), 3)
+        self.assertEqual(len(self.accounts_calls), 2)
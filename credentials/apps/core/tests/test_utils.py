@@ -2,10 +2,16 @@
 
 from unittest import mock
 
+from django.core.cache import cache
 from django.test import TestCase
 
 from credentials.apps.core.tests.factories import UserFactory
-from credentials.apps.core.utils import update_full_name
+from credentials.apps.core.utils import (
+    bump_cache_versions,
+    get_cache_version,
+    get_cache_versions,
+    update_full_name,
+)
 
 
 class UtilsTests(TestCase):
@@ -28,3 +34,29 @@ class UtilsTests(TestCase):
         update_full_name(strategy, {"full_name": "Bort"}, self.user)
         self.assertEqual(self.user.full_name, "Bort")
         self.assertTrue(strategy.storage.user.changed.called)
+
+
+class CacheVersionsTests(TestCase):
+    """Tests for the cached version tokens."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_get_cache_version(self):
+        version = get_cache_version("test.version")
+        self.assertIsNotNone(version)
+        self.assertEqual(get_cache_version("test.version"), version)
+        self.assertEqual(get_cache_versions(["test.version"]), {"test.version": version})
+
+    def test_bump_cache_versions(self):
+        versions = get_cache_versions(["test.version.1", "test.version.2"])
+        bump_cache_versions("test.version.1")
+        self.assertNotEqual(get_cache_version("test.version.1"), versions["test.version.1"])
+        self.assertEqual(get_cache_version("test.version.2"), versions["test.version.2"])
+
+    def test_evicted_cache_version(self):
+        version = get_cache_version("test.version")
+        cache.delete("test.version")
+        self.assertNotEqual(get_cache_version("test.version"), version)
@@ -0,0 +1,209 @@
+"""
+Cache of the learners' profiles (User API account and verified name), as used to render certificates.
+
+Profiles are cached with stale-while-revalidate semantics:
+
+- for `USER_CACHE_TTL` seconds, a cached profile is fresh and served as is;
+- for `USER_CACHE_STALE_TTL` more seconds, it's stale: it's still served right away, while a refresh is fetched in
+  background (one at a time for a profile);
+- after that, it's gone and fetched again synchronously.
+
+Failed lookups are cached too, for `USER_CACHE_NEGATIVE_TTL` seconds, so that a learner whose lookup fails doesn't
+cost LMS calls on every view. A profile's accounts and verified name lookups are made concurrently, and profiles can be
+warmed in bulk, with one accounts call for many learners (see `warm_user_profiles`). `USER_PROFILE_CHANGED` is sent
+when a refreshed profile differs from the cached one.
+"""
+
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.dispatch import Signal
+from edx_django_utils.monitoring import set_custom_attribute
+
+
+logger = logging.getLogger(__name__)
+
+# The number of usernames looked up by one accounts call while warming profiles (the usernames are in the URL).
+WARM_BATCH_SIZE = 100
+
+# Sent when a cached profile is refreshed (or warmed) with different data, with:
+#   - site_configuration: the learner's SiteConfiguration;
+#   - username: the learner's username.
+USER_PROFILE_CHANGED = Signal()
+
+_fetch_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="user-profiles-fetch")
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="user-profiles-refresh")
+
+
+class UserProfileUnavailable(requests.exceptions.RequestException):
+    """
+    The learner's profile lookup recently failed (and is not retried until the negative cache entry expires).
+    """
+
+
+def get_cache_key(site_configuration, username):
+    return "user.api.data.{}.{}".format(site_configuration.site_id, hashlib.md5(username.encode("utf8")).hexdigest())
+
+
+def _fresh_entry(user_data):
+    return {"data": user_data, "fresh_until": time.time() + settings.USER_CACHE_TTL}
+
+
+def _negative_entry(error):
+    return {"data": None, "error": str(error)}
+
+
+def _cache_entries(entries):
+    """
+    Caches profile entries (by cache key), for their fresh and stale periods or, if failed lookups, their negative one.
+    """
+    profiles = {key: entry for key, entry in entries.items() if entry["data"] is not None}
+    failures = {key: entry for key, entry in entries.items() if entry["data"] is None}
+    if profiles:
+        cache.set_many(profiles, settings.USER_CACHE_TTL + settings.USER_CACHE_STALE_TTL)
+    if failures and settings.USER_CACHE_NEGATIVE_TTL > 0:
+        cache.set_many(failures, settings.USER_CACHE_NEGATIVE_TTL)
+
+
+def _get_verified_name_data(site_configuration, username):
+    verification_url = urljoin(site_configuration.name_verification_api_url, f"?username={username}")
+    verification_response = site_configuration.api_client.get(verification_url)
+    if verification_response.status_code != 200:
+        return {}
+    verification_data = verification_response.json()
+    return {
+        "verified_name": verification_data.get("verified_name"),
+        "use_verified_name_for_certs": verification_data.get("use_verified_name_for_certs"),
+    }
+
+
+def fetch_user_profile(site_configuration, username):
+    """
+    Retrieves the learner's profile from the User API and Verified Name API (concurrently).
+
+    Raises:
+        requests.exceptions.RequestException: the User API call failed
+    """
+    verification = _fetch_executor.submit(_get_verified_name_data, site_configuration, username)
+
+    user_url = urljoin(site_configuration.user_api_url, f"accounts/{username}")
+    user_response = site_configuration.api_client.get(user_url)
+    user_response.raise_for_status()
+    user_data = user_response.json()
+
+    user_data.update(verification.result())
+    return user_data
+
+
+def _refresh_user_profile(site_configuration, username, stale_data):
+    key = get_cache_key(site_configuration, username)
+    try:
+        user_data = fetch_user_profile(site_configuration, username)
+    except requests.exceptions.RequestException as exc:
+        # the stale profile keeps being served, the refresh lock (not released) throttles the retries
+        logger.warning("Failed to refresh the profile of user [%s]: %s", username, exc)
+        return
+    _cache_entries({key: _fresh_entry(user_data)})
+    cache.delete(f"{key}.refreshing")
+    if user_data != stale_data:
+        USER_PROFILE_CHANGED.send(sender=None, site_configuration=site_configuration, username=username)
+
+
+def _schedule_refresh(site_configuration, username, stale_data):
+    key = get_cache_key(site_configuration, username)
+    # only one refresh at a time for a profile, across processes
+    if cache.add(f"{key}.refreshing", True, max(settings.USER_CACHE_NEGATIVE_TTL, 1)):
+        _refresh_executor.submit(_refresh_user_profile, site_configuration, username, stale_data)
+
+
+def get_user_profile(site_configuration, username):
+    """
+    Returns the learner's profile, from the cache if possible.
+
+    Raises:
+        requests.exceptions.RequestException: the profile can't be retrieved (`UserProfileUnavailable` if the lookup
+            failed recently)
+    """
+    if settings.USER_CACHE_TTL <= 0:
+        return fetch_user_profile(site_configuration, username)
+
+    key = get_cache_key(site_configuration, username)
+    entry = cache.get(key)
+
+    if entry is not None:
+        if entry["data"] is None:
+            set_custom_attribute("user_profile_cache", "negative")
+            raise UserProfileUnavailable(entry["error"])
+        if entry["fresh_until"] > time.time():
+            set_custom_attribute("user_profile_cache", "hit")
+        else:
+            set_custom_attribute("user_profile_cache", "stale")
+            _schedule_refresh(site_configuration, username, entry["data"])
+        return entry["data"]
+
+    set_custom_attribute("user_profile_cache", "miss")
+    try:
+        user_data = fetch_user_profile(site_configuration, username)
+    except requests.exceptions.RequestException as exc:
+        _cache_entries({key: _negative_entry(exc)})
+        raise
+    _cache_entries({key: _fresh_entry(user_data)})
+    return user_data
+
+
+def warm_user_profiles(site_configuration, usernames, batch_size=WARM_BATCH_SIZE):
+    """
+    Caches the profiles of the learners which are not cached or stale.
+
+    The User API accounts are retrieved with one call per `batch_size` usernames (and the verified names
+    concurrently). Learners missing from the response are negatively cached.
+
+    Returns:
+        int: the number of profiles retrieved
+    """
+    keys = {get_cache_key(site_configuration, username): username for username in set(usernames)}
+    now = time.time()
+    cached = cache.get_many(keys)
+    usernames = sorted(
+        username
+        for key, username in keys.items()
+        if key not in cached or (cached[key]["data"] is not None and cached[key]["fresh_until"] <= now)
+    )
+
+    warmed = 0
+    for start in range(0, len(usernames), batch_size):
+        batch = usernames[start : start + batch_size]
+        verifications = {
+            username: _fetch_executor.submit(_get_verified_name_data, site_configuration, username)
+            for username in batch
+        }
+
+        user_url = urljoin(site_configuration.user_api_url, "accounts?username={}".format(",".join(batch)))
+        user_response = site_configuration.api_client.get(user_url)
+        user_response.raise_for_status()
+        accounts = {account["username"]: account for account in user_response.json()}
+
+        entries = {}
+        changed = []
+        for username in batch:
+            key = get_cache_key(site_configuration, username)
+            verification_data = verifications[username].result()
+            if username in accounts:
+                entries[key] = _fresh_entry({**accounts[username], **verification_data})
+                if key in cached and cached[key]["data"] != entries[key]["data"]:
+                    changed.append(username)
+            else:
+                entries[key] = _negative_entry(f"No account found for user [{username}].")
+        _cache_entries(entries)
+        warmed += len(accounts)
+
+        for username in changed:
+            USER_PROFILE_CHANGED.send(sender=None, site_configuration=site_configuration, username=username)
+
+    return warmed
@@ -1,5 +1,9 @@
 """Core utils."""
 
+import uuid
+
+from django.core.cache import cache
+
 
 # This function is used by our oauth2 authorization pipeline. See settings/base.py
 def update_full_name(strategy, details, user=None, *_args, **_kwargs):  # pylint: disable=keyword-arg-before-vararg
@@ -26,3 +30,27 @@ def _choices(*values):
     Helper for use with model field 'choices'.
     """
     return [(value,) * 2 for value in values]
+
+
+def get_cache_versions(keys):
+    """
+    Returns the version tokens stored in the cache under the given keys, creating the missing ones.
+
+    A version token is shared by all processes: whatever a process caches along with a version becomes stale once
+    the token is replaced (see `bump_cache_versions`), or evicted.
+    """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return versions
+
+
+def get_cache_version(key):
+    return get_cache_versions([key])[key]
+
+
+def bump_cache_versions(*keys):
+    if keys:
+        cache.set_many({key: uuid.uuid4().hex for key in keys}, None)
@@ -184,6 +184,30 @@ def get_user_credentials_by_id(request_username, status, program_uuid):
     return user_credentials
 
 
+def get_course_user_credentials_by_certificate_ids(usernames, course_certificate_ids):
+    """
+    Get the visible user credentials (of any status) of several learners for the given course certificates
+
+    Arguments:
+        usernames(list): Usernames for whom we are getting UserCredential objects for
+        course_certificate_ids(list): IDs of the CourseCertificates the UserCredential objects are for
+
+    Returns:
+        list(UserCredential): The UserCredential objects associated with given filters, ordered by ID
+    """
+    return (
+        filter_visible(
+            _UserCredential.objects.filter(
+                username__in=usernames,
+                credential_content_type=ContentType.objects.get_for_model(_CourseCertificate),
+                credential_id__in=course_certificate_ids,
+            )
+        )
+        .distinct()
+        .order_by("id")
+    )
+
+
 def get_user_credentials_by_content_type(request_username, course_cert_content_types, status):
     """
     Get user credentials by given filters
@@ -215,19 +239,21 @@ def get_user_credentials_by_content_type(request_username, course_cert_content_t
     return user_credentials.distinct()
 
 
-def get_credential_dates(user_credentials, many):
+def get_credential_dates(user_credentials, many, use_date_override=False):
     """
     Get visible credential dates or single date depending on 'many' arugment
 
     Arguments:
         user_credentials(list): List of user credential(s)
         many(bool): Determines whether to look for dates of many credentials or just a single one
+        use_date_override(bool): Whether date overrides apply when looking up many credentials. A single credential
+            lookup always applies its date override.
 
     Returns:
         dict(DateTime): Returns a dictionary of DateTimes keyed by UserCredential
     """
     if many:
-        return get_credential_visible_dates(user_credentials)
+        return get_credential_visible_dates(user_credentials, use_date_override=use_date_override)
     else:
         return get_credential_visible_date(user_credentials, use_date_override=True)
 
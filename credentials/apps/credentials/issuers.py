@@ -82,6 +82,7 @@ class AbstractCredentialIssuer(metaclass=abc.ABCMeta):
             credential_id=credential.id,
             defaults={
                 "status": status,
+                "site_id": credential.site_id,
             },
         )
 
@@ -178,6 +179,7 @@ class ProgramCertificateIssuer(AbstractCredentialIssuer):
             credential_id=credential.id,
             defaults={
                 "status": status,
+                "site_id": credential.site_id,
             },
         )
 
@@ -0,0 +1,67 @@
+"""
+Django management command to set the denormalized site of the existing user credentials.
+"""
+
+import logging
+import time
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+
+from credentials.apps.credentials.models import UserCredential
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Set the site of the user credentials which don't have one yet, from their credential configuration. "
+        "Credentials are updated in chunks (with one query per credential type), ordered by id, so the command can be "
+        "interrupted and run again. Enable the `api.use_user_credential_site` switch once it's done."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk_size", type=int, default=10000, help="Number of credentials to update at a time. Default 10000"
+        )
+        parser.add_argument(
+            "--pause_secs", type=float, default=0, help="Number of seconds to pause between chunks. Default 0"
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        pause = options["pause_secs"]
+
+        content_types = {
+            content_type_id: ContentType.objects.get_for_id(content_type_id).model_class()
+            for content_type_id in UserCredential.objects.filter(site__isnull=True)
+            .values_list("credential_content_type", flat=True)
+            .distinct()
+        }
+
+        last_id = 0
+        processed = 0
+        while True:
+            ids = list(
+                UserCredential.objects.filter(site__isnull=True, id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+
+            for content_type_id, model in content_types.items():
+                if model is None:
+                    continue
+                processed += UserCredential.objects.filter(
+                    id__in=ids, credential_content_type=content_type_id, site__isnull=True
+                ).update(site=Subquery(model.objects.filter(pk=OuterRef("credential_id")).values("site")[:1]))
+
+            last_id = ids[-1]
+            logger.info(f"Processed {processed} user credentials (up to id {last_id})")
+            if pause:
+                time.sleep(pause)
+
+        logger.info(f"backfill_user_credential_sites finished, processed {processed} user credentials")
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any
 
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
 from credentials.apps.credentials.models import RevokeCertificatesConfig, UserCredential
 
@@ -139,7 +140,8 @@ class Command(BaseCommand):
         if not user_creds_to_revoke:
             raise CommandError("No active certificates match the given criteria")
 
-        # as a manually input list, this should be small enough to do in a single bulk_update
+        # as a manually input list, this should be small enough to save the credentials one by one (rather than with
+        # a bulk_update), so that the receivers of their changes (e.g. the record snapshots) are notified
         for user_cred in user_creds_to_revoke:
             if verbosity:
                 # It's not worth doing an extra query to annotate the verbose logging message with
@@ -148,6 +150,8 @@ class Command(BaseCommand):
                 logger.info(f"Revoking UserCredential {user_cred.id} ({credential_type} {credential_id})")
             user_cred.status = UserCredential.REVOKED
         if not dry_run:
-            user_creds_to_revoke.bulk_update(user_creds_to_revoke, ["status"])
+            with transaction.atomic():
+                for user_cred in user_creds_to_revoke:
+                    user_cred.save(update_fields=["status", "modified"])
 
         logger.info("Done revoking certificates")
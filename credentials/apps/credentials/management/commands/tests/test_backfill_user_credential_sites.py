@@ -0,0 +1,32 @@
+"""
+Tests for the backfill_user_credential_sites management command
+"""
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from credentials.apps.credentials.models import UserCredential
+from credentials.apps.credentials.tests.factories import CourseCertificateFactory, UserCredentialFactory
+
+
+class BackfillUserCredentialSitesTests(TestCase):
+    def test_backfill(self):
+        program_credentials = UserCredentialFactory.create_batch(3)
+        course_credentials = UserCredentialFactory.create_batch(2, credential=CourseCertificateFactory())
+        dangling = UserCredentialFactory()
+        UserCredential.objects.filter(pk=dangling.pk).update(credential_id=999999)
+        UserCredential.objects.update(site=None)
+
+        call_command("backfill_user_credential_sites", chunk_size=2)
+
+        for user_credential in program_credentials + course_credentials:
+            user_credential.refresh_from_db()
+            self.assertIsNotNone(user_credential.site_id)
+            self.assertEqual(user_credential.site_id, user_credential.credential.site_id)
+        dangling.refresh_from_db()
+        self.assertIsNone(dangling.site_id)
+
+    def test_nothing_to_backfill(self):
+        UserCredentialFactory()
+        with self.assertNumQueries(2):
+            call_command("backfill_user_credential_sites")
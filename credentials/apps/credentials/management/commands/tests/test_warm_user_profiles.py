@@ -0,0 +1,50 @@
+"""
+Tests for the warm_user_profiles management command
+"""
+
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from credentials.apps.core.tests.mixins import SiteMixin
+from credentials.apps.credentials.models import UserCredential
+from credentials.apps.credentials.tests.factories import (
+    CourseCertificateFactory,
+    ProgramCertificateFactory,
+    UserCredentialFactory,
+)
+
+
+COMMAND = "credentials.apps.credentials.management.commands.warm_user_profiles"
+
+
+class WarmUserProfilesTests(SiteMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        program_certificate = ProgramCertificateFactory(site=self.site)
+        UserCredentialFactory(username="alice", credential=program_certificate)
+        UserCredentialFactory(username="bob", credential=program_certificate)
+        UserCredentialFactory(username="carol", credential=program_certificate, status=UserCredential.REVOKED)
+        UserCredentialFactory(username="dave", credential=CourseCertificateFactory(site=self.site))
+        UserCredentialFactory(username="erin", credential=ProgramCertificateFactory())
+
+    def test_program_certificate_holders(self):
+        with mock.patch(f"{COMMAND}.warm_user_profiles", return_value=2) as warm_user_profiles:
+            call_command("warm_user_profiles", site_domain=self.site.domain, batch_size=10)
+
+        site_configuration, usernames = warm_user_profiles.call_args.args
+        self.assertEqual(site_configuration, self.site_configuration)
+        self.assertEqual(sorted(usernames), ["alice", "bob"])
+        self.assertEqual(warm_user_profiles.call_args.kwargs, {"batch_size": 10})
+
+    def test_usernames(self):
+        with mock.patch(f"{COMMAND}.warm_user_profiles", return_value=1) as warm_user_profiles:
+            call_command("warm_user_profiles", "--usernames", "zed", site_domain=self.site.domain)
+
+        self.assertEqual(warm_user_profiles.call_args.args[1], ["zed"])
+
+    def test_site_not_found(self):
+        with self.assertRaisesRegex(CommandError, "not found"):
+            call_command("warm_user_profiles", site_domain="unknown.example.com")
@@ -0,0 +1,54 @@
+"""
+Django management command to warm the cache of the profiles of the learners holding program certificates.
+"""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from credentials.apps.core.models import SiteConfiguration
+from credentials.apps.core.user_profiles import WARM_BATCH_SIZE, warm_user_profiles
+from credentials.apps.credentials.models import UserCredential
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Cache the profiles (User API account and verified name) of the learners holding awarded program certificates "
+        "of a site, so that rendering their certificates doesn't call the LMS. Profiles which are cached and fresh are "
+        "skipped, the others are retrieved with one accounts call per batch of learners."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--site_domain", required=True, help="Domain of the site to warm the profiles of")
+        parser.add_argument(
+            "--usernames", default=None, nargs="+", help="Learners to warm the profiles of. Default all of them"
+        )
+        parser.add_argument(
+            "--batch_size",
+            type=int,
+            default=WARM_BATCH_SIZE,
+            help=f"Number of learners looked up by one accounts call. Default {WARM_BATCH_SIZE}",
+        )
+
+    def handle(self, *args, **options):
+        site_configuration = (
+            SiteConfiguration.objects.select_related("site").filter(site__domain=options["site_domain"]).first()
+        )
+        if site_configuration is None:
+            raise CommandError(f"Site [{options['site_domain']}] not found")
+
+        usernames = options["usernames"]
+        if usernames is None:
+            usernames = (
+                UserCredential.objects.filter(
+                    status=UserCredential.AWARDED, program_credentials__site=site_configuration.site
+                )
+                .values_list("username", flat=True)
+                .distinct()
+            )
+
+        warmed = warm_user_profiles(site_configuration, list(usernames), batch_size=options["batch_size"])
+        logger.info(f"Warmed {warmed} user profiles of site [{site_configuration.site.domain}]")
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.19 on 2026-10-18 19:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sites", "0002_alter_domain_unique"),
+        ("credentials", "0031_usercredential_explicit_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usercredential",
+            name="site",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="sites.site",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="usercredential",
+            index=models.Index(fields=["site", "username", "status"], name="usercredential_site_username"),
+        ),
+        migrations.AddIndex(
+            model_name="usercredential",
+            index=models.Index(
+                fields=["site", "credential_content_type", "credential_id"], name="usercredential_site_credential"
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.19 on 2026-10-18 20:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("credentials", "0032_usercredential_site"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="usercredential",
+            index=models.Index(fields=["site", "modified", "id"], name="usercredential_site_modified"),
+        ),
+    ]
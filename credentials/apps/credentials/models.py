@@ -81,6 +81,14 @@ class AbstractCredential(TimeStampedModel):
     class Meta:
         abstract = True
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Keep the denormalized site of the credentials issued with this configuration in sync.
+        if self.pk:
+            UserCredential.objects.filter(
+                credential_content_type=ContentType.objects.get_for_model(self), credential_id=self.pk
+            ).exclude(site_id=self.site_id).update(site_id=self.site_id)
+
 
 class Signatory(TimeStampedModel):
     """
@@ -185,9 +193,39 @@ class UserCredential(TimeStampedModel):
         max_length=255, blank=True, null=True, help_text=_("URL at which the credential can be downloaded")
     )
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    # Denormalized site of the credential configuration (see `save`), so that the credentials of a site are filtered
+    # without joining every credential configuration table. Indexed by the composite indexes below.
+    site = models.ForeignKey(
+        Site, null=True, blank=True, editable=False, db_index=False, on_delete=models.SET_NULL, related_name="+"
+    )
 
     class Meta:
         unique_together = (("username", "credential_content_type", "credential_id"),)
+        indexes = [
+            models.Index(fields=["site", "username", "status"], name="usercredential_site_username"),
+            models.Index(
+                fields=["site", "credential_content_type", "credential_id"], name="usercredential_site_credential"
+            ),
+            # Cursor pages of the v2 API, ordered by (modified, id).
+            models.Index(fields=["site", "modified", "id"], name="usercredential_site_modified"),
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The credential the site was set from. Read from the instance dict, so that deferred fields aren't loaded.
+        self._site_credential = (self.__dict__.get("credential_content_type_id"), self.__dict__.get("credential_id"))
+
+    def save(self, *args, **kwargs):
+        """Sets the denormalized site from the credential configuration, if it's not set or the credential changed."""
+        credential = (self.credential_content_type_id, self.credential_id)
+        if self.site_id is None or credential != self._site_credential:
+            site = getattr(self.credential, "site", None)
+            if getattr(site, "pk", None) != self.site_id:
+                self.site = site
+                if kwargs.get("update_fields") is not None:
+                    kwargs["update_fields"] = {*kwargs["update_fields"], "site"}
+        super().save(*args, **kwargs)
+        self._site_credential = credential
 
     def get_absolute_url(self):
         return reverse("credentials:render", kwargs={"uuid": self.uuid.hex})
@@ -0,0 +1,83 @@
+"""
+Full-page cache of the rendered (public) certificate pages.
+
+Certificate pages are shared on social networks, so their crawlers (and employers) may request a page many times in a
+row. Anonymous requests of a page are served from a cache of its rendered HTML, by credential UUID, language and site,
+for `RENDER_CREDENTIAL_CACHE_TTL` seconds, without database queries or LMS calls.
+
+A cached page records the versions of the data it was rendered from (its dependencies): the user credential, the
+program (catalog data and certificate configuration), the site configuration and the learner's profile. Changing
+one of them stores a new version (see `invalidate`, called by the `credentials` app signal receivers), so that the
+pages rendered from the previous one are no longer served. Versions are kept in the cache: a dependency whose
+version got evicted invalidates its pages too.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from credentials.apps.core.utils import bump_cache_versions, get_cache_versions
+
+
+KEY_PREFIX = "credentials.render"
+
+
+def credential_dependency(credential_uuid):
+    return f"{KEY_PREFIX}.version.credential.{credential_uuid}"
+
+
+def program_dependency(program_uuid):
+    return f"{KEY_PREFIX}.version.program.{program_uuid}"
+
+
+def site_dependency(site_id):
+    return f"{KEY_PREFIX}.version.site.{site_id}"
+
+
+def user_dependency(username):
+    return f"{KEY_PREFIX}.version.user.{hashlib.md5(username.encode('utf8')).hexdigest()}"
+
+
+def get_page_key(credential_uuid, language, site_id):
+    return f"{KEY_PREFIX}.page.{site_id}.{credential_uuid}.{language}"
+
+
+def invalidate(*dependencies):
+    """
+    Stores new versions of the given dependencies, so that the pages rendered from them are no longer served.
+    """
+    bump_cache_versions(*dependencies)
+
+
+def get_versions(dependencies):
+    """
+    Returns the current versions of the given dependencies (creating the missing ones).
+
+    To be called before reading the data a page is rendered from, so that a change made while it's rendered
+    invalidates it.
+    """
+    return get_cache_versions(dependencies)
+
+
+def get_page(credential_uuid, language, site_id):
+    """
+    Returns the cached page (a dict with its `content` and `etag`), if any and its dependencies didn't change.
+    """
+    page = cache.get(get_page_key(credential_uuid, language, site_id))
+    if page is None or cache.get_many(page["versions"]) != page["versions"]:
+        return None
+    return page
+
+
+def set_page(credential_uuid, language, site_id, content, versions):
+    """
+    Caches a rendered page, along with the versions of its dependencies (see `get_versions`).
+
+    Returns:
+        str: the page's ETag
+    """
+    etag = hashlib.md5(content).hexdigest()
+    page = {"content": content, "etag": etag, "versions": versions}
+    cache.set(get_page_key(credential_uuid, language, site_id), page, settings.RENDER_CREDENTIAL_CACHE_TTL)
+    return etag
@@ -4,13 +4,28 @@ Signal receivers for the `credentials` Django app.
 
 import logging
 
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.sites.models import Site
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from openedx_events.learning.data import CertificateData
 from openedx_events.learning.signals import CERTIFICATE_CREATED, CERTIFICATE_REVOKED
 
+from credentials.apps.catalog.models import CourseRun, Organization, Program
+from credentials.apps.catalog.signals import CATALOG_PROGRAMS_CHANGED
 from credentials.apps.core.api import get_or_create_user_from_event_data
+from credentials.apps.core.models import SiteConfiguration
+from credentials.apps.core.user_profiles import USER_PROFILE_CHANGED
+from credentials.apps.credentials import render_cache
 from credentials.apps.credentials.api import process_course_credential_update
 from credentials.apps.credentials.constants import UserCredentialStatus
+from credentials.apps.credentials.models import (
+    CourseCertificate,
+    ProgramCertificate,
+    Signatory,
+    UserCredential,
+    UserCredentialDateOverride,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -49,3 +64,121 @@ def process_course_credential_event(sender, **kwargs):  # pylint: disable=unused
             f"Unable to process the `{event_type}` event with UUID {kwargs['metadata'].id}: could not retrieve or "
             f"create a user with LMS user id [{certificate_data.user.id}]"
         )
+
+
+def _invalidate_program_pages(**program_filters):
+    program_uuids = Program.objects.filter(**program_filters).values_list("uuid", flat=True).distinct()
+    render_cache.invalidate(*(render_cache.program_dependency(program_uuid) for program_uuid in program_uuids))
+
+
+@receiver(post_save, sender=UserCredential)
+@receiver(post_delete, sender=UserCredential)
+def invalidate_user_credential_pages(instance, **kwargs):
+    dependencies = [render_cache.credential_dependency(instance.uuid)]
+    if instance.credential_content_type_id == ContentType.objects.get_for_model(CourseCertificate).id:
+        # The visible date of a program credential is the latest date of the learner's course credentials in it.
+        program_credential_uuids = UserCredential.objects.filter(
+            username=instance.username,
+            program_credentials__program__course_runs__coursecertificate__id=instance.credential_id,
+        ).values_list("uuid", flat=True)
+        dependencies += [
+            render_cache.credential_dependency(credential_uuid) for credential_uuid in program_credential_uuids
+        ]
+    render_cache.invalidate(*dependencies)
+
+
+@receiver(post_save, sender=UserCredentialDateOverride)
+@receiver(post_delete, sender=UserCredentialDateOverride)
+def invalidate_date_override_pages(instance, **kwargs):
+    try:
+        user_credential = instance.user_credential
+    except UserCredential.DoesNotExist:
+        # The credential is being deleted along with its override, and its own receiver takes care of it.
+        return
+    render_cache.invalidate(render_cache.credential_dependency(user_credential.uuid))
+
+
+@receiver(post_save, sender=ProgramCertificate)
+def invalidate_program_certificate_pages(instance, **kwargs):
+    render_cache.invalidate(render_cache.program_dependency(instance.program_uuid))
+
+
+@receiver(m2m_changed, sender=ProgramCertificate.signatories.through)
+def invalidate_program_certificate_signatories_pages(sender, instance, action, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if isinstance(instance, ProgramCertificate):
+        program_uuids = [instance.program_uuid]
+    else:
+        program_uuids = ProgramCertificate.objects.filter(
+            pk__in=pk_set if pk_set else sender.objects.filter(signatory=instance).values("programcertificate")
+        ).values_list("program_uuid", flat=True)
+    render_cache.invalidate(*(render_cache.program_dependency(program_uuid) for program_uuid in program_uuids))
+
+
+@receiver(post_save, sender=Signatory)
+def invalidate_signatory_pages(instance, **kwargs):
+    program_uuids = ProgramCertificate.objects.filter(signatories=instance).values_list("program_uuid", flat=True)
+    render_cache.invalidate(*(render_cache.program_dependency(program_uuid) for program_uuid in program_uuids))
+
+
+@receiver(post_save, sender=CourseCertificate)
+def invalidate_course_certificate_pages(instance, **kwargs):
+    # The certificate_available_date decides the visible dates of the program certificates.
+    if instance.course_run_id:
+        _invalidate_program_pages(course_runs=instance.course_run_id)
+
+
+@receiver(post_save, sender=Program)
+def invalidate_program_pages(instance, **kwargs):
+    render_cache.invalidate(render_cache.program_dependency(instance.uuid))
+
+
+@receiver(post_save, sender=Organization)
+def invalidate_organization_pages(instance, **kwargs):
+    _invalidate_program_pages(authoring_organizations=instance)
+
+
+@receiver(post_save, sender=CourseRun)
+def invalidate_course_run_pages(instance, **kwargs):
+    _invalidate_program_pages(course_runs=instance)
+
+
+@receiver(m2m_changed, sender=Program.course_runs.through)
+@receiver(m2m_changed, sender=Program.authoring_organizations.through)
+def invalidate_program_membership_pages(sender, instance, action, pk_set, **kwargs):
+    """Invalidates the pages of the programs whose course runs or organizations changed."""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if isinstance(instance, Program):
+        render_cache.invalidate(render_cache.program_dependency(instance.uuid))
+    elif pk_set:
+        # Seen from the course run or organization side, `pk_set` holds the ids of the programs.
+        _invalidate_program_pages(pk__in=pk_set)
+    else:
+        # A clear from the course run or organization side; look the programs up before they are unlinked.
+        _invalidate_program_pages(
+            pk__in=sender.objects.filter(**{instance._meta.model_name: instance.pk}).values("program")
+        )
+
+
+@receiver(CATALOG_PROGRAMS_CHANGED)
+def invalidate_catalog_programs_pages(program_ids, **kwargs):
+    """Invalidates the pages of the programs changed by a bulk catalog sync (which sends no model signals)."""
+    _invalidate_program_pages(pk__in=program_ids)
+
+
+@receiver(post_save, sender=SiteConfiguration)
+@receiver(post_delete, sender=SiteConfiguration)
+@receiver(post_save, sender=Site)
+def invalidate_site_pages(sender, instance, **kwargs):
+    render_cache.invalidate(
+        render_cache.site_dependency(instance.site_id if sender is SiteConfiguration else instance.pk)
+    )
+
+
+@receiver(USER_PROFILE_CHANGED)
+def invalidate_user_profile_pages(username, **kwargs):
+    render_cache.invalidate(render_cache.user_dependency(username))
@@ -474,8 +474,7 @@ class ProcessCourseCredentialUpdateTests(SiteMixin, TestCase):
         assert credential.username == self.user.username
         assert credential.credential_id == course_cert_config.id
         assert credential.status == "awarded"
-        # 22 is the content type for "Course Certificate"
-        assert credential.credential_content_type_id == 22
+        assert credential.credential_content_type_id == ContentType.objects.get_for_model(CourseCertificate).id
 
     def test_revoke_course_credential(self):
         """
@@ -498,8 +497,7 @@ class ProcessCourseCredentialUpdateTests(SiteMixin, TestCase):
         assert credential.username == self.user.username
         assert credential.credential_id == course_cert_config.id
         assert credential.status == "revoked"
-        # 22 is the content type for "Course Certificate"
-        assert credential.credential_content_type_id == 22
+        assert credential.credential_content_type_id == ContentType.objects.get_for_model(CourseCertificate).id
 
     def test_update_existing_cert(self):
         """
@@ -565,8 +563,7 @@ class ProcessCourseCredentialUpdateTests(SiteMixin, TestCase):
         assert credential.username == self.user.username
         assert credential.credential_id == course_cert_config.id
         assert credential.status == "awarded"
-        # 22 is the content type for "Course Certificate"
-        assert credential.credential_content_type_id == 22
+        assert credential.credential_content_type_id == ContentType.objects.get_for_model(CourseCertificate).id
 
     def test_award_course_cert_no_course_certificate_exception_occurs(self):
         """
@@ -8,12 +8,15 @@ import ddt
 from django.core.exceptions import ValidationError
 from django.core.files.images import ImageFile
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.template.defaultfilters import slugify
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from opaque_keys.edx.locator import CourseLocator
 
 from credentials.apps.catalog.data import OrganizationDetails, ProgramDetails
 from credentials.apps.catalog.tests.factories import CourseRunFactory
+from credentials.apps.core.tests.factories import SiteFactory
 from credentials.apps.core.tests.mixins import SiteMixin
 from credentials.apps.credentials import constants
 from credentials.apps.credentials.exceptions import NoMatchingProgramException
@@ -181,6 +184,63 @@ class UserCredentialTests(TestCase):
         self.assertEqual(credential.status, UserCredential.REVOKED)
 
 
+class UserCredentialSiteTests(TestCase):
+    """Tests the denormalized site of the user credentials."""
+
+    def test_site_on_create(self):
+        user_credential = UserCredentialFactory()
+        self.assertEqual(user_credential.site_id, user_credential.credential.site_id)
+
+    def test_site_on_credential_change(self):
+        user_credential = UserCredentialFactory()
+        other_certificate = ProgramCertificateFactory()
+        user_credential.credential = other_certificate
+        user_credential.save()
+
+        user_credential.refresh_from_db()
+        self.assertEqual(user_credential.site_id, other_certificate.site_id)
+
+    def test_site_with_update_fields(self):
+        user_credential = UserCredentialFactory()
+        UserCredential.objects.filter(pk=user_credential.pk).update(site=None)
+        user_credential = UserCredential.objects.get(pk=user_credential.pk)
+
+        user_credential.status = UserCredential.REVOKED
+        user_credential.save(update_fields=["status"])
+
+        user_credential.refresh_from_db()
+        self.assertEqual(user_credential.site_id, user_credential.credential.site_id)
+
+    def test_no_lookup_once_set(self):
+        user_credential = UserCredential.objects.get(pk=UserCredentialFactory().pk)
+        user_credential.status = UserCredential.REVOKED
+        with CaptureQueriesContext(connection) as captured:
+            user_credential.save()
+        self.assertFalse([query for query in captured if 'FROM "credentials_programcertificate"' in query["sql"]])
+
+    def test_deferred_fields(self):
+        """Verify the credentials load without their credential fields, which are only read when they are saved."""
+        user_credential = UserCredentialFactory()
+
+        with self.assertNumQueries(1):
+            user_credentials = list(UserCredential.objects.only("id", "uuid"))
+        self.assertEqual([credential.uuid for credential in user_credentials], [user_credential.uuid])
+
+        user_credentials[0].save()
+        user_credentials[0].refresh_from_db()
+        self.assertEqual(user_credentials[0].site_id, user_credential.credential.site_id)
+
+    def test_credential_site_change(self):
+        """Verify the credentials follow their configuration to another site."""
+        user_credential = UserCredentialFactory()
+        certificate = user_credential.credential
+        certificate.site = SiteFactory()
+        certificate.save()
+
+        user_credential.refresh_from_db()
+        self.assertEqual(user_credential.site_id, certificate.site_id)
+
+
 @ddt.ddt
 class ProgramCompletionEmailConfigurationTests(TestCase):
     def setUp(self):
@@ -1,20 +1,38 @@
+import datetime
 import textwrap
 from unittest import mock
 
 import ddt
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
 from django.core import mail
 from django.test import TestCase, override_settings
 from slugify import slugify
 from testfixtures import LogCapture
 
 from credentials.apps.catalog.data import ProgramStatus
-from credentials.apps.catalog.tests.factories import ProgramFactory
+from credentials.apps.catalog.tests.factories import CourseRunFactory, ProgramFactory
 from credentials.apps.core.tests.factories import USER_PASSWORD, UserFactory
 from credentials.apps.core.tests.mixins import SiteMixin
-from credentials.apps.credentials.models import ProgramCompletionEmailConfiguration
-from credentials.apps.credentials.tests.factories import ProgramCertificateFactory
-from credentials.apps.credentials.utils import send_program_certificate_created_message, validate_duplicate_attributes
+from credentials.apps.credentials.models import (
+    CourseCertificate,
+    ProgramCertificate,
+    ProgramCompletionEmailConfiguration,
+    UserCredential,
+)
+from credentials.apps.credentials.tests.factories import (
+    CourseCertificateFactory,
+    ProgramCertificateFactory,
+    UserCredentialDateOverrideFactory,
+    UserCredentialFactory,
+)
+from credentials.apps.credentials.utils import (
+    annotate_program_certificate_visible_dates,
+    filter_visible,
+    get_credential_visible_dates,
+    send_program_certificate_created_message,
+    validate_duplicate_attributes,
+)
 
 
 User = get_user_model()
@@ -43,6 +61,134 @@ class CredentialsUtilsTests(TestCase):
         self.assertFalse(validate_duplicate_attributes(attributes))
 
 
+class VisibleDateTestMixin(SiteMixin):
+    """Builds learners' course and program credentials for the visible date tests."""
+
+    PAST = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    FUTURE = datetime.datetime(9999, 1, 1, tzinfo=datetime.timezone.utc)
+
+    def setUp(self):
+        super().setUp()
+        self.username = "test-user"
+
+    def _create_program_credential(self, certificate_available_dates):
+        """
+        Creates a program with one course run per given certificate_available_date, awards the learner a course
+        credential for each run and a program credential for the program.
+        """
+        course_runs = []
+        for certificate_available_date in certificate_available_dates:
+            course_run = CourseRunFactory(course__site=self.site)
+            course_certificate = CourseCertificateFactory(
+                course_id=course_run.key,
+                course_run=course_run,
+                site=self.site,
+                certificate_available_date=certificate_available_date,
+            )
+            UserCredentialFactory(username=self.username, credential=course_certificate)
+            course_runs.append(course_run)
+        program = ProgramFactory(site=self.site, course_runs=course_runs)
+        program_certificate = ProgramCertificateFactory(site=self.site, program=program)
+        return UserCredentialFactory(username=self.username, credential=program_certificate)
+
+
+@ddt.ddt
+class FilterVisibleTests(VisibleDateTestMixin, TestCase):
+    """Tests for credentials.utils.filter_visible and the program visible date annotation."""
+
+    def test_program_visible_date_is_latest_course_date(self):
+        program_credential = self._create_program_credential([self.PAST, self.FUTURE])
+        annotated = annotate_program_certificate_visible_dates(UserCredential.objects.filter(pk=program_credential.pk))
+        self.assertEqual(annotated.get().program_visible_date, self.FUTURE)
+
+    def test_program_visible_date_falls_back_to_created(self):
+        program_credential = self._create_program_credential([None])
+        course_credential = UserCredential.objects.get(username=self.username, course_credentials__isnull=False)
+        annotated = annotate_program_certificate_visible_dates(UserCredential.objects.filter(pk=program_credential.pk))
+        self.assertEqual(annotated.get().program_visible_date, course_credential.created)
+
+    def test_program_visible_date_ignores_other_learners(self):
+        program_credential = self._create_program_credential([None])
+        course_credential = UserCredential.objects.get(username=self.username, course_credentials__isnull=False)
+        other_course_credential = UserCredentialFactory(username="other-user", credential=course_credential.credential)
+        UserCredential.objects.filter(pk=other_course_credential.pk).update(created=self.FUTURE)
+
+        annotated = annotate_program_certificate_visible_dates(UserCredential.objects.filter(pk=program_credential.pk))
+        self.assertEqual(annotated.get().program_visible_date, course_credential.created)
+
+    def test_filter_visible(self):
+        visible_program_credential = self._create_program_credential([self.PAST])
+        hidden_program_credential = self._create_program_credential([self.PAST, self.FUTURE])
+
+        visible = filter_visible(UserCredential.objects.filter(username=self.username))
+
+        self.assertIn(visible_program_credential, visible)
+        self.assertNotIn(hidden_program_credential, visible)
+        self.assertEqual(
+            visible.filter(course_credentials__isnull=False).count(),
+            2,
+        )
+
+    @ddt.data(1, 5, 20)
+    def test_filter_visible_query_count(self, program_count):
+        """Verify the number of queries doesn't depend on the number of program credentials."""
+        for __ in range(program_count):
+            self._create_program_credential([self.PAST, self.PAST])
+
+        with self.assertNumQueries(1):
+            visible = list(filter_visible(UserCredential.objects.filter(username=self.username)))
+
+        self.assertEqual(len(visible), program_count * 3)
+
+
+@ddt.ddt
+class GetCredentialVisibleDatesTests(VisibleDateTestMixin, TestCase):
+    """Tests for credentials.utils.get_credential_visible_dates"""
+
+    OVERRIDE = datetime.datetime(2021, 5, 11, tzinfo=datetime.timezone.utc)
+
+    def setUp(self):
+        super().setUp()
+        # Content types are cached per process; warm the cache so it doesn't skew query counts.
+        ContentType.objects.get_for_models(CourseCertificate, ProgramCertificate)
+
+    @ddt.data(True, False)
+    def test_visible_dates(self, use_date_override):
+        program_credential = self._create_program_credential([self.PAST, None])
+        course_credentials = UserCredential.objects.filter(username=self.username, course_credentials__isnull=False)
+        dated_credential = course_credentials.get(course_credentials__certificate_available_date=self.PAST)
+        undated_credential = course_credentials.get(course_credentials__certificate_available_date__isnull=True)
+        UserCredentialDateOverrideFactory(user_credential=dated_credential, date=self.OVERRIDE)
+
+        visible_dates = get_credential_visible_dates(
+            UserCredential.objects.filter(username=self.username), use_date_override
+        )
+
+        self.assertEqual(visible_dates[dated_credential], self.OVERRIDE if use_date_override else self.PAST)
+        self.assertEqual(visible_dates[undated_credential], undated_credential.created)
+        self.assertEqual(visible_dates[program_credential], max(self.PAST, undated_credential.created))
+
+    def test_program_credential_without_course_credentials(self):
+        program_credential = UserCredentialFactory(
+            username=self.username, credential=ProgramCertificateFactory(site=self.site)
+        )
+        self.assertEqual(get_credential_visible_dates([program_credential]), {program_credential: None})
+
+    @ddt.data(1, 5, 20)
+    def test_visible_dates_query_count(self, program_count):
+        """Verify the number of queries doesn't depend on the number of credentials."""
+        for __ in range(program_count):
+            self._create_program_credential([self.PAST, None])
+        user_credentials = list(UserCredential.objects.filter(username=self.username))
+
+        # certificate available dates, date overrides and program visible dates
+        with self.assertNumQueries(3):
+            visible_dates = get_credential_visible_dates(user_credentials, use_date_override=True)
+
+        self.assertEqual(len(visible_dates), program_count * 3)
+        self.assertTrue(all(visible_dates.values()))
+
+
 @override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
 class ProgramCertificateIssuedEmailTests(SiteMixin, TestCase):
     """
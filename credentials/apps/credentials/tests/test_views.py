@@ -7,9 +7,11 @@ from unittest.mock import PropertyMock, patch
 
 import ddt
 import responses
+from django.core.cache import cache
+from django.core.management import call_command
 from django.template import Context, Template
 from django.template.loader import select_template
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.utils.text import slugify
 from faker import Faker
@@ -18,6 +20,8 @@ from credentials.apps.catalog.data import OrganizationDetails, ProgramDetails
 from credentials.apps.catalog.tests.factories import CourseFactory, CourseRunFactory, ProgramFactory
 from credentials.apps.core.tests.factories import USER_PASSWORD, SiteConfigurationFactory, UserFactory
 from credentials.apps.core.tests.mixins import SiteMixin
+from credentials.apps.core.user_profiles import USER_PROFILE_CHANGED
+from credentials.apps.credentials import render_cache
 from credentials.apps.credentials.exceptions import MissingCertificateLogoError
 from credentials.apps.credentials.models import ProgramCertificate, UserCredential
 from credentials.apps.credentials.templatetags import i18n_assets
@@ -462,6 +466,163 @@ class RenderExampleCredentialViewTests(SiteMixin, TestCase):
         assert response.status_code != 200
 
 
+@ddt.ddt
+class RenderCredentialPageCacheTests(SiteMixin, TestCase):
+    """Tests the cache of the rendered certificate pages."""
+
+    MOCK_USER_DATA = {"username": "test-user", "name": "Test User"}
+
+    def setUp(self):
+        super().setUp()
+        self.course_run = CourseRunFactory(course=CourseFactory(site=self.site))
+        self.course_certificate = factories.CourseCertificateFactory(
+            course_id=self.course_run.key, site=self.site, certificate_available_date="1994-05-11T03:14:01Z"
+        )
+        self.program = ProgramFactory(course_runs=[self.course_run], site=self.site)
+        self.program_certificate = factories.ProgramCertificateFactory(
+            site=self.site, program_uuid=self.program.uuid, program=self.program
+        )
+        self.user_credential = factories.UserCredentialFactory(
+            username=self.MOCK_USER_DATA["username"], credential=self.program_certificate
+        )
+        self.course_user_credential = factories.UserCredentialFactory(
+            username=self.MOCK_USER_DATA["username"], credential=self.course_certificate
+        )
+
+        program_details = ProgramDetails(
+            uuid=str(self.program.uuid),
+            title="Fake PC",
+            type="Professional Certificate",
+            type_slug="professional-certificate",
+            credential_title=None,
+            course_count=1,
+            organizations=[
+                OrganizationDetails(
+                    uuid=str(uuid.uuid4()),
+                    key="TestX",
+                    name="Test",
+                    display_name="TestX",
+                    certificate_logo_image_url="http://example.com/logo.png",
+                )
+            ],
+            hours_of_effort=None,
+            status="active",
+        )
+        user_data_patcher = patch(
+            "credentials.apps.core.models.SiteConfiguration.get_user_api_data", return_value=self.MOCK_USER_DATA
+        )
+        program_details_patcher = patch(
+            "credentials.apps.credentials.models.ProgramCertificate.program_details",
+            new_callable=PropertyMock,
+            return_value=program_details,
+        )
+        self.user_data = user_data_patcher.start()
+        self.addCleanup(user_data_patcher.stop)
+        program_details_patcher.start()
+        self.addCleanup(program_details_patcher.stop)
+
+    def render(self, **extra):
+        return self.client.get(self.user_credential.get_absolute_url(), **extra)
+
+    @property
+    def render_count(self):
+        return self.user_data.call_count
+
+    def test_hit(self):
+        with patch("credentials.apps.credentials.views.set_custom_attribute") as set_custom_attribute:
+            first = self.render()
+            with self.assertNumQueries(0):
+                second = self.render()
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertEqual(self.render_count, 1)
+        self.assertEqual(
+            [call.args for call in set_custom_attribute.call_args_list if call.args[0] == "render_credential_cache"],
+            [("render_credential_cache", "miss"), ("render_credential_cache", "hit")],
+        )
+
+    def test_not_modified(self):
+        etag = self.render()["ETag"]
+        response = self.render(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_authenticated_user(self):
+        """Verify the pages of authenticated users, which hold their sharing banner, are not cached."""
+        user = UserFactory(username=self.MOCK_USER_DATA["username"])
+        self.client.login(username=user.username, password=USER_PASSWORD)
+        self.render()
+        response = self.render()
+        self.assertEqual(self.render_count, 2)
+        self.assertNotIn("ETag", response)
+
+    def test_query_string(self):
+        self.render()
+        self.render(data={"utm_source": "linkedin"})
+        self.assertEqual(self.render_count, 2)
+
+    @override_settings(RENDER_CREDENTIAL_CACHE_TTL=0)
+    def test_disabled(self):
+        self.render()
+        self.render()
+        self.assertEqual(self.render_count, 2)
+
+    def test_language(self):
+        self.render(HTTP_ACCEPT_LANGUAGE="en")
+        self.render(HTTP_ACCEPT_LANGUAGE="es-419")
+        self.render(HTTP_ACCEPT_LANGUAGE="en")
+        self.assertEqual(self.render_count, 2)
+
+    def test_revoked(self):
+        self.render()
+        self.user_credential.revoke()
+        self.assertEqual(self.render().status_code, 404)
+
+    @ddt.data(
+        lambda test: test.program.save(),
+        lambda test: test.program_certificate.save(),
+        lambda test: test.program_certificate.signatories.add(factories.SignatoryFactory()),
+        lambda test: test.course_certificate.save(),
+        # the visible date of the program credential depends on the course credentials
+        lambda test: test.course_user_credential.revoke(),
+        lambda test: call_command(
+            "revoke_certificates",
+            "--lms_user_ids",
+            UserFactory(username=test.MOCK_USER_DATA["username"], lms_user_id=42).lms_user_id,
+            f"--credential_id={test.course_certificate.id}",
+            "--credential_type=coursecertificate",
+        ),
+        lambda test: test.site_configuration.save(),
+        lambda test: factories.UserCredentialDateOverrideFactory(user_credential=test.user_credential),
+        lambda test: USER_PROFILE_CHANGED.send(
+            sender=None, site_configuration=test.site_configuration, username=test.MOCK_USER_DATA["username"]
+        ),
+        # an evicted version
+        lambda test: cache.delete(render_cache.credential_dependency(test.user_credential.uuid)),
+    )
+    def test_invalidation(self, change):
+        self.render()
+        self.render()
+        change(self)
+        self.assertEqual(self.render().status_code, 200)
+        self.assertEqual(self.render_count, 2)
+
+    def test_other_credential_not_invalidated(self):
+        self.render()
+        factories.UserCredentialFactory(username="another-user", credential=self.program_certificate)
+        self.render()
+        self.assertEqual(self.render_count, 1)
+
+    def test_other_learner_course_credential_not_invalidated(self):
+        self.render()
+        factories.UserCredentialFactory(username="another-user", credential=self.course_certificate).revoke()
+        self.render()
+        self.assertEqual(self.render_count, 1)
+
+
 @ddt.ddt
 class ExampleCredentialTests(SiteMixin, TestCase):
     def test_get(self):
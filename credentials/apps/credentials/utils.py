@@ -2,25 +2,29 @@ import datetime
 import logging
 import textwrap
 from itertools import groupby
-from typing import TYPE_CHECKING, Dict, Optional
+from typing import TYPE_CHECKING, Dict
 
 from django.conf import settings
-from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Q
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import DateTimeField, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from edx_ace import Recipient, ace
 
 from credentials.apps.catalog.data import ProgramStatus
 from credentials.apps.core.api import get_user_by_username
 from credentials.apps.credentials.messages import ProgramCertificateIssuedMessage
-from credentials.apps.credentials.models import ProgramCompletionEmailConfiguration, UserCredential
+from credentials.apps.credentials.models import (
+    CourseCertificate,
+    ProgramCertificate,
+    ProgramCompletionEmailConfiguration,
+    UserCredential,
+    UserCredentialDateOverride,
+)
 
 
 if TYPE_CHECKING:
-    from django.db.models import DateTimeField
     from django.db.models.query import QuerySet
 
-    from credentials.apps.credentials.models import ProgramCertificate
-
 log = logging.getLogger(__name__)
 
 VISIBLE_DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
@@ -91,66 +95,59 @@ def _filter_visible_program_certificates(query_set: "QuerySet") -> "QuerySet":
     Filters a UserCredentials queryset by excluding credentials that aren’t
     supposed to be visible yet according to their certificate_available_date.
 
+    The visible date of every program credential is computed in the database
+    (see `annotate_program_certificate_visible_dates`), so the number of
+    queries doesn't depend on the number of credentials or course runs.
+
     Arguments:
         query_set (UserCredential QuerySet): A queryset of UserCredential
         objects of the ProgramCertificate ContentType.
 
     Returns:
-        (QuerySet): A queryset of program UserCredentials that should be visible.
+        (QuerySet): A lazy queryset of program UserCredentials that should be visible.
     """
     now = datetime.datetime.now(datetime.timezone.utc)
-    visible_program_cert_ids = []  # type: list[Optional[int]]
-    for user_credential in query_set:
-        program_visible_date = _get_program_certificate_visible_date(user_credential)
-        if program_visible_date and program_visible_date <= now:
-            visible_program_cert_ids.append(user_credential.id)
-    return UserCredential.objects.filter(pk__in=visible_program_cert_ids)
-
-
-def _get_program_certificate_visible_date(user_program_credential: UserCredential) -> Optional[datetime.datetime]:
-    """
-    Finds the program credential visible date by finding the latest associated
-    course certificate_available_date. If a course credential has no
-    certificate_available_date, use its created date instead.
+    visible_program_certs = annotate_program_certificate_visible_dates(query_set).filter(program_visible_date__lte=now)
+    return UserCredential.objects.filter(pk__in=visible_program_certs.values("pk"))
 
-    Arguments:
-        user_program_credential (UserCredential): A single UserCredential object; this
-        must be of the ProgramCertificate ContentType.
 
-    Returns:
-        (DateTime or None): The date on which the program credential should be
-        visible. (It shouldn’t return None but is technically possible.)
+def annotate_program_certificate_visible_dates(query_set: "QuerySet") -> "QuerySet":
     """
-    last_date = None  # type: Optional[datetime.datetime]
-    for course_run in user_program_credential.credential.program.course_runs.all():
-        # Does the user have a course cert for this course run?
-        course_run_cert = UserCredential.objects.filter(
-            username=user_program_credential.username,
-            course_credentials__course_run=course_run,
-        ).first()
-
-        if course_run_cert:
-            date = _get_issue_date_for_course_credential(course_run_cert)
-            last_date = max(last_date, date) if last_date else date
-
-    return last_date
-
+    Annotates a queryset of program UserCredentials with `program_visible_date`.
 
-def _get_issue_date_for_course_credential(course_run_user_credentials: UserCredential) -> "DateTimeField":
-    """
-    Retrieves the issue date for a given course run UserCredential. This method
-    attempts to find the date based on the certificate availability date
-    and falls back to created date.
+    The visible date of a program credential is the latest issue date of the
+    learner's course credentials for the course runs in the program, where the
+    issue date is the course certificate_available_date, falling back to the
+    course credential's created date. It is computed with a correlated
+    aggregate subquery, so evaluating the queryset is a single query.
 
     Arguments:
-        course_run_user_credentials (UserCredential): A Course Run UserCredential
+        query_set (UserCredential QuerySet): A queryset of UserCredential
+        objects of the ProgramCertificate ContentType.
 
     Returns:
-        datetime: The datetime that the credential should be visible and was issued.
+        (QuerySet): The queryset annotated with `program_visible_date`, which is
+        None when the learner holds no course credential in the program.
     """
-    if course_run_user_credentials.credential.certificate_available_date:
-        return course_run_user_credentials.credential.certificate_available_date
-    return course_run_user_credentials.created
+    course_credential_dates = (
+        UserCredential.objects.filter(
+            username=OuterRef("username"),
+            course_credentials__course_run__programs__programcertificate__id=OuterRef("credential_id"),
+        )
+        .order_by()
+        .values("username")
+        .annotate(
+            visible_date=Max(
+                Coalesce(
+                    "course_credentials__certificate_available_date",
+                    "created",
+                    output_field=DateTimeField(),
+                )
+            ),
+        )
+        .values("visible_date")
+    )
+    return query_set.annotate(program_visible_date=Subquery(course_credential_dates[:1], output_field=DateTimeField()))
 
 
 def get_credential_visible_dates(
@@ -164,6 +161,10 @@ def get_credential_visible_dates(
     visible date calculations with the UserCredential’s date override,
     if present.
 
+    Certificate available dates, date overrides and program visible dates are
+    bulk-loaded up front, so the number of queries doesn't depend on the number
+    of credentials.
+
     Returns:
         (Dict): Returns a dictionary of DateTimes keyed by UserCredential. If the
         credential's visible date cannot be calculated, returns None instead of
@@ -174,26 +175,65 @@ def get_credential_visible_dates(
                 ...
             }
     """
+    user_credentials = list(user_credentials)
+    course_content_type = ContentType.objects.get_for_model(CourseCertificate)
+    program_content_type = ContentType.objects.get_for_model(ProgramCertificate)
+
+    course_user_credentials = [
+        user_credential
+        for user_credential in user_credentials
+        if user_credential.credential_content_type_id == course_content_type.id
+    ]
+    program_user_credential_ids = [
+        user_credential.id
+        for user_credential in user_credentials
+        if user_credential.credential_content_type_id == program_content_type.id
+    ]
+
+    certificate_available_dates = {}
+    date_overrides = {}
+    if course_user_credentials:
+        certificate_available_dates = dict(
+            CourseCertificate.objects.filter(
+                id__in={user_credential.credential_id for user_credential in course_user_credentials}
+            ).values_list("id", "certificate_available_date")
+        )
+        # Date override only applies to Course Run UserCredential dates
+        # we should reconsider this if we ever decide they should
+        # impact the issue date of Program Certs.
+        if use_date_override:
+            date_overrides = dict(
+                UserCredentialDateOverride.objects.filter(
+                    user_credential_id__in=[user_credential.id for user_credential in course_user_credentials]
+                ).values_list("user_credential_id", "date")
+            )
+
+    program_visible_dates = {}
+    if program_user_credential_ids:
+        program_visible_dates = dict(
+            annotate_program_certificate_visible_dates(
+                UserCredential.objects.filter(id__in=program_user_credential_ids)
+            ).values_list("id", "program_visible_date")
+        )
+
     visible_date_dict = {}
 
     for user_credential in user_credentials:
         date = None
         # If this is a course credential
-        if user_credential.course_credentials.exists():
-            date = _get_issue_date_for_course_credential(user_credential)
-
-            # Date override only applies to Course Run UserCredential dates
-            # we should reconsider this if we ever decide they should
-            # impact the issue date of Program Certs.
-            if use_date_override:
-                try:
-                    date = user_credential.date_override.date
-                except ObjectDoesNotExist:
-                    pass
+        if (
+            user_credential.credential_content_type_id == course_content_type.id
+            and user_credential.credential_id in certificate_available_dates
+        ):
+            date = (
+                date_overrides.get(user_credential.id)
+                or certificate_available_dates[user_credential.credential_id]
+                or user_credential.created
+            )
 
         # If this is a program credential
-        elif user_credential.program_credentials.exists():
-            date = _get_program_certificate_visible_date(user_credential)
+        elif user_credential.id in program_visible_dates:
+            date = program_visible_dates[user_credential.id]
 
         visible_date_dict[user_credential] = date
 
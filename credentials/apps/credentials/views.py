@@ -5,17 +5,21 @@ from urllib.parse import urlencode
 
 from django.conf import settings
 from django.contrib.admin.views.decorators import staff_member_required
-from django.http import Http404
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from django.template.defaultfilters import slugify
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
 from django.utils.functional import cached_property
-from django.utils.translation import gettext as _, override
+from django.utils.http import quote_etag
+from django.utils.translation import get_language, gettext as _, override
 from django.views.generic import TemplateView
+from edx_django_utils.monitoring import set_custom_attribute
 
 from credentials.apps.catalog.data import OrganizationDetails, ProgramDetails
 from credentials.apps.core.views import ThemeViewMixin
+from credentials.apps.credentials import render_cache
 from credentials.apps.credentials.exceptions import MissingCertificateLogoError
 from credentials.apps.credentials.models import ProgramCertificate, UserCredential
 from credentials.apps.credentials.utils import get_credential_visible_date, to_language
@@ -77,6 +81,8 @@ class RenderCredential(SocialMediaMixin, ThemeViewMixin, TemplateView):
     # This allows us to use this one view to render credentials for any number of content types
     # (e.g., courses, programs).
     template_name = "credentials/base.html"
+    # Whether anonymous requests are served from the rendered pages cache (see `credentials.render_cache`).
+    cache_pages = True
 
     @cached_property
     def user_credential(self):
@@ -87,6 +93,43 @@ class RenderCredential(SocialMediaMixin, ThemeViewMixin, TemplateView):
             program_credentials__site=self.request.site,
         )
 
+    def is_page_cacheable(self):
+        # Pages of authenticated users hold their sharing banner, and the sharing URLs hold the query string.
+        return (
+            self.cache_pages
+            and settings.RENDER_CREDENTIAL_CACHE_TTL > 0
+            and not self.request.user.is_authenticated
+            and not self.request.GET
+        )
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_page_cacheable():
+            set_custom_attribute("render_credential_cache", "bypass")
+            return super().get(request, *args, **kwargs)
+
+        page_args = (self.kwargs.get("uuid"), get_language(), request.site.id)
+        page = render_cache.get_page(*page_args)
+        if page is not None:
+            set_custom_attribute("render_credential_cache", "hit")
+            response = HttpResponse(page["content"])
+            etag = page["etag"]
+        else:
+            set_custom_attribute("render_credential_cache", "miss")
+            user_credential = self.user_credential
+            versions = render_cache.get_versions(
+                [
+                    render_cache.credential_dependency(user_credential.uuid),
+                    render_cache.program_dependency(user_credential.credential.program_uuid),
+                    render_cache.site_dependency(request.site.id),
+                    render_cache.user_dependency(user_credential.username),
+                ]
+            )
+            response = super().get(request, *args, **kwargs).render()
+            etag = render_cache.set_page(*page_args, response.content, versions)
+
+        response["ETag"] = quote_etag(etag)
+        return get_conditional_response(request, etag=response["ETag"], response=response)
+
     def get_visible_date(self):
         visible_date = get_credential_visible_date(self.user_credential)
         now = datetime.datetime.now(datetime.timezone.utc)
@@ -221,6 +264,8 @@ class RenderExampleProgramCredential(RenderCredential):
     This View overrides just enough of the RenderCredential View to be able to display an example certificate.
     """
 
+    cache_pages = False
+
     @cached_property
     def user_credential(self):
         """
@@ -5,18 +5,22 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import BadRequest
+from django.db.models import Min, prefetch_related_objects
 from django.template.defaultfilters import slugify
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from credentials.apps.catalog.api import get_program_and_course_details
 from credentials.apps.core.api import get_user_by_username
 from credentials.apps.credentials.api import (
+    get_course_user_credentials_by_certificate_ids,
     get_credential_dates,
     get_user_credentials_by_content_type,
     get_user_credentials_by_id,
 )
 from credentials.apps.credentials.data import UserCredentialStatus
-from credentials.apps.records.models import ProgramCertRecord, UserCreditPathway, UserGrade
+from credentials.apps.credentials.models import CourseCertificate
+from credentials.apps.records.models import ProgramCertRecord, ProgramRecordSnapshot, UserCreditPathway, UserGrade
 from credentials.apps.records.utils import get_credentials
 
 
@@ -25,6 +29,18 @@ if TYPE_CHECKING:
 
 COURSE_CERTIFICATE_CONTENT_TYPE = ContentType.objects.filter(app_label="credentials", model="coursecertificate")
 
+PROGRAM_RECORDS_EXPORT_CHUNK_SIZE = 500
+PROGRAM_RECORDS_CSV_LEARNER_FIELDS = ("full_name", "username", "email")
+PROGRAM_RECORDS_CSV_GRADE_FIELDS = (
+    "name",
+    "school",
+    "attempts",
+    "course_id",
+    "issue_date",
+    "percent_grade",
+    "letter_grade",
+)
+
 
 def _does_awarded_program_cert_exist_for_user(program, user):
     """
@@ -120,7 +136,7 @@ def _get_transformed_pathway_data(program, user):
     return pathway_data
 
 
-def _get_transformed_grade_data(program, user):  # pylint: disable=too-many-statements
+def _get_transformed_grade_data(program, user):
     """
     A utility function that gathers and transforms a learner's grade data for course-runs that are part of a Program.
     This data is used to render a learner's Program Record page.
@@ -138,24 +154,46 @@ def _get_transformed_grade_data(program, user):  # pylint: disable=too-many-stat
             updated in a specific Program.
     """
     # creates a Django QuerySet containing the course-runs of the specified program
-    program_course_runs = program.course_runs.all()
-    # creates an immutable set of course-run data from the above QuerySet
-    program_course_runs_set = frozenset(program_course_runs)
+    program_course_runs = program.course_runs.select_related("course").prefetch_related("course__owners")
 
     # get all of the learner's course certificates associated with the program courses (including non-AWARDED ones)
     course_user_credentials = get_user_credentials_by_content_type(
         user.username, COURSE_CERTIFICATE_CONTENT_TYPE, status=None
+    ).prefetch_related("credential__course_run__course")
+    # retrieves the learner's grades (from verified course-runs) relevant to this program
+    course_grades = UserGrade.objects.select_related("course_run__course").filter(
+        username=user.username, course_run__in=frozenset(program_course_runs), verified=True
     )
+
+    return _transform_grade_data(program_course_runs, course_user_credentials, course_grades)
+
+
+def _transform_grade_data(  # pylint: disable=too-many-statements
+    program_course_runs, course_user_credentials, course_grades, visible_dates=None, issue_dates=None
+):
+    """
+    Transforms a learner's (already loaded) course certificates and grades into the grade data of a Program Record.
+
+    Args:
+        program_course_runs (Iterable[CourseRun]): The course-runs of the Program, in the Program's order
+        course_user_credentials (Iterable[UserCredential]): The learner's visible course certificates
+        course_grades (Iterable[UserGrade]): The learner's verified grades in the Program's course-runs
+        visible_dates (Dict): Visible dates of (at least) the learner's course certificates, computed if not given
+        issue_dates (Dict): Issue dates (taking date overrides into account) of (at least) the learner's awarded
+            course certificates, computed if not given
+
+    Returns:
+        See `_get_transformed_grade_data`.
+    """
+    # creates an immutable set of the program's course-runs
+    program_course_runs_set = frozenset(program_course_runs)
     # create a new dictionary, mapping a course-run id (key) to an associated credential
     user_credential_dict = {
         user_credential.credential.course_run.key: user_credential for user_credential in course_user_credentials
     }
     # maps a credential to its visible_date (a date when the certificate becomes viewable)
-    visible_dates = get_credential_dates(course_user_credentials, True)
-    # retrieves the learner's grades (from verified course-runs) relevant to this program
-    course_grades = UserGrade.objects.select_related("course_run__course").filter(
-        username=user.username, course_run__in=program_course_runs_set, verified=True
-    )
+    if visible_dates is None:
+        visible_dates = get_credential_dates(course_user_credentials, True)
 
     # `num_attempts_dict` is used to track how many times a learner has attempted a particular course
     num_attempts_dict = defaultdict(int)
@@ -198,15 +236,16 @@ def _get_transformed_grade_data(program, user):  # pylint: disable=too-many-stat
             and user_credential.credential.course_run in program_course_runs_set
         ):
             awarded_course_credential_dict[user_credential.credential.course_run.course] = user_credential
+    # maps an awarded credential to its issue date, taking date overrides into account
+    if issue_dates is None:
+        issue_dates = get_credential_dates(awarded_course_credential_dict.values(), True, use_date_override=True)
 
     # Add the credential and grade data to the response in the order that is maintained by the Program's sorted field
     for course_run in program_course_runs:
         course = course_run.course
         grade = highest_attempt_dict.get(course, None)
         awarded_credential = awarded_course_credential_dict.get(course, None)
-        issue_date = None
-        if awarded_credential:
-            issue_date = get_credential_dates(awarded_credential, False)
+        issue_date = issue_dates.get(awarded_credential)
 
         match = False
         course_run_key = ""
@@ -255,7 +294,7 @@ def _get_transformed_grade_data(program, user):  # pylint: disable=too-many-stat
             transformed_grade_data.append(
                 {
                     "name": course.title,
-                    "school": ", ".join(course.owners.values_list("name", flat=True)),
+                    "school": ", ".join(owner.name for owner in course.owners.all()),
                     "attempts": course_attempts,
                     "course_id": course_run_key,
                     "issue_date": issue_date_formatted,
@@ -294,10 +333,109 @@ def _get_shared_program_cert_record_data(program, user):
         return str(shared_program_record.uuid.hex)
 
 
+def _build_program_record_snapshot_data(program, user):
+    """
+    A utility function that gathers the program, grade and pathway sections of a learner's Program Record. These are
+    the expensive parts of the record, and the parts stored in a ProgramRecordSnapshot.
+
+    Args:
+        program (Program): Program object instance
+        user (User): Django User object
+
+    Returns:
+        Dict: A JSON serializable dictionary containing the program, grade, and pathway data of the Program Record
+    """
+    grade_data, highest_attempt_dict, last_updated = _get_transformed_grade_data(program, user)
+    program_data = _get_transformed_program_data(program, user, highest_attempt_dict, last_updated)
+    pathway_data = _get_transformed_pathway_data(program, user)
+
+    return {
+        "program": program_data,
+        "grades": grade_data,
+        "pathways": pathway_data,
+    }
+
+
+def _get_next_visible_date(program):
+    """
+    A utility function that finds the next time a course certificate in a Program becomes visible. Until then, the
+    visible course credentials (and therefore the grades) of the Program Record can't change by themselves.
+
+    Args:
+        program (Program): Program object instance
+
+    Returns:
+        DateTime: The earliest certificate_available_date in the future, or None
+    """
+    return CourseCertificate.objects.filter(
+        course_run__programs=program,
+        certificate_available_date__gt=timezone.now(),
+    ).aggregate(next_visible_date=Min("certificate_available_date"))["next_visible_date"]
+
+
+def refresh_program_record_snapshot(program, user):
+    """
+    Rebuilds and stores the ProgramRecordSnapshot of a learner in a Program.
+
+    Args:
+        program (Program): Program object instance
+        user (User): Django User object
+
+    Returns:
+        ProgramRecordSnapshot: The up-to-date snapshot
+    """
+    # Read the clock before the record data, so a change that lands while we are building is newer than the snapshot.
+    generated_at = timezone.now()
+    data = _build_program_record_snapshot_data(program, user)
+    snapshot, __ = ProgramRecordSnapshot.objects.update_or_create(
+        user=user,
+        program=program,
+        defaults={
+            "data": data,
+            "generated_at": generated_at,
+            "expires_at": _get_next_visible_date(program),
+        },
+    )
+    return snapshot
+
+
+def get_program_record_snapshot(program, user):
+    """
+    Retrieves the ProgramRecordSnapshot of a learner in a Program, rebuilding it if it is missing or stale.
+
+    Args:
+        program (Program): Program object instance
+        user (User): Django User object
+
+    Returns:
+        ProgramRecordSnapshot: The up-to-date snapshot
+    """
+    snapshot = ProgramRecordSnapshot.objects.filter(user=user, program=program).first()
+    if snapshot is None or snapshot.is_stale():
+        snapshot = refresh_program_record_snapshot(program, user)
+    return snapshot
+
+
+def invalidate_program_record_snapshots(**filters):
+    """
+    Marks the ProgramRecordSnapshots matching the given filters as stale, so they are rebuilt on their next read.
+
+    Args:
+        filters: Keyword arguments used to filter the ProgramRecordSnapshot queryset
+
+    Returns:
+        int: The number of snapshots marked as stale
+    """
+    return ProgramRecordSnapshot.objects.filter(**filters).update(invalidated_at=timezone.now())
+
+
 def get_program_record_data(user, program_uuid, site, platform_name=None):
     """
     Get all of the data associated with a record by its uuid
 
+    The program, grade and pathway data are served from the learner's ProgramRecordSnapshot, which is only rebuilt
+    when the data it was built from changes.
+
     Arguments:
         user(user): Django User object
         program_uuid(str): A Program's unique indentifier, used to retrieve a Program object instance
@@ -311,21 +449,123 @@ def get_program_record_data(user, program_uuid, site, platform_name=None):
     program = get_program_and_course_details(program_uuid, site)
 
     learner_data = _get_transformed_learner_data(user)
-    grade_data, highest_attempt_dict, last_updated = _get_transformed_grade_data(program, user)
-    program_data = _get_transformed_program_data(program, user, highest_attempt_dict, last_updated)
-    pathway_data = _get_transformed_pathway_data(program, user)
+    snapshot_data = get_program_record_snapshot(program, user).data
     shared_program_record_uuid = _get_shared_program_cert_record_data(program, user)
 
     return {
         "learner": learner_data,
-        "program": program_data,
+        "program": snapshot_data["program"],
         "platform_name": platform_name,
-        "grades": grade_data,
-        "pathways": pathway_data,
+        "grades": snapshot_data["grades"],
+        "pathways": snapshot_data["pathways"],
         "shared_program_record_uuid": shared_program_record_uuid,
     }
 
 
+def iter_program_records_data(program, chunk_size=PROGRAM_RECORDS_EXPORT_CHUNK_SIZE):
+    """
+    Yields the learner and grade data of every learner with a shared record (ProgramCertRecord) in a Program.
+
+    Unlike `get_program_record_data`, learners are processed in chunks: the course certificates, their dates and the
+    grades of a whole chunk of learners are loaded at once, so the number of queries depends on the number of chunks
+    (not learners), and only one chunk is held in memory at a time.
+
+    Arguments:
+        program(Program): Program object instance
+        chunk_size(int): Number of learners to load at a time
+
+    Yields:
+        Tuple[Dict, List[Dict]]: The learner data (see `_get_transformed_learner_data`) and grade data (see
+            `_get_transformed_grade_data`) of a learner
+    """
+    program_course_runs = list(program.course_runs.select_related("course"))
+    prefetch_related_objects([course_run.course for course_run in program_course_runs], "owners")
+    course_runs = {course_run.id: course_run for course_run in program_course_runs}
+
+    course_certificates = CourseCertificate.objects.filter(course_run__in=program_course_runs).in_bulk()
+    for course_certificate in course_certificates.values():
+        # share the course runs (and their courses and owners) loaded above
+        course_certificate.course_run = course_runs[course_certificate.course_run_id]
+
+    last_id = 0
+    while True:
+        program_cert_records = list(
+            ProgramCertRecord.objects.filter(program=program, id__gt=last_id)
+            .select_related("user")
+            .order_by("id")[:chunk_size]
+        )
+        if not program_cert_records:
+            break
+        last_id = program_cert_records[-1].id
+        usernames = [program_cert_record.user.username for program_cert_record in program_cert_records]
+
+        course_user_credentials = []
+        if course_certificates:
+            course_user_credentials = list(
+                get_course_user_credentials_by_certificate_ids(usernames, course_certificates.keys())
+            )
+        user_credentials_by_username = defaultdict(list)
+        for user_credential in course_user_credentials:
+            user_credential.credential = course_certificates[user_credential.credential_id]
+            user_credentials_by_username[user_credential.username].append(user_credential)
+
+        visible_dates = get_credential_dates(course_user_credentials, True)
+        issue_dates = get_credential_dates(
+            [
+                user_credential
+                for user_credential in course_user_credentials
+                if user_credential.status == UserCredentialStatus.AWARDED.value
+            ],
+            True,
+            use_date_override=True,
+        )
+
+        grades_by_username = defaultdict(list)
+        if program_course_runs:
+            for course_grade in UserGrade.objects.filter(
+                username__in=usernames, course_run__in=program_course_runs, verified=True
+            ).order_by("id"):
+                course_grade.course_run = course_runs[course_grade.course_run_id]
+                grades_by_username[course_grade.username].append(course_grade)
+
+        for program_cert_record in program_cert_records:
+            user = program_cert_record.user
+            grade_data, __, __ = _transform_grade_data(
+                program_course_runs,
+                user_credentials_by_username[user.username],
+                grades_by_username[user.username],
+                visible_dates=visible_dates,
+                issue_dates=issue_dates,
+            )
+            yield _get_transformed_learner_data(user), grade_data
+
+
+def iter_program_records_csv_rows(program, platform_name, chunk_size=PROGRAM_RECORDS_EXPORT_CHUNK_SIZE):
+    """
+    Yields the rows of the CSV report of every learner's record in a Program: the Program metadata, followed by a row
+    per learner and course.
+
+    Arguments:
+        program(Program): Program object instance
+        platform_name(str): Name of the platform associated with the program records
+        chunk_size(int): Number of learners to load at a time
+
+    Yields:
+        List: A CSV row
+    """
+    yield ["Program Name", program.title]
+    yield ["Program Type", program.type]
+    yield ["Platform Provider", platform_name]
+    yield ["Authoring Organization(s)", ", ".join(program.authoring_organizations.values_list("name", flat=True))]
+    yield [""]
+    yield [*PROGRAM_RECORDS_CSV_LEARNER_FIELDS, *PROGRAM_RECORDS_CSV_GRADE_FIELDS]
+
+    for learner_data, grade_data in iter_program_records_data(program, chunk_size=chunk_size):
+        learner_row = [learner_data[field] for field in PROGRAM_RECORDS_CSV_LEARNER_FIELDS]
+        for grade in grade_data:
+            yield learner_row + [grade[field] for field in PROGRAM_RECORDS_CSV_GRADE_FIELDS]
+
+
 def get_program_details(request_user, request_site, uuid, is_public):
     """
     Retrieves the details (earned certificates and grade data) of a learner in the specified Program. This utility
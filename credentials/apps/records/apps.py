@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class RecordsConfig(AppConfig):
+    name = "credentials.apps.records"
+    verbose_name = "Records"
+
+    def ready(self):
+        """
+        Connects the signal handlers that keep Program Record snapshots up to date.
+        """
+        from credentials.apps.records import signals  # pylint: disable=unused-import,import-outside-toplevel
@@ -0,0 +1,69 @@
+"""
+Django management command to export the Program Records of every learner in a Program as a csv report.
+"""
+
+import csv
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from credentials.apps.catalog.models import Program
+from credentials.apps.core.models import SiteConfiguration
+from credentials.apps.records.api import PROGRAM_RECORDS_EXPORT_CHUNK_SIZE, iter_program_records_csv_rows
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the Program Records of every learner who has shared a record in a Program as a csv report. Learners "
+        "are loaded in chunks, so the report can cover any number of learners."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("program_uuid", help="UUID of the Program to export the records of")
+        parser.add_argument(
+            "--site_domain", default=None, help="Domain of the Program's site, if the Program exists on several sites"
+        )
+        parser.add_argument("--output", default=None, help="Path of the csv file to write. Default standard output")
+        parser.add_argument(
+            "--chunk_size",
+            type=int,
+            default=PROGRAM_RECORDS_EXPORT_CHUNK_SIZE,
+            help="Number of learners to load at a time",
+        )
+
+    def handle(self, *args, **options):
+        programs = Program.objects.select_related("site").filter(uuid=options["program_uuid"])
+        if options["site_domain"]:
+            programs = programs.filter(site__domain=options["site_domain"])
+
+        programs = list(programs[:2])
+        if not programs:
+            raise CommandError(f"Program [{options['program_uuid']}] not found")
+        if len(programs) > 1:
+            raise CommandError(f"Program [{options['program_uuid']}] exists on several sites, use --site_domain")
+        program = programs[0]
+
+        platform_name = (
+            SiteConfiguration.objects.filter(site=program.site).values_list("platform_name", flat=True).first() or ""
+        )
+        rows = iter_program_records_csv_rows(program, platform_name, chunk_size=options["chunk_size"])
+
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as output:
+                count = self._write(output, rows)
+        else:
+            count = self._write(self.stdout, rows)
+
+        logger.info(f"Exported {count} rows of the [{program.uuid}] program records")
+
+    @staticmethod
+    def _write(output, rows):
+        writer = csv.writer(output, quoting=csv.QUOTE_ALL)
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
@@ -0,0 +1,58 @@
+"""
+Tests for the export_program_records management command
+"""
+
+import csv
+import io
+import os
+import tempfile
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from credentials.apps.catalog.tests.factories import CourseRunFactory, ProgramFactory
+from credentials.apps.core.tests.factories import UserFactory
+from credentials.apps.core.tests.mixins import SiteMixin
+from credentials.apps.records.tests.factories import ProgramCertRecordFactory, UserGradeFactory
+
+
+class ExportProgramRecordsTests(SiteMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.course_run = CourseRunFactory(course__site=self.site)
+        self.program = ProgramFactory(site=self.site, course_runs=[self.course_run])
+        self.users = UserFactory.create_batch(3)
+        for user in self.users:
+            ProgramCertRecordFactory(user=user, program=self.program)
+            UserGradeFactory(username=user.username, course_run=self.course_run)
+
+    def _assert_report(self, content):
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(rows[0], ["Program Name", self.program.title])
+        self.assertEqual(rows[2], ["Platform Provider", self.site_configuration.platform_name])
+        self.assertEqual([row[1] for row in rows[6:]], [user.username for user in self.users])
+
+    def test_output_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.csv")
+            call_command("export_program_records", str(self.program.uuid), "--output", path, "--chunk_size", "2")
+            with open(path, encoding="utf-8") as report:
+                self._assert_report(report.read())
+
+    def test_stdout(self):
+        stdout = io.StringIO()
+        call_command("export_program_records", str(self.program.uuid), stdout=stdout)
+        self._assert_report(stdout.getvalue())
+
+    def test_program_not_found(self):
+        with self.assertRaises(CommandError):
+            call_command("export_program_records", str(ProgramFactory.build().uuid))
+
+    def test_program_on_several_sites(self):
+        ProgramFactory(uuid=self.program.uuid)
+        with self.assertRaises(CommandError):
+            call_command("export_program_records", str(self.program.uuid))
+
+        stdout = io.StringIO()
+        call_command("export_program_records", str(self.program.uuid), "--site_domain", self.site.domain, stdout=stdout)
+        self._assert_report(stdout.getvalue())
@@ -0,0 +1,55 @@
+"""
+Tests for the warm_program_record_snapshots management command
+"""
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from credentials.apps.catalog.tests.factories import CourseRunFactory, ProgramFactory
+from credentials.apps.core.tests.factories import UserFactory
+from credentials.apps.core.tests.mixins import SiteMixin
+from credentials.apps.records.api import refresh_program_record_snapshot
+from credentials.apps.records.models import ProgramRecordSnapshot
+from credentials.apps.records.tests.factories import ProgramCertRecordFactory, UserGradeFactory
+
+
+class WarmProgramRecordSnapshotsTests(SiteMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.course_run = CourseRunFactory(course__site=self.site)
+        self.program = ProgramFactory(site=self.site, course_runs=[self.course_run])
+        self.other_program = ProgramFactory(site=self.site)
+        self.users = UserFactory.create_batch(3)
+        for user in self.users:
+            ProgramCertRecordFactory(user=user, program=self.program)
+        ProgramCertRecordFactory(user=self.users[0], program=self.other_program)
+
+    def test_builds_missing_snapshots(self):
+        call_command("warm_program_record_snapshots")
+        self.assertEqual(ProgramRecordSnapshot.objects.count(), 4)
+        self.assertFalse(any(snapshot.is_stale() for snapshot in ProgramRecordSnapshot.objects.all()))
+
+    def test_program_uuids(self):
+        call_command("warm_program_record_snapshots", "--program_uuids", str(self.other_program.uuid))
+        self.assertQuerysetEqual(
+            ProgramRecordSnapshot.objects.values_list("user", "program"),
+            [(self.users[0].id, self.other_program.id)],
+            transform=tuple,
+        )
+
+    def test_rebuilds_only_stale_snapshots(self):
+        fresh = refresh_program_record_snapshot(self.program, self.users[1])
+        stale = refresh_program_record_snapshot(self.program, self.users[2])
+        UserGradeFactory(username=self.users[2].username, course_run=self.course_run)
+
+        call_command("warm_program_record_snapshots", "--program_uuids", str(self.program.uuid))
+
+        self.assertEqual(ProgramRecordSnapshot.objects.get(pk=fresh.pk).generated_at, fresh.generated_at)
+        stale_after = ProgramRecordSnapshot.objects.get(pk=stale.pk)
+        self.assertGreater(stale_after.generated_at, stale.generated_at)
+        self.assertFalse(stale_after.is_stale())
+
+    def test_force(self):
+        fresh = refresh_program_record_snapshot(self.program, self.users[1])
+        call_command("warm_program_record_snapshots", "--force")
+        self.assertGreater(ProgramRecordSnapshot.objects.get(pk=fresh.pk).generated_at, fresh.generated_at)
@@ -0,0 +1,72 @@
+"""
+Django management command to (re)build Program Record snapshots in bulk.
+"""
+
+import logging
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from credentials.apps.catalog.models import Program
+from credentials.apps.records.api import refresh_program_record_snapshot
+from credentials.apps.records.models import ProgramCertRecord, ProgramRecordSnapshot
+
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the Program Record snapshots of every shared program record and rebuild the stale ones, so the records "
+        "are ready before learners or pathway organizations look at them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--program_uuids", nargs="+", default=None, help="Only warm the snapshots of these programs. Default all"
+        )
+        parser.add_argument("--force", action="store_true", help="Rebuild snapshots even if they are up to date")
+        parser.add_argument("--batch_size", type=int, default=500, help="Number of records to load at a time")
+
+    def handle(self, *args, **options):
+        program_uuids = options.get("program_uuids")
+        force = options.get("force")
+        batch_size = options.get("batch_size")
+
+        programs = Program.objects.all()
+        if program_uuids:
+            programs = programs.filter(uuid__in=program_uuids)
+
+        # Every (user, program) pair that has a shared record or an existing snapshot
+        pairs = set(ProgramCertRecord.objects.filter(program__in=programs).values_list("user_id", "program_id"))
+        pairs.update(ProgramRecordSnapshot.objects.filter(program__in=programs).values_list("user_id", "program_id"))
+
+        snapshots = {}
+        if not force:
+            now = timezone.now()
+            for snapshot in ProgramRecordSnapshot.objects.filter(program__in=programs).iterator(chunk_size=batch_size):
+                snapshots[(snapshot.user_id, snapshot.program_id)] = not snapshot.is_stale(now)
+
+        pairs_to_warm = sorted(pair for pair in pairs if not snapshots.get(pair, False))
+        logger.info(f"Warming {len(pairs_to_warm)} of {len(pairs)} program record snapshots")
+
+        warmed = failed = 0
+        for start in range(0, len(pairs_to_warm), batch_size):
+            batch = pairs_to_warm[start : start + batch_size]
+            users = User.objects.in_bulk({user_id for user_id, __ in batch})
+            batch_programs = Program.objects.prefetch_related("course_runs__course").in_bulk(
+                {program_id for __, program_id in batch}
+            )
+            for user_id, program_id in batch:
+                try:
+                    refresh_program_record_snapshot(batch_programs[program_id], users[user_id])
+                    warmed += 1
+                except Exception:
+                    failed += 1
+                    logger.exception(
+                        f"Failed to warm the program record snapshot of user [{user_id}] in [{program_id}]"
+                    )
+
+        logger.info(f"Warmed {warmed} program record snapshots, {failed} failed")
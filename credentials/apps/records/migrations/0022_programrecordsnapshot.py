@@ -0,0 +1,53 @@
+# Generated by Django 4.2.19 on 2026-10-18 18:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0015_auto_20201130_2041"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("records", "0021_usergrade_lms_last_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProgramRecordSnapshot",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name="created"),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name="modified"),
+                ),
+                ("data", models.JSONField()),
+                ("generated_at", models.DateTimeField(help_text="When the data used to build this snapshot was read.")),
+                (
+                    "invalidated_at",
+                    models.DateTimeField(
+                        blank=True, help_text="When the data used to build this snapshot last changed.", null=True
+                    ),
+                ),
+                (
+                    "expires_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When a course certificate in this program next becomes visible.",
+                        null=True,
+                    ),
+                ),
+                ("program", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="catalog.program")),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "unique_together": {("user", "program")},
+            },
+        ),
+    ]
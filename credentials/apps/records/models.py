@@ -6,6 +6,7 @@ import uuid
 
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
 
@@ -99,3 +100,39 @@ class UserCreditPathway(TimeStampedModel):
 
     class Meta:
         unique_together = ("user", "pathway", "program")
+
+
+class ProgramRecordSnapshot(TimeStampedModel):
+    """
+    A precomputed copy of the program, grade and pathway sections of a learner's Program Record.
+
+    Snapshots are rebuilt on read once they are stale: when a grade, credential, date override, credit pathway or the
+    program's catalog data changed after the snapshot was generated, or once a course certificate in the program
+    becomes visible.
+
+    .. no_pii: This model has no PII.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    program = models.ForeignKey(Program, on_delete=models.CASCADE)
+    data = models.JSONField()
+    generated_at = models.DateTimeField(help_text=_("When the data used to build this snapshot was read."))
+    invalidated_at = models.DateTimeField(
+        null=True, blank=True, help_text=_("When the data used to build this snapshot last changed.")
+    )
+    expires_at = models.DateTimeField(
+        null=True, blank=True, help_text=_("When a course certificate in this program next becomes visible.")
+    )
+
+    class Meta:
+        unique_together = ("user", "program")
+
+    def __str__(self):
+        return f"ProgramRecordSnapshot: {self.user_id} {self.program_id}"
+
+    def is_stale(self, now=None):
+        """Whether the snapshot has to be rebuilt before it is served."""
+        now = now or timezone.now()
+        if self.invalidated_at and self.invalidated_at >= self.generated_at:
+            return True
+        return bool(self.expires_at and self.expires_at <= now)
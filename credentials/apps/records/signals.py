@@ -0,0 +1,140 @@
+"""
+Signal receivers for the `records` Django app.
+
+Program Record snapshots are built from grades, credentials, date overrides, credit pathways and catalog data. These
+receivers mark the affected snapshots as stale whenever one of those changes, so they are rebuilt on their next read.
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from credentials.apps.catalog.models import Course, CourseRun, Organization, Pathway, Program
+from credentials.apps.catalog.signals import CATALOG_PROGRAMS_CHANGED
+from credentials.apps.credentials.models import (
+    CourseCertificate,
+    ProgramCertificate,
+    UserCredential,
+    UserCredentialDateOverride,
+)
+from credentials.apps.records.api import invalidate_program_record_snapshots
+from credentials.apps.records.models import UserCreditPathway, UserGrade
+
+
+def _invalidate_user_credential_snapshots(user_credential):
+    content_types = ContentType.objects.get_for_models(CourseCertificate, ProgramCertificate)
+    if user_credential.credential_content_type_id == content_types[CourseCertificate].id:
+        invalidate_program_record_snapshots(
+            user__username=user_credential.username,
+            program__course_runs__coursecertificate=user_credential.credential_id,
+        )
+    elif user_credential.credential_content_type_id == content_types[ProgramCertificate].id:
+        invalidate_program_record_snapshots(
+            user__username=user_credential.username,
+            program__programcertificate=user_credential.credential_id,
+        )
+
+
+@receiver(post_save, sender=UserGrade)
+@receiver(post_delete, sender=UserGrade)
+def invalidate_user_grade_snapshots(instance, **kwargs):
+    invalidate_program_record_snapshots(user__username=instance.username, program__course_runs=instance.course_run_id)
+
+
+@receiver(post_save, sender=UserCredential)
+@receiver(post_delete, sender=UserCredential)
+def invalidate_user_credential_snapshots(instance, **kwargs):
+    _invalidate_user_credential_snapshots(instance)
+
+
+@receiver(post_save, sender=UserCredentialDateOverride)
+@receiver(post_delete, sender=UserCredentialDateOverride)
+def invalidate_date_override_snapshots(instance, **kwargs):
+    try:
+        user_credential = instance.user_credential
+    except UserCredential.DoesNotExist:
+        # The credential is being deleted along with its override, and its own receiver takes care of it.
+        return
+    _invalidate_user_credential_snapshots(user_credential)
+
+
+@receiver(post_save, sender=UserCreditPathway)
+@receiver(post_delete, sender=UserCreditPathway)
+def invalidate_user_credit_pathway_snapshots(instance, **kwargs):
+    invalidate_program_record_snapshots(user=instance.user_id, program__pathways=instance.pathway_id)
+
+
+@receiver(post_save, sender=CourseCertificate)
+def invalidate_course_certificate_snapshots(instance, **kwargs):
+    # The certificate_available_date decides which course credentials are visible on a record.
+    if instance.course_run_id:
+        invalidate_program_record_snapshots(program__course_runs=instance.course_run_id)
+
+
+@receiver(post_save, sender=Program)
+def invalidate_program_snapshots(instance, **kwargs):
+    invalidate_program_record_snapshots(program=instance)
+
+
+@receiver(post_save, sender=Pathway)
+def invalidate_pathway_snapshots(instance, **kwargs):
+    invalidate_program_record_snapshots(program__pathways=instance)
+
+
+@receiver(post_save, sender=Course)
+def invalidate_course_snapshots(instance, **kwargs):
+    # The course title is the name of its grades.
+    invalidate_program_record_snapshots(program__course_runs__course=instance)
+
+
+@receiver(post_save, sender=CourseRun)
+def invalidate_course_run_snapshots(instance, **kwargs):
+    invalidate_program_record_snapshots(program__course_runs=instance)
+
+
+@receiver(post_save, sender=Organization)
+def invalidate_organization_snapshots(instance, **kwargs):
+    # Organizations are the school of the programs they author, and of the grades of the courses they own.
+    invalidate_program_record_snapshots(program__authoring_organizations=instance)
+    invalidate_program_record_snapshots(program__course_runs__course__owners=instance)
+
+
+@receiver(m2m_changed, sender=Program.course_runs.through)
+@receiver(m2m_changed, sender=Program.authoring_organizations.through)
+@receiver(m2m_changed, sender=Pathway.programs.through)
+def invalidate_program_membership_snapshots(sender, instance, action, pk_set, **kwargs):
+    """Invalidates the records of the programs whose course runs, organizations or pathways changed."""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if isinstance(instance, Program):
+        invalidate_program_record_snapshots(program=instance)
+    elif pk_set:
+        # Seen from the course run, organization or pathway side, `pk_set` holds the ids of the programs.
+        invalidate_program_record_snapshots(program__in=pk_set)
+    else:
+        # A clear from the course run, organization or pathway side; look the programs up before they are unlinked.
+        program_ids = sender.objects.filter(**{instance._meta.model_name: instance.pk}).values("program")
+        invalidate_program_record_snapshots(program__in=program_ids)
+
+
+@receiver(m2m_changed, sender=Course.owners.through)
+def invalidate_course_owners_snapshots(instance, action, pk_set, **kwargs):
+    """Invalidates the records of the programs whose courses changed owners (the school of their grades)."""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if isinstance(instance, Course):
+        invalidate_program_record_snapshots(program__course_runs__course=instance)
+    elif pk_set:
+        # Seen from the organization side, `pk_set` holds the ids of the courses.
+        invalidate_program_record_snapshots(program__course_runs__course__in=pk_set)
+    else:
+        # A clear from the organization side, before its courses are unlinked.
+        invalidate_program_record_snapshots(program__course_runs__course__owners=instance)
+
+
+@receiver(CATALOG_PROGRAMS_CHANGED)
+def invalidate_catalog_programs_snapshots(program_ids, **kwargs):
+    """Invalidates the records of the programs changed by a bulk catalog sync (which sends no model signals)."""
+    invalidate_program_record_snapshots(program__in=program_ids)
@@ -5,8 +5,11 @@ Tests for the `api.py` file of the Records Django app.
 import datetime
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import connection
 from django.template.defaultfilters import slugify
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from credentials.apps.catalog.tests.factories import (
     CourseFactory,
@@ -21,6 +24,7 @@ from credentials.apps.credentials.api import get_credential_dates
 from credentials.apps.credentials.tests.factories import (
     CourseCertificateFactory,
     ProgramCertificateFactory,
+    UserCredentialDateOverrideFactory,
     UserCredentialFactory,
 )
 from credentials.apps.records.api import (
@@ -30,8 +34,14 @@ from credentials.apps.records.api import (
     _get_transformed_learner_data,
     _get_transformed_pathway_data,
     _get_transformed_program_data,
+    get_program_record_data,
+    invalidate_program_record_snapshots,
+    iter_program_records_csv_rows,
+    iter_program_records_data,
+    refresh_program_record_snapshot,
 )
 from credentials.apps.records.constants import UserCreditPathwayStatus
+from credentials.apps.records.models import UserGrade
 from credentials.apps.records.tests.factories import (
     ProgramCertRecordFactory,
     UserCreditPathwayFactory,
@@ -619,3 +629,210 @@ class ApiTests(SiteMixin, TestCase):
 
         result = _get_shared_program_cert_record_data(self.program1, self.user)
         assert result is None
+
+
+class ProgramRecordSnapshotTests(SiteMixin, TestCase):
+    """
+    Tests for the Program Record snapshots of the Records Django app's `api.py` file.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+        self.course_run = CourseRunFactory(course=CourseFactory(site=self.site))
+        self.program = ProgramFactory(site=self.site, course_runs=[self.course_run])
+        self.course_certificate = CourseCertificateFactory(
+            course_id=self.course_run.key, course_run=self.course_run, site=self.site
+        )
+        self.program_certificate = ProgramCertificateFactory(site=self.site, program=self.program)
+        self.course_credential = UserCredentialFactory(username=self.user.username, credential=self.course_certificate)
+        self.grade = UserGradeFactory(username=self.user.username, course_run=self.course_run, percent_grade=0.5)
+        self.snapshot = refresh_program_record_snapshot(self.program, self.user)
+
+    def _assert_stale(self, stale=True):
+        self.snapshot.refresh_from_db()
+        assert self.snapshot.is_stale() is stale
+
+    def test_get_program_record_data_uses_snapshot(self):
+        """Verify the record is served from the snapshot until it is invalidated."""
+        record = get_program_record_data(self.user, self.program.uuid, self.site)
+        assert record["grades"] == self.snapshot.data["grades"]
+        assert record["learner"]["username"] == self.user.username
+
+        # bypass the signals, so the snapshot doesn't know about the change
+        UserGrade.objects.filter(pk=self.grade.pk).update(percent_grade=0.9)
+        record = get_program_record_data(self.user, self.program.uuid, self.site)
+        assert record["grades"][0]["percent_grade"] == 0.5
+
+        invalidate_program_record_snapshots(program=self.program)
+        record = get_program_record_data(self.user, self.program.uuid, self.site)
+        assert record["grades"][0]["percent_grade"] == 0.9
+        self._assert_stale(False)
+
+    def test_unrelated_changes_keep_snapshot(self):
+        other_user = UserFactory()
+        UserGradeFactory(username=other_user.username, course_run=self.course_run)
+        UserCredentialFactory(username=other_user.username, credential=self.program_certificate)
+        UserGradeFactory(username=self.user.username)
+        self._assert_stale(False)
+
+    def test_grade_change_invalidates(self):
+        self.grade.percent_grade = 0.9
+        self.grade.save()
+        self._assert_stale()
+
+    def test_course_credential_change_invalidates(self):
+        self.course_credential.revoke()
+        self._assert_stale()
+
+    def test_program_credential_invalidates(self):
+        UserCredentialFactory(username=self.user.username, credential=self.program_certificate)
+        self._assert_stale()
+
+    def test_date_override_invalidates(self):
+        UserCredentialDateOverrideFactory(user_credential=self.course_credential)
+        self._assert_stale()
+
+    def test_credit_pathway_invalidates(self):
+        pathway = PathwayFactory(site=self.site, programs=[self.program])
+        self.snapshot = refresh_program_record_snapshot(self.program, self.user)
+        UserCreditPathwayFactory(user=self.user, pathway=pathway, status=UserCreditPathwayStatus.SENT)
+        self._assert_stale()
+
+    def test_catalog_membership_invalidates(self):
+        self.program.course_runs.add(CourseRunFactory(course=CourseFactory(site=self.site)))
+        self._assert_stale()
+
+    def test_catalog_membership_reverse_clear_invalidates(self):
+        self.course_run.programs.clear()
+        self._assert_stale()
+
+    def test_course_change_invalidates(self):
+        self.course_run.course.title = "New title"
+        self.course_run.course.save()
+        self._assert_stale()
+
+    def test_course_run_change_invalidates(self):
+        self.course_run.save()
+        self._assert_stale()
+
+    def test_course_owners_change_invalidates(self):
+        self.course_run.course.owners.add(OrganizationFactory(site=self.site))
+        self._assert_stale()
+
+    def test_course_owners_reverse_clear_invalidates(self):
+        organization = OrganizationFactory(site=self.site)
+        self.course_run.course.owners.add(organization)
+        self.snapshot = refresh_program_record_snapshot(self.program, self.user)
+        organization.owned_courses.clear()
+        self._assert_stale()
+
+    def test_organization_change_invalidates(self):
+        for organizations in (self.program.authoring_organizations, self.course_run.course.owners):
+            organization = OrganizationFactory(site=self.site)
+            organizations.add(organization)
+            self.snapshot = refresh_program_record_snapshot(self.program, self.user)
+            organization.name = "New name"
+            organization.save()
+            self._assert_stale()
+
+    def test_revoke_certificates_command_invalidates(self):
+        call_command(
+            "revoke_certificates",
+            "--lms_user_ids",
+            self.user.lms_user_id,
+            f"--credential_id={self.course_certificate.id}",
+            "--credential_type=coursecertificate",
+        )
+        self._assert_stale()
+
+    def test_certificate_becoming_visible_expires_snapshot(self):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self.course_certificate.certificate_available_date = now + datetime.timedelta(days=1)
+        self.course_certificate.save()
+        self.snapshot = refresh_program_record_snapshot(self.program, self.user)
+
+        assert self.snapshot.expires_at == self.course_certificate.certificate_available_date
+        assert self.snapshot.is_stale(now) is False
+        assert self.snapshot.is_stale(now + datetime.timedelta(days=2)) is True
+
+
+class ProgramRecordsExportTests(SiteMixin, TestCase):
+    """
+    Tests for the bulk (multi-learner) Program Records export of the Records Django app's `api.py` file.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course_runs = [CourseRunFactory(course=CourseFactory(site=self.site)) for _ in range(2)]
+        # a second attempt at the first course
+        self.course_runs.append(CourseRunFactory(course=self.course_runs[0].course))
+        for course_run in self.course_runs:
+            course_run.course.owners.set([OrganizationFactory(site=self.site), OrganizationFactory(site=self.site)])
+        self.program = ProgramFactory(site=self.site, course_runs=self.course_runs)
+        self.course_certificates = [
+            CourseCertificateFactory(course_id=course_run.key, course_run=course_run, site=self.site)
+            for course_run in self.course_runs
+        ]
+        self.users = [self._create_learner(index) for index in range(5)]
+        # a learner without a shared record isn't exported
+        UserGradeFactory(username=UserFactory().username, course_run=self.course_runs[0])
+
+    def _create_learner(self, index):
+        user = UserFactory()
+        ProgramCertRecordFactory(user=user, program=self.program)
+        for attempt, (course_run, course_certificate) in enumerate(zip(self.course_runs, self.course_certificates)):
+            if (index + attempt) % 3 == 0:
+                continue
+            user_credential = UserCredentialFactory(username=user.username, credential=course_certificate)
+            if index == attempt:
+                user_credential.revoke()
+            if index == 4:
+                UserCredentialDateOverrideFactory(user_credential=user_credential)
+            UserGradeFactory(
+                username=user.username,
+                course_run=course_run,
+                percent_grade=0.5 + (index + attempt) / 20,
+                letter_grade="" if index == 2 else "B",
+            )
+        return user
+
+    def test_matches_single_learner_records(self):
+        """Verify every learner's exported grade data is the one of their Program Record."""
+        exported = list(iter_program_records_data(self.program, chunk_size=2))
+
+        assert [learner_data["username"] for learner_data, __ in exported] == [user.username for user in self.users]
+        for user, (learner_data, grade_data) in zip(self.users, exported):
+            assert learner_data == _get_transformed_learner_data(user)
+            assert grade_data == _get_transformed_grade_data(self.program, user)[0]
+
+    def test_query_count_does_not_depend_on_learners(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                list(iter_program_records_data(self.program, chunk_size=100))
+            return len(queries)
+
+        expected = count_queries()
+        self.users += [self._create_learner(index) for index in range(5, 15)]
+        assert count_queries() == expected
+
+    def test_csv_rows(self):
+        rows = list(iter_program_records_csv_rows(self.program, "Test Platform", chunk_size=2))
+
+        assert rows[0] == ["Program Name", self.program.title]
+        assert rows[2] == ["Platform Provider", "Test Platform"]
+        assert rows[5] == [
+            "full_name",
+            "username",
+            "email",
+            "name",
+            "school",
+            "attempts",
+            "course_id",
+            "issue_date",
+            "percent_grade",
+            "letter_grade",
+        ]
+        # a row per learner and course
+        assert len(rows[6:]) == len(self.users) * 2
+        assert [row[1] for row in rows[6:8]] == [self.users[0].username] * 2
@@ -1,6 +1,8 @@
 import urllib
 from logging import DEBUG
+from uuid import uuid4
 
+import pytest
 from django.contrib.contenttypes.models import ContentType
 from django.core import mail
 from django.test import TestCase
@@ -9,6 +11,7 @@ from django.urls import reverse
 from rest_framework.test import APIRequestFactory
 
 from credentials.apps.catalog.data import ProgramStatus
+from credentials.apps.catalog.models import CourseRun, Program
 from credentials.apps.catalog.tests.factories import (
     CourseFactory,
     CourseRunFactory,
@@ -16,9 +19,10 @@ from credentials.apps.catalog.tests.factories import (
     PathwayFactory,
     ProgramFactory,
 )
-from credentials.apps.core.tests.factories import USER_PASSWORD, UserFactory
+from credentials.apps.core.tests.factories import USER_PASSWORD, SiteFactory, UserFactory
 from credentials.apps.core.tests.mixins import SiteMixin
 from credentials.apps.credentials.data import UserCredentialStatus
+from credentials.apps.credentials.models import CourseCertificate, ProgramCertificate, UserCredential
 from credentials.apps.credentials.tests.factories import (
     CourseCertificateFactory,
     ProgramCertificateFactory,
@@ -427,3 +431,60 @@ class GetProgramDataTests(SiteMixin, TestCase):
         assert result[1]["uuid"] == str(self.program2.uuid).replace("-", "")
         assert result[1]["completed"]
         assert not result[1]["empty"]
+
+
+def _create_programs_with_credentials(site, username, program_count):
+    """
+    Bulk creates `program_count` programs with two course runs each, and awards the learner a course credential in the
+    first run of every program and a program credential in every other program.
+    """
+    organization = OrganizationFactory(site=site)
+    course = CourseFactory(site=site)
+    course_runs = CourseRun.objects.bulk_create(
+        CourseRun(course=course, uuid=uuid4(), key=f"course-v1:edX+{index}+run") for index in range(program_count * 2)
+    )
+    programs = Program.objects.bulk_create(
+        Program(site=site, uuid=uuid4(), title=f"Program {index:04}", status=ProgramStatus.ACTIVE.value)
+        for index in range(program_count)
+    )
+    Program.course_runs.through.objects.bulk_create(
+        Program.course_runs.through(program=program, courserun=course_run, sort_value=index % 2)
+        for index, (program, course_run) in enumerate(zip([p for p in programs for __ in range(2)], course_runs))
+    )
+    Program.authoring_organizations.through.objects.bulk_create(
+        Program.authoring_organizations.through(program=program, organization=organization, sort_value=0)
+        for program in programs
+    )
+    course_certificates = CourseCertificate.objects.bulk_create(
+        CourseCertificate(site=site, course_id=course_run.key, course_run=course_run, certificate_type="verified")
+        for course_run in course_runs[::2]
+    )
+    program_certificates = ProgramCertificate.objects.bulk_create(
+        ProgramCertificate(site=site, program_uuid=program.uuid, program=program) for program in programs[::2]
+    )
+    content_types = ContentType.objects.get_for_models(CourseCertificate, ProgramCertificate)
+    UserCredential.objects.bulk_create(
+        UserCredential(
+            username=username,
+            credential_content_type=content_types[type(certificate)],
+            credential_id=certificate.id,
+        )
+        for certificate in course_certificates + program_certificates
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("include_empty_programs", [True, False])
+@pytest.mark.parametrize("program_count", [1, 50, 500])
+def test_get_user_program_data_query_count(django_assert_max_num_queries, program_count, include_empty_programs):
+    """Verify the records dashboard data is loaded in a fixed number of queries, however many programs there are."""
+    site = SiteFactory()
+    user = UserFactory()
+    _create_programs_with_credentials(site, user.username, program_count)
+
+    with django_assert_max_num_queries(7):
+        result = get_user_program_data(user.username, site, include_empty_programs=include_empty_programs)
+
+    assert len(result) == program_count
+    assert sum(program["completed"] for program in result) == (program_count + 1) // 2
+    assert not any(program["empty"] for program in result)
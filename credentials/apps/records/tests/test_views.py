@@ -408,6 +408,49 @@ class ProgramRecordCsvViewTests(SiteMixin, TestCase):
         self.assertEqual(200, response.status_code)
 
 
+class ProgramRecordsCsvExportViewTests(SiteMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.course_run = CourseRunFactory(course=CourseFactory(site=self.site))
+        self.program = ProgramFactory(site=self.site, course_runs=[self.course_run])
+        self.users = UserFactory.create_batch(3)
+        for user in self.users:
+            ProgramCertRecordFactory(user=user, program=self.program)
+            UserGradeFactory(username=user.username, course_run=self.course_run)
+        self.url = reverse("records:program_records_csv_export", kwargs={"uuid": self.program.uuid.hex})
+        self.staff = UserFactory(is_staff=True)
+
+    def test_streams_csv(self):
+        self.client.login(username=self.staff.username, password=USER_PASSWORD)
+        response = self.client.get(self.url)
+
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response["Content-Disposition"],
+            'attachment; filename="{}_grades.csv"'.format(self.program.title.replace(" ", "_").lower()),
+        )
+        body = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode("utf-8"))))
+        self.assertEqual(body[0], ["Program Name", self.program.title])
+        self.assertEqual(body[5][:3], ["full_name", "username", "email"])
+        self.assertEqual([row[1] for row in body[6:]], [user.username for user in self.users])
+
+    def test_staff_only(self):
+        response = self.client.get(self.url)
+        self.assertEqual(302, response.status_code)
+
+        self.client.login(username=self.users[0].username, password=USER_PASSWORD)
+        response = self.client.get(self.url)
+        self.assertEqual(403, response.status_code)
+
+    def test_other_site_program(self):
+        self.client.login(username=self.staff.username, password=USER_PASSWORD)
+        response = self.client.get(
+            reverse("records:program_records_csv_export", kwargs={"uuid": ProgramFactory().uuid.hex})
+        )
+        self.assertEqual(404, response.status_code)
+
+
 class LearnerRecordRedirectionTests(SiteMixin, TestCase):
     """
     Tests for the RecordsView and ProgramRecordsView views that ensure the system redirects learners' to the Learner
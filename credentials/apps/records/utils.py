@@ -136,7 +136,9 @@ def _course_credentials_to_course_runs(request_site, course_credentials):
     course_credential_ids = [
         x.credential_id for x in course_credentials if x.status == UserCredentialStatus.AWARDED.value
     ]
-    course_certificates = get_course_certificates_with_ids(course_credential_ids, request_site)
+    course_certificates = get_course_certificates_with_ids(course_credential_ids, request_site).select_related(
+        "course_run"
+    )
     return [course_cert.course_run for course_cert in course_certificates]
 
 
@@ -170,7 +172,7 @@ def get_user_program_data(
     if include_retired_programs:
         allowed_statuses.append(ProgramStatus.RETIRED.value)
 
-    # Get a list of programs
+    # Get a list of programs, with their organizations and course runs prefetched
     programs = get_filtered_programs(request_site, allowed_statuses, **course_filters)
 
     # Get the completed programs and a UUID set using the program_credentials
@@ -180,14 +182,15 @@ def get_user_program_data(
         program_certificate.program_uuid for program_certificate in program_certificates
     )
 
+    # Only read the prefetched relations below, anything else would cost a query per program
     return [
         {
             "name": program.title,
-            "partner": ", ".join(program.authoring_organizations.values_list("name", flat=True)),
+            "partner": ", ".join(organization.name for organization in program.authoring_organizations.all()),
             "uuid": program.uuid.hex,
             "type": slugify(program.type),
             "completed": program.uuid in completed_program_uuids,
-            "empty": not bool(course_runs.intersection(frozenset(program.course_runs.all()))),
+            "empty": course_runs.isdisjoint(program.course_runs.all()),
         }
         for program in programs
     ]
@@ -9,8 +9,8 @@ from uuid import uuid4
 from django import http
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.mixins import AccessMixin, LoginRequiredMixin
-from django.http import Http404, HttpRequest, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.contrib.auth.mixins import AccessMixin, LoginRequiredMixin, UserPassesTestMixin
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.utils.decorators import method_decorator
@@ -24,7 +24,7 @@ from credentials.apps.catalog.models import Pathway, Program
 from credentials.apps.core.api import get_user_by_username
 from credentials.apps.core.views import ThemeViewMixin
 from credentials.apps.credentials.models import ProgramCertificate, UserCredential
-from credentials.apps.records.api import get_program_record_data
+from credentials.apps.records.api import get_program_record_data, iter_program_records_csv_rows
 from credentials.apps.records.constants import UserCreditPathwayStatus
 from credentials.apps.records.messages import ProgramCreditRequest
 from credentials.apps.records.models import ProgramCertRecord, UserCreditPathway
@@ -373,3 +373,36 @@ class ProgramRecordCsvView(RecordsEnabledMixin, View):
         filename = filename.replace(" ", "_").lower()
         response["Content-Disposition"] = 'attachment; filename="{filename}.csv"'.format(filename=filename)
         return response
+
+
+class _Echo:
+    """
+    A file-like object that returns what is written to it, so a csv.writer's rows can be streamed as they are written.
+    """
+
+    def write(self, value):
+        return value
+
+
+class ProgramRecordsCsvExportView(LoginRequiredMixin, UserPassesTestMixin, RecordsEnabledMixin, View):
+    """
+    Streams a csv report of the Program Records of every learner who has shared a record in a Program (staff only).
+
+    Learners are loaded in chunks while the response is being sent, so the report can cover any number of learners.
+    """
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request: HttpRequest, *args, **kwargs):
+        program = get_object_or_404(Program, uuid=kwargs.get("uuid"), site=request.site)
+        platform_name = request.site.siteconfiguration.platform_name
+
+        writer = csv.writer(_Echo(), quoting=csv.QUOTE_ALL)
+        response = StreamingHttpResponse(
+            (writer.writerow(row) for row in iter_program_records_csv_rows(program, platform_name)),
+            content_type="text/csv",
+        )
+        filename = "{program_name}_grades".format(program_name=program.title).replace(" ", "_").lower()
+        response["Content-Disposition"] = 'attachment; filename="{filename}.csv"'.format(filename=filename)
+        return response
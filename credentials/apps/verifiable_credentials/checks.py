@@ -4,6 +4,7 @@ Verifiable Credentials self-checks.
 
 from django.core.checks import Error, Tags, register
 
+from .issuance.verification import SELF_VERIFICATION_POLICIES
 from .settings import vc_settings
 from .toggles import ENABLE_VERIFIABLE_CREDENTIALS
 
@@ -18,6 +19,7 @@ def vc_settings_checks(*args, **kwargs):
         - No default storages defined
         - DEFAULT_ISSUER[ID] is not set
         - DEFAULT_ISSUER[KEY] is not set
+        - SELF_VERIFICATION_POLICY is unknown
 
     Returns:
         List of any Errors.
@@ -60,4 +62,13 @@ def vc_settings_checks(*args, **kwargs):
             )
         )
 
+    if vc_settings.SELF_VERIFICATION_POLICY not in SELF_VERIFICATION_POLICIES:
+        errors.append(
+            Error(
+                f"Unknown SELF_VERIFICATION_POLICY: {vc_settings.SELF_VERIFICATION_POLICY}.",
+                hint=f"Set SELF_VERIFICATION_POLICY to one of: {', '.join(SELF_VERIFICATION_POLICIES)}.",
+                id="verifiable_credentials.E006",
+            )
+        )
+
     return errors
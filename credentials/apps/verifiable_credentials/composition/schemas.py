@@ -15,7 +15,7 @@ class EducationalOccupationalProgramSchema(serializers.Serializer):  # pylint: d
     TYPE = "EducationalOccupationalProgram"
 
     id = serializers.CharField(default=TYPE, help_text="https://schema.org/EducationalOccupationalProgram")
-    name = serializers.CharField(source="user_credential.credential.program.title")
+    name = serializers.CharField(source="program.title")
     description = serializers.CharField(source="user_credential.credential.program_uuid")
 
     class Meta:
@@ -54,9 +54,9 @@ class EducationalOccupationalCredentialSchema(serializers.Serializer):  # pylint
         """
         representation = super().to_representation(instance)
 
-        if instance.user_credential.credential_content_type.model == CredentialsType.PROGRAM:
+        if instance.credential_content_type == CredentialsType.PROGRAM:
             representation["program"] = EducationalOccupationalProgramSchema(instance).data
-        elif instance.user_credential.credential_content_type.model == CredentialsType.COURSE:
+        elif instance.credential_content_type == CredentialsType.COURSE:
             representation["course"] = EducationalOccupationalCourseSchema(instance).data
 
         return representation
@@ -1,10 +1,6 @@
-import base64
-import gzip
-
 from django.utils.translation import gettext as _
 from rest_framework import serializers
 
-from ..settings import vc_settings
 from . import CredentialDataModel
 
 
@@ -139,21 +135,12 @@ class CredentialWithStatusList2021DataModel(
 
 def regenerate_encoded_status_sequence(issuer_id):
     """
-    Create Status List indecies sequence from scratch for given Issuer.
+    Status List sequence for given Issuer (compressed, encoded).
 
-    - create zero byte sequence of configured length
-    - find all related to revoked credentials indicies
-    - mark revoked
-    - compress
-    - encode
+    The sequence is maintained as a bit-packed bitmap (one bit per position), updated in place on credential
+    status changes, so it's not regenerated from the issuance lines here; the encoded form is recomputed only
+    if the bitmap changed since the last time.
     """
-    from ..issuance.utils import get_revoked_indices  # pylint: disable=import-outside-toplevel
-
-    status_list = bytearray(vc_settings.STATUS_LIST_LENGTH)
-
-    for index in get_revoked_indices(issuer_id):
-        status_list[index] = 1
+    from ..issuance.models import StatusListBitmap  # pylint: disable=import-outside-toplevel
 
-    gzip_data = gzip.compress(status_list)
-    base64_data = base64.b64encode(gzip_data)
-    return base64_data.decode("utf-8")
+    return StatusListBitmap.get_for_issuer(issuer_id).get_encoded_list()
@@ -1,6 +1,8 @@
 import pytest
 from django.test import TestCase
 
+from credentials.apps.verifiable_credentials.issuance.models import IssuanceLine
+
 from ..open_badges import AchievementSchema, CredentialSubjectSchema, OpenBadges301DataModel, OpenBadgesDataModel
 
 
@@ -199,3 +201,27 @@ class TestOpenBadgesDataModel:
         composed_obv3 = OpenBadgesDataModel(course_issuance_line).data
 
         assert composed_obv3["credentialSubject"]["achievement"]["criteria"]["narrative"] == expected_narrative_value
+
+    @pytest.mark.django_db
+    @pytest.mark.usefixtures("site_configuration")
+    @pytest.mark.parametrize(
+        "issuance_line_fixture,expected_queries",
+        [
+            # user credential, credential, site, site configuration, program, organizations, courses count,
+            # issuers registry, subject:
+            ("program_issuance_line", 9),
+            # user credential, credential, site, site configuration, course run, course, issuers registry, subject:
+            ("course_issuance_line", 8),
+        ],
+    )
+    def test_composition_queries(self, request, django_assert_num_queries, issuance_line_fixture, expected_queries):
+        """
+        Composition queries count doesn't depend on how many times properties are used.
+        """
+        issuance_line = IssuanceLine.objects.get(uuid=request.getfixturevalue(issuance_line_fixture).uuid)
+
+        with django_assert_num_queries(expected_queries):
+            OpenBadges301DataModel(issuance_line).data  # pylint: disable=expression-not-assigned
+
+        with django_assert_num_queries(0):
+            OpenBadges301DataModel(issuance_line).data  # pylint: disable=expression-not-assigned
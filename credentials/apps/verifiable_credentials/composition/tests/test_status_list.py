@@ -29,11 +29,9 @@ class StatusListCompositionTestCase(TestCase):
         decompressed_data = gzip.decompress(decoded_data)
         status_list = bytearray(decompressed_data)
 
-        for i in range(5):
-            if i in mock_get_revoked_indices.return_value:
-                self.assertEqual(status_list[i], 1)
-            else:
-                self.assertEqual(status_list[i], 0)
+        # one bit per position, the first one is the left-most:
+        self.assertEqual(status_list[0], 0b01010100)
+        self.assertFalse(any(status_list[1:]))
 
     def test_status_list_2021_entry_mixin_get_context(self):
         self.assertEqual(type(StatusList2021EntryMixin.get_context()), list)
@@ -10,7 +10,11 @@ from credentials.apps.catalog.tests.factories import (
 from credentials.apps.core.tests.factories import UserFactory
 from credentials.apps.core.tests.mixins import SiteMixin
 from credentials.apps.credentials.tests.factories import ProgramCertificateFactory, UserCredentialFactory
-from credentials.apps.verifiable_credentials.issuance.tests.factories import IssuanceLineFactory
+from credentials.apps.verifiable_credentials.issuance.models import IssuanceLine
+from credentials.apps.verifiable_credentials.issuance.tests.factories import (
+    IssuanceConfigurationFactory,
+    IssuanceLineFactory,
+)
 from credentials.apps.verifiable_credentials.storages.learner_credential_wallet import LCWallet
 
 from ..verifiable_credentials import VerifiableCredentialsDataModel
@@ -58,3 +62,20 @@ class VerifiableCredentialsTestCase(SiteMixin, TestCase):
         )
         credential_types = VerifiableCredentialsDataModel().resolve_credential_type(issuance_line_without_credential)
         self.assertEqual(credential_types, [])
+
+    def test_composition_queries(self):
+        """
+        Composition data is loaded at once (see `IssuanceContext`), regardless of properties usage.
+        """
+        IssuanceConfigurationFactory.create(issuer_id="test-issuer-id-1", issuer_name="Test Issuer")
+        issuance_line = IssuanceLine.objects.get(uuid=self.issuance_line_program_certificate.uuid)
+
+        # user credential, credential, site, site configuration, program, organizations, courses count,
+        # issuers registry, subject:
+        with self.assertNumQueries(9):
+            composed = VerifiableCredentialsDataModel(issuance_line).data
+
+        self.assertEqual(composed["issuer"]["name"], "Test Issuer")
+        self.assertEqual(
+            composed["credentialSubject"]["hasCredential"]["program"]["name"], self.program_cert.program.title
+        )
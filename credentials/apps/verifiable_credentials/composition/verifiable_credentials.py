@@ -42,7 +42,7 @@ class VerifiableCredentialsDataModel(CredentialWithStatusList2021DataModel):  #
         if not issuance_line.user_credential:
             return []
 
-        credential_content_type = issuance_line.user_credential.credential_content_type.model
+        credential_content_type = issuance_line.credential_content_type
 
         # configuration: Open edX internal credential type <> verifiable credential type
         credential_types = {
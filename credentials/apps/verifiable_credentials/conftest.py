@@ -16,6 +16,7 @@ from credentials.apps.credentials.tests.factories import (
     ProgramCertificateFactory,
     UserCredentialFactory,
 )
+from credentials.apps.verifiable_credentials.issuance.registry import invalidate_issuer_registry
 from credentials.apps.verifiable_credentials.issuance.tests.factories import IssuanceLineFactory
 
 
@@ -31,6 +32,14 @@ def vc_enabled(settings):
     settings.ENABLE_VERIFIABLE_CREDENTIALS = True
 
 
+@pytest.fixture(autouse=True)
+def fresh_issuer_registry():
+    """
+    Issuance configurations rolled back after a test don't invalidate the (process-wide) issuers registry.
+    """
+    invalidate_issuer_registry()
+
+
 @pytest.fixture()
 def vc_disabled(settings):
     settings.ENABLE_VERIFIABLE_CREDENTIALS = False
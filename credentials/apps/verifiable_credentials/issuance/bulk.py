@@ -0,0 +1,183 @@
+"""
+Bulk verifiable credentials issuance.
+
+Issues many (already initiated) issuance lines at once, e.g. to push a whole cohort's credentials:
+
+- issuance lines are loaded in chunks, with their issuers and composition data fetched in bulk (see
+  `IssuanceContext`);
+- credentials are composed in the calling thread (database access), then signed and verified concurrently
+  on a bounded asyncio pool (didkit functions are coroutines);
+- results are yielded chunk by chunk, so they can be streamed back (see `BulkIssueCredentialsView`).
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+import didkit
+from asgiref.sync import async_to_sync
+from django.utils import timezone
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import ValidationError
+
+from ..settings import vc_settings
+from . import IssuanceException
+from .context import IssuanceContext
+from .main import CredentialIssuer
+from .models import IssuanceLine
+from .utils import get_issuer_key
+from .verification import is_verification_deferred, record_verification, should_verify_inline, verify_deferred
+
+
+logger = logging.getLogger(__name__)
+
+ISSUED = "issued"
+FAILED = "failed"
+
+
+class BulkCredentialIssuer:
+    """
+    Issue verifiable credentials for many issuance lines.
+
+    Args:
+        issuance_uuids: identifiers of the issuance lines to process
+        concurrency: (optional) max number of credentials signed at once
+        chunk_size: (optional) number of issuance lines loaded and processed at once
+
+    Yields (see `issue`) a result per issuance line, in the given order:
+        {"issuance_uuid": ..., "status": "issued", "verifiable_credential": {...}}
+        {"issuance_uuid": ..., "status": "failed", "error": "..."}
+    """
+
+    def __init__(self, issuance_uuids, *, concurrency=None, chunk_size=None):
+        self.issuance_uuids = [str(issuance_uuid) for issuance_uuid in issuance_uuids]
+        self.concurrency = concurrency or vc_settings.BULK_ISSUANCE_CONCURRENCY
+        self.chunk_size = chunk_size or vc_settings.BULK_ISSUANCE_CHUNK_SIZE
+        self._issuer_keys = {}
+
+    def issue(self):
+        for start in range(0, len(self.issuance_uuids), self.chunk_size):
+            yield from self.issue_chunk(self.issuance_uuids[start : start + self.chunk_size])
+
+    def issue_chunk(self, issuance_uuids):
+        """
+        Compose, sign and verify a chunk of issuance lines, then finalize the issued ones.
+        """
+        issuance_lines = {
+            str(issuance_line.uuid): issuance_line
+            for issuance_line in IssuanceLine.objects.filter(uuid__in=issuance_uuids)
+            .select_related("user_credential__credential_content_type")
+            .prefetch_related("user_credential__credential")
+        }
+        self._load_issuer_keys({issuance_line.issuer_id for issuance_line in issuance_lines.values()})
+        IssuanceContext.load_many(issuance_lines.values())
+
+        results, composed = {}, {}
+        for issuance_uuid in issuance_uuids:
+            try:
+                composed[issuance_uuid] = self.compose(issuance_uuid, issuance_lines.get(issuance_uuid))
+            except (ValidationError, IssuanceException) as exc:
+                results[issuance_uuid] = self._failure(issuance_uuid, exc.detail)
+            except Exception as exc:
+                # a single broken issuance line mustn't fail the whole chunk:
+                logger.exception("Bulk issuance composition failed for issuance line [%s]", issuance_uuid)
+                results[issuance_uuid] = self._failure(issuance_uuid, exc)
+
+        signed = async_to_sync(self.sign_all)(
+            {
+                issuance_uuid: (composed_credential, self._issuer_keys[issuance_lines[issuance_uuid].issuer_id])
+                for issuance_uuid, composed_credential in composed.items()
+            }
+        )
+        verification_statuses = defaultdict(list)
+        for issuance_uuid, (verifiable_credential_json, error, verification_status) in signed.items():
+            if verification_status is None and error is None:
+                if is_verification_deferred():
+                    verification_status = IssuanceLine.VERIFICATION_STATUSES.pending
+                    verify_deferred(issuance_uuid, verifiable_credential_json)
+                else:
+                    verification_status = IssuanceLine.VERIFICATION_STATUSES.skipped
+            if verification_status is not None:
+                verification_statuses[verification_status].append(issuance_uuid)
+
+            if error is None:
+                results[issuance_uuid] = {
+                    "issuance_uuid": issuance_uuid,
+                    "status": ISSUED,
+                    "verifiable_credential": json.loads(verifiable_credential_json),
+                }
+            else:
+                results[issuance_uuid] = self._failure(issuance_uuid, error)
+
+        issued = [issuance_uuid for issuance_uuid, result in results.items() if result["status"] == ISSUED]
+        IssuanceLine.objects.filter(uuid__in=issued).update(processed=True, modified=timezone.now())
+        for verification_status, verified_uuids in verification_statuses.items():
+            record_verification(verified_uuids, verification_status)
+
+        for issuance_uuid in issuance_uuids:
+            yield results[issuance_uuid]
+
+    def compose(self, issuance_uuid, issuance_line):
+        if issuance_line is None:
+            raise ValidationError(
+                _("Couldn't find such issuance line: [{issuance_uuid}]").format(issuance_uuid=issuance_uuid)
+            )
+        if issuance_line.issuer_id not in self._issuer_keys:
+            raise ValidationError(
+                _("Can't find an Issuer with such ID [{issuer_id}]").format(issuer_id=issuance_line.issuer_id)
+            )
+        return CredentialIssuer(issuance_uuid=issuance_uuid, issuance_line=issuance_line).compose()
+
+    async def sign_all(self, composed):
+        """
+        Sign (and verify) composed credentials concurrently, at most `concurrency` at a time.
+
+        Returns:
+            dict: (verifiable credential JSON, error, verification status) per issuance line, the verification
+                status is None if the credential wasn't verified inline (see the self-verification policy)
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        options = json.dumps(CredentialIssuer.SIGNATURE_OPTIONS)
+
+        async def sign(composed_credential_json, issuer_key):
+            async with semaphore:
+                try:
+                    verifiable_credential_json = await didkit.issue_credential(
+                        composed_credential_json, options, issuer_key
+                    )
+                except (didkit.DIDKitException, ValueError) as exc:
+                    return None, _("Provided data didn't validate [{error}]").format(error=exc), None
+
+                # see the self-verification policy:
+                if not should_verify_inline():
+                    return verifiable_credential_json, None, None
+
+                try:
+                    await didkit.verify_credential(verifiable_credential_json, json.dumps({}))
+                except didkit.DIDKitException as exc:
+                    return (
+                        None,
+                        _("Issued verifiable credential can't be verified! [{error}]").format(error=exc),
+                        IssuanceLine.VERIFICATION_STATUSES.failed,
+                    )
+
+                return verifiable_credential_json, None, IssuanceLine.VERIFICATION_STATUSES.passed
+
+        issuance_uuids = list(composed)
+        signed = await asyncio.gather(*(sign(*composed[issuance_uuid]) for issuance_uuid in issuance_uuids))
+        return dict(zip(issuance_uuids, signed))
+
+    def _load_issuer_keys(self, issuer_ids):
+        for issuer_id in issuer_ids - self._issuer_keys.keys():
+            if (issuer_key := get_issuer_key(issuer_id)) is not None:
+                self._issuer_keys[issuer_id] = issuer_key
+
+    @staticmethod
+    def _failure(issuance_uuid, error):
+        # validation errors details are nested ({"reason": ["..."]}), report the message only:
+        while isinstance(error, (dict, list)):
+            error = next(iter(error.values() if isinstance(error, dict) else error), "")
+        error = str(error)
+        logger.warning("Bulk issuance failed for issuance line [%s]: %s", issuance_uuid, error)
+        return {"issuance_uuid": issuance_uuid, "status": FAILED, "error": error}
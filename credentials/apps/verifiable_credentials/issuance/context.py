@@ -0,0 +1,170 @@
+"""
+Issuance context: everything verifiable credential composition needs, loaded upfront.
+
+Data models (see `composition`) read issuance line properties (issuer name, credential name and description,
+program/course details, subject name, etc.), many of them several times. Instead of resolving those lazily
+(one or more queries per property access), the related objects are loaded at once, in a fixed number of queries
+for any number of issuance lines (see `IssuanceContext.load_many`).
+"""
+
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, F, prefetch_related_objects
+
+from credentials.apps.catalog.models import Course, Program
+from credentials.apps.credentials.models import CourseCertificate, ProgramCertificate, UserCredential
+
+
+User = get_user_model()
+
+
+class IssuanceContext:
+    """
+    Preloaded issuance line's related data (issuer, user credential and its credential, program or course,
+    organizations, site configuration, subject).
+    """
+
+    def __init__(
+        self,
+        issuance_line,
+        *,
+        issuer=None,
+        subject_fullname=None,
+        organization_names=None,
+        course_count=0,
+        course_by_key=None,
+    ):
+        self.issuance_line = issuance_line
+        self.issuer = issuer
+        self.subject_fullname = subject_fullname
+        self.organization_names = organization_names or []
+        self.course_count = course_count
+        # course of a course certificate without course run, found by its (legacy) course run key:
+        self.course_by_key = course_by_key
+
+    @property
+    def user_credential(self):
+        return self.issuance_line.user_credential
+
+    @property
+    def credential(self):
+        return getattr(self.user_credential, "credential", None)
+
+    @property
+    def credential_content_type(self):
+        return self.user_credential.credential_content_type.model
+
+    @property
+    def issuer_name(self):
+        return getattr(self.issuer, "issuer_name", None)
+
+    @property
+    def program(self):
+        return getattr(self.credential, "program", None)
+
+    @property
+    def course(self):
+        if course_run := getattr(self.credential, "course_run", None):
+            return course_run.course
+        return self.course_by_key
+
+    @property
+    def platform_name(self):
+        # prefetched missing site configuration is None (instead of raising):
+        if not (site_configuration := getattr(self.credential.site, "siteconfiguration", None)):
+            return ""
+        return site_configuration.platform_name
+
+    @classmethod
+    def load(cls, issuance_line):
+        return cls.load_many([issuance_line])[0]
+
+    @classmethod
+    def load_many(cls, issuance_lines):
+        """
+        Loads issuance contexts for the given issuance lines (and attaches them to the lines).
+
+        Already loaded related objects are reused as is.
+        """
+        from .registry import get_issuer_registry  # pylint: disable=import-outside-toplevel
+
+        issuance_lines = list(issuance_lines)
+        prefetch_related_objects(issuance_lines, "user_credential")
+        user_credentials = [
+            issuance_line.user_credential for issuance_line in issuance_lines if issuance_line.user_credential
+        ]
+
+        # content types are cached process-wide:
+        content_type_field = UserCredential._meta.get_field("credential_content_type")
+        for user_credential in user_credentials:
+            if not content_type_field.is_cached(user_credential):
+                user_credential.credential_content_type = ContentType.objects.get_for_id(
+                    user_credential.credential_content_type_id
+                )
+        prefetch_related_objects(user_credentials, "credential")
+
+        credentials = defaultdict(list)
+        for user_credential in user_credentials:
+            if user_credential.credential is not None:
+                credentials[type(user_credential.credential)].append(user_credential.credential)
+        program_certificates = credentials[ProgramCertificate]
+        course_certificates = credentials[CourseCertificate]
+
+        prefetch_related_objects(
+            [credential for group in credentials.values() for credential in group], "site__siteconfiguration"
+        )
+        prefetch_related_objects(program_certificates, "program__authoring_organizations")
+        prefetch_related_objects(course_certificates, "course_run__course")
+
+        # course certificates without course run are matched with their course by the course run key:
+        course_keys = {
+            certificate.course_id
+            for certificate in course_certificates
+            if certificate.course_run_id is None and certificate.course_id
+        }
+        courses_by_key = {}
+        if course_keys:
+            for course in (
+                Course.objects.filter(course_runs__key__in=course_keys)
+                .annotate(course_run_key=F("course_runs__key"))
+                .order_by("id")
+            ):
+                courses_by_key.setdefault(course.course_run_key, course)
+
+        program_ids = {certificate.program_id for certificate in program_certificates if certificate.program_id}
+        course_counts = (
+            dict(
+                Program.objects.filter(id__in=program_ids)
+                .annotate(course_count=Count("course_runs"))
+                .values_list("id", "course_count")
+            )
+            if program_ids
+            else {}
+        )
+        issuer_registry = get_issuer_registry()
+        usernames = {user_credential.username for user_credential in user_credentials}
+        fullnames = (
+            dict(User.objects.filter(username__in=usernames).values_list("username", "full_name")) if usernames else {}
+        )
+
+        contexts = []
+        for issuance_line in issuance_lines:
+            user_credential = issuance_line.user_credential
+            credential = getattr(user_credential, "credential", None)
+            program = getattr(credential, "program", None)
+            context = cls(
+                issuance_line,
+                issuer=issuer_registry.get_issuer(issuance_line.issuer_id),
+                subject_fullname=fullnames.get(getattr(user_credential, "username", None)),
+                organization_names=(
+                    [organization.name for organization in program.authoring_organizations.all()] if program else []
+                ),
+                course_count=course_counts.get(getattr(program, "id", None), 0),
+                course_by_key=courses_by_key.get(getattr(credential, "course_id", None)),
+            )
+            issuance_line.issuance_context = context
+            contexts.append(context)
+
+        return contexts
@@ -13,10 +13,11 @@ from rest_framework.exceptions import ValidationError
 from credentials.apps.credentials.constants import UserCredentialStatus
 
 from ..issuance import IssuanceException
-from ..issuance.utils import didkit_issue_credential, didkit_verify_credential, get_issuer
+from ..issuance.utils import didkit_issue_credential, didkit_verify_credential, get_issuer_key
 from ..settings import vc_settings
 from ..storages.utils import get_storage
 from .models import IssuanceLine
+from .verification import is_verification_deferred, record_verification, should_verify_inline, verify_deferred
 
 
 logger = logging.getLogger(__name__)
@@ -41,17 +42,23 @@ class CredentialIssuer:
         UserCredentialStatus.REVOKED,
     ]
 
-    def __init__(self, *, issuance_uuid, data=None):
-        self._issuance_line = self._pickup_issuance_line(issuance_uuid)
+    # NOTE: currently, the Ed25519Signature2020 Linked Data Proof suite is used exclusively (see `sign`)
+    SIGNATURE_OPTIONS = {
+        "type": "Ed25519Signature2020",
+    }
+
+    def __init__(self, *, issuance_uuid, data=None, issuance_line=None):
+        self._issuance_line = self._pickup_issuance_line(issuance_uuid, issuance_line=issuance_line)
         self._storage = self._issuance_line.storage
         if data is not None:
             self._validate(data)
 
-    def _pickup_issuance_line(self, issuance_uuid):
+    def _pickup_issuance_line(self, issuance_uuid, issuance_line=None):
         """
-        Find previously initiated issuance line for processing.
+        Find previously initiated issuance line for processing (unless it's already loaded).
         """
-        issuance_line = IssuanceLine.objects.filter(uuid=issuance_uuid).first()
+        if issuance_line is None:
+            issuance_line = IssuanceLine.objects.filter(uuid=issuance_uuid).first()
         if not issuance_line:
             msg = _("Couldn't find such issuance line: [{issuance_uuid}]").format(issuance_uuid=issuance_uuid)
             logger.exception(msg)
@@ -98,14 +105,11 @@ class CredentialIssuer:
         """
         err_message = _("Provided data didn't validate")
 
-        didkit_options = {
-            "type": "Ed25519Signature2020",
-        }
-        issuer_key = get_issuer(self._issuance_line.issuer_id).issuer_key
+        issuer_key = get_issuer_key(self._issuance_line.issuer_id)
 
         try:
             verifiable_credential_json = didkit_issue_credential(
-                composed_credential_json, json.dumps(didkit_options), issuer_key
+                composed_credential_json, json.dumps(self.SIGNATURE_OPTIONS), issuer_key
             )
         except didkit.DIDKitException as exc:  # pylint: disable=no-member, useless-suppression
             logger.exception(err_message)
@@ -143,8 +147,19 @@ class CredentialIssuer:
         # signing / structure validation:
         verifiable_credential_json = self.sign(composed_credential)
 
-        # check it's verifiable:
-        self.verify(verifiable_credential_json)
+        # check it's verifiable (see the self-verification policy):
+        if should_verify_inline():
+            try:
+                self.verify(verifiable_credential_json)
+            except IssuanceException as exc:
+                record_verification([self._issuance_line.uuid], IssuanceLine.VERIFICATION_STATUSES.failed, error=exc)
+                raise
+            self._issuance_line.verification_status = IssuanceLine.VERIFICATION_STATUSES.passed
+        elif is_verification_deferred():
+            self._issuance_line.verification_status = IssuanceLine.VERIFICATION_STATUSES.pending
+            verify_deferred(self._issuance_line.uuid, verifiable_credential_json)
+        else:
+            self._issuance_line.verification_status = IssuanceLine.VERIFICATION_STATUSES.skipped
 
         # issuance line finalization:
         self._issuance_line.finalize()
@@ -164,11 +179,19 @@ class CredentialIssuer:
         if issuer_id is None:
             issuer_id = IssuanceLine.resolve_issuer().issuer_id
 
+        lookup = {
+            "storage_id": storage_id,
+            "user_credential": user_credential,
+            "issuer_id": issuer_id,
+            "processed": not bool(user_credential),
+        }
+        issuance_line = IssuanceLine.objects.filter(**lookup).first()
+        if issuance_line:
+            return issuance_line
+
+        # status list position is taken only for a new issuance line (outside of its creation transaction):
         issuance_line, __ = IssuanceLine.objects.get_or_create(
-            storage_id=storage_id,
-            user_credential=user_credential,
-            issuer_id=issuer_id,
-            processed=not bool(user_credential),
+            **lookup,
             defaults={
                 "data_model_id": data_model.ID,
                 "status_index": user_credential and IssuanceLine.get_next_status_index(issuer_id),
@@ -2,17 +2,21 @@
 Verifiable Credentials DB models.
 """
 
+import base64
+import gzip
+import logging
+import math
 import uuid
 from urllib.parse import urljoin
 
 from crum import get_current_request
-from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.urls import reverse
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
+from model_utils import Choices
 
-from credentials.apps.catalog.models import Course
 from credentials.apps.credentials.models import UserCredential
 from credentials.apps.verifiable_credentials.utils import capitalize_first
 
@@ -22,7 +26,7 @@ from ..settings import vc_settings
 from ..storages.utils import get_storage
 
 
-User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 def generate_data_model_choices():
@@ -73,6 +77,14 @@ class IssuanceLine(TimeStampedModel):
         blank=True,
         help_text=_("Keeps track on a corresponding user credential's status"),
     )
+    VERIFICATION_STATUSES = Choices("pending", "passed", "failed", "skipped")
+    verification_status = models.CharField(
+        max_length=32,
+        null=True,
+        blank=True,
+        choices=VERIFICATION_STATUSES,
+        help_text=_("Issued verifiable credential self-verification outcome"),
+    )
 
     class Meta:
         ordering = ("created",)
@@ -96,11 +108,18 @@ class IssuanceLine(TimeStampedModel):
     def data_model_name(self):
         return self.data_model and self.data_model.NAME
 
+    @cached_property
+    def issuance_context(self):
+        """
+        Related data used for composition, loaded at once (see `IssuanceContext`).
+        """
+        from .context import IssuanceContext  # pylint: disable=import-outside-toplevel
+
+        return IssuanceContext.load(self)
+
     @property
     def issuer_name(self):
-        from .utils import get_issuer  # pylint: disable=import-outside-toplevel
-
-        return getattr(get_issuer(self.issuer_id), "issuer_name", None)
+        return self.issuance_context.issuer_name
 
     @property
     def credential_verbose_type(self):
@@ -148,9 +167,9 @@ class IssuanceLine(TimeStampedModel):
             ).format(
                 credential_type=self.credential_verbose_type,
                 program_title=self.program.title,
-                organizations=", ".join(list(self.program.authoring_organizations.values_list("name", flat=True))),
+                organizations=", ".join(self.issuance_context.organization_names),
                 platform_name=self.platform_name,
-                course_count=self.program.course_runs.count(),
+                course_count=self.issuance_context.course_count,
                 effort_info=effort_portion,
             )
         elif self.credential_content_type == CredentialsType.COURSE:
@@ -175,7 +194,7 @@ class IssuanceLine(TimeStampedModel):
             ).format(
                 recipient_fullname=self.subject_fullname or _("recipient"),
                 program_title=self.program.title,
-                organizations=", ".join(list(self.program.authoring_organizations.values_list("name", flat=True))),
+                organizations=", ".join(self.issuance_context.organization_names),
                 platform_name=self.platform_name,
             )
         elif self.credential_content_type == CredentialsType.COURSE:
@@ -191,26 +210,23 @@ class IssuanceLine(TimeStampedModel):
 
     @property
     def credential_content_type(self):
-        return self.user_credential.credential_content_type.model
+        return self.issuance_context.credential_content_type
 
     @property
     def program(self):
-        return getattr(self.user_credential.credential, "program", None)
+        return self.issuance_context.program
 
     @property
     def course(self):
-        course_id = getattr(self.user_credential.credential, "course_id", None)
-        return Course.objects.filter(course_runs__key=course_id).first()
+        return self.issuance_context.course
 
     @property
     def platform_name(self):
-        if not (site_configuration := getattr(self.user_credential.credential.site, "siteconfiguration", "")):
-            return site_configuration
-        return site_configuration.platform_name
+        return self.issuance_context.platform_name
 
     @property
     def subject_fullname(self):
-        return User.objects.filter(username=self.user_credential.username).values_list("full_name", flat=True).first()
+        return self.issuance_context.subject_fullname
 
     def construct(self, context):
         serializer = self.data_model(self, context=context)
@@ -252,10 +268,18 @@ class IssuanceLine(TimeStampedModel):
         """
         Return next status list position for given Issuer.
         """
-        last = cls.objects.filter(issuer_id=issuer_id, status_index__gte=0).order_by("status_index").last()
-        if not last:
-            return 0
-        return last.status_index + 1
+        from .utils import status_index_allocator  # pylint: disable=import-outside-toplevel
+
+        return status_index_allocator.allocate(issuer_id)
+
+    @classmethod
+    def get_last_status_index(cls, issuer_id):
+        """
+        Return the last taken status list position for given Issuer (if any).
+        """
+        return cls.objects.filter(issuer_id=issuer_id, status_index__gte=0).aggregate(last=models.Max("status_index"))[
+            "last"
+        ]
 
     @classmethod
     def get_indicies_for_status(cls, *, issuer_id, status):
@@ -313,3 +337,172 @@ class IssuanceConfiguration(TimeStampedModel):
                 "issuer_name": vc_settings.DEFAULT_ISSUER.get("NAME"),
             },
         )
+
+
+class StatusIndexCounter(TimeStampedModel):
+    """
+    Issuer's next free status list position.
+
+    .. no_pii:
+
+    Positions are handed out in blocks (see `issuance.utils.StatusIndexAllocator`) under the counter's row lock,
+    so concurrent issuance initiations never get the same position.
+    """
+
+    issuer_id = models.CharField(primary_key=True, max_length=255, help_text=_("Issuer DID"))
+    next_status_index = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"StatusIndexCounter(issuer_id={self.issuer_id}, next_status_index={self.next_status_index})"
+
+    @classmethod
+    def reserve(cls, issuer_id, count=1):
+        """
+        Reserve a block of consecutive status list positions for given Issuer.
+
+        Returns:
+            range: reserved positions
+        """
+        with transaction.atomic():
+            counter = cls.objects.select_for_update().filter(issuer_id=issuer_id).first()
+            if counter is None:
+                # the first reservation starts after the positions taken before the counter existed:
+                last_status_index = IssuanceLine.get_last_status_index(issuer_id)
+                try:
+                    with transaction.atomic():
+                        counter = cls.objects.create(
+                            issuer_id=issuer_id,
+                            next_status_index=0 if last_status_index is None else last_status_index + 1,
+                        )
+                except IntegrityError:
+                    # created concurrently:
+                    counter = cls.objects.select_for_update().get(issuer_id=issuer_id)
+
+            start = counter.next_status_index
+            counter.next_status_index = start + count
+            counter.save(update_fields=["next_status_index", "modified"])
+
+        return range(start, start + count)
+
+
+class StatusListBitmap(TimeStampedModel):
+    """
+    Issuer's Status List 2021 sequence: one bit per status list position, set for revoked credentials.
+
+    .. no_pii:
+
+    NOTE:
+        - the bitmap is updated in place when credentials are revoked or reinstated (see signals);
+        - the encoded (compressed) sequence is recomputed lazily, only after the bitmap changed;
+        - `rebuild` recreates the bitmap from the issuance lines (see `rebuild_status_lists` command).
+    """
+
+    issuer_id = models.CharField(primary_key=True, max_length=255, help_text=_("Issuer DID"))
+    bitmap = models.BinaryField(help_text=_("Status list sequence, bit-packed (the first position is the left-most)"))
+    encoded_list = models.TextField(blank=True, default="", help_text=_("Compressed and encoded status sequence"))
+    dirty = models.BooleanField(default=True, help_text=_("The encoded sequence is outdated"))
+
+    def __str__(self):
+        return f"StatusListBitmap(issuer_id={self.issuer_id})"
+
+    @staticmethod
+    def get_bitmap_size():
+        return math.ceil(vc_settings.STATUS_LIST_LENGTH / 8)
+
+    @classmethod
+    def build_bitmap(cls, issuer_id):
+        """
+        Create status sequence from scratch for given Issuer (marks all revoked credentials' positions).
+        """
+        from .utils import get_revoked_indices  # pylint: disable=import-outside-toplevel
+
+        bitmap = bytearray(cls.get_bitmap_size())
+        cls._set_bits(bitmap, get_revoked_indices(issuer_id), True)
+        return bytes(bitmap)
+
+    @staticmethod
+    def _set_bits(bitmap, status_indices, value):
+        """
+        Set (or clear) given positions, return whether the bitmap changed.
+        """
+        changed = False
+        for status_index in status_indices:
+            if status_index >= len(bitmap) * 8:
+                # positions out of the list aren't handed out, unless STATUS_LIST_LENGTH was reduced since:
+                logger.error("Status index [%s] is out of the status list bounds, skipping.", status_index)
+                continue
+
+            position, mask = status_index // 8, 0x80 >> (status_index % 8)
+            if bool(bitmap[position] & mask) != value:
+                bitmap[position] ^= mask
+                changed = True
+        return changed
+
+    @classmethod
+    def get_for_issuer(cls, issuer_id):
+        """
+        Fetch Issuer's status list bitmap, build it if there is no (valid) one yet.
+        """
+        status_list = cls.objects.filter(issuer_id=issuer_id).first()
+        if status_list is None:
+            status_list, __ = cls.objects.get_or_create(
+                issuer_id=issuer_id, defaults={"bitmap": cls.build_bitmap(issuer_id)}
+            )
+        elif len(status_list.bitmap) != cls.get_bitmap_size():
+            # status list length was re-configured:
+            status_list, __ = cls.rebuild(issuer_id)
+        return status_list
+
+    @classmethod
+    def rebuild(cls, issuer_id):
+        """
+        Recreate Issuer's status list bitmap from the issuance lines.
+
+        Returns:
+            tuple(StatusListBitmap, bool): the bitmap and whether the stored one was inconsistent.
+        """
+        bitmap = cls.build_bitmap(issuer_id)
+        with transaction.atomic():
+            status_list, created = cls.objects.select_for_update().get_or_create(
+                issuer_id=issuer_id, defaults={"bitmap": bitmap}
+            )
+            changed = not created and bytes(status_list.bitmap) != bitmap
+            if changed:
+                status_list.bitmap = bitmap
+                status_list.dirty = True
+                status_list.save()
+        return status_list, changed
+
+    @classmethod
+    def update_statuses(cls, issuer_id, status_indices, revoked):
+        """
+        Mark given positions of Issuer's status list as revoked (or active).
+        """
+        with transaction.atomic():
+            status_list = cls.objects.select_for_update().filter(issuer_id=issuer_id).first()
+            if status_list is None or len(status_list.bitmap) != cls.get_bitmap_size():
+                # a freshly built bitmap already reflects the current statuses:
+                cls.rebuild(issuer_id)
+                return
+
+            bitmap = bytearray(status_list.bitmap)
+            if cls._set_bits(bitmap, status_indices, revoked):
+                status_list.bitmap = bytes(bitmap)
+                status_list.dirty = True
+                status_list.save(update_fields=["bitmap", "dirty", "modified"])
+
+    def is_revoked(self, status_index):
+        return bool(bytes(self.bitmap)[status_index // 8] & (0x80 >> (status_index % 8)))
+
+    def get_encoded_list(self):
+        """
+        Compressed and base64 encoded status sequence (recomputed only if the bitmap changed).
+        """
+        if self.dirty or not self.encoded_list:
+            self.encoded_list = base64.b64encode(gzip.compress(bytes(self.bitmap))).decode("utf-8")
+            self.dirty = False
+            # unless the bitmap was updated meanwhile:
+            type(self).objects.filter(issuer_id=self.issuer_id, modified=self.modified).update(
+                encoded_list=self.encoded_list, dirty=False
+            )
+        return self.encoded_list
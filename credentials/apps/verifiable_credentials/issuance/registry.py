@@ -0,0 +1,86 @@
+"""
+Issuers registry.
+
+All issuance configurations are loaded once per process (with their keys serialized for didkit) and reused
+until their cached version changes (see `invalidate_issuer_registry`).
+"""
+
+import json
+import logging
+import threading
+
+from django.apps import apps
+
+from credentials.apps.core.utils import bump_cache_versions, get_cache_version
+
+
+logger = logging.getLogger(__name__)
+
+ISSUER_REGISTRY_VERSION_CACHE_KEY = "vc.issuer_registry.version"
+
+
+class IssuerRegistry:
+    """
+    All issuance configurations, by issuer ID (DID), in the `IssuanceConfiguration` default order.
+
+    NOTE: registry's issuance configurations are shared, they must not be modified.
+    """
+
+    def __init__(self, version=None, issuers=None):
+        self.version = version
+        self.issuers = issuers or {}
+        # signing keys (JWK) serialized once:
+        self.keys = {issuer_id: self._serialize_key(issuer.issuer_key) for issuer_id, issuer in self.issuers.items()}
+        enabled = [issuer for issuer in self.issuers.values() if issuer.enabled]
+        self.default_issuer = enabled[-1] if enabled else None
+
+    @classmethod
+    def load(cls, version=None):
+        # looked up through the app registry, the issuance models use the registry (issuance context):
+        issuance_configuration_model = apps.get_model("verifiable_credentials", "IssuanceConfiguration")
+        return cls(
+            version=version,
+            issuers={issuer.issuer_id: issuer for issuer in issuance_configuration_model.objects.all()},
+        )
+
+    @staticmethod
+    def _serialize_key(issuer_key):
+        return issuer_key if isinstance(issuer_key, str) else json.dumps(issuer_key)
+
+    def get_issuer(self, issuer_id):
+        return self.issuers.get(issuer_id)
+
+    def get_key(self, issuer_id):
+        return self.keys.get(issuer_id)
+
+
+_registry = IssuerRegistry()
+_registry_lock = threading.Lock()
+
+
+def get_issuer_registry():
+    """
+    Return the issuers registry, reloading it if issuance configurations have changed.
+    """
+    global _registry  # pylint: disable=global-statement
+
+    version = get_cache_version(ISSUER_REGISTRY_VERSION_CACHE_KEY)
+    registry = _registry
+    if registry.version is not None and registry.version == version:
+        return registry
+
+    with _registry_lock:
+        if _registry.version is None or _registry.version != version:
+            logger.debug("Verifiable credentials: (re)loading issuers registry (version %s).", version)
+            _registry = IssuerRegistry.load(version=version)
+        return _registry
+
+
+def invalidate_issuer_registry():
+    """
+    Mark the issuers registry as stale for all processes.
+    """
+    global _registry  # pylint: disable=global-statement
+
+    bump_cache_versions(ISSUER_REGISTRY_VERSION_CACHE_KEY)
+    _registry = IssuerRegistry()
@@ -3,12 +3,22 @@ Status List issuance utils.
 
 Status list is managed for each Issuer separately.
 Status lists are verifiable credentials themselves, but with a specific shape.
+
+Signed status lists are cached: they are only issued again after an Issuer's status sequence (or configuration)
+changes, which replaces the Issuer's status list version token (see `invalidate_status_list`).
 """
 
+import hashlib
+import json
 import logging
 
+from crum import get_current_request
+from django.core.cache import cache
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from credentials.apps.core.utils import bump_cache_versions, get_cache_version
+
 from ..issuance.main import CredentialIssuer
 from ..settings import vc_settings
 from . import IssuanceException
@@ -33,3 +43,48 @@ def issue_status_list(issuer_id):
         logger.exception(msg)
 
     return None
+
+
+STATUS_LIST_VERSION_CACHE_KEY = "vc.status_list.version.{issuer_id}"
+STATUS_LIST_CACHE_KEY = "vc.status_list.{issuer_id}.{version}.{base_url}"
+
+
+def get_status_list(issuer_id):
+    """
+    Return the signed Status List 2021 for Issuer, issuing it only if its cached version is outdated.
+
+    Returns:
+        dict: "credential" (the status list verifiable credential), "etag" and "last_modified" (timestamp)
+        None: the status list generation failed
+    """
+    # status list credential refers to its own URL, which depends on the requested host:
+    request = get_current_request()
+    base_url = request.build_absolute_uri("/") if request else ""
+    cache_key = STATUS_LIST_CACHE_KEY.format(
+        issuer_id=hashlib.md5(issuer_id.encode()).hexdigest(),
+        version=get_cache_version(STATUS_LIST_VERSION_CACHE_KEY.format(issuer_id=issuer_id)),
+        base_url=hashlib.md5(base_url.encode()).hexdigest(),
+    )
+
+    status_list = cache.get(cache_key)
+    if status_list is not None:
+        return status_list
+
+    credential = issue_status_list(issuer_id)
+    if credential is None:
+        return None
+
+    status_list = {
+        "credential": credential,
+        "etag": hashlib.sha256(json.dumps(credential, sort_keys=True).encode()).hexdigest(),
+        "last_modified": int(timezone.now().timestamp()),
+    }
+    cache.set(cache_key, status_list, vc_settings.STATUS_LIST_CACHE_TIMEOUT)
+    return status_list
+
+
+def invalidate_status_list(issuer_id):
+    """
+    Mark Issuer's cached status lists outdated (for all processes).
+    """
+    bump_cache_versions(STATUS_LIST_VERSION_CACHE_KEY.format(issuer_id=issuer_id))
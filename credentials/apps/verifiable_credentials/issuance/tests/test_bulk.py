@@ -0,0 +1,251 @@
+import asyncio
+import json
+import os
+import time
+import unittest
+import uuid
+from unittest import mock
+
+import didkit
+from crum import set_current_request
+from django.contrib.contenttypes.models import ContentType
+from django.test import RequestFactory, TestCase, override_settings
+
+from credentials.apps.catalog.tests.factories import (
+    CourseFactory,
+    CourseRunFactory,
+    OrganizationFactory,
+    ProgramFactory,
+)
+from credentials.apps.core.tests.mixins import SiteMixin
+from credentials.apps.credentials.constants import UserCredentialStatus
+from credentials.apps.credentials.tests.factories import ProgramCertificateFactory, UserCredentialFactory
+from credentials.apps.verifiable_credentials.issuance import IssuanceException
+from credentials.apps.verifiable_credentials.issuance.bulk import FAILED, ISSUED, BulkCredentialIssuer
+from credentials.apps.verifiable_credentials.issuance.main import CredentialIssuer
+from credentials.apps.verifiable_credentials.issuance.models import IssuanceLine
+from credentials.apps.verifiable_credentials.issuance.tests.factories import (
+    IssuanceConfigurationFactory,
+    IssuanceLineFactory,
+)
+from credentials.apps.verifiable_credentials.storages.learner_credential_wallet import LCWallet
+
+
+class BulkIssuanceTestCase(SiteMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        orgs = [OrganizationFactory.create(name=name, site=self.site) for name in ["TestOrg1", "TestOrg2"]]
+        course = CourseFactory.create(site=self.site)
+        program = ProgramFactory(
+            title="TestProgram1",
+            course_runs=CourseRunFactory.create_batch(2, course=course),
+            authoring_organizations=orgs,
+            site=self.site,
+        )
+        self.program_cert = ProgramCertificateFactory.create(program_uuid=program.uuid, site=self.site)
+        self.issuance_configuration = IssuanceConfigurationFactory.create(issuer_id="test-issuer-id")
+        self.issuance_lines = [self.create_issuance_line() for __ in range(3)]
+
+    def create_issuance_line(self, **kwargs):
+        return IssuanceLineFactory.create(
+            user_credential=UserCredentialFactory.create(
+                credential_content_type=ContentType.objects.get(app_label="credentials", model="programcertificate"),
+                credential=self.program_cert,
+            ),
+            issuer_id=self.issuance_configuration.issuer_id,
+            storage_id=LCWallet.ID,
+            data_model_id=LCWallet.PREFERRED_DATA_MODEL.ID,
+            subject_id="did:example:holder",
+            status=UserCredentialStatus.AWARDED,
+            **kwargs,
+        )
+
+    @staticmethod
+    async def fake_issue_credential(credential, options, issuer_key):  # pylint: disable=unused-argument
+        return json.dumps(dict(json.loads(credential), proof={"type": "Ed25519Signature2020"}))
+
+    @mock.patch(
+        "credentials.apps.verifiable_credentials.issuance.bulk.didkit.verify_credential", new_callable=mock.AsyncMock
+    )
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.bulk.didkit.issue_credential")
+    def test_issue(self, mock_issue_credential, mock_verify_credential):
+        mock_issue_credential.side_effect = self.fake_issue_credential
+        mock_verify_credential.return_value = '{"checks":["proof"],"warnings":[],"errors":[]}'
+        missing_uuid = str(uuid.uuid4())
+        issuance_uuids = [str(issuance_line.uuid) for issuance_line in self.issuance_lines]
+
+        results = list(BulkCredentialIssuer([*issuance_uuids, missing_uuid], chunk_size=2).issue())
+
+        self.assertEqual([result["issuance_uuid"] for result in results], [*issuance_uuids, missing_uuid])
+        self.assertEqual([result["status"] for result in results], [ISSUED, ISSUED, ISSUED, FAILED])
+        self.assertEqual(results[0]["verifiable_credential"]["proof"], {"type": "Ed25519Signature2020"})
+        self.assertEqual(results[0]["verifiable_credential"]["credentialSubject"]["id"], "did:example:holder")
+        self.assertEqual(results[3]["error"], f"Couldn't find such issuance line: [{missing_uuid}]")
+        self.assertEqual(IssuanceLine.objects.filter(uuid__in=issuance_uuids, processed=True).count(), 3)
+        self.assertEqual(mock_verify_credential.call_count, 3)
+        self.assertEqual(
+            IssuanceLine.objects.filter(
+                uuid__in=issuance_uuids, verification_status=IssuanceLine.VERIFICATION_STATUSES.passed
+            ).count(),
+            3,
+        )
+
+    @override_settings(VERIFIABLE_CREDENTIALS={"SELF_VERIFICATION_POLICY": "deferred"})
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.verification._deferred_executor")
+    @mock.patch(
+        "credentials.apps.verifiable_credentials.issuance.bulk.didkit.verify_credential", new_callable=mock.AsyncMock
+    )
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.bulk.didkit.issue_credential")
+    def test_issue_verification_deferred(self, mock_issue_credential, mock_verify_credential, mock_executor):
+        mock_issue_credential.side_effect = self.fake_issue_credential
+        issuance_uuids = [str(issuance_line.uuid) for issuance_line in self.issuance_lines]
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            results = list(BulkCredentialIssuer(issuance_uuids).issue())
+
+        self.assertEqual({result["status"] for result in results}, {ISSUED})
+        mock_verify_credential.assert_not_called()
+        self.assertEqual(len(callbacks), 3)
+        self.assertEqual(
+            IssuanceLine.objects.filter(
+                uuid__in=issuance_uuids, verification_status=IssuanceLine.VERIFICATION_STATUSES.pending
+            ).count(),
+            3,
+        )
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(mock_executor.submit.call_count, 3)
+
+    @override_settings(VERIFIABLE_CREDENTIALS={"SELF_VERIFICATION_POLICY": "sampled"})
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.verification.random.randrange", side_effect=[0, 1, 1])
+    @mock.patch(
+        "credentials.apps.verifiable_credentials.issuance.bulk.didkit.verify_credential", new_callable=mock.AsyncMock
+    )
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.bulk.didkit.issue_credential")
+    def test_issue_verification_sampled(self, mock_issue_credential, mock_verify_credential, _):
+        mock_issue_credential.side_effect = self.fake_issue_credential
+        issuance_uuids = [str(issuance_line.uuid) for issuance_line in self.issuance_lines]
+
+        results = list(BulkCredentialIssuer(issuance_uuids).issue())
+
+        self.assertEqual({result["status"] for result in results}, {ISSUED})
+        self.assertEqual(mock_verify_credential.call_count, 1)
+        self.assertEqual(
+            sorted(IssuanceLine.objects.filter(uuid__in=issuance_uuids).values_list("verification_status", flat=True)),
+            ["passed", "skipped", "skipped"],
+        )
+
+    @mock.patch(
+        "credentials.apps.verifiable_credentials.issuance.bulk.didkit.verify_credential", new_callable=mock.AsyncMock
+    )
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.bulk.didkit.issue_credential")
+    def test_issue_failures(self, mock_issue_credential, mock_verify_credential):
+        inactive_issuance_line = self.create_issuance_line()
+        inactive_issuance_line.status = UserCredentialStatus.REVOKED
+        inactive_issuance_line.save()
+
+        async def issue_credential(credential, options, issuer_key):
+            if json.loads(credential)["credentialSubject"]["id"] == "did:example:invalid":
+                raise didkit.DIDKitException("invalid subject")
+            return await self.fake_issue_credential(credential, options, issuer_key)
+
+        mock_issue_credential.side_effect = issue_credential
+        mock_verify_credential.return_value = "{}"
+        IssuanceLine.objects.filter(uuid=self.issuance_lines[1].uuid).update(subject_id="did:example:invalid")
+
+        results = list(
+            BulkCredentialIssuer(
+                [self.issuance_lines[0].uuid, self.issuance_lines[1].uuid, inactive_issuance_line.uuid]
+            ).issue()
+        )
+
+        self.assertEqual([result["status"] for result in results], [ISSUED, FAILED, FAILED])
+        self.assertEqual(results[1]["error"], "Provided data didn't validate [invalid subject]")
+        self.assertIn("Seems credential isn't active anymore", results[2]["error"])
+        self.assertFalse(IssuanceLine.objects.get(uuid=self.issuance_lines[1].uuid).processed)
+
+    @mock.patch(
+        "credentials.apps.verifiable_credentials.issuance.bulk.didkit.verify_credential", new_callable=mock.AsyncMock
+    )
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.bulk.didkit.issue_credential")
+    def test_issue_composition_errors(self, mock_issue_credential, mock_verify_credential):
+        """A line failing to compose is reported as failed, the other lines of its chunk are still issued."""
+        compose = BulkCredentialIssuer.compose
+        errors = {
+            str(self.issuance_lines[1].uuid): IssuanceException(detail="No such storage"),
+            str(self.issuance_lines[2].uuid): KeyError("surprise"),
+        }
+
+        def compose_or_fail(bulk_issuer, issuance_uuid, issuance_line):
+            if error := errors.get(issuance_uuid):
+                raise error
+            return compose(bulk_issuer, issuance_uuid, issuance_line)
+
+        mock_issue_credential.side_effect = self.fake_issue_credential
+        mock_verify_credential.return_value = "{}"
+        issuance_uuids = [str(issuance_line.uuid) for issuance_line in self.issuance_lines]
+
+        with mock.patch.object(BulkCredentialIssuer, "compose", autospec=True, side_effect=compose_or_fail):
+            results = list(BulkCredentialIssuer(issuance_uuids).issue())
+
+        self.assertEqual([result["status"] for result in results], [ISSUED, FAILED, FAILED])
+        self.assertEqual(results[1]["error"], "No such storage")
+        self.assertEqual(results[2]["error"], "'surprise'")
+        self.assertEqual(
+            list(IssuanceLine.objects.filter(uuid__in=issuance_uuids, processed=True).values_list("uuid", flat=True)),
+            [self.issuance_lines[0].uuid],
+        )
+
+    @mock.patch(
+        "credentials.apps.verifiable_credentials.issuance.bulk.didkit.verify_credential", new_callable=mock.AsyncMock
+    )
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.bulk.didkit.issue_credential")
+    def test_issue_concurrency(self, mock_issue_credential, mock_verify_credential):
+        running = []
+        max_running = []
+
+        async def issue_credential(credential, options, issuer_key):
+            running.append(credential)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+            return await self.fake_issue_credential(credential, options, issuer_key)
+
+        mock_issue_credential.side_effect = issue_credential
+        mock_verify_credential.return_value = "{}"
+        issuance_lines = self.issuance_lines + [self.create_issuance_line() for __ in range(5)]
+
+        results = list(BulkCredentialIssuer([line.uuid for line in issuance_lines], concurrency=3).issue())
+
+        self.assertEqual({result["status"] for result in results}, {ISSUED})
+        self.assertEqual(max(max_running), 3)
+
+    @unittest.skipUnless(os.environ.get("VC_BULK_ISSUANCE_BENCHMARK"), "Set VC_BULK_ISSUANCE_BENCHMARK=1 to run it")
+    def test_benchmark(self):
+        """
+        Compares one by one and bulk issuance throughput, e.g.:
+
+            VC_BULK_ISSUANCE_BENCHMARK=1 pytest credentials/apps/verifiable_credentials/issuance -k benchmark -s
+        """
+        issuer_key = didkit.generate_ed25519_key()
+        self.issuance_configuration.issuer_key = issuer_key
+        self.issuance_configuration.save()
+        issuance_lines = [self.create_issuance_line() for __ in range(200)]
+        issuer_id = didkit.key_to_did(jwk=issuer_key, method_pattern="key")
+        IssuanceLine.objects.update(issuer_id=issuer_id)
+        self.issuance_configuration.delete()
+        IssuanceConfigurationFactory.create(issuer_id=issuer_id, issuer_key=issuer_key)
+        # status list URLs are built for the current request:
+        set_current_request(RequestFactory().get("/"))
+        self.addCleanup(set_current_request, None)
+
+        start = time.perf_counter()
+        for issuance_line in issuance_lines[:100]:
+            CredentialIssuer(issuance_uuid=issuance_line.uuid).issue()
+        print(f"One by one: {100 / (time.perf_counter() - start):.1f} credentials/sec")
+
+        start = time.perf_counter()
+        results = list(BulkCredentialIssuer([issuance_line.uuid for issuance_line in issuance_lines[100:]]).issue())
+        print(f"Bulk: {100 / (time.perf_counter() - start):.1f} credentials/sec")
+        self.assertEqual({result["status"] for result in results}, {ISSUED})
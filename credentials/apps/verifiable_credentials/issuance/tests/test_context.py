@@ -0,0 +1,104 @@
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from credentials.apps.catalog.tests.factories import (
+    CourseFactory,
+    CourseRunFactory,
+    OrganizationFactory,
+    ProgramFactory,
+)
+from credentials.apps.core.tests.factories import UserFactory
+from credentials.apps.core.tests.mixins import SiteMixin
+from credentials.apps.credentials.tests.factories import (
+    CourseCertificateFactory,
+    ProgramCertificateFactory,
+    UserCredentialFactory,
+)
+from credentials.apps.verifiable_credentials.issuance.context import IssuanceContext
+from credentials.apps.verifiable_credentials.issuance.models import IssuanceLine
+from credentials.apps.verifiable_credentials.issuance.registry import get_issuer_registry
+from credentials.apps.verifiable_credentials.issuance.tests.factories import (
+    IssuanceConfigurationFactory,
+    IssuanceLineFactory,
+)
+
+
+class IssuanceContextTestCase(SiteMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.issuance_configuration = IssuanceConfigurationFactory.create(issuer_name="Test Issuer")
+        self.orgs = [OrganizationFactory.create(name=name, site=self.site) for name in ["TestOrg2", "TestOrg1"]]
+        course = CourseFactory.create(site=self.site, title="TestCourse1")
+        self.course_runs = CourseRunFactory.create_batch(3, course=course)
+        program = ProgramFactory.create(
+            title="TestProgram1", course_runs=self.course_runs, authoring_organizations=self.orgs, site=self.site
+        )
+        self.program_certificate = ProgramCertificateFactory.create(program=program, site=self.site)
+        self.course_certificate = CourseCertificateFactory.create(
+            course_id=self.course_runs[0].key, course_run=self.course_runs[0], site=self.site
+        )
+
+    def create_issuance_line(self, credential):
+        user = UserFactory.create()
+        return IssuanceLineFactory.create(
+            user_credential=UserCredentialFactory.create(
+                username=user.username,
+                credential_content_type=ContentType.objects.get_for_model(credential),
+                credential=credential,
+            ),
+            issuer_id=self.issuance_configuration.issuer_id,
+        )
+
+    def load_issuance_lines(self, count):
+        issuance_lines = [self.create_issuance_line(self.program_certificate) for __ in range(count)] + [
+            self.create_issuance_line(self.course_certificate) for __ in range(count)
+        ]
+        return list(IssuanceLine.objects.filter(uuid__in=[issuance_line.uuid for issuance_line in issuance_lines]))
+
+    def test_load(self):
+        issuance_line = self.load_issuance_lines(1)[0]
+
+        context = IssuanceContext.load(issuance_line)
+
+        self.assertIs(issuance_line.issuance_context, context)
+        self.assertEqual(context.issuer_name, "Test Issuer")
+        self.assertEqual(context.credential_content_type, "programcertificate")
+        self.assertEqual(context.program.title, "TestProgram1")
+        self.assertEqual(context.organization_names, ["TestOrg2", "TestOrg1"])
+        self.assertEqual(context.course_count, 3)
+        self.assertEqual(context.platform_name, self.site_configuration.platform_name)
+        self.assertEqual(
+            context.subject_fullname,
+            UserFactory._meta.model.objects.get(username=context.user_credential.username).full_name,
+        )
+
+    def test_load_course_without_course_run(self):
+        """
+        A course certificate without course run gets its course by its course run key.
+        """
+        self.course_certificate.course_run = None
+        self.course_certificate.save()
+        issuance_lines = self.load_issuance_lines(2)
+
+        contexts = IssuanceContext.load_many(issuance_lines)
+
+        self.assertEqual([context.course.title for context in contexts if context.course], ["TestCourse1"] * 2)
+
+    def test_load_many(self):
+        """
+        Queries count doesn't depend on the issuance lines count.
+        """
+        get_issuer_registry()
+
+        for count in (1, 5):
+            issuance_lines = self.load_issuance_lines(count)
+
+            # user credentials, program and course certificates, sites, site configurations, programs,
+            # organizations, course runs, courses, courses count, subjects (issuers are already loaded):
+            with self.assertNumQueries(11):
+                contexts = IssuanceContext.load_many(issuance_lines)
+
+            self.assertEqual(len(contexts), count * 2)
+            self.assertEqual({context.program.title for context in contexts if context.program}, {"TestProgram1"})
+            self.assertEqual({context.course.title for context in contexts if context.course}, {"TestCourse1"})
+            self.assertEqual({context.issuer_name for context in contexts}, {"Test Issuer"})
@@ -4,7 +4,7 @@ from unittest import mock
 
 import didkit
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from rest_framework.exceptions import ValidationError
 from testfixtures import LogCapture
 
@@ -19,6 +19,7 @@ from credentials.apps.core.tests.mixins import SiteMixin
 from credentials.apps.credentials.constants import UserCredentialStatus
 from credentials.apps.credentials.tests.factories import ProgramCertificateFactory, UserCredentialFactory
 from credentials.apps.verifiable_credentials.issuance.main import CredentialIssuer
+from credentials.apps.verifiable_credentials.issuance.models import IssuanceLine
 from credentials.apps.verifiable_credentials.issuance.tests.factories import (
     IssuanceConfigurationFactory,
     IssuanceLineFactory,
@@ -142,3 +143,76 @@ class MainIssuanceTestCase(SiteMixin, TestCase):
         mock_verify.assert_called_once_with(json.dumps({"credential": "composed-and-signed"}))
         mock_finalize.assert_called_once()
         self.assertEqual(result, json.loads(json.dumps({"credential": "composed-and-signed"})))
+
+
+@mock.patch("credentials.apps.verifiable_credentials.issuance.main.CredentialIssuer.compose", return_value={})
+@mock.patch(
+    "credentials.apps.verifiable_credentials.issuance.main.CredentialIssuer.sign",
+    return_value=json.dumps({"credential": "composed-and-signed"}),
+)
+class SelfVerificationPolicyTestCase(SiteMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.issuance_line = IssuanceLineFactory.create(user_credential=UserCredentialFactory(), status_index=5)
+
+    def issue(self):
+        CredentialIssuer(issuance_uuid=self.issuance_line.uuid).issue()
+        self.issuance_line.refresh_from_db()
+
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.main.CredentialIssuer.verify")
+    def test_always(self, mock_verify, *_):
+        self.issue()
+
+        mock_verify.assert_called_once()
+        self.assertTrue(self.issuance_line.processed)
+        self.assertEqual(self.issuance_line.verification_status, IssuanceLine.VERIFICATION_STATUSES.passed)
+
+    @mock.patch(
+        "credentials.apps.verifiable_credentials.issuance.main.CredentialIssuer.verify",
+        side_effect=IssuanceException("Issued verifiable credential can't be verified!"),
+    )
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.verification.set_custom_attribute")
+    def test_always_failed(self, mock_set_custom_attribute, *_):
+        with self.assertRaises(IssuanceException):
+            self.issue()
+
+        self.issuance_line.refresh_from_db()
+        self.assertFalse(self.issuance_line.processed)
+        self.assertEqual(self.issuance_line.verification_status, IssuanceLine.VERIFICATION_STATUSES.failed)
+        mock_set_custom_attribute.assert_any_call("vc_self_verification_failed", True)
+
+    @override_settings(VERIFIABLE_CREDENTIALS={"SELF_VERIFICATION_POLICY": "sampled"})
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.main.CredentialIssuer.verify")
+    def test_sampled(self, mock_verify, *_):
+        with mock.patch("credentials.apps.verifiable_credentials.issuance.verification.random.randrange") as randrange:
+            randrange.return_value = 3
+            self.issue()
+            mock_verify.assert_not_called()
+            self.assertEqual(self.issuance_line.verification_status, IssuanceLine.VERIFICATION_STATUSES.skipped)
+
+            randrange.return_value = 0
+            self.issue()
+            mock_verify.assert_called_once()
+            self.assertEqual(self.issuance_line.verification_status, IssuanceLine.VERIFICATION_STATUSES.passed)
+            randrange.assert_called_with(10)
+
+    @override_settings(VERIFIABLE_CREDENTIALS={"SELF_VERIFICATION_POLICY": "deferred"})
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.main.CredentialIssuer.verify")
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.verification._deferred_executor")
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.verification.didkit_verify_credential")
+    def test_deferred(self, mock_didkit_verify_credential, mock_executor, mock_verify, *_):
+        mock_executor.submit.side_effect = lambda func, *args: func(*args)
+        mock_didkit_verify_credential.side_effect = didkit.DIDKitException("Invalid proof")
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.issue()
+
+        mock_verify.assert_not_called()
+        self.assertTrue(self.issuance_line.processed)
+        self.assertEqual(self.issuance_line.verification_status, IssuanceLine.VERIFICATION_STATUSES.pending)
+
+        for callback in callbacks:
+            callback()
+        self.issuance_line.refresh_from_db()
+        mock_didkit_verify_credential.assert_called_once_with(json.dumps({"credential": "composed-and-signed"}), "{}")
+        self.assertEqual(self.issuance_line.verification_status, IssuanceLine.VERIFICATION_STATUSES.failed)
@@ -1,7 +1,9 @@
+import base64
+import gzip
 from unittest import mock
 
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from rest_framework.test import APIRequestFactory
 
 from credentials.apps.catalog.tests.factories import (
@@ -14,10 +16,13 @@ from credentials.apps.core.tests.factories import UserFactory
 from credentials.apps.core.tests.mixins import SiteMixin
 from credentials.apps.credentials.constants import UserCredentialStatus
 from credentials.apps.credentials.tests.factories import ProgramCertificateFactory, UserCredentialFactory
-from credentials.apps.verifiable_credentials.issuance.tests.factories import IssuanceLineFactory
+from credentials.apps.verifiable_credentials.issuance.tests.factories import (
+    IssuanceConfigurationFactory,
+    IssuanceLineFactory,
+)
 from credentials.apps.verifiable_credentials.storages.learner_credential_wallet import LCWallet
 
-from ..models import IssuanceConfiguration, IssuanceLine
+from ..models import IssuanceConfiguration, IssuanceLine, StatusIndexCounter, StatusListBitmap
 
 
 class IssuanceLineTestCase(SiteMixin, TestCase):
@@ -56,10 +61,12 @@ class IssuanceLineTestCase(SiteMixin, TestCase):
         self.issuance_line.data_model  # pylint: disable=pointless-statement
         mock_get_data_model.assert_called_with(self.issuance_line.data_model_id)
 
-    @mock.patch("credentials.apps.verifiable_credentials.issuance.utils.get_issuer")
-    def test_issuer_name_property(self, mock_get_issuer):
-        self.issuance_line.issuer_name  # pylint: disable=pointless-statement
-        mock_get_issuer.assert_called_with(self.issuance_line.issuer_id)
+    def test_issuer_name_property(self):
+        self.assertIsNone(self.issuance_line.issuer_name)
+
+        IssuanceConfigurationFactory.create(issuer_id=self.issuance_line.issuer_id, issuer_name="Test Issuer")
+        issuance_line = IssuanceLine.objects.get(uuid=self.issuance_line.uuid)
+        self.assertEqual(issuance_line.issuer_name, "Test Issuer")
 
     def test_finalize(self):
         self.issuance_line.processed = False
@@ -129,3 +136,86 @@ class IssuanceConfigurationTestCase(SiteMixin, TestCase):
         self.assertEqual(issuance_configuration.issuer_id, "test-issuer-did")
         self.assertEqual(issuance_configuration.issuer_key, "test-issuer-key")
         self.assertEqual(issuance_configuration.issuer_name, "test-issuer-name")
+
+
+@override_settings(VERIFIABLE_CREDENTIALS={"STATUS_LIST_LENGTH": 16})
+class StatusListBitmapTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        for status_index, status in ((1, UserCredentialStatus.REVOKED), (2, UserCredentialStatus.AWARDED)):
+            IssuanceLineFactory.create(
+                issuer_id="test-issuer-id",
+                processed=True,
+                user_credential__status=status,
+                status=status,
+                status_index=status_index,
+            )
+
+    def decode(self, encoded_list):
+        return bytearray(gzip.decompress(base64.b64decode(encoded_list)))
+
+    def test_get_for_issuer_builds_bitmap(self):
+        status_list = StatusListBitmap.get_for_issuer("test-issuer-id")
+
+        # one bit per position:
+        self.assertEqual(len(status_list.bitmap), 2)
+        self.assertEqual(bytes(status_list.bitmap), bytes([0b01000000, 0]))
+        self.assertTrue(status_list.is_revoked(1))
+        self.assertFalse(status_list.is_revoked(2))
+
+    def test_update_statuses(self):
+        StatusListBitmap.get_for_issuer("test-issuer-id")
+
+        StatusListBitmap.update_statuses("test-issuer-id", [2, 9], revoked=True)
+        StatusListBitmap.update_statuses("test-issuer-id", [1], revoked=False)
+
+        status_list = StatusListBitmap.objects.get(issuer_id="test-issuer-id")
+        self.assertEqual(bytes(status_list.bitmap), bytes([0b00100000, 0b01000000]))
+        self.assertTrue(status_list.dirty)
+
+    def test_update_statuses_out_of_bounds(self):
+        StatusListBitmap.get_for_issuer("test-issuer-id")
+        StatusListBitmap.update_statuses("test-issuer-id", [16], revoked=True)
+        self.assertEqual(bytes(StatusListBitmap.objects.get().bitmap), bytes([0b01000000, 0]))
+
+    def test_get_encoded_list_lazy(self):
+        status_list = StatusListBitmap.get_for_issuer("test-issuer-id")
+        encoded_list = status_list.get_encoded_list()
+        self.assertEqual(self.decode(encoded_list), bytearray([0b01000000, 0]))
+
+        with self.assertNumQueries(1):
+            status_list = StatusListBitmap.get_for_issuer("test-issuer-id")
+            self.assertEqual(status_list.get_encoded_list(), encoded_list)
+
+        StatusListBitmap.update_statuses("test-issuer-id", [0], revoked=True)
+        status_list = StatusListBitmap.get_for_issuer("test-issuer-id")
+        self.assertEqual(self.decode(status_list.get_encoded_list()), bytearray([0b11000000, 0]))
+        self.assertFalse(StatusListBitmap.objects.get().dirty)
+
+    def test_rebuild(self):
+        StatusListBitmap.objects.create(issuer_id="test-issuer-id", bitmap=bytes([0b00010000, 0]))
+
+        status_list, changed = StatusListBitmap.rebuild("test-issuer-id")
+
+        self.assertTrue(changed)
+        self.assertEqual(bytes(status_list.bitmap), bytes([0b01000000, 0]))
+        self.assertFalse(StatusListBitmap.rebuild("test-issuer-id")[1])
+
+    @override_settings(VERIFIABLE_CREDENTIALS={"STATUS_LIST_LENGTH": 100})
+    def test_get_for_issuer_length_changed(self):
+        StatusListBitmap.objects.create(issuer_id="test-issuer-id", bitmap=bytes(2))
+        self.assertEqual(len(StatusListBitmap.get_for_issuer("test-issuer-id").bitmap), 13)
+
+
+class StatusIndexCounterTestCase(TestCase):
+    def test_reserve_first(self):
+        self.assertEqual(StatusIndexCounter.reserve("test-issuer-id"), range(1))
+        self.assertEqual(StatusIndexCounter.reserve("test-issuer-id", count=3), range(1, 4))
+        self.assertEqual(StatusIndexCounter.objects.get(issuer_id="test-issuer-id").next_status_index, 4)
+
+    def test_reserve_after_existing_issuance_lines(self):
+        IssuanceLineFactory.create(issuer_id="test-issuer-id", status_index=7)
+        IssuanceLineFactory.create(issuer_id="another-issuer-id", status_index=20)
+
+        self.assertEqual(StatusIndexCounter.reserve("test-issuer-id", count=2), range(8, 10))
+        self.assertEqual(StatusIndexCounter.reserve("another-issuer-id"), range(21, 22))
@@ -0,0 +1,62 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from credentials.apps.verifiable_credentials.issuance.models import IssuanceConfiguration
+from credentials.apps.verifiable_credentials.issuance.registry import (
+    ISSUER_REGISTRY_VERSION_CACHE_KEY,
+    get_issuer_registry,
+    invalidate_issuer_registry,
+)
+from credentials.apps.verifiable_credentials.issuance.tests.factories import IssuanceConfigurationFactory
+from credentials.apps.verifiable_credentials.issuance.utils import get_default_issuer, get_issuer, get_issuer_key
+
+
+class IssuerRegistryTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        invalidate_issuer_registry()
+        self.issuance_configuration = IssuanceConfigurationFactory.create(
+            issuer_id="did:key:test-issuer", issuer_key={"kty": "OKP", "crv": "Ed25519"}
+        )
+
+    def test_loaded_once(self):
+        with self.assertNumQueries(1):
+            get_issuer("did:key:test-issuer")
+            get_default_issuer()
+            get_issuer_key("did:key:test-issuer")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_issuer("did:key:test-issuer"), self.issuance_configuration)
+            self.assertIsNone(get_issuer("did:key:unknown"))
+
+    def test_serialized_keys(self):
+        IssuanceConfigurationFactory.create(issuer_id="did:key:test-issuer-2", issuer_key='{"kty": "OKP"}')
+
+        self.assertEqual(json.loads(get_issuer_key("did:key:test-issuer")), {"kty": "OKP", "crv": "Ed25519"})
+        self.assertEqual(get_issuer_key("did:key:test-issuer-2"), '{"kty": "OKP"}')
+        self.assertIsNone(get_issuer_key("did:key:unknown"))
+
+    def test_invalidated_on_change(self):
+        get_issuer_registry()
+
+        self.issuance_configuration.issuer_name = "Renamed Issuer"
+        self.issuance_configuration.save()
+        self.assertEqual(get_issuer("did:key:test-issuer").issuer_name, "Renamed Issuer")
+
+        IssuanceConfiguration.objects.filter(issuer_id="did:key:test-issuer").delete()
+        self.assertIsNone(get_issuer("did:key:test-issuer"))
+
+    def test_reloaded_on_version_change(self):
+        """
+        Another process' change is noticed through the shared version token.
+        """
+        registry = get_issuer_registry()
+        IssuanceConfiguration.objects.filter(issuer_id="did:key:test-issuer").update(issuer_name="Renamed Issuer")
+        self.assertIs(get_issuer_registry(), registry)
+
+        cache.set(ISSUER_REGISTRY_VERSION_CACHE_KEY, "another-version", None)
+
+        self.assertIsNot(get_issuer_registry(), registry)
+        self.assertEqual(get_issuer("did:key:test-issuer").issuer_name, "Renamed Issuer")
@@ -1,12 +1,13 @@
 from unittest import mock
 
+from django.core.cache import cache
 from django.test import TestCase
 from testfixtures import LogCapture
 
 from credentials.apps.verifiable_credentials.issuance.main import CredentialIssuer
 
 from .. import IssuanceException
-from ..status_list import issue_status_list
+from ..status_list import get_status_list, invalidate_status_list, issue_status_list
 
 
 LOGGER_NAME = "credentials.apps.verifiable_credentials.issuance.status_list"
@@ -29,3 +30,42 @@ class StatusListIssuanceTestCase(TestCase):
             log_capture.check(
                 (LOGGER_NAME, "ERROR", "Status List generation failed: [test-issuer-id]"),
             )
+
+
+@mock.patch("credentials.apps.verifiable_credentials.issuance.status_list.issue_status_list")
+class StatusListCacheTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_get_status_list_cached(self, mock_issue_status_list):
+        mock_issue_status_list.return_value = {"encodedList": "dummy"}
+
+        status_list = get_status_list("test-issuer-id")
+
+        self.assertEqual(status_list["credential"], {"encodedList": "dummy"})
+        self.assertEqual(get_status_list("test-issuer-id"), status_list)
+        mock_issue_status_list.assert_called_once_with("test-issuer-id")
+
+    def test_invalidate_status_list(self, mock_issue_status_list):
+        mock_issue_status_list.side_effect = [
+            {"encodedList": "dummy"},
+            {"encodedList": "another"},
+            {"encodedList": "updated"},
+        ]
+
+        status_list = get_status_list("test-issuer-id")
+        get_status_list("another-issuer-id")
+        invalidate_status_list("test-issuer-id")
+        updated_status_list = get_status_list("test-issuer-id")
+
+        self.assertEqual(updated_status_list["credential"], {"encodedList": "updated"})
+        self.assertNotEqual(updated_status_list["etag"], status_list["etag"])
+        self.assertEqual(get_status_list("another-issuer-id")["credential"], {"encodedList": "another"})
+        self.assertEqual(mock_issue_status_list.call_count, 3)
+
+    def test_get_status_list_failure_not_cached(self, mock_issue_status_list):
+        mock_issue_status_list.side_effect = [None, {"encodedList": "dummy"}]
+
+        self.assertIsNone(get_status_list("test-issuer-id"))
+        self.assertEqual(get_status_list("test-issuer-id")["credential"], {"encodedList": "dummy"})
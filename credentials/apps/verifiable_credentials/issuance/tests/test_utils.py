@@ -1,7 +1,11 @@
+import threading
+import time
+import unittest
 from unittest import mock
 
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
 
 from credentials.apps.catalog.tests.factories import (
     CourseFactory,
@@ -13,7 +17,13 @@ from credentials.apps.core.tests.factories import UserFactory
 from credentials.apps.core.tests.mixins import SiteMixin
 from credentials.apps.credentials.constants import UserCredentialStatus
 from credentials.apps.credentials.tests.factories import ProgramCertificateFactory, UserCredentialFactory
-from credentials.apps.verifiable_credentials.issuance.models import IssuanceConfiguration
+from credentials.apps.verifiable_credentials.issuance import IssuanceException
+from credentials.apps.verifiable_credentials.issuance.main import CredentialIssuer
+from credentials.apps.verifiable_credentials.issuance.models import (
+    IssuanceConfiguration,
+    IssuanceLine,
+    StatusIndexCounter,
+)
 from credentials.apps.verifiable_credentials.issuance.tests.factories import (
     IssuanceConfigurationFactory,
     IssuanceLineFactory,
@@ -22,6 +32,7 @@ from credentials.apps.verifiable_credentials.settings import VerifiableCredentia
 from credentials.apps.verifiable_credentials.storages.learner_credential_wallet import LCWallet
 
 from ..utils import (
+    StatusIndexAllocator,
     create_issuers,
     get_active_issuers,
     get_default_issuer,
@@ -104,3 +115,103 @@ class UtilsIssuanceTestCase(SiteMixin, TestCase):
     def test_get_revoked_indices(self, mock_get_indicies_for_status):
         get_revoked_indices("test-issuer-id")
         mock_get_indicies_for_status.assert_called_once()
+
+
+@override_settings(VERIFIABLE_CREDENTIALS={"STATUS_INDEX_BLOCK_SIZE": 5})
+class StatusIndexAllocatorTestCase(TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.allocator = StatusIndexAllocator()
+
+    def test_allocate_in_blocks(self):
+        self.assertEqual([self.allocator.allocate("test-issuer-id") for __ in range(7)], list(range(7)))
+        self.assertEqual(StatusIndexCounter.objects.get(issuer_id="test-issuer-id").next_status_index, 10)
+
+        # another process:
+        self.assertEqual(StatusIndexAllocator().allocate("test-issuer-id"), 10)
+
+    @override_settings(VERIFIABLE_CREDENTIALS={"STATUS_INDEX_BLOCK_SIZE": 5, "STATUS_LIST_LENGTH": 8})
+    def test_allocate_status_list_full(self):
+        self.assertEqual([self.allocator.allocate("test-issuer-id") for __ in range(8)], list(range(8)))
+        with self.assertRaisesMessage(IssuanceException, "The status list of the issuer [test-issuer-id] is full"):
+            self.allocator.allocate("test-issuer-id")
+
+    def test_allocate_in_transaction(self):
+        with mock.patch("django.db.transaction.get_connection") as mock_get_connection:
+            mock_get_connection.return_value.in_atomic_block = True
+            self.assertEqual([self.allocator.allocate("test-issuer-id") for __ in range(2)], [0, 1])
+        self.assertEqual(StatusIndexCounter.objects.get(issuer_id="test-issuer-id").next_status_index, 2)
+
+    def test_parallel_allocations(self):
+        reserved_blocks = []
+
+        def reserve(issuer_id, count=1):  # pylint: disable=unused-argument
+            # like the counter's row lock, but slow enough to expose races:
+            with lock:
+                time.sleep(0.001)
+                start = len(reserved_blocks) * count
+                reserved_blocks.append(start)
+            return range(start, start + count)
+
+        lock = threading.Lock()
+        allocated = []
+        with mock.patch.object(StatusIndexCounter, "reserve", side_effect=reserve):
+            threads = [
+                threading.Thread(
+                    target=lambda: allocated.extend(self.allocator.allocate("test-issuer-id") for __ in range(100))
+                )
+                for __ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(sorted(allocated), list(range(800)))
+        self.assertEqual(len(reserved_blocks), 800 / 5)
+
+
+@unittest.skipIf(connection.vendor == "sqlite", "SQLite test database doesn't support concurrent writes")
+@override_settings(VERIFIABLE_CREDENTIALS={"STATUS_INDEX_BLOCK_SIZE": 10})
+class StatusIndexAllocationStressTestCase(SiteMixin, TransactionTestCase):
+    """
+    Concurrent issuance initiations (e.g. a cohort's certificates awarded at once) must not share positions.
+    """
+
+    THREADS = 8
+    INITS_PER_THREAD = 25
+
+    def setUp(self):
+        super().setUp()
+        self.user_credentials = UserCredentialFactory.create_batch(self.THREADS * self.INITS_PER_THREAD)
+
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.utils.status_index_allocator", StatusIndexAllocator())
+    def test_parallel_inits(self):
+        errors = []
+
+        def init(user_credentials):
+            try:
+                for user_credential in user_credentials:
+                    CredentialIssuer.init(
+                        storage_id=LCWallet.ID, user_credential=user_credential, issuer_id="test-issuer-id"
+                    )
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=init, args=(self.user_credentials[i :: self.THREADS],)) for i in range(self.THREADS)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = time.perf_counter() - start
+
+        self.assertEqual(errors, [])
+        status_indices = list(IssuanceLine.objects.values_list("status_index", flat=True))
+        self.assertEqual(len(status_indices), self.THREADS * self.INITS_PER_THREAD)
+        self.assertEqual(len(set(status_indices)), len(status_indices))
+        print(f"{len(status_indices) / duration:.1f} issuance initiations/sec")
@@ -2,16 +2,22 @@
 Issuance utils.
 """
 
+import threading
+from collections import defaultdict, deque
+
 import didkit
 from asgiref.sync import async_to_sync
 
 # pylint: disable=cyclic-import
+from django.db import transaction
 from django.utils.translation import gettext as _
 
 from credentials.apps.credentials.models import UserCredential
 
-from ..settings import VerifiableCredentialsImproperlyConfigured
-from .models import IssuanceConfiguration, IssuanceLine
+from ..settings import VerifiableCredentialsImproperlyConfigured, vc_settings
+from . import IssuanceException
+from .models import IssuanceConfiguration, IssuanceLine, StatusIndexCounter
+from .registry import get_issuer_registry
 
 
 def create_issuers():
@@ -26,7 +32,7 @@ def get_active_issuers():
     Collect all enabled issuers' ids.
     """
     # currently, the only (system level, default) is supported.
-    return list(IssuanceConfiguration.objects.filter(enabled=True).values_list("issuer_id", flat=True))
+    return [issuer_id for issuer_id, issuer in get_issuer_registry().issuers.items() if issuer.enabled]
 
 
 def get_issuers():
@@ -34,7 +40,10 @@ def get_issuers():
     Collect all issuers.
     """
     # currently, the only (system level, default) is supported.
-    return list(IssuanceConfiguration.objects.values())
+    return [
+        {field.attname: getattr(issuer, field.attname) for field in issuer._meta.concrete_fields}
+        for issuer in get_issuer_registry().issuers.values()
+    ]
 
 
 def get_issuer_ids():
@@ -42,14 +51,14 @@ def get_issuer_ids():
     Collect all issuers' ids.
     """
     # currently, the only (system level, default) is supported.
-    return list(IssuanceConfiguration.objects.values_list("issuer_id", flat=True))
+    return list(get_issuer_registry().issuers)
 
 
 def get_default_issuer():
     """
     Fetch the default issuer.
     """
-    issuer = IssuanceConfiguration.objects.filter(enabled=True).last()
+    issuer = get_issuer_registry().default_issuer
     if not issuer:
         msg = _("There are no enabled Issuance Configurations for some reason! At least one must be always active.")
         raise VerifiableCredentialsImproperlyConfigured(msg)
@@ -60,8 +69,14 @@ def get_issuer(issuer_id):
     """
     Fetch issuer by given ID.
     """
-    issuer = IssuanceConfiguration.objects.filter(issuer_id=issuer_id).first()
-    return issuer
+    return get_issuer_registry().get_issuer(issuer_id)
+
+
+def get_issuer_key(issuer_id):
+    """
+    Issuer's signing key (JWK, serialized), if there is such issuer.
+    """
+    return get_issuer_registry().get_key(issuer_id)
 
 
 def get_revoked_indices(issuer_id):
@@ -71,6 +86,57 @@ def get_revoked_indices(issuer_id):
     return IssuanceLine.get_indicies_for_status(issuer_id=issuer_id, status=UserCredential.REVOKED)
 
 
+class StatusIndexAllocator:
+    """
+    Hands out unique status list positions per Issuer.
+
+    Each process reserves positions in blocks of `STATUS_INDEX_BLOCK_SIZE` (a single counter update per block)
+    and serves them from memory to its threads. Positions left unused in a block (e.g. on process restart) are
+    never taken by anyone else, they just stay unused in the status list.
+    """
+
+    def __init__(self):
+        self._reserved = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def allocate(self, issuer_id):
+        """
+        Return next free status list position for given Issuer.
+
+        Raises:
+            IssuanceException: the Issuer's status list is full (see `STATUS_LIST_LENGTH`)
+        """
+        # a block reserved inside an outer transaction could be rolled back along with it after the positions
+        # were handed out, so only a single position is reserved (and used right away) then:
+        if transaction.get_connection().in_atomic_block:
+            status_index = StatusIndexCounter.reserve(issuer_id)[0]
+        else:
+            with self._lock:
+                reserved = self._reserved[issuer_id]
+                if not reserved:
+                    reserved.extend(StatusIndexCounter.reserve(issuer_id, count=vc_settings.STATUS_INDEX_BLOCK_SIZE))
+                status_index = reserved.popleft()
+
+        # a position out of the status list couldn't ever be revoked:
+        if status_index >= vc_settings.STATUS_LIST_LENGTH:
+            raise IssuanceException(
+                detail=_("The status list of the issuer [{issuer_id}] is full ({length} positions).").format(
+                    issuer_id=issuer_id, length=vc_settings.STATUS_LIST_LENGTH
+                )
+            )
+        return status_index
+
+    def reset(self):
+        """
+        Drop reserved positions (they stay unused).
+        """
+        with self._lock:
+            self._reserved.clear()
+
+
+status_index_allocator = StatusIndexAllocator()
+
+
 @async_to_sync
 async def didkit_issue_credential(credential, options, issuer_key):
     """
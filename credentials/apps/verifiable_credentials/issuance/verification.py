@@ -0,0 +1,80 @@
+"""
+Issued verifiable credentials self-verification.
+
+Verifying a just signed credential roughly doubles the issuance cryptographic cost, while the issuer key is
+trusted and local. The `SELF_VERIFICATION_POLICY` setting defines when it's done:
+
+- "always": every issued credential is verified before it's returned (failure aborts the issuance);
+- "sampled": 1 in `SELF_VERIFICATION_SAMPLE_RATE` issued credentials is verified that way;
+- "deferred": credentials are returned right away and verified in background, after the issuance.
+
+The outcome is recorded on the issuance line (`verification_status`) and reported to monitoring, so
+verification regressions are still noticed.
+"""
+
+import json
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import didkit
+from django.db import close_old_connections, transaction
+from edx_django_utils.monitoring import set_custom_attribute
+
+from ..settings import vc_settings
+from .models import IssuanceLine
+from .utils import didkit_verify_credential
+
+
+logger = logging.getLogger(__name__)
+
+ALWAYS = "always"
+SAMPLED = "sampled"
+DEFERRED = "deferred"
+SELF_VERIFICATION_POLICIES = (ALWAYS, SAMPLED, DEFERRED)
+
+_deferred_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vc-self-verification")
+
+
+def should_verify_inline():
+    """
+    Whether the credential being issued is to be verified right away.
+    """
+    policy = vc_settings.SELF_VERIFICATION_POLICY
+    if policy == SAMPLED:
+        return random.randrange(max(vc_settings.SELF_VERIFICATION_SAMPLE_RATE, 1)) == 0
+    return policy == ALWAYS
+
+
+def is_verification_deferred():
+    return vc_settings.SELF_VERIFICATION_POLICY == DEFERRED
+
+
+def record_verification(issuance_uuids, verification_status, error=None):
+    """
+    Store self-verification outcome on the issuance line(s) and report it.
+    """
+    IssuanceLine.objects.filter(uuid__in=issuance_uuids).update(verification_status=verification_status)
+
+    set_custom_attribute("vc_self_verification", verification_status)
+    if verification_status == IssuanceLine.VERIFICATION_STATUSES.failed:
+        set_custom_attribute("vc_self_verification_failed", True)
+        logger.error("Issued verifiable credential(s) %s can't be verified: %s", issuance_uuids, error)
+
+
+def verify_deferred(issuance_uuid, verifiable_credential_json):
+    """
+    Verify issued credential in background once the issuance is committed.
+    """
+    transaction.on_commit(lambda: _deferred_executor.submit(_verify, issuance_uuid, verifiable_credential_json))
+
+
+def _verify(issuance_uuid, verifiable_credential_json):
+    try:
+        didkit_verify_credential(verifiable_credential_json, json.dumps({}))
+    except didkit.DIDKitException as exc:  # pylint: disable=no-member, useless-suppression
+        record_verification([issuance_uuid], IssuanceLine.VERIFICATION_STATUSES.failed, error=exc)
+    else:
+        record_verification([issuance_uuid], IssuanceLine.VERIFICATION_STATUSES.passed)
+    finally:
+        close_old_connections()
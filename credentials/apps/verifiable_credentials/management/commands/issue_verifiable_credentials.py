@@ -0,0 +1,60 @@
+"""
+Issue verifiable credentials for many issuance lines at once.
+"""
+
+import json
+import logging
+
+from django.core.management import BaseCommand, CommandError
+
+from credentials.apps.verifiable_credentials.issuance.bulk import ISSUED, BulkCredentialIssuer
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Issue verifiable credentials for the given (initiated) issuance lines, output NDJSON results"
+
+    def add_arguments(self, parser):
+        """
+        Add arguments to the command parser.
+        """
+        parser.add_argument("issuance_uuids", nargs="*", type=str, help="Issuance line identifiers")
+        parser.add_argument(
+            "--file",
+            type=str,
+            default=None,
+            help="A file with issuance line identifiers (one per line)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="The maximum number of credentials signed at once",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=None,
+            help="The number of issuance lines processed at once",
+        )
+
+    def handle(self, *args, **options):
+        issuance_uuids = list(options.get("issuance_uuids"))
+        if options.get("file"):
+            with open(options["file"], encoding="utf-8") as issuance_uuids_file:
+                issuance_uuids.extend(line.strip() for line in issuance_uuids_file if line.strip())
+
+        if not issuance_uuids:
+            raise CommandError("No issuance lines provided")
+
+        bulk_issuer = BulkCredentialIssuer(
+            issuance_uuids, concurrency=options.get("concurrency"), chunk_size=options.get("chunk_size")
+        )
+        issued = 0
+        for result in bulk_issuer.issue():
+            issued += result["status"] == ISSUED
+            self.stdout.write(json.dumps(result))
+
+        self.stderr.write(f"Issued {issued} of {len(issuance_uuids)} verifiable credentials")
@@ -0,0 +1,53 @@
+"""
+Check (and rebuild) issuers' status list bitmaps against the issuance lines.
+"""
+
+import logging
+
+from django.core.management import BaseCommand
+
+from credentials.apps.verifiable_credentials.issuance.models import StatusListBitmap
+from credentials.apps.verifiable_credentials.issuance.status_list import invalidate_status_list
+from credentials.apps.verifiable_credentials.issuance.utils import get_issuer_ids
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Rebuild Status List 2021 sequences from the issuance lines"
+
+    def add_arguments(self, parser):
+        """
+        Add arguments to the command parser.
+        """
+        parser.add_argument("issuer_ids", nargs="*", type=str, help="Issuer DIDs (all issuers by default)")
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report inconsistent status lists, don't rebuild them",
+        )
+
+    def handle(self, *args, **options):
+        issuer_ids = options.get("issuer_ids") or get_issuer_ids()
+        inconsistent = []
+
+        for issuer_id in issuer_ids:
+            if options.get("check"):
+                status_list = StatusListBitmap.objects.filter(issuer_id=issuer_id).first()
+                consistent = status_list is None or bytes(status_list.bitmap) == StatusListBitmap.build_bitmap(
+                    issuer_id
+                )
+            else:
+                __, changed = StatusListBitmap.rebuild(issuer_id)
+                consistent = not changed
+                if changed:
+                    invalidate_status_list(issuer_id)
+
+            if not consistent:
+                inconsistent.append(issuer_id)
+                logger.warning("Status list of [%s] is inconsistent with the issuance lines.", issuer_id)
+
+        self.stdout.write(f"Inconsistent status lists: {inconsistent}")
+        if inconsistent and options.get("check"):
+            self.stdout.write("Re-run the command without --check to rebuild them.")
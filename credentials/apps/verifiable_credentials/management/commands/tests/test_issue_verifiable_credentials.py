@@ -0,0 +1,31 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from credentials.apps.verifiable_credentials.management.commands import issue_verifiable_credentials
+
+
+class IssueVerifiableCredentialsTestCase(TestCase):
+    @patch.object(issue_verifiable_credentials, "BulkCredentialIssuer")
+    def test_issue_verifiable_credentials(self, mock_bulk_issuer):
+        mock_bulk_issuer.return_value.issue.return_value = iter(
+            [
+                {"issuance_uuid": "uuid-1", "status": "issued", "verifiable_credential": {}},
+                {"issuance_uuid": "uuid-2", "status": "failed", "error": "error"},
+            ]
+        )
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command(
+            "issue_verifiable_credentials", "uuid-1", "uuid-2", "--concurrency", "2", stdout=stdout, stderr=stderr
+        )
+
+        mock_bulk_issuer.assert_called_once_with(["uuid-1", "uuid-2"], concurrency=2, chunk_size=None)
+        self.assertEqual(len(stdout.getvalue().splitlines()), 2)
+        self.assertIn("Issued 1 of 2 verifiable credentials", stderr.getvalue())
+
+    def test_no_issuance_lines(self):
+        with self.assertRaises(CommandError):
+            call_command("issue_verifiable_credentials")
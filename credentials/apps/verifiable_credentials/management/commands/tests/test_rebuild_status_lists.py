@@ -0,0 +1,34 @@
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from credentials.apps.credentials.constants import UserCredentialStatus
+from credentials.apps.verifiable_credentials.issuance.models import StatusListBitmap
+from credentials.apps.verifiable_credentials.issuance.tests.factories import (
+    IssuanceConfigurationFactory,
+    IssuanceLineFactory,
+)
+
+
+@override_settings(VERIFIABLE_CREDENTIALS={"STATUS_LIST_LENGTH": 16})
+class RebuildStatusListsTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        IssuanceConfigurationFactory(issuer_id="test-issuer-id")
+        IssuanceLineFactory.create(
+            issuer_id="test-issuer-id",
+            processed=True,
+            user_credential__status=UserCredentialStatus.REVOKED,
+            status=UserCredentialStatus.REVOKED,
+            status_index=3,
+        )
+        StatusListBitmap.objects.create(issuer_id="test-issuer-id", bitmap=bytes(2))
+
+    def test_check(self):
+        call_command("rebuild_status_lists", "--check")
+        self.assertEqual(bytes(StatusListBitmap.objects.get().bitmap), bytes(2))
+
+    def test_rebuild(self):
+        call_command("rebuild_status_lists", "test-issuer-id")
+        status_list = StatusListBitmap.objects.get()
+        self.assertEqual(bytes(status_list.bitmap), bytes([0b00010000, 0]))
+        self.assertTrue(status_list.dirty)
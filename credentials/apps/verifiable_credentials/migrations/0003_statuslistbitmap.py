@@ -0,0 +1,46 @@
+# Generated by Django 4.2.19 on 2026-10-18 19:02
+
+from django.db import migrations, models
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("verifiable_credentials", "0002_alter_issuanceline_subject_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StatusListBitmap",
+            fields=[
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name="created"),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name="modified"),
+                ),
+                (
+                    "issuer_id",
+                    models.CharField(help_text="Issuer DID", max_length=255, primary_key=True, serialize=False),
+                ),
+                (
+                    "bitmap",
+                    models.BinaryField(
+                        help_text="Status list sequence, bit-packed (the first position is the left-most)"
+                    ),
+                ),
+                (
+                    "encoded_list",
+                    models.TextField(blank=True, default="", help_text="Compressed and encoded status sequence"),
+                ),
+                ("dirty", models.BooleanField(default=True, help_text="The encoded sequence is outdated")),
+            ],
+            options={
+                "get_latest_by": "modified",
+                "abstract": False,
+            },
+        ),
+    ]
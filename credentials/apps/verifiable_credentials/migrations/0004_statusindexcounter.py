@@ -0,0 +1,36 @@
+# Generated by Django 4.2.19 on 2026-10-18 19:04
+
+from django.db import migrations, models
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("verifiable_credentials", "0003_statuslistbitmap"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StatusIndexCounter",
+            fields=[
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name="created"),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name="modified"),
+                ),
+                (
+                    "issuer_id",
+                    models.CharField(help_text="Issuer DID", max_length=255, primary_key=True, serialize=False),
+                ),
+                ("next_status_index", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "get_latest_by": "modified",
+                "abstract": False,
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.19 on 2026-10-18 19:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("verifiable_credentials", "0004_statusindexcounter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issuanceline",
+            name="verification_status",
+            field=models.CharField(
+                blank=True,
+                choices=[("pending", "pending"), ("passed", "passed"), ("failed", "failed"), ("skipped", "skipped")],
+                help_text="Issued verifiable credential self-verification outcome",
+                max_length=32,
+                null=True,
+            ),
+        ),
+    ]
@@ -1,10 +1,19 @@
 import json
+import os
+import time
+import unittest
+from datetime import timedelta
 from unittest import mock
 
+import didkit
 from ddt import data, ddt, unpack
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 
 from credentials.apps.catalog.tests.factories import (
@@ -15,13 +24,18 @@ from credentials.apps.catalog.tests.factories import (
 )
 from credentials.apps.core.tests.factories import USER_PASSWORD, UserFactory
 from credentials.apps.core.tests.mixins import SiteMixin
+from credentials.apps.credentials.constants import UserCredentialStatus
+from credentials.apps.credentials.models import CourseCertificate
 from credentials.apps.credentials.tests.factories import (
     CourseCertificateFactory,
     ProgramCertificateFactory,
     UserCredentialFactory,
 )
 from credentials.apps.verifiable_credentials.issuance import IssuanceException
-from credentials.apps.verifiable_credentials.issuance.tests.factories import IssuanceLineFactory
+from credentials.apps.verifiable_credentials.issuance.tests.factories import (
+    IssuanceConfigurationFactory,
+    IssuanceLineFactory,
+)
 from credentials.apps.verifiable_credentials.storages.learner_credential_wallet import LCWallet
 from credentials.apps.verifiable_credentials.utils import get_user_credentials_data
 
@@ -117,6 +131,123 @@ class ProgramCredentialsViewTests(SiteMixin, TestCase):
         for key in not_in_keys:
             self.assertNotIn(key, response.data)
 
+    def test_conditional_requests(self):
+        self.client.login(username=self.user.username, password=USER_PASSWORD)
+        response = self.client.get("/verifiable_credentials/api/v1/credentials/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("private", response["Cache-Control"])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/verifiable_credentials/api/v1/credentials/", HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(
+            len([query for query in queries.captured_queries if "credentials_usercredential" in query["sql"]]), 1
+        )
+
+        # a removed credential doesn't make the credentials more recent:
+        self.assertNotIn("Last-Modified", response)
+
+        etag = self.client.get("/verifiable_credentials/api/v1/credentials/")["ETag"]
+        self.course_user_credentials[0].save()
+        response = self.client.get("/verifiable_credentials/api/v1/credentials/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # different query, different representation:
+        response = self.client.get(
+            "/verifiable_credentials/api/v1/credentials/?types=coursecertificate", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @data("course", "course_cert", "program", "org", "delete")
+    def test_conditional_requests_related_changes(self, change):
+        """
+        Titles and organizations come from the credential configurations and the catalog, and are validated too.
+        """
+        self.client.login(username=self.user.username, password=USER_PASSWORD)
+        etag = self.client.get("/verifiable_credentials/api/v1/credentials/")["ETag"]
+
+        if change == "course":
+            self.course.title = "Renamed course"
+            self.course.save()
+        elif change == "course_cert":
+            self.course_certs[0].title = "Renamed certificate"
+            self.course_certs[0].save()
+        elif change == "program":
+            self.program.title = "Renamed program"
+            self.program.save()
+        elif change == "org":
+            self.orgs[0].name = "Renamed organization"
+            self.orgs[0].save()
+        else:
+            self.course_user_credentials[0].delete()
+
+        response = self.client.get("/verifiable_credentials/api/v1/credentials/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_conditional_requests_course_without_course_run(self):
+        CourseCertificate.objects.filter(id__in=[course_cert.id for course_cert in self.course_certs]).update(
+            course_run=None
+        )
+        self.client.login(username=self.user.username, password=USER_PASSWORD)
+        etag = self.client.get("/verifiable_credentials/api/v1/credentials/")["ETag"]
+
+        self.course.title = "Renamed course"
+        self.course.save()
+
+        response = self.client.get("/verifiable_credentials/api/v1/credentials/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_conditional_requests_visibility(self):
+        """
+        A credential becoming visible changes the response, even though it's not modified itself.
+        """
+        self.client.login(username=self.user.username, password=USER_PASSWORD)
+        CourseCertificate.objects.filter(id=self.course_certs[0].id).update(
+            certificate_available_date=timezone.now() + timedelta(days=1)
+        )
+        response = self.client.get("/verifiable_credentials/api/v1/credentials/?types=coursecertificate")
+        self.assertEqual(len(response.data["course_credentials"]), 1)
+
+        CourseCertificate.objects.filter(id=self.course_certs[0].id).update(
+            certificate_available_date=timezone.now() - timedelta(days=1)
+        )
+        response = self.client.get(
+            "/verifiable_credentials/api/v1/credentials/?types=coursecertificate",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["course_credentials"]), 2)
+
+    def test_pagination(self):
+        self.client.login(username=self.user.username, password=USER_PASSWORD)
+
+        response = self.client.get("/verifiable_credentials/api/v1/credentials/?page_size=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [credential["uuid"] for credential in response.data["course_credentials"]],
+            [user_credential.uuid.hex for user_credential in self.course_user_credentials],
+        )
+        self.assertEqual(response.data["program_credentials"], [])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["course_credentials"], [])
+        self.assertEqual(
+            [credential["uuid"] for credential in response.data["program_credentials"]],
+            [self.program_user_credential.uuid.hex],
+        )
+        self.assertIsNone(response.data["next"])
+
+    @data(("page_size=0", 400), ("page_size=many", 400), ("page_size=2&cursor=invalid", 404))
+    @unpack
+    def test_pagination_invalid_params(self, params, expected_status):
+        self.client.login(username=self.user.username, password=USER_PASSWORD)
+        response = self.client.get(f"/verifiable_credentials/api/v1/credentials/?{params}")
+        self.assertEqual(response.status_code, expected_status)
+
 
 class InitIssuanceViewTestCase(SiteMixin, TestCase):
     url_path = reverse("verifiable_credentials:api:v1:credentials-init")
@@ -260,6 +391,51 @@ class IssueCredentialViewTestCase(SiteMixin, TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
+@ddt
+class BulkIssueCredentialsViewTestCase(SiteMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url_path = reverse("verifiable_credentials:api:v1:credentials-issue-bulk")
+        self.issuance_uuids = ["c9bf9e57-1685-4c89-bafb-ff5af830be8a", "f8a5d1ad-d5d9-4a66-9d0e-2c7f1d3e2b11"]
+
+    def authenticate_user(self, user):
+        self.client.logout()
+        self.client.login(username=user.username, password=USER_PASSWORD)
+
+    def test_authentication(self):
+        self.authenticate_user(UserFactory())
+        response = self.client.post(
+            self.url_path, json.dumps({"issuance_uuids": self.issuance_uuids}), JSON_CONTENT_TYPE
+        )
+        self.assertEqual(response.status_code, 403)
+
+    @mock.patch("credentials.apps.verifiable_credentials.rest_api.v1.views.BulkCredentialIssuer")
+    def test_post_valid_request(self, mock_bulk_issuer):
+        self.authenticate_user(UserFactory(is_staff=True))
+        mock_bulk_issuer.return_value.issue.return_value = iter(
+            [
+                {"issuance_uuid": self.issuance_uuids[0], "status": "issued", "verifiable_credential": {}},
+                {"issuance_uuid": self.issuance_uuids[1], "status": "failed", "error": "error"},
+            ]
+        )
+
+        response = self.client.post(
+            self.url_path, json.dumps({"issuance_uuids": self.issuance_uuids}), JSON_CONTENT_TYPE
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)["status"] for line in lines], ["issued", "failed"])
+        mock_bulk_issuer.assert_called_once_with(self.issuance_uuids)
+
+    @data({}, {"issuance_uuids": []}, {"issuance_uuids": "not-a-list"}, {"issuance_uuids": ["not-a-uuid"]})
+    def test_post_invalid_request(self, request_data):
+        self.authenticate_user(UserFactory(is_staff=True))
+        response = self.client.post(self.url_path, json.dumps(request_data), JSON_CONTENT_TYPE)
+        self.assertEqual(response.status_code, 400)
+
+
 class AvailableStoragesViewTestCase(SiteMixin, TestCase):
     url_path = reverse("verifiable_credentials:api:v1:storages")
 
@@ -285,19 +461,81 @@ class StatusList2021ViewTestCase(SiteMixin, TestCase):
     def setUp(self):
         super().setUp()
         self.user = UserFactory()
+        self.url_path = reverse("verifiable_credentials:api:v1:status-list-2021-v1", args=["test-issuer-id"])
+        cache.clear()
 
     def authenticate_user(self, user):
         self.client.logout()
         self.client.login(username=user.username, password=USER_PASSWORD)
 
-    @mock.patch("credentials.apps.verifiable_credentials.rest_api.v1.views.issue_status_list")
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.status_list.issue_status_list")
     @mock.patch("credentials.apps.verifiable_credentials.rest_api.v1.views.get_issuer_ids")
     def test_get_valid_request(self, mock_get_issuer_ids, mock_issue_status_list):
         self.authenticate_user(self.user)
         mock_get_issuer_ids.return_value = ["test-issuer-id"]
         mock_issue_status_list.return_value = {"test_status_list": "test"}
 
-        url_path = reverse("verifiable_credentials:api:v1:status-list-2021-v1", args=["test-issuer-id"])
-        response = self.client.get(url_path)
+        response = self.client.get(self.url_path)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data, {"test_status_list": "test"})
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.status_list.issue_status_list")
+    @mock.patch("credentials.apps.verifiable_credentials.rest_api.v1.views.get_issuer_ids")
+    def test_conditional_requests(self, mock_get_issuer_ids, mock_issue_status_list):
+        mock_get_issuer_ids.return_value = ["test-issuer-id"]
+        mock_issue_status_list.return_value = {"test_status_list": "test"}
+
+        response = self.client.get(self.url_path)
+
+        not_modified = self.client.get(self.url_path, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+        not_modified = self.client.get(self.url_path, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(not_modified.status_code, 304)
+
+        modified = self.client.get(self.url_path, HTTP_IF_NONE_MATCH='"outdated"')
+        self.assertEqual(modified.status_code, 200)
+        self.assertEqual(modified.data, {"test_status_list": "test"})
+
+        # the status list was issued (and signed) only once:
+        mock_issue_status_list.assert_called_once()
+
+    @mock.patch("credentials.apps.verifiable_credentials.issuance.status_list.issue_status_list")
+    @mock.patch("credentials.apps.verifiable_credentials.rest_api.v1.views.get_issuer_ids")
+    def test_status_change(self, mock_get_issuer_ids, mock_issue_status_list):
+        mock_get_issuer_ids.return_value = ["test-issuer-id"]
+        mock_issue_status_list.side_effect = [{"encodedList": "initial"}, {"encodedList": "updated"}]
+        issuance_line = IssuanceLineFactory(issuer_id="test-issuer-id", status=UserCredentialStatus.AWARDED)
+        response = self.client.get(self.url_path)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            issuance_line.user_credential.revoke()
+
+        response = self.client.get(self.url_path, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"encodedList": "updated"})
+
+    @unittest.skipUnless(
+        os.environ.get("VC_STATUS_LIST_BENCHMARK"), "Set VC_STATUS_LIST_BENCHMARK=1 to run the benchmark"
+    )
+    def test_benchmark(self):
+        """
+        Compares status list requests throughput with and without the cache, e.g.:
+
+            VC_STATUS_LIST_BENCHMARK=1 pytest credentials/apps/verifiable_credentials/rest_api -k benchmark -s
+        """
+        issuer_key = didkit.generate_ed25519_key()  # pylint: disable=no-member, useless-suppression
+        issuer_id = didkit.key_to_did(jwk=issuer_key, method_pattern="key")
+        IssuanceConfigurationFactory(issuer_id=issuer_id, issuer_key=issuer_key)
+        url_path = reverse("verifiable_credentials:api:v1:status-list-2021-v1", args=[issuer_id])
+
+        for label, clear_cache in (("uncached", True), ("cached", False)):
+            start = time.perf_counter()
+            for __ in range(50):
+                if clear_cache:
+                    cache.clear()
+                self.assertEqual(self.client.get(url_path).status_code, 200)
+            print(f"Status list ({label}): {50 / (time.perf_counter() - start):.1f} requests/sec")
@@ -2,30 +2,43 @@
 Verifiable Credentials API v1 views.
 """
 
+import base64
+import hashlib
+import json
 import logging
 
+from crum import set_current_request
 from django.contrib.auth import get_user_model
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from django.utils.translation import gettext as _
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
 from rest_framework import mixins, status, viewsets
 from rest_framework.authentication import SessionAuthentication
 from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.generics import ListAPIView
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
+from credentials.apps.catalog.models import Course
 from credentials.apps.credentials.models import UserCredential
 from credentials.apps.verifiable_credentials.issuance import IssuanceException
+from credentials.apps.verifiable_credentials.issuance.bulk import BulkCredentialIssuer
 from credentials.apps.verifiable_credentials.issuance.main import CredentialIssuer
 from credentials.apps.verifiable_credentials.issuance.serializers import StorageSerializer
-from credentials.apps.verifiable_credentials.issuance.status_list import issue_status_list
+from credentials.apps.verifiable_credentials.issuance.status_list import get_status_list
 from credentials.apps.verifiable_credentials.issuance.utils import get_issuer_ids
 from credentials.apps.verifiable_credentials.permissions import VerifiablePresentation
 from credentials.apps.verifiable_credentials.storages.utils import get_available_storages, get_storage
 from credentials.apps.verifiable_credentials.utils import (
     generate_base64_qr_code,
     get_user_credentials_data,
+    get_user_credentials_page,
     is_valid_uuid,
 )
 
@@ -57,6 +70,8 @@ class CredentialsViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
         "coursecertificate": "course_credentials",
     }
 
+    MAX_PAGE_SIZE = 100
+
     def list(self, request, *args, **kwargs):
         """
         Retrieve a list of issued credentials for the authenticated user.
@@ -67,6 +82,12 @@ class CredentialsViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
             types (str, optional): A comma-separated list of credential types to filter the results.
                                    Valid types are "programcertificate" and "coursecertificate".
                                    If not provided, all credential types will be included.
+            page_size (int, optional): Paginate credentials (of all the requested types together), up to 100 per
+                                   page; the "next" page link is added to the response.
+            cursor (str, optional): A page position (see the "next" link).
+
+        Conditional requests ("If-None-Match", "If-Modified-Since") get "304 Not Modified" while the user's
+        credentials are unchanged.
 
         Arguments:
             request: The HTTP request object containing the query parameters.
@@ -106,20 +127,104 @@ class CredentialsViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
             }
         """
         types = self.request.query_params.get("types")
-        response = {}
 
         if types:
             types = types.split(",")
         else:
             types = self.CREDENTIAL_TYPES_MAP.keys()
-
-        for credential_type in types:
-            if credential_type in self.CREDENTIAL_TYPES_MAP:
-                response[self.CREDENTIAL_TYPES_MAP[credential_type]] = get_user_credentials_data(
-                    request.user.username, credential_type
+        types = [
+            credential_type for credential_type in dict.fromkeys(types) if credential_type in self.CREDENTIAL_TYPES_MAP
+        ]
+
+        # an unchanged wallet poll is answered with "304 Not Modified" after a single query; credentials change
+        # with their UserCredential (modified), or become visible once their certificate available date comes,
+        # and their titles and organizations come from their configurations and the catalog:
+        state = UserCredential.objects.filter(username=request.user.username).aggregate(
+            last_modified=Max("modified"),
+            count=Count("id", distinct=True),
+            visible_count=Count(
+                "course_credentials",
+                distinct=True,
+                filter=Q(course_credentials__certificate_available_date__lte=timezone.now()),
+            ),
+            course_certificate_modified=Max("course_credentials__modified"),
+            course_modified=Max("course_credentials__course_run__course__modified"),
+            # certificates without course run get the title of the course of their course run key:
+            course_by_key_modified=Max(
+                Subquery(
+                    Course.objects.filter(course_runs__key=OuterRef("course_credentials__course_id"))
+                    .order_by("-modified")
+                    .values("modified")[:1]
                 )
+            ),
+            program_certificate_modified=Max("program_credentials__modified"),
+            program_modified=Max("program_credentials__program__modified"),
+            organization_modified=Max("program_credentials__program__authoring_organizations__modified"),
+        )
+        etag = None
+        if state["last_modified"] is not None:
+            # no Last-Modified: the removal of a credential, or a catalog change, doesn't make it more recent
+            etag = '"{}"'.format(
+                hashlib.md5(
+                    ":".join(
+                        [
+                            *(str(value) for __, value in sorted(state.items())),
+                            request.get_full_path(),
+                        ]
+                    ).encode()
+                ).hexdigest()
+            )
+            response = get_conditional_response(request, etag=etag)
+            if response is not None:
+                return response
+
+        response = Response(self.get_credentials_data(request, types))
+
+        if etag is not None:
+            response["ETag"] = etag
+        patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+        return response
+
+    def get_credentials_data(self, request, types):
+        """
+        Collect credentials data per type, a single page of them if a page size is requested.
+        """
+        username = request.user.username
+        page_size = request.query_params.get("page_size")
+
+        if page_size is None:
+            return {
+                self.CREDENTIAL_TYPES_MAP[credential_type]: get_user_credentials_data(username, credential_type)
+                for credential_type in types
+            }
 
-        return Response(response)
+        try:
+            page_size = min(int(page_size), self.MAX_PAGE_SIZE)
+            if page_size < 1:
+                raise ValueError
+        except ValueError:
+            raise ValidationError({"page_size": _("A positive integer is expected.")})
+
+        after_id = None
+        if cursor := request.query_params.get("cursor"):
+            try:
+                after_id = int(base64.urlsafe_b64decode(cursor.encode()).decode())
+            except (TypeError, ValueError):
+                raise NotFound(_("Invalid cursor"))
+
+        data, next_id = get_user_credentials_page(username, types, after_id=after_id, page_size=page_size)
+
+        response = {self.CREDENTIAL_TYPES_MAP[credential_type]: data[credential_type] for credential_type in types}
+        response["next"] = (
+            replace_query_param(
+                request.build_absolute_uri(),
+                "cursor",
+                base64.urlsafe_b64encode(str(next_id).encode()).decode(),
+            )
+            if next_id is not None
+            else None
+        )
+        return response
 
 
 class InitIssuanceView(APIView):
@@ -236,6 +341,56 @@ class IssueCredentialView(APIView):
             raise ValidationError({"issuance_issue": exc.detail})
 
 
+class BulkIssueCredentialsView(APIView):
+    """
+    This API endpoint allows issuing many (already initiated) verifiable credentials at once.
+
+    POST: /verifiable_credentials/api/v1/credentials/issue/bulk/
+
+    POST Parameters:
+        * issuance_uuids: Required. A list of issuance line identifiers.
+    Returns:
+        NDJSON stream with a result per issuance line (in the requested order), e.g.:
+            {"issuance_uuid": "...", "status": "issued", "verifiable_credential": {...}}
+            {"issuance_uuid": "...", "status": "failed", "error": "..."}
+    """
+
+    authentication_classes = (
+        JwtAuthentication,
+        SessionAuthentication,
+    )
+    permission_classes = (IsAdminUser,)
+
+    def post(self, request, *args, **kwargs):
+        issuance_uuids = request.data.get("issuance_uuids")
+
+        if not issuance_uuids or not isinstance(issuance_uuids, list):
+            msg = _("Mandatory data is missing")
+            logger.exception(msg)
+            raise ValidationError({"issuance_uuids": msg})
+
+        invalid_uuids = [issuance_uuid for issuance_uuid in issuance_uuids if not is_valid_uuid(str(issuance_uuid))]
+        if invalid_uuids:
+            msg = _("Issuance line identifiers must be valid UUIDs: {invalid_uuids}").format(
+                invalid_uuids=invalid_uuids
+            )
+            logger.exception(msg)
+            raise ValidationError({"issuance_uuids": msg})
+
+        bulk_issuer = BulkCredentialIssuer(issuance_uuids)
+
+        def stream():
+            # composition relies on the current request, which is already gone once the response is streamed:
+            set_current_request(request)
+            try:
+                for result in bulk_issuer.issue():
+                    yield json.dumps(result) + "\n"
+            finally:
+                set_current_request(None)
+
+        return StreamingHttpResponse(stream(), content_type="application/x-ndjson")
+
+
 class AvailableStoragesView(ListAPIView):
     """
     List data for all available storages.
@@ -264,6 +419,9 @@ class StatusList2021View(APIView):
     Verifiable credentials status verification.
 
     GET: /verifiable_credentials/api/v1/status-list/2021/v1/<issuer-ID>/
+
+    The signed status list is cached until the Issuer's status sequence changes, and served with ETag and
+    Last-Modified headers: conditional requests get "304 Not Modified" while the status list is unchanged.
     """
 
     permission_classes = (AllowAny,)
@@ -277,7 +435,20 @@ class StatusList2021View(APIView):
             raise NotFound({"reason": msg})
 
         try:
-            status_list = issue_status_list(issuer_id=issuer_id)
-            return Response(status_list)
+            status_list = get_status_list(issuer_id=issuer_id)
         except IssuanceException as exc:
             raise ValidationError({"reason": exc.detail})
+
+        if status_list is None:
+            return Response(None)
+
+        response = get_conditional_response(
+            request, etag=f'"{status_list["etag"]}"', last_modified=status_list["last_modified"]
+        )
+        if response is None:
+            response = Response(status_list["credential"])
+
+        response["ETag"] = f'"{status_list["etag"]}"'
+        response["Last-Modified"] = http_date(status_list["last_modified"])
+        patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+        return response
@@ -40,6 +40,12 @@ DEFAULTS = {
     "STATUS_LIST_STORAGE": "credentials.apps.verifiable_credentials.storages.status_list.StatusList2021",
     "STATUS_LIST_DATA_MODEL": "credentials.apps.verifiable_credentials.composition.status_list.StatusListDataModel",
     "STATUS_LIST_LENGTH": 10000,
+    "STATUS_LIST_CACHE_TIMEOUT": 60 * 60 * 24,
+    "STATUS_INDEX_BLOCK_SIZE": 10,
+    "BULK_ISSUANCE_CONCURRENCY": 8,
+    "BULK_ISSUANCE_CHUNK_SIZE": 100,
+    "SELF_VERIFICATION_POLICY": "always",
+    "SELF_VERIFICATION_SAMPLE_RATE": 10,
 }
 
 # List of settings that may be in string import notation:
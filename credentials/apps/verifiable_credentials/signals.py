@@ -2,12 +2,18 @@
 Verifiable Credentials signal handlers.
 """
 
-from django.db.models.signals import post_save
+from collections import defaultdict
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from credentials.apps.credentials.models import UserCredential
 
-from .issuance.models import IssuanceLine
+from .issuance.models import IssuanceConfiguration, IssuanceLine, StatusListBitmap
+from .issuance.registry import invalidate_issuer_registry
+from .issuance.status_list import invalidate_status_list
 
 
 @receiver(post_save, sender=UserCredential)
@@ -27,4 +33,36 @@ def update_issuance_lines(instance, created, **kwargs):
 
     # find all related issuance lines and switch status:
     issuance_lines = IssuanceLine.objects.filter(user_credential=user_credential)
+    changed_status_indices = defaultdict(list)
+    for issuer_id, status_index, processed in issuance_lines.exclude(status=user_credential.status).values_list(
+        "issuer_id", "status_index", "processed"
+    ):
+        changed_status_indices[issuer_id].extend([status_index] if processed and status_index is not None else [])
     issuance_lines.update(status=user_credential.status)
+
+    # update issuers' status sequences in place, their status lists are outdated now:
+    for issuer_id, status_indices in changed_status_indices.items():
+        if status_indices:
+            StatusListBitmap.update_statuses(
+                issuer_id, status_indices, revoked=user_credential.status == UserCredential.REVOKED
+            )
+        transaction.on_commit(partial(invalidate_status_list, issuer_id))
+
+
+@receiver(post_save, sender=IssuanceConfiguration)
+@receiver(post_delete, sender=IssuanceConfiguration)
+def invalidate_issuer_status_list(instance, **kwargs):
+    """
+    Status lists are signed with the issuer key, re-issue them on issuer configuration change.
+    """
+    transaction.on_commit(partial(invalidate_status_list, instance.issuer_id))
+
+
+@receiver(post_save, sender=IssuanceConfiguration)
+@receiver(post_delete, sender=IssuanceConfiguration)
+def invalidate_issuers(**kwargs):
+    """
+    Drop the issuers registry on issuer configuration change (and on commit, once the change is visible).
+    """
+    invalidate_issuer_registry()
+    transaction.on_commit(invalidate_issuer_registry)
@@ -11,11 +11,12 @@ class VCSettingsChecksTestCase(TestCase):
             "DEFAULT_DATA_MODELS": [],
             "DEFAULT_STORAGES": [],
             "DEFAULT_ISSUER": {},
+            "SELF_VERIFICATION_POLICY": "never",
         }
     )
     def test_vc_settings_checks(self):
         errors = vc_settings_checks()
-        self.assertEqual(len(errors), 4)
+        self.assertEqual(len(errors), 5)
 
         expected_errors = [
             {
@@ -34,6 +35,10 @@ class VCSettingsChecksTestCase(TestCase):
                 "id": "verifiable_credentials.E005",
                 "msg": f"DEFAULT_ISSUER[KEY] is mandatory when {ENABLE_VERIFIABLE_CREDENTIALS.name} is True.",
             },
+            {
+                "id": "verifiable_credentials.E006",
+                "msg": "Unknown SELF_VERIFICATION_POLICY: never.",
+            },
         ]
 
         for i, error in enumerate(errors):
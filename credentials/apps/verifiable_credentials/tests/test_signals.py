@@ -1,3 +1,5 @@
+from unittest import mock
+
 from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
 
@@ -11,6 +13,7 @@ from credentials.apps.core.tests.factories import UserFactory
 from credentials.apps.core.tests.mixins import SiteMixin
 from credentials.apps.credentials.constants import UserCredentialStatus
 from credentials.apps.credentials.tests.factories import ProgramCertificateFactory, UserCredentialFactory
+from credentials.apps.verifiable_credentials.issuance.models import StatusListBitmap
 from credentials.apps.verifiable_credentials.issuance.tests.factories import IssuanceLineFactory
 from credentials.apps.verifiable_credentials.storages.learner_credential_wallet import LCWallet
 
@@ -57,3 +60,38 @@ class SignalsTestCase(SiteMixin, TestCase):
 
         self.assertEqual(self.issuance_line.status, UserCredentialStatus.AWARDED)
         self.assertEqual(self.issuance_line_2.status, UserCredentialStatus.AWARDED)
+
+    @mock.patch("credentials.apps.verifiable_credentials.signals.invalidate_status_list")
+    def test_update_issuance_lines_invalidates_status_list(self, mock_invalidate_status_list):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.program_user_credential.status = UserCredentialStatus.AWARDED
+            self.program_user_credential.save()
+
+        mock_invalidate_status_list.assert_has_calls(
+            [mock.call(str(self.issuance_line.issuer_id)), mock.call(str(self.issuance_line_2.issuer_id))],
+            any_order=True,
+        )
+
+    @mock.patch("credentials.apps.verifiable_credentials.signals.invalidate_status_list")
+    def test_unchanged_status_keeps_status_list(self, mock_invalidate_status_list):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.program_user_credential.save()
+
+        mock_invalidate_status_list.assert_not_called()
+
+    def test_update_issuance_lines_updates_status_list_bitmap(self):
+        self.issuance_line.processed = True
+        self.issuance_line.save()
+        status_list = StatusListBitmap.get_for_issuer(self.issuance_line.issuer_id)
+        self.assertTrue(status_list.is_revoked(5))
+
+        self.program_user_credential.status = UserCredentialStatus.AWARDED
+        self.program_user_credential.save()
+        status_list.refresh_from_db()
+        self.assertFalse(status_list.is_revoked(5))
+        self.assertTrue(status_list.dirty)
+
+        self.program_user_credential.status = UserCredentialStatus.REVOKED
+        self.program_user_credential.save()
+        status_list.refresh_from_db()
+        self.assertTrue(status_list.is_revoked(5))
@@ -3,6 +3,7 @@ import base64
 import pytest
 from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
+from opaque_keys.edx.keys import CourseKey
 
 from credentials.apps.catalog.tests.factories import (
     CourseFactory,
@@ -12,6 +13,7 @@ from credentials.apps.catalog.tests.factories import (
 )
 from credentials.apps.core.tests.factories import UserFactory
 from credentials.apps.core.tests.mixins import SiteMixin
+from credentials.apps.credentials.models import CourseCertificate
 from credentials.apps.credentials.tests.factories import (
     CourseCertificateFactory,
     ProgramCertificateFactory,
@@ -21,6 +23,7 @@ from credentials.apps.verifiable_credentials.utils import (
     capitalize_first,
     generate_base64_qr_code,
     get_user_credentials_data,
+    get_user_credentials_page,
 )
 
 
@@ -166,10 +169,61 @@ class GetProgramCertificatesTests(SiteMixin, TestCase):
         assert result[1]["credential_uuid"] == self.course_user_credentials[1].credential.course_id
         assert result[1]["credential_title"] == self.course.title
 
+    def test_get_user_course_credentials_data_without_course_run(self):
+        """
+        Certificates without course run get their course title through their course run key.
+        """
+        CourseCertificate.objects.filter(id__in=[cert.id for cert in self.course_certs]).update(course_run=None)
+
+        # user credentials, certificates, course runs (by key) with their courses:
+        with self.assertNumQueries(3):
+            result = get_user_credentials_data(self.user.username, "coursecertificate")
+
+        assert [credential["credential_title"] for credential in result] == [self.course.title, self.course.title]
+        assert [credential["credential_org"] for credential in result] == [
+            CourseKey.from_string(cert.course_id).org for cert in self.course_certs
+        ]
+
     def test_non_existing_content_type(self):
         result = get_user_credentials_data(self.user.username, "non_existing_content_type")
         assert result == []
 
+    def test_queries(self):
+        """
+        The number of queries doesn't depend on the number of credentials.
+        """
+        get_user_credentials_data(self.user.username, "coursecertificate")
+
+        # user credentials, certificates, programs, organizations:
+        with self.assertNumQueries(4):
+            get_user_credentials_data(self.user.username, "programcertificate")
+        # user credentials, certificates, course runs, courses:
+        with self.assertNumQueries(4):
+            result = get_user_credentials_data(self.user.username, "coursecertificate")
+
+        assert [credential["credential_title"] for credential in result] == [self.course.title, self.course.title]
+
+    def test_get_user_credentials_page(self):
+        page, next_id = get_user_credentials_page(
+            self.user.username, ["programcertificate", "coursecertificate"], page_size=1
+        )
+        assert page == {
+            "programcertificate": [],
+            "coursecertificate": get_user_credentials_data(self.user.username, "coursecertificate")[:1],
+        }
+        assert next_id == self.course_user_credentials[0].id
+
+        page, next_id = get_user_credentials_page(
+            self.user.username, ["programcertificate", "coursecertificate"], after_id=next_id, page_size=5
+        )
+        assert [credential["uuid"] for credential in page["coursecertificate"]] == [
+            self.course_user_credentials[1].uuid.hex
+        ]
+        assert [credential["uuid"] for credential in page["programcertificate"]] == [
+            self.program_user_credential.uuid.hex
+        ]
+        assert next_id is None
+
 
 class TestGenerateBase64QRCode(TestCase):
     def test_correct_output_format(self):
@@ -4,12 +4,93 @@ from uuid import UUID
 
 import qrcode
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import prefetch_related_objects
+from opaque_keys.edx.keys import CourseKey
 
 from credentials.apps.catalog.models import CourseRun
 from credentials.apps.credentials.api import get_user_credentials_by_content_type
 from credentials.apps.credentials.data import UserCredentialStatus
 
 
+def get_user_credentials(username, model, after_id=None, limit=None):
+    """
+    Awarded (visible) UserCredentials of the given type, ordered by ID, with everything their data needs loaded.
+
+    The number of queries doesn't depend on the number of credentials.
+
+    Arguments:
+        username(str): Username for whom we are getting UserCredential objects for
+        model(str): The model for content type (programcertificate | coursecertificate)
+        after_id(int): (optional) only UserCredentials with greater IDs are collected
+        limit(int): (optional) max number of UserCredentials to collect
+
+    Returns:
+        list(UserCredential)
+    """
+    try:
+        # content types are cached process-wide:
+        credential_cert_content_type = ContentType.objects.get_by_natural_key("credentials", model)
+    except ContentType.DoesNotExist:
+        return []
+
+    user_credentials = get_user_credentials_by_content_type(
+        username, [credential_cert_content_type], UserCredentialStatus.AWARDED.value
+    ).order_by("id")
+    if after_id is not None:
+        user_credentials = user_credentials.filter(id__gt=after_id)
+    if limit is not None:
+        user_credentials = user_credentials[:limit]
+
+    user_credentials = list(user_credentials)
+    prefetch_related_objects(user_credentials, "credential")
+    certificates = [user_credential.credential for user_credential in user_credentials]
+    if model == "programcertificate":
+        prefetch_related_objects(certificates, "program__authoring_organizations")
+    elif model == "coursecertificate":
+        prefetch_related_objects(certificates, "course_run__course")
+        # certificates without course run are matched with their course run by key:
+        course_keys = {certificate.course_id for certificate in certificates if certificate.course_run_id is None}
+        course_runs = {}
+        if course_keys:
+            for course_run in CourseRun.objects.filter(key__in=course_keys).select_related("course").order_by("id"):
+                course_runs.setdefault(course_run.key, course_run)
+        for certificate in certificates:
+            certificate.course_run_by_key = course_runs.get(certificate.course_id)
+
+    return user_credentials
+
+
+def get_user_credential_data(credential, model):
+    """
+    Translates a UserCredential (see `get_user_credentials`) into context data.
+    """
+    if model == "programcertificate":
+        credential_uuid = credential.credential.program_uuid.hex
+        credential_title = credential.credential.program.title
+        credential_org = ", ".join(
+            organization.name for organization in credential.credential.program.authoring_organizations.all()
+        )
+    elif model == "coursecertificate":
+        course_run = credential.credential.course_run or credential.credential.course_run_by_key
+        course = getattr(course_run, "course", None)
+        credential_uuid = credential.credential.course_id
+        credential_title = credential.credential.title or getattr(course, "title", "")
+        # course_id is the course run key (kept in sync by CourseCertificate.save), even without course run:
+        credential_org = CourseKey.from_string(credential.credential.course_id).org
+
+    return {
+        "uuid": credential.uuid.hex,
+        "status": credential.status,
+        "username": credential.username,
+        "download_url": credential.download_url,
+        "credential_id": credential.credential_id,
+        "credential_uuid": credential_uuid,  # pylint: disable=possibly-used-before-assignment
+        "credential_title": credential_title,  # pylint: disable=possibly-used-before-assignment
+        "credential_org": credential_org,  # pylint: disable=possibly-used-before-assignment
+        "modified_date": credential.modified.date().isoformat(),
+    }
+
+
 def get_user_credentials_data(username, model):
     """
     Translates a list of UserCredentials (for programs) into context data.
@@ -22,45 +103,33 @@ def get_user_credentials_data(username, model):
         list(dict): A list of dictionaries, each dictionary containing information for a credential that the
         user awarded
     """
-    try:
-        credential_cert_content_type = ContentType.objects.get(app_label="credentials", model=model)
-    except ContentType.DoesNotExist:
-        return []
+    return [get_user_credential_data(credential, model) for credential in get_user_credentials(username, model)]
 
-    credentials = get_user_credentials_by_content_type(
-        username, [credential_cert_content_type], UserCredentialStatus.AWARDED.value
+
+def get_user_credentials_page(username, models, after_id=None, page_size=None):
+    """
+    One page of user's credentials data of the given types (see `get_user_credentials_data`).
+
+    Credentials of all the types are paginated together, by UserCredential ID (a cursor).
+
+    Returns:
+        tuple: credentials data per type (dict), the last UserCredential ID for the next page (None if it's the last)
+    """
+    user_credentials = sorted(
+        (
+            (user_credential.id, model, user_credential)
+            for model in models
+            for user_credential in get_user_credentials(username, model, after_id=after_id, limit=page_size + 1)
+        ),
+        key=lambda item: item[0],
     )
 
-    data = []
-    for credential in credentials:
-        if model == "programcertificate":
-            credential_uuid = credential.credential.program_uuid.hex
-            credential_title = credential.credential.program.title
-            credential_org = ", ".join(
-                credential.credential.program.authoring_organizations.values_list("name", flat=True)
-            )
-        elif model == "coursecertificate":
-            course_run = CourseRun.objects.filter(key=credential.credential.course_id).first()
-            course = getattr(course_run, "course", None)
-            credential_uuid = credential.credential.course_id
-            credential_title = credential.credential.title or getattr(course, "title", "")
-            credential_org = credential.credential.course_key.org
-
-        data.append(
-            {
-                "uuid": credential.uuid.hex,
-                "status": credential.status,
-                "username": credential.username,
-                "download_url": credential.download_url,
-                "credential_id": credential.credential_id,
-                "credential_uuid": credential_uuid,  # pylint: disable=possibly-used-before-assignment
-                "credential_title": credential_title,  # pylint: disable=possibly-used-before-assignment
-                "credential_org": credential_org,  # pylint: disable=possibly-used-before-assignment
-                "modified_date": credential.modified.date().isoformat(),
-            }
-        )
+    data = {model: [] for model in models}
+    for __, model, user_credential in user_credentials[:page_size]:
+        data[model].append(get_user_credential_data(user_credential, model))
 
-    return data
+    next_id = user_credentials[page_size - 1][0] if len(user_credentials) > page_size else None
+    return data, next_id
 
 
 def generate_base64_qr_code(text):
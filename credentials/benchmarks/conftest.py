@@ -0,0 +1,151 @@
+# pylint: disable=redefined-outer-name
+"""
+Pytest: query count and latency benchmarks of the hot read paths.
+
+Every benchmark measures the number of database queries of one call and the mean latency of several calls (with
+pytest-benchmark), then compares them to the stored baselines (`baselines.json`):
+
+- the query count must not exceed its baseline (query counts don't depend on the database or the machine);
+- the mean latency must not exceed its baseline (recorded per database vendor) times the latency tolerance.
+
+The benchmarks are not part of the regular test run, see `make benchmarks` and `make benchmarks_update`.
+"""
+
+import json
+import os
+
+import pytest
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from edx_django_utils.cache import TieredCache
+
+from credentials.apps.core.api_clients import api_client_pool
+from credentials.apps.core.tests.factories import SiteConfigurationFactory
+
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+DOMAIN = "testserver.fake"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("baselines", "query count and latency baselines")
+    group.addoption(
+        "--update-baselines",
+        action="store_true",
+        default=False,
+        help="Store the measured query counts and latencies as the new baselines instead of checking them.",
+    )
+    group.addoption(
+        "--latency-tolerance",
+        type=float,
+        default=2.0,
+        help="How many times its baseline a mean latency may be before the benchmark fails (default: 2.0).",
+    )
+
+
+class Baselines:
+    """
+    Stored query counts (by benchmark) and mean latencies (by database vendor, then benchmark).
+    """
+
+    def __init__(self, path, update=False, latency_tolerance=2.0):
+        self.path = path
+        self.update = update
+        self.latency_tolerance = latency_tolerance
+        self.data = {"queries": {}, "latency": {}}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as baselines_file:
+                self.data.update(json.load(baselines_file))
+
+    def check(self, name, queries, latency):
+        vendor = connection.vendor
+
+        if self.update:
+            self.data["queries"][name] = queries
+            if latency is not None:
+                self.data["latency"].setdefault(vendor, {})[name] = round(latency, 6)
+            return
+
+        expected_queries = self.data["queries"].get(name)
+        if expected_queries is None:
+            pytest.fail(f"No query count baseline for [{name}], run `make benchmarks_update` to record it.")
+        assert queries <= expected_queries, (
+            f"[{name}] ran {queries} queries, its baseline is {expected_queries}. Fix the regression, or run "
+            "`make benchmarks_update` if the new count is expected."
+        )
+
+        expected_latency = self.data["latency"].get(vendor, {}).get(name)
+        if latency is not None and expected_latency is not None:
+            assert latency <= expected_latency * self.latency_tolerance, (
+                f"[{name}] took {latency * 1000:.2f}ms on average, its baseline ({vendor}) is "
+                f"{expected_latency * 1000:.2f}ms (tolerance x{self.latency_tolerance})."
+            )
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as baselines_file:
+            json.dump(self.data, baselines_file, indent=2, sort_keys=True)
+            baselines_file.write("\n")
+
+
+@pytest.fixture(scope="session")
+def baselines(request):
+    baselines = Baselines(
+        BASELINES_PATH,
+        update=request.config.getoption("--update-baselines"),
+        latency_tolerance=request.config.getoption("--latency-tolerance"),
+    )
+    yield baselines
+    if baselines.update:
+        baselines.save()
+
+
+@pytest.fixture
+def assert_within_baselines(request, benchmark, baselines):
+    """
+    Benchmarks a callable and checks its query count and mean latency against the stored baselines.
+
+    `setup` (optional) runs before every call, e.g. to clear caches so that every call is a cold one.
+    """
+
+    name = f"{os.path.basename(request.node.fspath)}::{request.node.name}"
+
+    def run(func, setup=None, rounds=10):
+        if setup:
+            setup()
+        with CaptureQueriesContext(connection) as captured:
+            result = func()
+        # counted right away: requests made by the timed calls below reset the connection's queries log
+        queries = len(captured)
+        benchmark.extra_info["queries"] = queries
+
+        benchmark.pedantic(func, setup=setup, rounds=rounds, iterations=1)
+        # no stats when benchmarks are disabled (--benchmark-disable)
+        latency = benchmark.stats.stats.mean if benchmark.stats else None
+
+        baselines.check(name, queries, latency)
+        return result
+
+    return run
+
+
+@pytest.fixture
+def site_configuration(db):  # pylint: disable=unused-argument
+    cache.clear()
+    TieredCache.dangerous_clear_all_tiers()
+    api_client_pool.clear()
+    Site.objects.all().delete()
+    return SiteConfigurationFactory(site__domain=DOMAIN, site__id=settings.SITE_ID)
+
+
+@pytest.fixture
+def site(site_configuration):
+    return site_configuration.site
+
+
+@pytest.fixture
+def client(site_configuration):  # pylint: disable=unused-argument
+    return Client(SERVER_NAME=DOMAIN)
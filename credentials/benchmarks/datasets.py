@@ -0,0 +1,91 @@
+"""
+Factory-built benchmark datasets.
+"""
+
+from credentials.apps.catalog.tests.factories import (
+    CourseFactory,
+    CourseRunFactory,
+    OrganizationFactory,
+    ProgramFactory,
+)
+from credentials.apps.core.tests.factories import UserFactory
+from credentials.apps.credentials.models import UserCredential, UserCredentialAttribute
+from credentials.apps.credentials.tests.factories import (
+    CourseCertificateFactory,
+    ProgramCertificateFactory,
+    UserCredentialFactory,
+)
+from credentials.apps.records.tests.factories import ProgramCertRecordFactory, UserGradeFactory
+
+
+PROGRAM_SIZE = 5
+BULK_CREATE_BATCH_SIZE = 5000
+
+
+def create_program(site, course_run_count=PROGRAM_SIZE):
+    """
+    A program with its organizations, course runs (a course each), course certificates and program certificate.
+    """
+    organizations = OrganizationFactory.create_batch(2, site=site)
+    course_runs = []
+    for __ in range(course_run_count):
+        course = CourseFactory(site=site)
+        course.owners.set(organizations[:1])
+        course_runs.append(CourseRunFactory(course=course))
+
+    program = ProgramFactory(
+        site=site, type="Professional Certificate", course_runs=course_runs, authoring_organizations=organizations
+    )
+    for course_run in course_runs:
+        CourseCertificateFactory(course_id=course_run.key, course_run=course_run, site=site)
+    ProgramCertificateFactory(site=site, program=program, program_uuid=program.uuid)
+    return program
+
+
+def enroll_learner(program, user, complete=True):
+    """
+    Awards the learner a course certificate (with a grade) in every course run of the program, and the program
+    certificate if `complete`.
+    """
+    for course_run in program.course_runs.all():
+        UserCredentialFactory(username=user.username, credential=course_run.coursecertificate)
+        UserGradeFactory(username=user.username, course_run=course_run, percent_grade=0.9, letter_grade="A")
+    if complete:
+        UserCredentialFactory(username=user.username, credential=program.programcertificate)
+    ProgramCertRecordFactory(user=user, program=program)
+
+
+def create_learner_with_credentials(site, course_credential_count):
+    """
+    A learner with the given number of course credentials, spread over (completed) programs of up to
+    `PROGRAM_SIZE` course runs.
+    """
+    user = UserFactory()
+    for start in range(0, course_credential_count, PROGRAM_SIZE):
+        program = create_program(site, min(PROGRAM_SIZE, course_credential_count - start))
+        enroll_learner(program, user)
+    return user
+
+
+def create_program_credential_holders(site, learner_count):
+    """
+    The given number of learners awarded the certificate of one program, with an attribute each.
+
+    Bulk created (without signals nor `save`), as the datasets of the paging benchmarks are large.
+    """
+    program = create_program(site, course_run_count=1)
+    UserCredential.objects.bulk_create(
+        (
+            UserCredential(username=f"holder{index}", credential=program.programcertificate, site=site)
+            for index in range(learner_count)
+        ),
+        batch_size=BULK_CREATE_BATCH_SIZE,
+    )
+    UserCredentialAttribute.objects.bulk_create(
+        (
+            UserCredentialAttribute(user_credential_id=user_credential_id, name="visible_date", value="2024-01-01")
+            for user_credential_id in UserCredential.objects.values_list("id", flat=True).iterator()
+        ),
+        batch_size=BULK_CREATE_BATCH_SIZE,
+    )
+    return program
@@ -0,0 +1,68 @@
+"""
+Benchmarks of the credentials REST API (v2).
+"""
+
+import pytest
+from django.urls import reverse
+from waffle.testutils import override_switch
+
+from credentials.apps.api.v2.pagination import ModifiedCursorPagination
+from credentials.apps.core.tests.factories import UserFactory
+from credentials.apps.credentials.models import UserCredential
+
+from .datasets import create_learner_with_credentials, create_program_credential_holders
+
+
+HOLDER_COUNT = 100000
+# the (fixed) size of the numbered pages
+PAGE_SIZE = 20
+
+
+@pytest.mark.parametrize("course_credential_count", [1, 20, 200])
+@pytest.mark.parametrize("user_credential_site", [False, True], ids=["joined-site", "denormalized-site"])
+def test_credentials_list(assert_within_baselines, client, site, user_credential_site, course_credential_count):
+    user = create_learner_with_credentials(site, course_credential_count)
+    client.force_login(UserFactory(is_staff=True, is_superuser=True))
+    url = reverse("api:v2:credentials-list")
+
+    with override_switch("api.use_user_credential_site", active=user_credential_site):
+        response = assert_within_baselines(lambda: client.get(url, {"username": user.username, "page_size": 1000}))
+    assert response.status_code == 200
+    assert response.data["count"] == course_credential_count + len(range(0, course_credential_count, 5))
+
+
+@pytest.mark.parametrize("pagination", ["page-number", "cursor"])
+def test_credentials_last_page(assert_within_baselines, client, site, pagination):
+    create_program_credential_holders(site, HOLDER_COUNT)
+    client.force_login(UserFactory(is_staff=True, is_superuser=True))
+    url = reverse("api:v2:credentials-list")
+
+    if pagination == "cursor":
+        # the position of the last credential of the previous page
+        previous = UserCredential.objects.order_by("modified", "id")[HOLDER_COUNT - PAGE_SIZE - 1]
+        params = {
+            "cursor": ModifiedCursorPagination.encode_cursor((previous.modified, previous.id)),
+            "page_size": PAGE_SIZE,
+        }
+    else:
+        params = {"page": HOLDER_COUNT // PAGE_SIZE}
+
+    with override_switch("api.use_user_credential_site", active=True):
+        response = assert_within_baselines(lambda: client.get(url, params))
+    assert response.status_code == 200
+    assert len(response.data["results"]) == PAGE_SIZE
+
+
+@pytest.mark.parametrize("fields", [None, "uuid,username,status,modified"], ids=["all-fields", "sparse-fields"])
+def test_credentials_sync_page(assert_within_baselines, client, site, fields):
+    create_program_credential_holders(site, HOLDER_COUNT)
+    client.force_login(UserFactory(is_staff=True, is_superuser=True))
+    url = reverse("api:v2:credentials-list")
+    params = {"cursor": "", "page_size": 1000, "modified_since": "2000-01-01T00:00:00Z"}
+    if fields:
+        params["fields"] = fields
+
+    with override_switch("api.use_user_credential_site", active=True):
+        response = assert_within_baselines(lambda: client.get(url, params))
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 1000
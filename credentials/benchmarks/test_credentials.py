@@ -0,0 +1,34 @@
+"""
+Benchmarks of the credential rendering views.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from credentials.apps.core.tests.factories import UserFactory
+
+from .datasets import create_program, enroll_learner
+
+
+@pytest.mark.parametrize("course_run_count", [5, 50])
+@pytest.mark.parametrize("page_cache", ["cold", "warm"])
+def test_render_credential(assert_within_baselines, client, site, page_cache, course_run_count):
+    program = create_program(site, course_run_count)
+    user = UserFactory()
+    enroll_learner(program, user)
+    user_credential = program.programcertificate.user_credentials.get(username=user.username)
+
+    with patch("credentials.apps.core.models.SiteConfiguration.get_user_api_data") as user_data:
+        user_data.return_value = {"username": user.username, "name": user.full_name, "email": user.email}
+        if page_cache == "cold":
+            response = assert_within_baselines(
+                lambda: client.get(user_credential.get_absolute_url()), setup=cache.clear
+            )
+        else:
+            # served from the rendered pages cache
+            client.get(user_credential.get_absolute_url())
+            response = assert_within_baselines(lambda: client.get(user_credential.get_absolute_url()))
+
+    assert response.status_code == 200
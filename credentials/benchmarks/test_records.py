@@ -0,0 +1,60 @@
+"""
+Benchmarks of the Program Record read paths.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from credentials.apps.core.tests.factories import UserFactory
+from credentials.apps.records.api import get_program_record_data
+from credentials.apps.records.models import ProgramRecordSnapshot
+from credentials.apps.records.utils import get_user_program_data
+
+from .datasets import create_learner_with_credentials, create_program, enroll_learner
+
+
+@pytest.mark.parametrize("course_run_count", [5, 50])
+@pytest.mark.parametrize("snapshot", ["cold", "warm"])
+def test_get_program_record_data(assert_within_baselines, site, course_run_count, snapshot):
+    program = create_program(site, course_run_count)
+    user = UserFactory()
+    enroll_learner(program, user)
+
+    def setup():
+        if snapshot == "cold":
+            ProgramRecordSnapshot.objects.all().delete()
+        else:
+            get_program_record_data(user, program.uuid, site)
+
+    record = assert_within_baselines(lambda: get_program_record_data(user, program.uuid, site), setup=setup)
+    assert len(record["grades"]) == course_run_count
+
+
+def test_get_program_record_data_scales(site):
+    """
+    A cold Program Record runs as many queries for a program of 50 course runs as for one of 5.
+    """
+
+    query_counts = []
+    for course_run_count in [5, 50]:
+        program = create_program(site, course_run_count)
+        user = UserFactory()
+        enroll_learner(program, user)
+        # first call loads what is shared by all records (e.g. the site configuration)
+        get_program_record_data(user, program.uuid, site)
+        ProgramRecordSnapshot.objects.all().delete()
+
+        with CaptureQueriesContext(connection) as captured:
+            get_program_record_data(user, program.uuid, site)
+        query_counts.append(len(captured))
+
+    assert query_counts[0] == query_counts[1]
+
+
+@pytest.mark.parametrize("course_credential_count", [1, 20, 200])
+def test_get_user_program_data(assert_within_baselines, site, course_credential_count):
+    user = create_learner_with_credentials(site, course_credential_count)
+
+    programs = assert_within_baselines(lambda: get_user_program_data(user.username, site))
+    assert len(programs) == -(-course_credential_count // 5)
@@ -0,0 +1,37 @@
+"""
+Benchmarks of the verifiable credentials read paths.
+"""
+
+import didkit
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from credentials.apps.credentials.constants import UserCredentialStatus
+from credentials.apps.credentials.tests.factories import UserCredentialFactory
+from credentials.apps.verifiable_credentials.issuance.tests.factories import (
+    IssuanceConfigurationFactory,
+    IssuanceLineFactory,
+)
+
+from .datasets import create_program
+
+
+@pytest.mark.parametrize("issued_count", [1, 20, 200])
+def test_status_list(assert_within_baselines, client, site, settings, issued_count):
+    settings.ENABLE_VERIFIABLE_CREDENTIALS = True
+    issuer_key = didkit.generate_ed25519_key()  # pylint: disable=no-member, useless-suppression
+    issuer_id = didkit.key_to_did(jwk=issuer_key, method_pattern="key")
+    IssuanceConfigurationFactory(issuer_id=issuer_id, issuer_key=issuer_key)
+    program_certificate = create_program(site).programcertificate
+    for index in range(issued_count):
+        user_credential = UserCredentialFactory(
+            credential=program_certificate,
+            status=UserCredentialStatus.REVOKED if index % 2 else UserCredentialStatus.AWARDED,
+        )
+        IssuanceLineFactory(user_credential=user_credential, issuer_id=issuer_id, status_index=index)
+    url = reverse("verifiable_credentials:api:v1:status-list-2021-v1", args=[issuer_id])
+
+    # cold requests: the status list is issued (signed) again every time
+    response = assert_within_baselines(lambda: client.get(url), setup=cache.clear)
+    assert response.status_code == 200
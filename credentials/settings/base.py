@@ -374,10 +374,20 @@ LOGIN_REDIRECT_URL = "api:v2:credentials-list"
 # CATALOG API CONFIGURATION
 # Specified in seconds. Enable caching by setting this to a value greater than 0.
 PROGRAMS_CACHE_TTL = 60 * 60
+# The number of catalog pages requested at once while copying the catalog data (see `copy_catalog`).
+CATALOG_FETCH_CONCURRENCY = 4
 
 # USER API CONFIGURATION
 # Specified in seconds. Enable caching by setting this to a value greater than 0.
 USER_CACHE_TTL = 30 * 60
+# Specified in seconds. How long an expired user profile is still served, while it's refreshed in background.
+USER_CACHE_STALE_TTL = 24 * 60 * 60
+# Specified in seconds. How long a failed user profile lookup is cached (0 to disable).
+USER_CACHE_NEGATIVE_TTL = 60
+
+# Specified in seconds. How long the rendered certificate pages are served from the cache to anonymous users
+# (0 to disable).
+RENDER_CREDENTIAL_CACHE_TTL = 60 * 60
 
 # Credentials service user in Programs service and LMS
 CREDENTIALS_SERVICE_USER = "credentials_service_user"
@@ -566,6 +576,18 @@ BADGES_CONFIG = {
         "CREDLY_SANDBOX_BASE_URL": "https://sandbox.credly.com/",
         "CREDLY_SANDBOX_API_BASE_URL": "https://sandbox-api.credly.com/v1/",
         "USE_SANDBOX": False,
+        # Credly API HTTP connections (shared per organization):
+        "HTTP_POOL_SIZE": 10,
+        "HTTP_CONNECT_TIMEOUT": 5,
+        "HTTP_READ_TIMEOUT": 10,
+        "BULK_CONCURRENCY": 4,
+        # Credly requests outbox (see "process_credly_operations" management command):
+        "OUTBOX_BATCH_SIZE": 100,
+        "OUTBOX_CONCURRENCY": 4,
+        "OUTBOX_MAX_ATTEMPTS": 8,
+        "OUTBOX_BACKOFF_SECONDS": 30,
+        "OUTBOX_MAX_BACKOFF_SECONDS": 3600,
+        "OUTBOX_LEASE_SECONDS": 600,
     },
     "rules": {
         "ignored_keypaths": [
@@ -650,3 +672,14 @@ EVENT_BUS_PRODUCER_CONFIG = {
 # .. toggle_use_cases: opt_in
 # .. toggle_creation_date: 2024-01-25
 LOG_INCOMING_REQUESTS = WaffleSwitch("api.log_incoming_requests", module_name=__name__)
+
+# .. toggle_name: USE_USER_CREDENTIAL_SITE
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: Toggle to filter the credentials of a site, in the v2 credentials API, on the denormalized
+#   `UserCredential.site` column instead of joining the credential configurations. To be enabled once the
+#   `backfill_user_credential_sites` management command has set the site of the existing credentials.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_target_removal_date: 2027-04-18
+USE_USER_CREDENTIAL_SITE = WaffleSwitch("api.use_user_credential_site", module_name=__name__)